@@ -1,49 +1,60 @@
-import time
 import logging
 from typing import Dict, Any
 
+from src.infrastructure.api.ticker_snapshot import TickerSnapshot
+from src.infrastructure.api.pair_registry import PairRegistry
+from src.core.cache.tiered_cache import get_shared_cache, trade_invalidation_tags, BALANCE_TAG
+
 
 class APIService:
     """🌐 API сервис с кэшированием"""
     
-    def __init__(self, api_client, config):
+    def __init__(self, api_client, config, cache=None):
         self.api = api_client
         self.config = config
         self.logger = logging.getLogger(__name__)
-        self._cache = {}
         self._cache_timeouts = {'balance': 10, 'price': 3, 'pair_settings': 300}
+        # Пространство общего кэша (синхронный код - только L1)
+        self.cache = (cache or get_shared_cache()).namespace("api_service", ttl=self._cache_timeouts['balance'])
+        self.ticker_snapshot = TickerSnapshot(self.api.get_ticker, refresh_interval=self._cache_timeouts['price'])
+        # pair_settings обновляется в фоновом потоке после start()
+        self.pair_registry = PairRegistry(self.api.get_pair_settings, refresh_interval=self._cache_timeouts['pair_settings'])
+    
+    def start(self):
+        """▶️ Загрузка справочника пар и запуск его фонового обновления"""
+        self.pair_registry.start_thread()
+    
+    def stop(self):
+        """⏹️ Остановка фонового обновления справочника пар"""
+        self.pair_registry.stop_thread()
+    
+    def close(self):
+        """🔒 То же, что stop()"""
+        self.stop()
         
     def get_current_price(self, pair: str) -> float:
-        """💱 Получение цены с кэшем"""
-        cache_key = f"price_{pair}"
-        
-        if self._is_cache_valid(cache_key, 'price'):
-            return self._cache[cache_key]['value']
-        
+        """💱 Получение цены из общего снимка ticker"""
         try:
-            ticker_data = self.api.get_ticker()
-            if ticker_data and pair in ticker_data:
-                price = float(ticker_data[pair]['last_trade'])
-                self._update_cache(cache_key, price, 'price')
-                return price
+            quote = self.ticker_snapshot.get_table_sync().get(pair)
+            if quote:
+                return float(quote.last_trade)
             return 0.0
         except Exception as e:
             self.logger.error(f"Ошибка получения цены {pair}: {e}")
             return 0.0
     
     def get_balance(self, currency: str) -> float:
-        """💰 Получение баланса с кэшем"""
-        cache_key = f"balance_{currency}"
-        
-        if self._is_cache_valid(cache_key, 'balance'):
-            return self._cache[cache_key]['value']
+        """💰 Получение баланса с кэшем (один user_info на все валюты)"""
+        balances = self.cache.get_nowait("balances")
+        if balances is not None:
+            return float(balances.get(currency, 0))
         
         try:
             user_info = self.api.get_user_info()
             if user_info and 'balances' in user_info:
-                balance = float(user_info['balances'].get(currency, 0))
-                self._update_cache(cache_key, balance, 'balance')
-                return balance
+                balances = user_info['balances']
+                self.cache.set_nowait("balances", balances, tags=[BALANCE_TAG])
+                return float(balances.get(currency, 0))
             return 0.0
         except Exception as e:
             self.logger.error(f"Ошибка получения баланса {currency}: {e}")
@@ -65,7 +76,7 @@ class APIService:
             
             if result.get('result'):
                 self.logger.info(f"✅ Ордер создан: ID {result.get('order_id')}")
-                self._invalidate_balance_cache()
+                self.cache.invalidate_tags_nowait(*trade_invalidation_tags(pair))
             
             return result
         except Exception as e:
@@ -73,41 +84,25 @@ class APIService:
             return {'result': False, 'error': str(e)}
     
     def _get_min_quantity(self, pair: str) -> float:
-        try:
-            settings = self.api.get_pair_settings()
-            if settings and pair in settings:
-                return float(settings[pair].get('min_quantity', 5.0))
-            return 5.0
-        except:
-            return 5.0
+        spec = self._get_pair_spec(pair)
+        return float(spec.min_quantity) if spec else 5.0
     
     def _get_price_precision(self, pair: str) -> int:
-        try:
-            settings = self.api.get_pair_settings()
-            if settings and pair in settings:
-                return int(settings[pair].get('price_precision', 8))
-            return 8
-        except:
-            return 8
-    
-    def _is_cache_valid(self, key: str, cache_type: str) -> bool:
-        if key not in self._cache:
-            return False
-        cache_entry = self._cache[key]
-        timeout = self._cache_timeouts.get(cache_type, 60)
-        return time.time() - cache_entry['timestamp'] < timeout
-    
-    def _update_cache(self, key: str, value: Any, cache_type: str):
-        self._cache[key] = {'value': value, 'timestamp': time.time(), 'type': cache_type}
+        spec = self._get_pair_spec(pair)
+        return spec.price_precision if spec else 8
     
-    def _invalidate_balance_cache(self):
-        keys_to_remove = [k for k in self._cache.keys() if k.startswith('balance_')]
-        for key in keys_to_remove:
-            del self._cache[key]
+    def _get_pair_spec(self, pair: str):
+        # Без start() справочник загружается при первом ордере
+        if not self.pair_registry.is_loaded:
+            try:
+                self.pair_registry.refresh_sync()
+            except Exception as e:
+                self.logger.warning(f"⚠️ Не удалось загрузить справочник пар: {e}")
+        return self.pair_registry.get(pair)
     
     def get_cache_stats(self) -> Dict[str, Any]:
         return {
-            'total_entries': len(self._cache),
-            'balance_entries': len([k for k in self._cache.keys() if k.startswith('balance_')]),
-            'price_entries': len([k for k in self._cache.keys() if k.startswith('price_')])
+            'cache': self.cache.get_stats(),
+            'ticker_snapshot': self.ticker_snapshot.get_status(),
+            'pair_registry': self.pair_registry.get_status()
         }
@@ -3,6 +3,7 @@ import sys
 import os
 import argparse
 import logging
+import time
 from pathlib import Path
 from datetime import datetime
 from typing import Optional
@@ -13,7 +14,7 @@ sys.path.insert(0, str(src_path))
 
 try:
     # Core импорты
-    from src.core.di_container import DependencyContainer
+    from src.core.di_container import DependencyContainer, ServiceLifetime
     from src.core.models import TradingPair
     from src.core.exceptions import TradingSystemError, ConfigurationError
 
@@ -25,6 +26,15 @@ try:
     from src.application.services.position_service import PositionService
     from src.application.services.risk_management_service import RiskManagementService
     from src.application.services.analytics_service import AnalyticsService
+    from src.application.services.polling_scheduler import AdaptivePollingScheduler, PollingConfig
+    from src.core.cache.tiered_cache import get_shared_cache
+    from src.core.cache.snapshot import CacheSnapshot
+
+    # Domain / Infrastructure
+    from src.domain.market.order_book import OrderBookRegistry
+    from src.domain.market.market_data_service import MarketDataService
+    from src.domain.execution.order_execution_service import OrderExecutionService
+    from src.infrastructure.api.infrastructure_api import APIClientFactory, ExmoAPIClient
 
 except ImportError as e:
     print(f"❌ Ошибка импорта компонентов новой архитектуры: {e}")
@@ -42,16 +52,21 @@ class TradingBotApplication:
         self.position_service: Optional[PositionService] = None
         self.risk_service: Optional[RiskManagementService] = None
         self.analytics_service: Optional[AnalyticsService] = None
+        self.cache_snapshot: Optional[CacheSnapshot] = None
+        self.exchange_api: Optional[ExmoAPIClient] = None
+        self.order_books: Optional[OrderBookRegistry] = None
 
         # Статус приложения
         self.is_initialized = False
         self.is_running = False
+        self.started_at: Optional[float] = None
 
         # Логирование - ИСПРАВЛЕНО: инициализируем сразу
         self.logger = logging.getLogger(__name__)
 
     async def initialize(self) -> None:
         """🚀 Инициализация приложения"""
+        self.started_at = time.perf_counter()
         try:
             print("🚀 Инициализация DOGE Trading Bot v4.1-refactored...")
 
@@ -101,6 +116,9 @@ class TradingBotApplication:
 
             self.logger.info(f"✅ Торговая сессия запущена: {session_id}")
 
+            # Адаптивный интервал между циклами
+            scheduler = await self._create_polling_scheduler()
+
             # Основной торговый цикл
             cycle_count = 0
             start_time = datetime.now()
@@ -108,11 +126,18 @@ class TradingBotApplication:
             while self.is_running:
                 try:
                     # Выполняем торговый цикл
+                    if scheduler:
+                        scheduler.cycle_started()
                     result = await self.trading_orchestrator.execute_trading_cycle()
                     cycle_count += 1
+                    if cycle_count == 1:
+                        self._report_startup_latency()
 
                     self.logger.debug(f"🔄 Цикл #{cycle_count}: {result.action}")
 
+                    if scheduler:
+                        self._update_polling_scheduler(scheduler, result)
+
                     # Проверяем условия завершения
                     if session_duration_minutes:
                         elapsed_minutes = (datetime.now() - start_time).total_seconds() / 60
@@ -121,7 +146,11 @@ class TradingBotApplication:
                             break
 
                     # Пауза между циклами
-                    await asyncio.sleep(self.settings.system.update_interval_seconds)
+                    if scheduler:
+                        await scheduler.wait()
+                        self.logger.debug(f"⏱️ Следующий интервал: {scheduler.current_interval:.1f}с")
+                    else:
+                        await asyncio.sleep(self.settings.system.update_interval_seconds)
 
                 except KeyboardInterrupt:
                     self.logger.info("⌨️ Получен сигнал остановки от пользователя")
@@ -136,12 +165,66 @@ class TradingBotApplication:
             self.is_running = False
 
             self.logger.info(f"🏁 Торговая сессия завершена. Циклов выполнено: {cycle_count}")
+            if scheduler:
+                self.logger.info(f"⏱️ Адаптивный интервал: {scheduler.get_status()}")
+            self.logger.info(f"🗄️ Общий кэш: {get_shared_cache().get_stats()}")
 
         except Exception as e:
             self.logger.critical(f"💥 Критическая ошибка торговой сессии: {e}")
             await self._emergency_shutdown()
             raise
 
+    async def _create_polling_scheduler(self) -> Optional[AdaptivePollingScheduler]:
+        """⏱️ Планировщик интервала циклов (None - фиксированный интервал)"""
+        system = self.settings.system
+        if not system.adaptive_polling_enabled:
+            return None
+
+        config = PollingConfig(
+            base_interval=system.update_interval_seconds,
+            min_interval=system.min_update_interval_seconds,
+            max_interval=system.max_update_interval_seconds,
+            volatility_halflife=system.volatility_halflife_seconds,
+            target_move_percent=system.target_move_percent
+        )
+
+        # Счетчик запросов лимитера - для оценки сэкономленных вызовов API
+        api_call_counter = None
+        metrics = getattr(getattr(self.trading_orchestrator.exchange_api, 'rate_limiter', None), 'metrics', None)
+        if metrics is not None and hasattr(metrics, 'total_requests'):
+            api_call_counter = lambda: metrics.total_requests
+
+        scheduler = AdaptivePollingScheduler(config, api_call_counter=api_call_counter)
+
+        # Тики из потока цен будят цикл при пересечении уровней
+        provider = self.trading_orchestrator.market_data_provider
+        if hasattr(provider, 'subscribe_to_price_updates'):
+            try:
+                await provider.subscribe_to_price_updates(
+                    str(self.trading_orchestrator.trading_pair), scheduler.observe_price
+                )
+            except Exception as e:
+                self.logger.warning(f"⚠️ Поток цен недоступен, интервал только по циклам: {e}")
+
+        return scheduler
+
+    def _update_polling_scheduler(self, scheduler: AdaptivePollingScheduler, result) -> None:
+        """🎯 Цена цикла и уровни DCA/стопа/пирамиды для планировщика"""
+        context = getattr(result, 'context', None)
+        if context is None:
+            return
+
+        scheduler.observe_price(context.current_price, wake=False)
+
+        position = context.position
+        trading = self.settings.trading
+        scheduler.set_levels_from_position(
+            getattr(position, 'average_price', None) if position else None,
+            self.settings.dca.price_drop_threshold_percent,
+            trading.stop_loss_percent,
+            [trading.min_profit_percent, trading.take_profit_percent]
+        )
+
     async def run_analytics_mode(self) -> None:
         """📊 Режим аналитики без торговли"""
         if not self.is_initialized:
@@ -308,6 +391,13 @@ class TradingBotApplication:
                 await self.trading_orchestrator.stop_trading_session()
                 self.is_running = False
 
+            # Снимок общего кэша для теплого старта следующего процесса
+            if self.cache_snapshot:
+                self.cache_snapshot.save(get_shared_cache())
+
+            if self.exchange_api:
+                await self.exchange_api.close()
+
             # Сохраняем финальное состояние
             if self.analytics_service:
                 final_metrics = await self.analytics_service.calculate_current_metrics()
@@ -370,9 +460,27 @@ class TradingBotApplication:
 
     async def _configure_dependencies(self) -> None:
         """💉 Настройка зависимостей в DI контейнере"""
-        # Здесь будет регистрация всех сервисов в DI контейнере
-        # Пока используем заглушки, так как Infrastructure слой не готов
-        self.logger.info("💉 DI зависимости настроены (заглушки)")
+        self.exchange_api = APIClientFactory.create_exmo_client(self.settings.api)
+        self.container.register_instance(ExmoAPIClient, self.exchange_api)
+
+        # Один реестр стаканов на процесс: стакан, снятый при исполнении,
+        # сразу виден в рыночных данных и наоборот
+        self.order_books = OrderBookRegistry(self.exchange_api)
+        self.container.register_instance(OrderBookRegistry, self.order_books)
+
+        self.container.register_factory(
+            MarketDataService,
+            lambda: MarketDataService(order_books=self.order_books, cache=get_shared_cache()),
+            ServiceLifetime.SINGLETON
+        )
+        self.container.register_factory(
+            OrderExecutionService,
+            lambda: OrderExecutionService(self.exchange_api, order_books=self.order_books),
+            ServiceLifetime.SINGLETON
+        )
+
+        # Остальные сервисы пока заглушки
+        self.logger.info("💉 DI зависимости настроены: API клиент, стаканы, рыночные данные, исполнение")
 
     async def _initialize_services(self) -> None:
         """🔧 Инициализация всех сервисов"""
@@ -383,11 +491,28 @@ class TradingBotApplication:
             # Пока используем заглушки, так как полная Infrastructure не готова
             # В будущем сервисы будут создаваться через DI контейнер
 
+            # Общий кэш: сделка инвалидирует балансы и данные пары во всех слоях
+            await get_shared_cache().subscribe_to_trades()
+
+            # Теплый старт: записи кэша прошлого процесса, чей TTL не истек
+            if self.settings.system.cache_enabled:
+                self.cache_snapshot = CacheSnapshot(self.settings.system.cache_snapshot_file)
+                self.cache_snapshot.restore(get_shared_cache())
+
             self.logger.info("🔧 Сервисы инициализированы (заглушки)")
 
         except Exception as e:
             raise TradingSystemError(f"Ошибка инициализации сервисов: {e}")
 
+    def _report_startup_latency(self) -> None:
+        """⏱️ Время от запуска до первого торгового цикла"""
+        if self.started_at is None:
+            return
+        elapsed = time.perf_counter() - self.started_at
+        restored = self.cache_snapshot.stats.restored if self.cache_snapshot else 0
+        mode = f"теплый старт, {restored} записей кэша" if restored else "холодный старт"
+        self.logger.info(f"⏱️ Первый торговый цикл через {elapsed:.2f}с после запуска ({mode})")
+
     async def _system_health_check(self) -> None:
         """🏥 Проверка здоровья системы"""
         try:
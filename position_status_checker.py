@@ -24,22 +24,36 @@ def load_position_data() -> Dict[str, Any]:
         print(f"❌ Ошибка загрузки позиций: {e}")
         return {}
 
-def get_current_market_price() -> float:
-    """💱 Получение текущей рыночной цены (упрощенная версия)"""
+_ticker_snapshot = None
+
+def get_ticker_snapshot():
+    """📸 Общий снимок ticker: все запросы цены скрипта обслуживаются одним запросом"""
+    global _ticker_snapshot
     
-    try:
-        # Импортируем API клиент
+    if _ticker_snapshot is None:
         from api_client import ExmoAPIClient
         from config import TradingConfig
+        from src.infrastructure.api.ticker_snapshot import TickerSnapshot
         
         config = TradingConfig()
         api = ExmoAPIClient(config.API_KEY, config.API_SECRET)
+        _ticker_snapshot = TickerSnapshot(api.get_ticker, refresh_interval=30)
+    
+    return _ticker_snapshot
+
+def get_current_market_price() -> float:
+    """💱 Получение текущей рыночной цены (упрощенная версия)"""
+    
+    try:
+        from config import TradingConfig
         
-        ticker_data = api.get_ticker()
+        config = TradingConfig()
         pair = f"{config.CURRENCY_1}_{config.CURRENCY_2}"
         
-        if ticker_data and pair in ticker_data:
-            return float(ticker_data[pair]['last_trade'])
+        quote = get_ticker_snapshot().get_table_sync().get(pair)
+        
+        if quote:
+            return float(quote.last_trade)
         
         print("⚠️ Не удалось получить цену через API")
         return 0.0
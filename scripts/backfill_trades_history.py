@@ -0,0 +1,91 @@
+import sys
+import time
+import asyncio
+import argparse
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from src.config.settings import APISettings, ConfigConstants
+from src.infrastructure.api.infrastructure_api import APIClientFactory
+from src.infrastructure.persistence.trade_history_sync import (
+    IncrementalTradeSync, TradeHistoryJournal, TradeHistoryBackfill
+)
+
+
+class ProgressPrinter:
+    """📈 Вывод хода загрузки не чаще раза в interval секунд"""
+
+    def __init__(self, interval: float):
+        self.interval = interval
+        self._last_print = 0.0
+
+    def __call__(self, progress, state, result):
+        now = time.monotonic()
+        if not result.completed and now - self._last_print < self.interval:
+            return
+        self._last_print = now
+        status = "✅" if result.completed else "⏳"
+        print(f"  {status} {result.pair:<12} страниц={result.pages:<5} новых={result.new_trades:<7} "
+              f"offset={state.pending_offset if state.pending_offset is not None else '-':<7} | "
+              f"всего: пар {progress.pairs_done}/{progress.pairs_total}, страниц {progress.pages}, "
+              f"сделок {progress.new_trades}, {progress.pages_per_second:.1f} стр/с")
+
+
+async def main_async(args):
+    settings = APISettings(
+        base_url=args.base_url,
+        rate_limit_per_minute=args.calls_per_minute,
+        rate_limit_per_hour=args.calls_per_minute * 60,
+        rate_limiter_type="priority",
+        http_transport=args.transport
+    )
+    # Один клиент - один лимитер: все пары делят общий бюджет запросов
+    client = APIClientFactory.create_exmo_client(settings)
+
+    sync = IncrementalTradeSync(TradeHistoryJournal(args.data_dir), page_size=args.page_size)
+    backfill = TradeHistoryBackfill(sync, concurrency=args.concurrency, on_progress=ProgressPrinter(args.progress_interval))
+
+    async def fetch_page(pair, offset, limit):
+        # get_trades_page поднимает исключение при ошибке - пустая страница только в конце истории
+        return await client.get_trades_page(pair, limit=limit, offset=offset)
+
+    print(f"⚡ Загрузка истории: {len(args.pairs)} пар, параллельно {args.concurrency}, "
+          f"лимит {args.calls_per_minute}/мин, страница {args.page_size}")
+    try:
+        progress = await backfill.run(args.pairs, fetch_page, args.max_pages)
+    finally:
+        await client.close()
+
+    print(f"\n📊 Итог за {progress.elapsed:.1f}с: страниц {progress.pages}, новых сделок {progress.new_trades}")
+    failed = 0
+    for pair in args.pairs:
+        result = progress.results.get(pair)
+        status = sync.get_status(pair)
+        if result is None or result.error:
+            failed += 1
+            print(f"  ❌ {pair:<12} {result.error if result else 'не запускалась'}")
+        else:
+            print(f"  {'✅' if result.completed else '⏸️'} {pair:<12} новых={result.new_trades:<7} "
+                  f"всего={status['total_trades']:<8} last_trade_id={status['last_trade_id']}")
+    return 1 if failed else 0
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Параллельная загрузка истории сделок по нескольким парам")
+    parser.add_argument("--pairs", type=lambda v: v.split(","), default=list(ConfigConstants.SUPPORTED_TRADING_PAIRS))
+    parser.add_argument("--concurrency", type=int, default=4)
+    parser.add_argument("--page-size", type=int, default=100)
+    parser.add_argument("--max-pages", type=int, default=None, help="ограничение страниц на пару за запуск")
+    parser.add_argument("--data-dir", default="data/trades_sync")
+    parser.add_argument("--calls-per-minute", type=int, default=30)
+    parser.add_argument("--base-url", default="https://api.exmo.com/v1.1")
+    parser.add_argument("--transport", default="aiohttp", choices=["requests", "aiohttp"])
+    parser.add_argument("--progress-interval", type=float, default=2.0)
+    args = parser.parse_args()
+
+    return asyncio.run(main_async(args))
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,199 @@
+import sys
+import time
+import random
+import asyncio
+import argparse
+from decimal import Decimal
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from src.config.settings import APISettings
+from src.infrastructure.api.infrastructure_api import APIClientFactory
+from exmo_stand_in import ExmoStandInServer, StandInConfig, LatencyProfile
+
+
+# Смесь операций бота: (операция, вес)
+WORKLOAD = (
+    ("get_current_price", 30),
+    ("get_order_book", 15),
+    ("get_balance", 20),
+    ("get_open_orders", 15),
+    ("get_trades_history", 10),
+    ("create_and_cancel", 10),
+)
+
+
+async def run_operation(client, operation, pair):
+    """Одна операция через полный стек клиента"""
+    if operation == "get_current_price":
+        await client.get_current_price(pair)
+    elif operation == "get_order_book":
+        await client.get_order_book(pair, limit=20)
+    elif operation == "get_balance":
+        await client.get_balance("EUR")
+    elif operation == "get_open_orders":
+        await client.get_open_orders()
+    elif operation == "get_trades_history":
+        await client.get_trades_history(pair)
+    elif operation == "create_and_cancel":
+        # Цена ниже рынка: ордер остается открытым и сразу отменяется
+        result = await client.create_order(pair, Decimal("10"), Decimal("0.1"), "buy")
+        if result.get("success"):
+            await client.cancel_order(str(result["order_id"]))
+
+
+async def sample_adaptive_delay(client, started, samples, interval):
+    """Снятие adaptive_delay лимитера во времени"""
+    while True:
+        samples.append((time.perf_counter() - started, client.rate_limiter.adaptive_delay))
+        await asyncio.sleep(interval)
+
+
+async def run_load(client, args):
+    """Прогон нагрузки заданной длительности"""
+    rng = random.Random(args.seed)
+    operations = [name for name, _ in WORKLOAD]
+    weights = [weight for _, weight in WORKLOAD]
+    latencies = {name: [] for name in operations}
+    errors = {name: 0 for name in operations}
+    samples = []
+
+    started = time.perf_counter()
+    deadline = started + args.duration
+
+    async def worker():
+        while time.perf_counter() < deadline:
+            operation = rng.choices(operations, weights)[0]
+            call_started = time.perf_counter()
+            try:
+                await run_operation(client, operation, args.pair)
+            except Exception:
+                errors[operation] += 1
+            latencies[operation].append(time.perf_counter() - call_started)
+
+    sampler = asyncio.ensure_future(sample_adaptive_delay(client, started, samples, args.sample_interval))
+    try:
+        await asyncio.gather(*(worker() for _ in range(args.concurrency)))
+    finally:
+        sampler.cancel()
+
+    return latencies, errors, samples, time.perf_counter() - started
+
+
+def percentile(values, pct):
+    """Перцентиль по отсортированной выборке"""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+def print_report(args, client, server, latencies, errors, samples, elapsed):
+    """Вывод отчета"""
+    all_latencies = [value for values in latencies.values() for value in values]
+    status = client.get_status()
+    limiter = status["rate_limiter"]
+
+    print(f"📊 API слой: limiter={args.limiter}, transport={args.transport}, "
+          f"конкурентность {args.concurrency}, {args.duration:.0f}с")
+    print(f"  операций: {len(all_latencies)}  throughput={len(all_latencies) / elapsed:8.1f} оп/с  "
+          f"p50={percentile(all_latencies, 50) * 1000:8.2f}мс  "
+          f"p99={percentile(all_latencies, 99) * 1000:8.2f}мс  "
+          f"max={max(all_latencies, default=0) * 1000:8.2f}мс")
+
+    print("  по операциям:")
+    for name, values in latencies.items():
+        print(f"    {name:<20} n={len(values):6d} err={errors[name]:5d} "
+              f"p50={percentile(values, 50) * 1000:8.2f}мс "
+              f"p99={percentile(values, 99) * 1000:8.2f}мс")
+
+    print("  по эндпоинтам (ожидание лимитера / сеть по классам ответа):")
+    for endpoint, histograms in status["latency"].items():
+        wait = histograms.get("permit_wait", {})
+        network = " ".join(
+            f"{response_class}: n={h['count']} p50={h['p50_ms']:.1f} p99={h['p99_ms']:.1f} max={h['max_ms']:.1f}"
+            for response_class, h in histograms["network"].items()
+        )
+        print(f"    {endpoint:<18} wait p99={wait.get('p99_ms', 0):8.1f}мс | {network}")
+
+    server_stats = server.stats.to_dict()
+    print(f"  сервер: запросов={server_stats['total_requests']} "
+          f"429={server_stats['rate_limited']} 500={server_stats['injected_errors']}")
+    print(f"  объединено запросов: {status['coalescing']['coalesced']} "
+          f"({status['coalescing']['saved_percent']:.1f}%)")
+
+    adaptive = limiter.get("adaptive", {})
+    delays = [delay for _, delay in samples]
+    above_zero = sum(1 for delay in delays if delay > 0) * args.sample_interval
+    print(f"  adaptive_delay: max={max(delays, default=0):.1f}с "
+          f"конец={adaptive.get('current_delay', 0):.1f}с "
+          f"время>0={above_zero:.1f}с  rate_limit_hits={limiter['metrics']['rate_limit_hits']}")
+
+    # Сжатая временная шкала: одно значение на секунду
+    timeline = {}
+    for moment, delay in samples:
+        timeline[int(moment)] = max(timeline.get(int(moment), 0.0), delay)
+    print("  шкала (с:задержка): " + " ".join(f"{second}:{delay:.1f}" for second, delay in sorted(timeline.items())))
+
+
+async def main_async(args):
+    config = StandInConfig(
+        latency=LatencyProfile(args.latency, args.latency_ms, args.latency_spread_ms),
+        rate_limit_per_second=args.server_rate_limit,
+        rate_limit_probability=args.rate_limit_probability,
+        error_rate=args.error_rate,
+        seed=args.seed
+    )
+    server = ExmoStandInServer(config, args.host, args.port)
+    server.seed_trades(args.pair, 200)
+    await server.start()
+
+    settings = APISettings(
+        api_key="k" * 32,
+        api_secret="s" * 32,
+        base_url=server.base_url,
+        retry_attempts=0,
+        rate_limit_per_minute=args.calls_per_minute,
+        rate_limit_per_hour=args.calls_per_minute * 60,
+        rate_limiter_type=args.limiter,
+        http_transport=args.transport,
+        http_pool_limit_per_host=args.concurrency
+    )
+    client = APIClientFactory.create_exmo_client(settings)
+
+    try:
+        latencies, errors, samples, elapsed = await run_load(client, args)
+        print_report(args, client, server, latencies, errors, samples, elapsed)
+    finally:
+        await client.close()
+        await server.stop()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Нагрузочный тест ExmoAPIClient на локальном stand-in EXMO")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--duration", type=float, default=20.0)
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--pair", default="DOGE_EUR")
+    parser.add_argument("--limiter", default="sliding_window", choices=["sliding_window", "priority"])
+    parser.add_argument("--transport", default="aiohttp", choices=["requests", "aiohttp"])
+    parser.add_argument("--calls-per-minute", type=int, default=900)
+    parser.add_argument("--server-rate-limit", type=int, default=10, help="лимит сервера, запросов/с")
+    parser.add_argument("--rate-limit-probability", type=float, default=0.0)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--latency", default="lognormal", choices=["fixed", "uniform", "exponential", "lognormal"])
+    parser.add_argument("--latency-ms", type=float, default=20.0)
+    parser.add_argument("--latency-spread-ms", type=float, default=10.0)
+    parser.add_argument("--sample-interval", type=float, default=0.25)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    asyncio.run(main_async(args))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,122 @@
+import sys
+import time
+import asyncio
+import argparse
+import statistics
+from decimal import Decimal
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from src.config.settings import APISettings
+from src.infrastructure.api.infrastructure_api import APIClientFactory
+from exmo_stand_in import ExmoStandInServer, StandInConfig, LatencyProfile
+
+
+def make_orders(count, pair):
+    """Лимитные ордера ниже рынка: остаются открытыми до отмены"""
+    return [
+        {"pair": pair, "quantity": Decimal("10"), "price": Decimal("0.1") - Decimal(i) / 10000, "order_type": "buy"}
+        for i in range(count)
+    ]
+
+
+async def run_sequential(client, orders):
+    """Ордер за ордером: N раундов на размещение и N на отмену"""
+    started = time.perf_counter()
+    results = [
+        await client.create_order(o["pair"], o["quantity"], o["price"], o["order_type"])
+        for o in orders
+    ]
+    placed = time.perf_counter() - started
+
+    order_ids = [str(r["order_id"]) for r in results if r.get("success")]
+    started = time.perf_counter()
+    for order_id in order_ids:
+        await client.cancel_order(order_id)
+    cancelled = time.perf_counter() - started
+
+    return placed, cancelled, len(order_ids)
+
+
+async def run_batch(client, orders):
+    """Пачка: create_orders + cancel_orders"""
+    started = time.perf_counter()
+    results = await client.create_orders(orders)
+    placed = time.perf_counter() - started
+
+    order_ids = [str(r["order_id"]) for r in results if r.get("success")]
+    started = time.perf_counter()
+    await client.cancel_orders(order_ids)
+    cancelled = time.perf_counter() - started
+
+    return placed, cancelled, len(order_ids)
+
+
+async def main_async(args):
+    config = StandInConfig(
+        latency=LatencyProfile(args.latency, args.latency_ms, args.latency_spread_ms),
+        rate_limit_per_second=args.server_rate_limit
+    )
+    server = ExmoStandInServer(config, args.host, args.port)
+    await server.start()
+
+    settings = APISettings(
+        api_key="k" * 32,
+        api_secret="s" * 32,
+        base_url=server.base_url,
+        retry_attempts=0,
+        rate_limit_per_minute=args.calls_per_minute,
+        rate_limit_per_hour=args.calls_per_minute * 60,
+        rate_limiter_type="priority",
+        http_transport=args.transport,
+        http_pool_limit_per_host=max(args.sizes)
+    )
+
+    try:
+        print(f"📦 Пакетные ордера: задержка {args.latency}({args.latency_ms}мс), "
+              f"лимит {args.calls_per_minute}/мин, transport={args.transport}, медиана из {args.rounds}")
+        print(f"  {'N':>4} {'режим':<12} {'размещение':>12} {'отмена':>10} {'мс/ордер':>10} {'успешно':>8}")
+
+        for size in args.sizes:
+            for mode, runner in (("sequential", run_sequential), ("batch", run_batch)):
+                placed_times, cancel_times, succeeded = [], [], 0
+                for _ in range(args.rounds):
+                    # Новый клиент на раунд: лимитер стартует с полными корзинами
+                    client = APIClientFactory.create_exmo_client(settings)
+                    try:
+                        placed, cancelled, succeeded = await runner(client, make_orders(size, args.pair))
+                    finally:
+                        await client.close()
+                    placed_times.append(placed)
+                    cancel_times.append(cancelled)
+
+                placed = statistics.median(placed_times)
+                cancelled = statistics.median(cancel_times)
+                print(f"  {size:>4} {mode:<12} {placed * 1000:>10.1f}мс {cancelled * 1000:>8.1f}мс "
+                      f"{(placed + cancelled) / size * 1000:>10.2f} {succeeded:>5}/{size}")
+    finally:
+        await server.stop()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Задержка пакетного размещения и отмены ордеров на stand-in EXMO")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--sizes", type=lambda v: [int(x) for x in v.split(",")], default=[1, 10, 50])
+    parser.add_argument("--rounds", type=int, default=3)
+    parser.add_argument("--pair", default="DOGE_EUR")
+    parser.add_argument("--transport", default="aiohttp", choices=["requests", "aiohttp"])
+    parser.add_argument("--calls-per-minute", type=int, default=6000)
+    parser.add_argument("--server-rate-limit", type=int, default=0, help="лимит сервера, запросов/с")
+    parser.add_argument("--latency", default="lognormal", choices=["fixed", "uniform", "exponential", "lognormal"])
+    parser.add_argument("--latency-ms", type=float, default=40.0)
+    parser.add_argument("--latency-spread-ms", type=float, default=15.0)
+    args = parser.parse_args()
+
+    asyncio.run(main_async(args))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
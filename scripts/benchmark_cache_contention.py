@@ -0,0 +1,133 @@
+import sys
+import time
+import random
+import asyncio
+import argparse
+import threading
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from src.infrastructure.cache.infrastructure_cache import InMemoryCache
+
+
+class GlobalLockCache(InMemoryCache):
+    """Прежняя схема: одна RLock на каждую операцию, включая оценку размера"""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._global_lock = threading.RLock()
+
+    def get_nowait(self, key, default=None):
+        with self._global_lock:
+            return super().get_nowait(key, default)
+
+    def set_nowait(self, key, value, ttl=None, metadata=None):
+        with self._global_lock:
+            super().set_nowait(key, value, ttl, metadata)
+
+    def increment_nowait(self, key, delta=1, initial=0):
+        with self._global_lock:
+            return super().increment_nowait(key, delta, initial)
+
+
+CACHES = {
+    "global-rlock": GlobalLockCache,
+    "striped": InMemoryCache,
+}
+
+
+def make_order_book(i, depth):
+    """Стакан - значение, размер которого оценивается через pickle"""
+    price = 0.1 + i % 1000 / 1000
+    return {
+        "ask": [[f"{price + level / 1e4:.8f}", f"{level * 1.5:.8f}"] for level in range(depth)],
+        "bid": [[f"{price - level / 1e4:.8f}", f"{level * 1.5:.8f}"] for level in range(depth)],
+    }
+
+
+def thread_worker(cache, ops, keys, write_share, depth, seed, counter):
+    """Поток executor'а: чтения, запись стаканов и счетчик запросов"""
+    rng = random.Random(seed)
+    for i in range(ops):
+        key = rng.choice(keys)
+        roll = rng.random()
+        if roll < write_share:
+            cache.set_nowait(key, make_order_book(i, depth))
+        elif roll < write_share * 2:
+            cache.increment_nowait("requests")
+        else:
+            cache.get_nowait(key)
+    counter.append(ops)
+
+
+async def task_worker(cache, ops, keys, seed, latencies):
+    """Задача event loop: чтения тикеров и учет промахов; время каждой операции"""
+    rng = random.Random(seed)
+    for i in range(ops):
+        started = time.perf_counter()
+        if await cache.get(rng.choice(keys)) is None:
+            await cache.increment("misses")
+        latencies.append(time.perf_counter() - started)
+        if i % 50 == 0:
+            await asyncio.sleep(0)
+    return ops
+
+
+async def run(name, args, keys):
+    cache = CACHES[name](args.cache_size, default_ttl=0, lock_stripes=args.stripes)
+    for i, key in enumerate(keys):
+        cache.set_nowait(key, make_order_book(i, args.depth))
+
+    loop = asyncio.get_running_loop()
+    done = []
+    latencies = []
+
+    started = time.perf_counter()
+    threads = [
+        loop.run_in_executor(
+            None, thread_worker, cache, args.thread_ops, keys, args.write_share, args.depth, seed, done
+        )
+        for seed in range(args.threads)
+    ]
+    tasks = [task_worker(cache, args.task_ops, keys, 1000 + seed, latencies) for seed in range(args.tasks)]
+    task_ops = await asyncio.gather(*tasks)
+    await asyncio.gather(*threads)
+    elapsed = time.perf_counter() - started
+
+    latencies.sort()
+    total_ops = sum(done) + sum(task_ops)
+    p99 = latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))]
+    return total_ops / elapsed, p99 * 1e6, latencies[-1] * 1000
+
+
+async def main_async(args):
+    keys = [f"order_book:P{i}" for i in range(args.keys)]
+    print(f"🧵 {args.threads} потоков x {args.thread_ops} операций, {args.tasks} задач x {args.task_ops}, "
+          f"{args.keys} ключей, глубина стакана {args.depth}")
+    print(f"  {'блокировки':<14} {'ops/s':>12} {'loop p99, мкс':>14} {'loop max, мс':>13}")
+    for name in args.caches:
+        ops_per_second, loop_p99, loop_max = await run(name, args, keys)
+        print(f"  {name:<14} {ops_per_second:>12,.0f} {loop_p99:>14.1f} {loop_max:>13.2f}")
+    return 0
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Конкуренция потоков и задач asyncio за InMemoryCache")
+    parser.add_argument("--threads", type=int, default=4)
+    parser.add_argument("--thread-ops", type=int, default=50_000)
+    parser.add_argument("--tasks", type=int, default=8)
+    parser.add_argument("--task-ops", type=int, default=20_000)
+    parser.add_argument("--keys", type=int, default=500)
+    parser.add_argument("--cache-size", type=int, default=1000)
+    parser.add_argument("--depth", type=int, default=50, help="уровней стакана в записываемом значении")
+    parser.add_argument("--write-share", type=float, default=0.1)
+    parser.add_argument("--stripes", type=int, default=16)
+    parser.add_argument("--caches", type=lambda v: v.split(","), default=list(CACHES))
+    args = parser.parse_args()
+
+    return asyncio.run(main_async(args))
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,116 @@
+import sys
+import time
+import random
+import asyncio
+import argparse
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from src.infrastructure.cache.infrastructure_cache import (
+    InMemoryCache, EvictionPolicy, LRUEvictionPolicy, WTinyLFUEvictionPolicy
+)
+
+
+class SortingLRUPolicy(EvictionPolicy):
+    """Прежний LRU: сортировка всех записей по last_accessed при каждом вытеснении"""
+
+    def should_evict(self, entry, cache_size, max_size):
+        return cache_size >= max_size
+
+    def select_victims(self, entries, count):
+        sorted_entries = sorted(entries.items(), key=lambda x: x[1].last_accessed)
+        return [key for key, _ in sorted_entries[:count]]
+
+
+POLICIES = {
+    "sorting-lru": SortingLRUPolicy,
+    "lru": LRUEvictionPolicy,
+    "tinylfu": WTinyLFUEvictionPolicy,
+}
+
+
+def make_bot_trace(length, hot_keys, scan_share, seed=7):
+    """Смесь бота: популярные тикеры/стаканы/балансы по Zipf и разовые запросы истории"""
+    rng = random.Random(seed)
+    kinds = ("ticker", "order_book", "trades", "balance")
+    hot = [f"{kinds[i % len(kinds)]}:P{i // len(kinds)}" for i in range(hot_keys)]
+    weights = [1.0 / (rank + 1) ** 0.9 for rank in range(hot_keys)]
+    cumulative = []
+    total = 0.0
+    for weight in weights:
+        total += weight
+        cumulative.append(total)
+
+    trace = []
+    one_off = 0
+    while len(trace) < length:
+        if rng.random() < scan_share:
+            # Загрузка истории - серия ключей, которые больше не читаются
+            for _ in range(rng.randint(20, 200)):
+                trace.append(f"history:{one_off}")
+                one_off += 1
+        else:
+            point = rng.random() * total
+            low, high = 0, hot_keys - 1
+            while low < high:
+                middle = (low + high) // 2
+                if cumulative[middle] < point:
+                    low = middle + 1
+                else:
+                    high = middle
+            trace.append(hot[low])
+    return trace[:length]
+
+
+def load_trace(path):
+    """Записанная трасса: один ключ на строку"""
+    with open(path, "r", encoding="utf-8") as f:
+        return [line.strip() for line in f if line.strip()]
+
+
+async def replay(cache, trace):
+    """Чтение с заполнением при промахе; (попадания, секунды)"""
+    hits = 0
+    started = time.perf_counter()
+    for key in trace:
+        if await cache.get(key) is not None:
+            hits += 1
+        else:
+            await cache.set(key, key)
+    return hits, time.perf_counter() - started
+
+
+async def main_async(args, trace):
+    print(f"📼 Трасса: {len(trace)} обращений, {len(set(trace))} уникальных ключей, кэш {args.cache_size}")
+    print(f"  {'политика':<12} {'hit rate':>9} {'ops/s':>12}")
+    for name in args.policies:
+        cache = InMemoryCache(args.cache_size, default_ttl=0, eviction_policy=POLICIES[name]())
+        hits, elapsed = await replay(cache, trace)
+        print(f"  {name:<12} {hits / len(trace) * 100:>8.2f}% {len(trace) / elapsed:>12,.0f}")
+        status = getattr(cache.eviction_policy, "get_status", None)
+        if status:
+            print(f"  {'':<12} {status()}")
+    return 0
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Сравнение политик вытеснения InMemoryCache на трассах обращений")
+    parser.add_argument("--trace", help="файл трассы (ключ на строку); по умолчанию - синтетическая смесь бота")
+    parser.add_argument("--save-trace", help="сохранить сгенерированную трассу в файл")
+    parser.add_argument("--length", type=int, default=200_000)
+    parser.add_argument("--hot-keys", type=int, default=4000)
+    parser.add_argument("--scan-share", type=float, default=0.01, help="доля обращений, начинающих загрузку истории")
+    parser.add_argument("--cache-size", type=int, default=1000)
+    parser.add_argument("--policies", type=lambda v: v.split(","), default=list(POLICIES))
+    args = parser.parse_args()
+
+    trace = load_trace(args.trace) if args.trace else make_bot_trace(args.length, args.hot_keys, args.scan_share)
+    if args.save_trace:
+        Path(args.save_trace).write_text("\n".join(trace), encoding="utf-8")
+
+    return asyncio.run(main_async(args, trace))
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,92 @@
+import sys
+import time
+import asyncio
+import argparse
+import statistics
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from src.infrastructure.api.infrastructure_api import HTTPClient, AiohttpHTTPClient
+from exmo_stand_in import ExmoStandInServer, StandInConfig, LatencyProfile
+
+
+async def run_load(client, requests_total, concurrency):
+    """Прогон нагрузки: возвращает список задержек и общее время"""
+    latencies = []
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def one_call():
+        async with semaphore:
+            started = time.perf_counter()
+            response = await client.get("ticker")
+            response.json()
+            latencies.append(time.perf_counter() - started)
+
+    # Прогрев соединений
+    await asyncio.gather(*(client.get("ticker") for _ in range(concurrency)))
+
+    started = time.perf_counter()
+    await asyncio.gather(*(one_call() for _ in range(requests_total)))
+    return latencies, time.perf_counter() - started
+
+
+def percentile(values, pct):
+    """Перцентиль по отсортированной выборке"""
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+def format_row(name, latencies, elapsed):
+    """Строка отчета для одного транспорта"""
+    return (f"  {name:<10} p50={percentile(latencies, 50) * 1000:7.2f}мс "
+            f"p99={percentile(latencies, 99) * 1000:7.2f}мс "
+            f"mean={statistics.mean(latencies) * 1000:7.2f}мс "
+            f"rps={len(latencies) / elapsed:8.1f}")
+
+
+async def main_async(args):
+    # Без лимита сервера и случайного блуждания: измеряется только транспорт
+    config = StandInConfig(latency=LatencyProfile("fixed", args.latency_ms), price_volatility=0.0)
+    server = ExmoStandInServer(config, args.host, args.port)
+    await server.start()
+    base_url = server.base_url
+
+    try:
+        results = {}
+
+        executor_client = HTTPClient(base_url, timeout=10, max_retries=0)
+        results["executor"] = await run_load(executor_client, args.requests, args.concurrency)
+        await executor_client.close()
+
+        aiohttp_client = AiohttpHTTPClient(
+            base_url, timeout=10, max_retries=0,
+            pool_limit=args.concurrency, pool_limit_per_host=args.concurrency
+        )
+        results["aiohttp"] = await run_load(aiohttp_client, args.requests, args.concurrency)
+        await aiohttp_client.close()
+
+        print(f"📊 HTTP транспорт: {args.requests} запросов, конкурентность {args.concurrency}, "
+              f"задержка сервера {args.latency_ms}мс")
+        for name, (latencies, elapsed) in results.items():
+            print(format_row(name, latencies, elapsed))
+    finally:
+        await server.stop()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Сравнение executor и aiohttp транспорта на локальном stand-in")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--latency-ms", type=float, default=5.0)
+    args = parser.parse_args()
+
+    asyncio.run(main_async(args))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,168 @@
+import sys
+import json
+import random
+import timeit
+import argparse
+import tracemalloc
+from dataclasses import dataclass
+from decimal import Decimal
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from src.infrastructure.api.decoding import decode_json, ORJSON_AVAILABLE, UserInfoRecord
+from src.infrastructure.api.ticker_snapshot import TickerQuote
+
+# --orjson: разбор через orjson (decode_json(fast=True)), как при json_decoder="orjson"
+FAST_JSON = False
+
+
+@dataclass(frozen=True)
+class BaselineQuote:
+    """Прежняя запись ticker: frozen dataclass с __dict__"""
+    pair: str
+    last_trade: Decimal
+    buy_price: Decimal
+    sell_price: Decimal
+    high: Decimal
+    low: Decimal
+    avg: Decimal
+    vol: Decimal
+    vol_curr: Decimal
+    updated: int
+
+
+def baseline_to_decimal(value):
+    """Прежнее преобразование: всегда через str()"""
+    if value is None or value == "":
+        return Decimal('0')
+    return Decimal(str(value))
+
+
+def make_ticker_payload(pairs, seed=7):
+    """Ответ ticker в формате EXMO: числа строками"""
+    rng = random.Random(seed)
+    payload = {}
+    for i in range(pairs):
+        price = rng.uniform(0.0001, 50000)
+        payload[f"C{i}_USD"] = {
+            "buy_price": f"{price * 0.999:.8f}",
+            "sell_price": f"{price * 1.001:.8f}",
+            "last_trade": f"{price:.8f}",
+            "high": f"{price * 1.05:.8f}",
+            "low": f"{price * 0.95:.8f}",
+            "avg": f"{price:.8f}",
+            "vol": f"{rng.uniform(0, 1e6):.8f}",
+            "vol_curr": f"{rng.uniform(0, 1e9):.8f}",
+            "updated": 1700000000 + i
+        }
+    return json.dumps(payload).encode()
+
+
+def make_user_info_payload(currencies, seed=7):
+    """Ответ user_info с балансами и резервами"""
+    rng = random.Random(seed)
+    names = [f"C{i}" for i in range(currencies)]
+    return json.dumps({
+        "uid": 123456,
+        "server_date": 1700000000,
+        "balances": {name: f"{rng.uniform(0, 1000):.8f}" for name in names},
+        "reserved": {name: f"{rng.uniform(0, 10):.8f}" for name in names}
+    }).encode()
+
+
+def parse_ticker_baseline(raw):
+    data = json.loads(raw)
+    return {
+        pair: BaselineQuote(
+            pair=pair,
+            last_trade=baseline_to_decimal(item.get("last_trade")),
+            buy_price=baseline_to_decimal(item.get("buy_price")),
+            sell_price=baseline_to_decimal(item.get("sell_price")),
+            high=baseline_to_decimal(item.get("high")),
+            low=baseline_to_decimal(item.get("low")),
+            avg=baseline_to_decimal(item.get("avg")),
+            vol=baseline_to_decimal(item.get("vol")),
+            vol_curr=baseline_to_decimal(item.get("vol_curr")),
+            updated=int(item.get("updated") or 0)
+        )
+        for pair, item in data.items()
+    }
+
+
+def parse_ticker_fast(raw):
+    return {pair: TickerQuote.from_payload(pair, item) for pair, item in decode_json(raw, fast=FAST_JSON).items()}
+
+
+def parse_user_info_baseline(raw):
+    data = json.loads(raw)
+    return {currency: Decimal(str(amount)) for currency, amount in data["balances"].items()}
+
+
+def parse_user_info_fast(raw):
+    return UserInfoRecord.from_payload(decode_json(raw, fast=FAST_JSON)).available_map()
+
+
+def measure_cpu(func, raw, repeat, number):
+    """Лучшее время одного разбора, мкс"""
+    return min(timeit.repeat(lambda: func(raw), repeat=repeat, number=number)) / number * 1e6
+
+
+def measure_memory(func, raw):
+    """Пиковые аллокации и удерживаемый объем результата"""
+    tracemalloc.start()
+    result = func(raw)
+    retained, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del result
+    return retained, peak
+
+
+def report(title, raw, baseline, fast, repeat, number):
+    print(f"\n{title}: {len(raw) / 1024:.1f} КБ")
+    print(f"  {'вариант':<10} {'мкс/ответ':>12} {'удержано':>12} {'пик':>12}")
+    results = {}
+    for name, func in (("baseline", baseline), ("fast", fast)):
+        cpu = measure_cpu(func, raw, repeat, number)
+        retained, peak = measure_memory(func, raw)
+        results[name] = cpu
+        print(f"  {name:<10} {cpu:>12.1f} {retained / 1024:>10.1f}КБ {peak / 1024:>10.1f}КБ")
+    print(f"  ускорение: x{results['baseline'] / results['fast']:.2f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="CPU и аллокации на разбор ответов ticker и user_info")
+    parser.add_argument("--pairs", type=int, default=400)
+    parser.add_argument("--currencies", type=int, default=150)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--number", type=int, default=50)
+    parser.add_argument("--orjson", action="store_true", help="быстрый разбор orjson (точность float)")
+    args = parser.parse_args()
+
+    global FAST_JSON
+    FAST_JSON = args.orjson and ORJSON_AVAILABLE
+    print(f"🧪 Разбор JSON -> Decimal, декодер: {'orjson' if FAST_JSON else 'json (parse_float=Decimal)'}")
+
+    ticker_raw = make_ticker_payload(args.pairs)
+    fast_sample = parse_ticker_fast(ticker_raw)
+    baseline_sample = parse_ticker_baseline(ticker_raw)
+    # Значения обязаны совпадать с прежним путем
+    assert all(fast_sample[p].price_key == (q.last_trade, q.buy_price, q.sell_price)
+               for p, q in baseline_sample.items())
+    report(f"ticker ({args.pairs} пар)", ticker_raw, parse_ticker_baseline, parse_ticker_fast,
+           args.repeat, args.number)
+
+    user_info_raw = make_user_info_payload(args.currencies)
+    assert parse_user_info_fast(user_info_raw) == parse_user_info_baseline(user_info_raw)
+    report(f"user_info ({args.currencies} валют)", user_info_raw, parse_user_info_baseline, parse_user_info_fast,
+           args.repeat, args.number)
+
+    quote = next(iter(fast_sample.values()))
+    baseline_quote = next(iter(baseline_sample.values()))
+    print(f"\n📦 Размер записи: TickerQuote {sys.getsizeof(quote)} Б (NamedTuple), "
+          f"BaselineQuote {sys.getsizeof(baseline_quote) + sys.getsizeof(baseline_quote.__dict__)} Б (с __dict__)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,147 @@
+import os
+import sys
+import json
+import time
+import pickle
+import random
+import shutil
+import argparse
+import tempfile
+from datetime import datetime, timedelta
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from src.infrastructure.cache.log_store import LogStructuredStore
+
+
+def make_value(i):
+    """Значение размером с тикер пары"""
+    price = 0.1 + i % 1000 / 1000
+    return {
+        "pair": f"C{i}_USD", "buy_price": f"{price:.8f}", "sell_price": f"{price * 1.001:.8f}",
+        "last_trade": f"{price:.8f}", "vol": f"{i * 7.5:.8f}", "updated": 1700000000 + i
+    }
+
+
+class LegacyLayout:
+    """Прежний формат PersistentCache: pickle-файл на ключ + cache_metadata.json"""
+
+    def __init__(self, path):
+        self.path = Path(path)
+        self.metadata_file = self.path / "cache_metadata.json"
+        self.metadata = {}
+
+    def file_path(self, key):
+        safe_key = key.replace('/', '_').replace('\\', '_').replace(':', '_')
+        return self.path / f"cache_{safe_key}.pkl"
+
+    def write(self, items):
+        for key, value in items:
+            temp_path = self.file_path(key).with_suffix('.tmp')
+            with open(temp_path, 'wb') as f:
+                pickle.dump(value, f)
+            temp_path.replace(self.file_path(key))
+            self.metadata[key] = {
+                "created_at": datetime.now().isoformat(),
+                "expires_at": (datetime.now() + timedelta(seconds=3600)).isoformat(),
+                "metadata": {}
+            }
+        with open(self.metadata_file, 'w') as f:
+            json.dump(self.metadata, f, indent=2)
+
+    def open(self):
+        with open(self.metadata_file, 'r') as f:
+            self.metadata = json.load(f)
+
+    def get(self, key):
+        expires_at = datetime.fromisoformat(self.metadata[key]["expires_at"])
+        if datetime.now() > expires_at:
+            return None
+        with open(self.file_path(key), 'rb') as f:
+            return pickle.load(f)
+
+
+def percentiles(samples):
+    samples = sorted(samples)
+    return {p: samples[min(len(samples) - 1, int(len(samples) * p / 100))] * 1e6 for p in (50, 99)}
+
+
+def timed_reads(get, keys):
+    samples = []
+    for key in keys:
+        started = time.perf_counter()
+        get(key)
+        samples.append(time.perf_counter() - started)
+    return percentiles(samples)
+
+
+def directory_stats(path):
+    files = list(Path(path).iterdir())
+    return len(files), sum(f.stat().st_size for f in files) / 1024 / 1024
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Старт и чтение PersistentCache: файл на ключ vs журнальный файл")
+    parser.add_argument("--entries", type=int, default=100_000)
+    parser.add_argument("--reads", type=int, default=20_000)
+    parser.add_argument("--dir", help="каталог для данных (по умолчанию временный)")
+    args = parser.parse_args()
+
+    base = Path(args.dir or tempfile.mkdtemp(prefix="cache_bench_"))
+    legacy_path, log_path = base / "legacy", base / "log"
+    legacy_path.mkdir(parents=True, exist_ok=True)
+    log_path.mkdir(parents=True, exist_ok=True)
+
+    items = [(f"ticker:C{i}_USD", make_value(i)) for i in range(args.entries)]
+    read_keys = [random.choice(items)[0] for _ in range(args.reads)]
+    expires_at = time.time() + 3600
+
+    print(f"📦 {args.entries} записей, {args.reads} случайных чтений, каталог {base}")
+
+    # Прежний формат
+    started = time.perf_counter()
+    legacy = LegacyLayout(legacy_path)
+    legacy.write(items)
+    legacy_write = time.perf_counter() - started
+
+    started = time.perf_counter()
+    legacy = LegacyLayout(legacy_path)
+    legacy.open()
+    legacy_startup = time.perf_counter() - started
+    legacy_reads = timed_reads(legacy.get, read_keys)
+    legacy_files, legacy_mb = directory_stats(legacy_path)
+
+    # Журнальный файл
+    started = time.perf_counter()
+    store = LogStructuredStore(str(log_path / "cache.log"))
+    for start in range(0, len(items), 1000):
+        store.put_many((key, value, expires_at) for key, value in items[start:start + 1000])
+    store.close()
+    log_write = time.perf_counter() - started
+
+    store = LogStructuredStore(str(log_path / "cache.log"))
+    hint_startup = store.startup_seconds
+    log_reads = timed_reads(store.get, read_keys)
+    store.close()
+    log_files, log_mb = directory_stats(log_path)
+
+    os.remove(log_path / "cache.log.hint")
+    store = LogStructuredStore(str(log_path / "cache.log"))
+    scan_startup = store.startup_seconds
+    store.close()
+
+    print(f"\n  {'формат':<22} {'запись, с':>10} {'старт, мс':>10} {'p50 чтения, мкс':>16} {'p99, мкс':>9} {'файлов':>8} {'МБ':>7}")
+    print(f"  {'файл на ключ + JSON':<22} {legacy_write:>10.2f} {legacy_startup * 1000:>10.1f} "
+          f"{legacy_reads[50]:>16.1f} {legacy_reads[99]:>9.1f} {legacy_files:>8} {legacy_mb:>7.1f}")
+    print(f"  {'журнал + hint':<22} {log_write:>10.2f} {hint_startup * 1000:>10.1f} "
+          f"{log_reads[50]:>16.1f} {log_reads[99]:>9.1f} {log_files:>8} {log_mb:>7.1f}")
+    print(f"  {'журнал без hint (скан)':<22} {'':>10} {scan_startup * 1000:>10.1f}")
+
+    if not args.dir:
+        shutil.rmtree(base, ignore_errors=True)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
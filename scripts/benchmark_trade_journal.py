@@ -0,0 +1,128 @@
+import sys
+import json
+import time
+import shutil
+import asyncio
+import argparse
+import tempfile
+from datetime import datetime, timedelta
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from src.core.models import TradeResult
+from src.infrastructure.persistence.infrastructure_persistence import TradeRepository, RepositoryConfig
+
+
+def write_history(path, trades):
+    """trades.json с готовой историей сделок - в формате, который пишет _save_all()"""
+    started = datetime(2024, 1, 1)
+    history = {
+        str(i + 1): {
+            "trade_id": str(i + 1), "pair": "DOGE_EUR", "success": True,
+            "pnl": f"{(i % 200 - 100) / 1000:.3f}", "commission": "0.003",
+            "execution_time": (started + timedelta(seconds=i * 30)).isoformat(),
+            "error_message": None, "metadata": {"order_id": 100000 + i, "strategy": "dca"}
+        }
+        for i in range(trades)
+    }
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(history, f, indent=2, ensure_ascii=False)
+
+
+def new_trade(i):
+    return TradeResult(
+        trade_id=None, pair="DOGE_EUR", success=True,
+        metadata={"order_id": 900000 + i, "strategy": "dca"}
+    )
+
+
+def percentile(values, share):
+    return values[min(len(values) - 1, int(len(values) * share))]
+
+
+async def run(args, trades, journal):
+    base = Path(tempfile.mkdtemp(prefix="trade_journal_", dir=args.dir))
+    write_history(base / "trades.json", trades)
+    config = RepositoryConfig(
+        storage_path=str(base), backup_enabled=False,
+        journal_enabled=journal, journal_fsync=args.fsync
+    )
+    repository = TradeRepository(config)
+
+    started = time.perf_counter()
+    assert await repository.count() == trades
+    open_seconds = time.perf_counter() - started
+
+    writes = args.writes if journal else args.legacy_writes
+    latencies = []
+    started = time.perf_counter()
+    for i in range(writes):
+        trade_started = time.perf_counter()
+        await repository.save(new_trade(i))
+        latencies.append(time.perf_counter() - trade_started)
+    await repository.close()   # ждем фоновое уплотнение
+    elapsed = time.perf_counter() - started
+    status = repository.get_journal_status()
+
+    reopen_seconds = None
+    if journal:
+        # Повторное открытие: снимок уже в формате журнала
+        await repository.compact()
+        await repository.close()
+        repository = TradeRepository(config)
+        started = time.perf_counter()
+        await repository.count()
+        reopen_seconds = time.perf_counter() - started
+        await repository.close()
+
+    shutil.rmtree(base, ignore_errors=True)
+    latencies.sort()
+    return {
+        'open': open_seconds if journal else None,
+        'reopen': reopen_seconds,
+        'writes': writes,
+        'p50': percentile(latencies, 0.5),
+        'p99': percentile(latencies, 0.99),
+        'max': latencies[-1],
+        'per_second': writes / elapsed,
+        'compactions': status.get('compactions', 0),
+        'compaction_seconds': status.get('last_compaction_seconds', 0.0)
+    }
+
+
+async def main_async(args):
+    print(f"📒 Запись сделок в TradeRepository: журнал (fsync={args.fsync}) против перезаписи файла")
+    print(f"  {'сделок':>9} {'режим':<10} {'записей':>8} {'открытие, мс':>13} {'повторно, мс':>13} {'p50, мс':>9} "
+          f"{'p99, мс':>9} {'max, мс':>9} {'записей/с':>10} {'уплотнений':>11} {'посл. уплотн., мс':>18}")
+    for trades in args.sizes:
+        modes = ["journal"] + (["rewrite"] if trades <= args.legacy_max else [])
+        for mode in modes:
+            result = await run(args, trades, journal=mode == "journal")
+            opened, reopened = (
+                f"{result[name] * 1000:.0f}" if result[name] is not None else "-" for name in ("open", "reopen")
+            )
+            print(f"  {trades:>9,} {mode:<10} {result['writes']:>8} {opened:>13} {reopened:>13} "
+                  f"{result['p50'] * 1000:>9.3f} {result['p99'] * 1000:>9.3f} {result['max'] * 1000:>9.1f} "
+                  f"{result['per_second']:>10,.0f} {result['compactions']:>11} "
+                  f"{result['compaction_seconds'] * 1000:>18.0f}")
+    return 0
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Задержка записи сделки: журнал с уплотнением и перезапись trades.json")
+    parser.add_argument("--sizes", type=lambda v: [int(s) for s in v.split(",")],
+                        default=[10_000, 100_000, 1_000_000], help="сделок в истории")
+    parser.add_argument("--writes", type=int, default=20_000, help="новых сделок в режиме журнала")
+    parser.add_argument("--fsync", choices=["always", "interval", "never"], default="interval")
+    parser.add_argument("--legacy-writes", type=int, default=5, help="новых сделок в режиме перезаписи")
+    parser.add_argument("--legacy-max", type=int, default=100_000,
+                        help="режим перезаписи только для истории не больше этой")
+    parser.add_argument("--dir", help="каталог для временных файлов")
+    args = parser.parse_args()
+
+    return asyncio.run(main_async(args))
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,92 @@
+import sys
+import time
+import asyncio
+import argparse
+import importlib
+import statistics
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from src.config.settings import APISettings
+from src.core.interfaces import IExchangeAPI
+from src.application.services.trading_orchestrator import TradingOrchestrator
+from src.infrastructure.api.infrastructure_api import APIClientFactory
+
+
+def load_container_factory(spec):
+    """Фабрика DI контейнера вида 'module:function'"""
+    module_name, _, attribute = spec.partition(":")
+    return getattr(importlib.import_module(module_name), attribute)
+
+
+def percentile(values, pct):
+    """Перцентиль по отсортированной выборке"""
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+async def main_async(args):
+    settings = APISettings(
+        base_url=args.base_url,
+        http_transport=args.transport,
+        http_cassette_mode=args.mode,
+        http_cassette_path=args.cassette,
+        http_cassette_replay_speed=args.speed,
+        rate_limiter_type="priority"
+    )
+    client = APIClientFactory.create_exmo_client(settings)
+
+    # Контейнер приложения, в котором биржевой API заменен клиентом с кассетой
+    container = load_container_factory(args.container)()
+    container.register_instance(IExchangeAPI, client)
+
+    orchestrator = TradingOrchestrator(container)
+    cycle_times = []
+
+    try:
+        await orchestrator.start_trading_session()
+        started = time.perf_counter()
+
+        for _ in range(args.cycles):
+            cycle_started = time.perf_counter()
+            await orchestrator.execute_trading_cycle()
+            cycle_times.append(time.perf_counter() - cycle_started)
+
+        total = time.perf_counter() - started
+        await orchestrator.stop_trading_session()
+    finally:
+        await client.close()
+
+    status = client.get_status()
+    print(f"🔄 Торговые циклы: {args.cycles}, режим {args.mode}, скорость {args.speed}")
+    print(f"  всего={total:.3f}с  mean={statistics.mean(cycle_times) * 1000:.2f}мс  "
+          f"p50={percentile(cycle_times, 50) * 1000:.2f}мс  p99={percentile(cycle_times, 99) * 1000:.2f}мс  "
+          f"max={max(cycle_times) * 1000:.2f}мс")
+    print(f"  статистика сессии: {orchestrator.get_session_statistics()}")
+    if status.get("cassette"):
+        print(f"  кассета: {status['cassette']}")
+    elif args.mode == "record":
+        print(f"  кассета записана: {args.cassette}")
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Замер TradingOrchestrator.execute_trading_cycle с записью или воспроизведением обмена с биржей"
+    )
+    parser.add_argument("--container", required=True, help="фабрика DI контейнера, например mymodule:build_container")
+    parser.add_argument("--mode", default="replay", choices=["off", "record", "replay"])
+    parser.add_argument("--cassette", default="data/cassettes/exmo_session.jsonl.gz")
+    parser.add_argument("--speed", type=float, default=0.0, help="0 - максимально быстро, 1 - записанный темп")
+    parser.add_argument("--cycles", type=int, default=100)
+    parser.add_argument("--base-url", default="https://api.exmo.com/v1.1")
+    parser.add_argument("--transport", default="aiohttp", choices=["requests", "aiohttp"])
+    args = parser.parse_args()
+
+    asyncio.run(main_async(args))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
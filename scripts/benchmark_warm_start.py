@@ -0,0 +1,122 @@
+import sys
+import time
+import shutil
+import asyncio
+import argparse
+import tempfile
+from decimal import Decimal
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from src.core.models import MarketData, TradingPair, Price
+from src.core.cache.tiered_cache import TieredCache
+from src.core.cache.snapshot import CacheSnapshot
+from src.domain.market.market_data_service import MarketDataService
+from src.domain.portfolio.balance_service import BalanceService
+from src.infrastructure.api.pair_registry import PairRegistry
+
+
+class SimulatedExchange:
+    """Биржа с фиксированной задержкой ответа и счетчиком запросов по эндпоинтам"""
+
+    def __init__(self, latency, pairs):
+        self.latency = latency
+        self.pairs = pairs
+        self.requests = {}
+
+    async def _request(self, endpoint):
+        self.requests[endpoint] = self.requests.get(endpoint, 0) + 1
+        await asyncio.sleep(self.latency)
+
+    async def pair_settings(self):
+        await self._request("pair_settings")
+        return {
+            f"C{i}_EUR": {
+                "min_quantity": "1", "max_quantity": "100000000", "min_price": "0.00000001",
+                "max_price": "10000", "min_amount": "1", "max_amount": "500000",
+                "price_precision": 8, "commission_taker_percent": "0.3", "commission_maker_percent": "0.3"
+            }
+            for i in range(self.pairs)
+        }
+
+    async def get_market_data(self, pair):
+        await self._request("ticker")
+        base, quote = pair.split("_")
+        return MarketData(pair=TradingPair(base, quote), current_price=Price(Decimal("0.1234"), quote))
+
+    async def get_balance(self, currency):
+        await self._request("user_info")
+        return Decimal("100")
+
+
+async def first_cycle(cache, exchange, pair, currencies):
+    """Старт процесса и первый цикл: справочник пар, данные пары, балансы"""
+    started = time.perf_counter()
+    registry = PairRegistry(exchange.pair_settings, cache=cache.namespace("exchange"))
+    await registry.start()
+
+    market_data = MarketDataService(exchange, cache_ttl_seconds=60, cache=cache)
+    balances = BalanceService(exchange, cache_ttl_seconds=30, cache=cache)
+    await market_data.get_market_data(pair)
+    for currency in currencies:
+        await balances.get_balance(currency)
+    elapsed = time.perf_counter() - started
+
+    await registry.stop()
+    await market_data.revalidation.close()
+    await balances.revalidation.close()
+    return elapsed
+
+
+async def main_async(args):
+    base = Path(args.dir or tempfile.mkdtemp(prefix="warm_start_"))
+    snapshot_path = base / "cache_snapshot.bin"
+    pair, currencies = "DOGE_EUR", ["DOGE", "EUR"]
+
+    print(f"🚀 Задержка биржи {args.latency * 1000:.0f}мс, {args.pairs} пар в pair_settings, простой {args.downtime}с")
+    print(f"  {'старт':<10} {'до 1-го цикла, мс':>18} {'запросов':>9}  эндпоинты")
+
+    # Первый процесс: холодный кэш, снимок при остановке
+    exchange = SimulatedExchange(args.latency, args.pairs)
+    cache = TieredCache()
+    elapsed = await first_cycle(cache, exchange, pair, currencies)
+    print(f"  {'холодный':<10} {elapsed * 1000:>18.1f} {sum(exchange.requests.values()):>9}  {exchange.requests}")
+    snapshot = CacheSnapshot(str(snapshot_path))
+    snapshot.save(cache)
+    saved = snapshot.get_status()
+
+    await asyncio.sleep(args.downtime)
+
+    # Второй процесс: восстановление снимка до первого цикла
+    exchange = SimulatedExchange(args.latency, args.pairs)
+    cache = TieredCache()
+    started = time.perf_counter()
+    snapshot = CacheSnapshot(str(snapshot_path))
+    snapshot.restore(cache)
+    await first_cycle(cache, exchange, pair, currencies)
+    elapsed = time.perf_counter() - started   # включая чтение снимка
+    print(f"  {'теплый':<10} {elapsed * 1000:>18.1f} {sum(exchange.requests.values()):>9}  {exchange.requests}")
+    restored = snapshot.get_status()
+    print(f"  снимок: {saved['saved']} записей, {saved['save_bytes']} байт, запись {saved['save_seconds'] * 1000:.2f}мс; "
+          f"восстановлено {restored['restored']}, истекло {restored['expired']}, "
+          f"чтение {restored['restore_seconds'] * 1000:.2f}мс")
+
+    if not args.dir:
+        shutil.rmtree(base, ignore_errors=True)
+    return 0
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Время до первого торгового цикла: холодный старт и снимок кэша")
+    parser.add_argument("--latency", type=float, default=0.15, help="задержка ответа биржи, с")
+    parser.add_argument("--pairs", type=int, default=400)
+    parser.add_argument("--downtime", type=float, default=1.0, help="пауза между процессами, с")
+    parser.add_argument("--dir", help="каталог для снимка (по умолчанию временный)")
+    args = parser.parse_args()
+
+    return asyncio.run(main_async(args))
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,347 @@
+import sys
+import time
+import random
+import asyncio
+import argparse
+from collections import deque
+from dataclasses import dataclass, field
+from decimal import Decimal
+from typing import Dict, Any, List, Optional
+
+from aiohttp import web
+
+
+DEFAULT_PRICES = {
+    "DOGE_EUR": Decimal("0.17077"),
+    "DOGE_USD": Decimal("0.18512"),
+    "BTC_EUR": Decimal("58030.0"),
+    "BTC_USD": Decimal("62911.5"),
+    "ETH_EUR": Decimal("2711.4"),
+    "ETH_USD": Decimal("2939.8"),
+    "LTC_EUR": Decimal("61.22"),
+    "XRP_EUR": Decimal("0.5123"),
+}
+
+
+@dataclass
+class LatencyProfile:
+    """⏱️ Распределение задержки ответа"""
+    distribution: str = "fixed"  # fixed, uniform, exponential, lognormal
+    mean_ms: float = 5.0
+    spread_ms: float = 0.0
+
+    def sample(self, rng: random.Random) -> float:
+        """Задержка в секундах"""
+        if self.distribution == "uniform":
+            value = rng.uniform(self.mean_ms - self.spread_ms, self.mean_ms + self.spread_ms)
+        elif self.distribution == "exponential":
+            value = rng.expovariate(1 / self.mean_ms) if self.mean_ms > 0 else 0.0
+        elif self.distribution == "lognormal":
+            # spread_ms задает сигму в долях среднего, дает длинный хвост
+            sigma = self.spread_ms / self.mean_ms if self.mean_ms > 0 else 0.0
+            value = self.mean_ms * rng.lognormvariate(0, sigma)
+        else:
+            value = self.mean_ms
+        return max(0.0, value) / 1000
+
+
+@dataclass
+class StandInConfig:
+    """⚙️ Поведение stand-in сервера"""
+    latency: LatencyProfile = field(default_factory=LatencyProfile)
+    endpoint_latency: Dict[str, LatencyProfile] = field(default_factory=dict)
+    rate_limit_per_second: int = 0          # 0 - без серверного лимита
+    rate_limit_probability: float = 0.0     # случайные 429
+    error_rate: float = 0.0                 # случайные 500
+    price_volatility: float = 0.0005        # шаг случайного блуждания цены
+    seed: int = 42
+
+
+@dataclass
+class StandInStats:
+    """📊 Статистика stand-in сервера"""
+    requests: Dict[str, int] = field(default_factory=dict)
+    rate_limited: int = 0
+    injected_errors: int = 0
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "requests": dict(self.requests),
+            "total_requests": sum(self.requests.values()),
+            "rate_limited": self.rate_limited,
+            "injected_errors": self.injected_errors
+        }
+
+
+class ExmoStandInServer:
+    """🧪 Локальный stand-in EXMO API для нагрузочных тестов"""
+
+    ENDPOINTS = (
+        "ticker", "order_book", "user_info", "order_create",
+        "order_cancel", "user_trades", "user_open_orders",
+    )
+
+    def __init__(
+        self,
+        config: Optional[StandInConfig] = None,
+        host: str = "127.0.0.1",
+        port: int = 8765
+    ):
+        self.config = config or StandInConfig()
+        self.host = host
+        self.port = port
+
+        self._rng = random.Random(self.config.seed)
+        self._runner: Optional[web.AppRunner] = None
+
+        # Состояние биржи
+        self.prices: Dict[str, Decimal] = dict(DEFAULT_PRICES)
+        self.balances: Dict[str, Decimal] = {
+            "EUR": Decimal("1000"), "USD": Decimal("1000"), "DOGE": Decimal("5000"),
+            "BTC": Decimal("0.05"), "ETH": Decimal("1"), "LTC": Decimal("10"), "XRP": Decimal("1000"),
+        }
+        self.open_orders: Dict[int, Dict[str, Any]] = {}
+        self.trades: Dict[str, List[Dict[str, Any]]] = {pair: [] for pair in self.prices}
+        self._next_order_id = 1000000
+        self._next_trade_id = 5000000
+        self._recent_requests: deque = deque()
+
+        self.stats = StandInStats()
+
+    @property
+    def base_url(self) -> str:
+        """URL для ExmoAPIClient"""
+        return f"http://{self.host}:{self.port}"
+
+    async def start(self) -> None:
+        """🚀 Запуск сервера"""
+        app = web.Application()
+        for endpoint in self.ENDPOINTS:
+            handler = self._wrap(endpoint, getattr(self, f"_handle_{endpoint}"))
+            app.router.add_route("*", f"/{endpoint}", handler)
+
+        self._runner = web.AppRunner(app)
+        await self._runner.setup()
+        await web.TCPSite(self._runner, self.host, self.port).start()
+
+    async def stop(self) -> None:
+        """🛑 Остановка сервера"""
+        if self._runner:
+            await self._runner.cleanup()
+            self._runner = None
+
+    def seed_trades(self, pair: str, count: int) -> None:
+        """📜 Наполнение истории сделок"""
+        for _ in range(count):
+            self._record_trade(pair, self._rng.choice(("buy", "sell")),
+                               Decimal("10"), self.prices[pair], order_id=0)
+
+    def _wrap(self, endpoint: str, handler):
+        """Общая обработка: задержка, 429, ошибки, статистика"""
+        async def wrapped(request: web.Request) -> web.Response:
+            self.stats.requests[endpoint] = self.stats.requests.get(endpoint, 0) + 1
+
+            latency = self.config.endpoint_latency.get(endpoint, self.config.latency)
+            delay = latency.sample(self._rng)
+            if delay > 0:
+                await asyncio.sleep(delay)
+
+            if self._is_rate_limited():
+                self.stats.rate_limited += 1
+                return web.json_response({"error": "Rate limit exceeded"}, status=429)
+
+            if self.config.error_rate and self._rng.random() < self.config.error_rate:
+                self.stats.injected_errors += 1
+                return web.json_response({"error": "Internal error"}, status=500)
+
+            params = dict(request.query)
+            if request.method == "POST":
+                params.update(await request.post())
+
+            return web.json_response(handler(params))
+
+        return wrapped
+
+    def _is_rate_limited(self) -> bool:
+        """Серверный лимит в окне 1с плюс случайная инъекция 429"""
+        if self.config.rate_limit_probability and self._rng.random() < self.config.rate_limit_probability:
+            return True
+
+        if self.config.rate_limit_per_second <= 0:
+            return False
+
+        now = time.monotonic()
+        while self._recent_requests and self._recent_requests[0] <= now - 1.0:
+            self._recent_requests.popleft()
+
+        if len(self._recent_requests) >= self.config.rate_limit_per_second:
+            return True
+
+        self._recent_requests.append(now)
+        return False
+
+    # ================= ЭНДПОИНТЫ =================
+
+    def _handle_ticker(self, params: Dict[str, Any]) -> Dict[str, Any]:
+        updated = int(time.time())
+        result = {}
+        for pair in self.prices:
+            price = self._walk_price(pair)
+            spread = price * Decimal("0.001")
+            result[pair] = {
+                "buy_price": str(price - spread), "sell_price": str(price + spread),
+                "last_trade": str(price), "high": str(price * Decimal("1.03")),
+                "low": str(price * Decimal("0.97")), "avg": str(price),
+                "vol": "182345.12", "vol_curr": str(price * Decimal("182345.12")),
+                "updated": updated,
+            }
+        return result
+
+    def _handle_order_book(self, params: Dict[str, Any]) -> Dict[str, Any]:
+        limit = int(params.get("limit", 100))
+        result = {}
+        for pair in str(params.get("pair", "DOGE_EUR")).split(","):
+            price = self.prices.get(pair, Decimal("1"))
+            step = price * Decimal("0.0005")
+            asks = [[str(price + step * (i + 1)), "100", str((price + step * (i + 1)) * 100)] for i in range(limit)]
+            bids = [[str(price - step * (i + 1)), "100", str((price - step * (i + 1)) * 100)] for i in range(limit)]
+            result[pair] = {
+                "ask_quantity": str(100 * limit), "ask_amount": "0", "ask_top": asks[0][0] if asks else "0",
+                "bid_quantity": str(100 * limit), "bid_amount": "0", "bid_top": bids[0][0] if bids else "0",
+                "ask": asks, "bid": bids,
+            }
+        return result
+
+    def _handle_user_info(self, params: Dict[str, Any]) -> Dict[str, Any]:
+        reserved: Dict[str, Decimal] = {}
+        for order in self.open_orders.values():
+            base, quote = order["pair"].split("_")
+            if order["type"] == "buy":
+                reserved[quote] = reserved.get(quote, Decimal("0")) + order["quantity"] * order["price"]
+            else:
+                reserved[base] = reserved.get(base, Decimal("0")) + order["quantity"]
+
+        return {
+            "uid": 123456,
+            "server_date": int(time.time()),
+            "balances": {c: str(v) for c, v in self.balances.items()},
+            "reserved": {c: str(reserved.get(c, Decimal("0"))) for c in self.balances},
+        }
+
+    def _handle_order_create(self, params: Dict[str, Any]) -> Dict[str, Any]:
+        try:
+            pair = params["pair"]
+            quantity = Decimal(str(params["quantity"]))
+            price = Decimal(str(params["price"]))
+            order_type = params["type"]
+        except Exception:
+            return {"result": False, "error": "Error 40005: Invalid parameters", "order_id": 0}
+
+        if pair not in self.prices:
+            return {"result": False, "error": f"Error 50304: Unknown pair {pair}", "order_id": 0}
+
+        self._next_order_id += 1
+        order_id = self._next_order_id
+        market = self.prices[pair]
+
+        # Ордер исполняется сразу, если пересекает рынок, иначе остается открытым
+        crosses = (order_type == "buy" and price >= market) or (order_type == "sell" and price <= market)
+        if crosses:
+            self._record_trade(pair, order_type, quantity, price, order_id)
+        else:
+            self.open_orders[order_id] = {
+                "order_id": order_id, "pair": pair, "type": order_type,
+                "quantity": quantity, "price": price, "created": int(time.time()),
+            }
+
+        return {"result": True, "error": "", "order_id": order_id}
+
+    def _handle_order_cancel(self, params: Dict[str, Any]) -> Dict[str, Any]:
+        try:
+            order_id = int(params["order_id"])
+        except Exception:
+            return {"result": False, "error": "Error 40005: Invalid order_id"}
+
+        if self.open_orders.pop(order_id, None) is None:
+            return {"result": False, "error": f"Error 50304: Order {order_id} not found"}
+        return {"result": True, "error": ""}
+
+    def _handle_user_trades(self, params: Dict[str, Any]) -> Dict[str, Any]:
+        offset = int(params.get("offset", 0))
+        limit = int(params.get("limit", 100))
+        result = {}
+        for pair in str(params.get("pair", "")).split(","):
+            trades = self.trades.get(pair, [])
+            # EXMO отдает сделки от новых к старым
+            newest_first = trades[::-1]
+            result[pair] = newest_first[offset:offset + limit]
+        return result
+
+    def _handle_user_open_orders(self, params: Dict[str, Any]) -> Dict[str, Any]:
+        result: Dict[str, List[Dict[str, Any]]] = {}
+        for order in self.open_orders.values():
+            result.setdefault(order["pair"], []).append({
+                "order_id": str(order["order_id"]), "created": str(order["created"]),
+                "type": order["type"], "pair": order["pair"], "price": str(order["price"]),
+                "quantity": str(order["quantity"]), "amount": str(order["quantity"] * order["price"]),
+            })
+        return result
+
+    # ================= ВСПОМОГАТЕЛЬНЫЕ =================
+
+    def _walk_price(self, pair: str) -> Decimal:
+        """Случайное блуждание цены"""
+        if self.config.price_volatility:
+            factor = Decimal(str(1 + self._rng.gauss(0, self.config.price_volatility)))
+            self.prices[pair] = (self.prices[pair] * factor).quantize(Decimal("0.00000001"))
+        return self.prices[pair]
+
+    def _record_trade(self, pair: str, order_type: str, quantity: Decimal, price: Decimal, order_id: int) -> None:
+        """Запись исполненной сделки"""
+        self._next_trade_id += 1
+        self.trades.setdefault(pair, []).append({
+            "trade_id": self._next_trade_id, "date": int(time.time()), "type": order_type,
+            "pair": pair, "order_id": order_id, "quantity": str(quantity),
+            "price": str(price), "amount": str(quantity * price),
+        })
+
+
+async def serve_forever(server: ExmoStandInServer) -> None:
+    """Запуск до прерывания"""
+    await server.start()
+    print(f"🧪 EXMO stand-in слушает {server.base_url}")
+    try:
+        while True:
+            await asyncio.sleep(3600)
+    finally:
+        await server.stop()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Локальный stand-in EXMO API")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--latency", default="fixed", choices=["fixed", "uniform", "exponential", "lognormal"])
+    parser.add_argument("--latency-ms", type=float, default=5.0)
+    parser.add_argument("--latency-spread-ms", type=float, default=0.0)
+    parser.add_argument("--rate-limit-per-second", type=int, default=10)
+    parser.add_argument("--rate-limit-probability", type=float, default=0.0)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    args = parser.parse_args()
+
+    config = StandInConfig(
+        latency=LatencyProfile(args.latency, args.latency_ms, args.latency_spread_ms),
+        rate_limit_per_second=args.rate_limit_per_second,
+        rate_limit_probability=args.rate_limit_probability,
+        error_rate=args.error_rate
+    )
+
+    try:
+        asyncio.run(serve_forever(ExmoStandInServer(config, args.host, args.port)))
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
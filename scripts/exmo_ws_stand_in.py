@@ -0,0 +1,291 @@
+import sys
+import json
+import time
+import random
+import asyncio
+import argparse
+from decimal import Decimal
+from pathlib import Path
+from typing import Dict, Any, List, Optional
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import aiohttp
+from aiohttp import web
+
+from exmo_stand_in import DEFAULT_PRICES
+
+
+TOPIC_PREFIX = "spot/ticker:"
+
+
+def load_recording(path: Path) -> List[Dict[str, Any]]:
+    """📼 Загрузка записанных сообщений ticker (JSONL)"""
+    messages = []
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            message = json.loads(line)
+            if message.get("event") == "update" and message.get("topic", "").startswith(TOPIC_PREFIX):
+                messages.append(message)
+    return messages
+
+
+def synthesize_recording(pairs: List[str], count: int, interval_ms: int, seed: int) -> List[Dict[str, Any]]:
+    """🎲 Синтетическая запись: случайное блуждание цен"""
+    rng = random.Random(seed)
+    prices = {pair: DEFAULT_PRICES.get(pair, Decimal("1")) for pair in pairs}
+    ts = int(time.time() * 1000)
+    messages = []
+
+    for i in range(count):
+        pair = pairs[i % len(pairs)]
+        prices[pair] = (prices[pair] * Decimal(str(1 + rng.gauss(0, 0.0005)))).quantize(Decimal("0.00000001"))
+        price = prices[pair]
+        spread = price * Decimal("0.001")
+        ts += interval_ms
+        messages.append({
+            "ts": ts, "event": "update", "topic": f"{TOPIC_PREFIX}{pair}",
+            "data": {
+                "buy_price": str(price - spread), "sell_price": str(price + spread),
+                "last_trade": str(price), "high": str(price), "low": str(price), "avg": str(price),
+                "vol": "1000", "vol_curr": str(price * 1000), "updated": ts // 1000,
+            }
+        })
+
+    return messages
+
+
+class ExmoWSStandInServer:
+    """🧪 Локальный stand-in EXMO WebSocket, воспроизводящий записанные тики"""
+
+    def __init__(
+        self,
+        messages: List[Dict[str, Any]],
+        host: str = "127.0.0.1",
+        port: int = 8766,
+        speed: float = 1.0,
+        drop_rate: float = 0.0,
+        disconnect_every: int = 0,
+        seed: int = 42
+    ):
+        self.messages = messages
+        self.host = host
+        self.port = port
+        self.speed = speed                        # 0 - без пауз, 1 - записанный темп
+        self.drop_rate = drop_rate                # доля пропусков, дает разрывы seq
+        self.disconnect_every = disconnect_every  # обрыв соединения каждые N сообщений
+
+        self._rng = random.Random(seed)
+        self._runner: Optional[web.AppRunner] = None
+        self.stats = {"connections": 0, "sent": 0, "dropped": 0, "disconnects": 0, "subscriptions": 0}
+
+    @property
+    def url(self) -> str:
+        """URL для ExmoPriceStream"""
+        return f"ws://{self.host}:{self.port}/v1/public"
+
+    async def start(self) -> None:
+        """🚀 Запуск сервера"""
+        app = web.Application()
+        app.router.add_get("/v1/public", self._handle_connection)
+        self._runner = web.AppRunner(app)
+        await self._runner.setup()
+        await web.TCPSite(self._runner, self.host, self.port).start()
+
+    async def stop(self) -> None:
+        """🛑 Остановка сервера"""
+        if self._runner:
+            await self._runner.cleanup()
+            self._runner = None
+
+    async def _handle_connection(self, request: web.Request) -> web.WebSocketResponse:
+        ws = web.WebSocketResponse()
+        await ws.prepare(request)
+        self.stats["connections"] += 1
+
+        await ws.send_json({"ts": int(time.time() * 1000), "event": "info", "code": 1,
+                            "message": "connection established", "session_id": str(self.stats["connections"])})
+
+        topics: set = set()
+        replay = asyncio.ensure_future(self._replay(ws, topics))
+
+        try:
+            async for message in ws:
+                if message.type != aiohttp.WSMsgType.TEXT:
+                    continue
+                request_data = json.loads(message.data)
+                method = request_data.get("method")
+                for topic in request_data.get("topics", []):
+                    if method == "subscribe":
+                        topics.add(topic)
+                        self.stats["subscriptions"] += 1
+                        event = "subscribed"
+                    else:
+                        topics.discard(topic)
+                        event = "unsubscribed"
+                    await ws.send_json({"ts": int(time.time() * 1000), "event": event,
+                                        "id": request_data.get("id"), "topic": topic})
+        finally:
+            replay.cancel()
+
+        return ws
+
+    async def _replay(self, ws: web.WebSocketResponse, topics: set) -> None:
+        """📼 Воспроизведение записи по кругу для подписанных топиков"""
+        sequences: Dict[str, int] = {}
+        sent_in_session = 0
+        previous_ts = None
+
+        while not ws.closed:
+            for message in self.messages:
+                if self.speed > 0 and previous_ts is not None:
+                    await asyncio.sleep(max(0, message["ts"] - previous_ts) / 1000 / self.speed)
+                else:
+                    await asyncio.sleep(0)
+                previous_ts = message["ts"]
+
+                topic = message["topic"]
+                if ws.closed:
+                    return
+                if topic not in topics:
+                    continue
+
+                # Нумерация по топику внутри сессии; пропуск увеличивает seq без отправки
+                sequences[topic] = sequences.get(topic, 0) + 1
+                if self.drop_rate and self._rng.random() < self.drop_rate:
+                    self.stats["dropped"] += 1
+                    continue
+
+                await ws.send_json(dict(message, ts=int(time.time() * 1000), seq=sequences[topic]))
+                self.stats["sent"] += 1
+                sent_in_session += 1
+
+                if self.disconnect_every and sent_in_session >= self.disconnect_every:
+                    self.stats["disconnects"] += 1
+                    await ws.close()
+                    return
+            previous_ts = None
+
+
+async def record(url: str, pairs: List[str], output: Path, duration: float) -> int:
+    """⏺️ Запись сообщений ticker с реального канала"""
+    recorded = 0
+    deadline = time.monotonic() + duration
+
+    async with aiohttp.ClientSession() as session:
+        async with session.ws_connect(url) as ws:
+            await ws.send_json({"id": 1, "method": "subscribe", "topics": [f"{TOPIC_PREFIX}{p}" for p in pairs]})
+            with open(output, "w", encoding="utf-8") as f:
+                while time.monotonic() < deadline:
+                    try:
+                        message = await asyncio.wait_for(ws.receive(), timeout=max(0.1, deadline - time.monotonic()))
+                    except asyncio.TimeoutError:
+                        break
+                    if message.type != aiohttp.WSMsgType.TEXT:
+                        break
+                    if json.loads(message.data).get("event") == "update":
+                        f.write(message.data + "\n")
+                        recorded += 1
+
+    return recorded
+
+
+async def self_test(server: ExmoWSStandInServer, pairs: List[str], duration: float) -> Dict[str, Any]:
+    """🔬 Прогон ExmoPriceStream против stand-in"""
+    from src.infrastructure.api.price_stream import ExmoPriceStream
+
+    async def resync(pair):
+        return DEFAULT_PRICES.get(pair, Decimal("1"))
+
+    stream = ExmoPriceStream(server.url, resync=resync, reconnect_max_delay=1.0)
+    latencies = []
+
+    def on_tick(tick):
+        if not tick.resynced:
+            latencies.append(time.time() - tick.timestamp.timestamp())
+
+    stream.add_listener(on_tick)
+
+    async def consume(pair):
+        async for _ in stream.get_price_stream(pair):
+            pass
+
+    consumers = [asyncio.ensure_future(consume(pair)) for pair in pairs]
+    await asyncio.sleep(duration)
+    for consumer in consumers:
+        consumer.cancel()
+    await stream.stop()
+
+    status = stream.get_status()
+    latencies.sort()
+    status["delivery_p50_ms"] = latencies[len(latencies) // 2] * 1000 if latencies else None
+    status["delivery_p99_ms"] = latencies[int(len(latencies) * 0.99)] * 1000 if latencies else None
+    return status
+
+
+async def main_async(args):
+    pairs = args.pairs.split(",")
+
+    if args.record:
+        recorded = await record(args.record_url, pairs, Path(args.record), args.duration)
+        print(f"⏺️ Записано {recorded} сообщений в {args.record}")
+        return
+
+    if args.ticks:
+        messages = load_recording(Path(args.ticks))
+    else:
+        messages = synthesize_recording(pairs, args.synthetic_count, args.synthetic_interval_ms, args.seed)
+
+    server = ExmoWSStandInServer(
+        messages, args.host, args.port,
+        speed=args.speed, drop_rate=args.drop_rate,
+        disconnect_every=args.disconnect_every, seed=args.seed
+    )
+    await server.start()
+
+    try:
+        if args.self_test:
+            status = await self_test(server, pairs, args.duration)
+            print(f"🔬 Поток цен: {args.duration:.0f}с, пары {', '.join(pairs)}")
+            for key in ("connections", "reconnects", "resubscriptions", "ticks", "sequence_gaps",
+                        "missed_messages", "out_of_order", "resyncs", "delivery_p50_ms", "delivery_p99_ms"):
+                print(f"  {key:<18} {status[key]}")
+            print(f"  сервер: {server.stats}")
+        else:
+            print(f"🧪 EXMO WebSocket stand-in слушает {server.url} ({len(messages)} сообщений в записи)")
+            while True:
+                await asyncio.sleep(3600)
+    finally:
+        await server.stop()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Локальный stand-in EXMO WebSocket с воспроизведением тиков")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8766)
+    parser.add_argument("--pairs", default="DOGE_EUR,BTC_EUR")
+    parser.add_argument("--ticks", help="JSONL с записанными сообщениями ticker")
+    parser.add_argument("--synthetic-count", type=int, default=1000)
+    parser.add_argument("--synthetic-interval-ms", type=int, default=50)
+    parser.add_argument("--speed", type=float, default=1.0, help="0 - без пауз")
+    parser.add_argument("--drop-rate", type=float, default=0.0)
+    parser.add_argument("--disconnect-every", type=int, default=0)
+    parser.add_argument("--self-test", action="store_true", help="прогнать ExmoPriceStream и вывести статистику")
+    parser.add_argument("--duration", type=float, default=10.0)
+    parser.add_argument("--record", help="записать тики реального канала в файл")
+    parser.add_argument("--record-url", default="wss://ws-api.exmo.com:443/v1/public")
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    try:
+        asyncio.run(main_async(args))
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,243 @@
+from typing import Optional, Dict, Any, Callable, List
+from decimal import Decimal
+import math
+import time
+import asyncio
+import logging
+from dataclasses import dataclass, field
+
+
+@dataclass
+class PollingConfig:
+    """⚙️ Настройки адаптивного интервала торгового цикла"""
+    base_interval: float = 60.0             # прежний фиксированный интервал - база для сравнения
+    min_interval: float = 10.0
+    max_interval: float = 300.0
+    volatility_halflife: float = 300.0      # период полураспада оценки волатильности, с
+    target_move_percent: float = 0.5        # ожидаемое движение цены за один интервал
+    level_guard_sigmas: float = 3.0         # запас до ближайшего уровня в сигмах
+
+    def validate(self) -> None:
+        if not 0 < self.min_interval <= self.base_interval <= self.max_interval:
+            raise ValueError("Нужно 0 < min_interval <= base_interval <= max_interval")
+        if self.volatility_halflife <= 0 or self.target_move_percent <= 0:
+            raise ValueError("volatility_halflife и target_move_percent должны быть положительными")
+
+
+@dataclass
+class SchedulerStats:
+    """📊 Статистика планировщика"""
+    cycles: int = 0
+    observations: int = 0
+    level_crossings: int = 0
+    early_wakeups: int = 0
+    reaction_latencies: List[float] = field(default_factory=list)
+    started: float = field(default_factory=time.monotonic)
+
+
+class AdaptivePollingScheduler:
+    """⏱️ Интервал торгового цикла по волатильности и близости к уровням
+
+    Волатильность - экспоненциально взвешенная по времени оценка дисперсии
+    лог-доходностей в секунду (sigma^2). Интервал T выбирается так, чтобы
+    ожидаемое движение sigma*sqrt(T) было около target_move_percent, и не
+    больше, чем нужно, чтобы за интервал цена с запасом в level_guard_sigmas
+    не проскочила ближайший уровень DCA/пирамиды/стопа. Пересечение уровня
+    тиком из потока будит цикл сразу.
+    """
+
+    def __init__(
+        self,
+        config: Optional[PollingConfig] = None,
+        api_call_counter: Optional[Callable[[], int]] = None,
+        clock: Callable[[], float] = time.monotonic
+    ):
+        self.config = config or PollingConfig()
+        self.config.validate()
+        self._api_call_counter = api_call_counter
+        self._clock = clock
+
+        # Онлайн оценка
+        self._variance_rate = 0.0      # sigma^2 лог-доходности в секунду
+        self._tick_rate = 0.0          # тиков в секунду (активность)
+        self._last_price: Optional[float] = None
+        self._last_time: Optional[float] = None
+
+        # Уровни стратегии
+        self.levels: Dict[str, Decimal] = {}
+        self._pending_crossing: Optional[float] = None
+        self._tighten_next = False
+        # Создается в wait(): Event привязывается к работающему event loop
+        self._wake_event: Optional[asyncio.Event] = None
+
+        self.current_interval = self.config.base_interval
+        self.stats = SchedulerStats(started=clock())
+        self._api_calls_at_start: Optional[int] = api_call_counter() if api_call_counter else None
+
+        self.logger = logging.getLogger(__name__)
+
+    # ================= НАБЛЮДЕНИЯ =================
+
+    def observe_price(self, price: Any, timestamp: Optional[float] = None, wake: bool = True) -> bool:
+        """📈 Новая цена; True - пересечен уровень
+
+        wake=True (тик потока) - пересечение будит цикл немедленно;
+        wake=False (цена, уже обработанная циклом) - только сокращает интервал.
+        """
+        value = float(getattr(price, 'value', price))
+        if value <= 0:
+            return False
+
+        now = self._clock() if timestamp is None else timestamp
+        self.stats.observations += 1
+        crossed = False
+
+        if self._last_price is not None and self._last_time is not None:
+            elapsed = max(now - self._last_time, 1e-3)
+            # Вес наблюдения растет с прошедшим временем (EWMA по времени)
+            alpha = 1.0 - math.exp(-elapsed * math.log(2) / self.config.volatility_halflife)
+            log_return = math.log(value / self._last_price)
+            self._variance_rate += alpha * (log_return * log_return / elapsed - self._variance_rate)
+            self._tick_rate += alpha * (1.0 / elapsed - self._tick_rate)
+
+            crossed = self._check_crossing(self._last_price, value, now, wake)
+
+        self._last_price = value
+        self._last_time = now
+        return crossed
+
+    def set_levels(self, levels: Dict[str, Optional[Decimal]]) -> None:
+        """🎯 Уровни, при пересечении которых цикл нужен немедленно"""
+        self.levels = {name: level for name, level in levels.items() if level is not None and level > 0}
+
+    def set_levels_from_position(
+        self,
+        average_price: Optional[Decimal],
+        dca_drop_percent: Decimal,
+        stop_loss_percent: Decimal,
+        take_profit_percents: List[Decimal]
+    ) -> None:
+        """🎯 Уровни DCA, стопа и пирамиды от средней цены позиции"""
+        if not average_price or average_price <= 0:
+            self.set_levels({})
+            return
+
+        hundred = Decimal('100')
+        levels = {
+            'dca': average_price * (1 - dca_drop_percent / hundred),
+            'stop_loss': average_price * (1 - stop_loss_percent / hundred)
+        }
+        for index, percent in enumerate(take_profit_percents):
+            levels[f'pyramid_{index + 1}'] = average_price * (1 + percent / hundred)
+        self.set_levels(levels)
+
+    def _check_crossing(self, previous: float, current: float, now: float, wake: bool) -> bool:
+        for name, level in self.levels.items():
+            level_value = float(level)
+            if (previous - level_value) * (current - level_value) <= 0 and previous != current:
+                self.stats.level_crossings += 1
+                self._tighten_next = True
+                if wake:
+                    self.logger.info(f"🎯 Цена {current} пересекла уровень {name} ({level_value}) - внеочередной цикл")
+                    if self._pending_crossing is None:
+                        self._pending_crossing = now
+                    if self._wake_event is not None:
+                        self._wake_event.set()
+                return True
+        return False
+
+    # ================= ИНТЕРВАЛ =================
+
+    @property
+    def volatility_per_second(self) -> float:
+        """sigma лог-доходности за секунду"""
+        return math.sqrt(self._variance_rate)
+
+    def nearest_level_distance(self) -> Optional[float]:
+        """Относительное расстояние до ближайшего уровня"""
+        if not self.levels or not self._last_price:
+            return None
+        return min(abs(float(level) - self._last_price) / self._last_price for level in self.levels.values())
+
+    def next_interval(self) -> float:
+        """⏱️ Интервал до следующего цикла"""
+        config = self.config
+        sigma = self.volatility_per_second
+
+        if self._pending_crossing is not None or self._tighten_next:
+            interval = config.min_interval
+        elif sigma <= 0:
+            interval = config.base_interval
+        else:
+            target = config.target_move_percent / 100
+            interval = (target / sigma) ** 2
+
+            distance = self.nearest_level_distance()
+            if distance is not None:
+                interval = min(interval, (distance / (config.level_guard_sigmas * sigma)) ** 2)
+
+        self.current_interval = min(max(interval, config.min_interval), config.max_interval)
+        return self.current_interval
+
+    async def wait(self) -> float:
+        """💤 Пауза до следующего цикла; прерывается пересечением уровня"""
+        interval = self.next_interval()
+        self._tighten_next = False
+        if self._pending_crossing is not None:
+            return 0.0
+
+        if self._wake_event is None:
+            self._wake_event = asyncio.Event()
+        self._wake_event.clear()
+        started = self._clock()
+        try:
+            await asyncio.wait_for(self._wake_event.wait(), timeout=interval)
+            self.stats.early_wakeups += 1
+        except asyncio.TimeoutError:
+            pass
+        return self._clock() - started
+
+    def cycle_started(self) -> None:
+        """▶️ Отметка начала цикла (для задержки реакции)"""
+        self.stats.cycles += 1
+        if self._pending_crossing is not None:
+            self.stats.reaction_latencies.append(self._clock() - self._pending_crossing)
+            self._pending_crossing = None
+
+    # ================= МЕТРИКИ =================
+
+    def get_status(self) -> Dict[str, Any]:
+        """📊 Метрики: сэкономленные циклы/запросы и задержка реакции"""
+        elapsed = self._clock() - self.stats.started
+        baseline_cycles = elapsed / self.config.base_interval
+        cycles_saved = baseline_cycles - self.stats.cycles
+
+        api_calls = calls_per_cycle = api_calls_saved = None
+        if self._api_call_counter is not None and self._api_calls_at_start is not None:
+            api_calls = self._api_call_counter() - self._api_calls_at_start
+            if self.stats.cycles:
+                calls_per_cycle = api_calls / self.stats.cycles
+                api_calls_saved = round(cycles_saved * calls_per_cycle)
+
+        latencies = self.stats.reaction_latencies
+        distance = self.nearest_level_distance()
+        return {
+            'current_interval': round(self.current_interval, 2),
+            'volatility_per_minute_percent': round(self.volatility_per_second * math.sqrt(60) * 100, 4),
+            'ticks_per_minute': round(self._tick_rate * 60, 2),
+            'nearest_level_percent': round(distance * 100, 3) if distance is not None else None,
+            'levels': {name: str(level) for name, level in self.levels.items()},
+            'cycles': self.stats.cycles,
+            'baseline_cycles': round(baseline_cycles, 1),
+            'cycles_saved': round(cycles_saved, 1),
+            'api_calls': api_calls,
+            'api_calls_per_cycle': round(calls_per_cycle, 2) if calls_per_cycle is not None else None,
+            'api_calls_saved': api_calls_saved,
+            'level_crossings': self.stats.level_crossings,
+            'early_wakeups': self.stats.early_wakeups,
+            'reaction_latency': {
+                'count': len(latencies),
+                'mean_seconds': round(sum(latencies) / len(latencies), 3) if latencies else None,
+                'max_seconds': round(max(latencies), 3) if latencies else None
+            }
+        }
@@ -41,6 +41,8 @@ except ImportError:
     class DomainEvent: pass
     def publish_event(event): pass
 
+from ...core.cache.tiered_cache import TieredCache, get_shared_cache, pair_tag, BALANCE_TAG
+
 
 class RiskDecision(Enum):
     """🎯 Решения риск-менеджмента"""
@@ -120,7 +122,8 @@ class RiskManagementService:
         position_manager: IPositionManager,
         market_data_provider: IMarketDataProvider,
         trading_pair: TradingPair,
-        initial_balance: Money
+        initial_balance: Money,
+        cache: Optional[TieredCache] = None
     ):
         self.risk_manager = risk_manager
         self.position_manager = position_manager
@@ -140,9 +143,12 @@ class RiskManagementService:
         self.auto_emergency_stop = True
         self.assessment_timeout = timedelta(seconds=30)
         
-        # Кэш оценок
-        self._assessment_cache: Dict[str, Tuple[RiskAssessmentResult, datetime]] = {}
+        # Кэш оценок - пространство общего кэша; оценка зависит от баланса
+        # и пары, поэтому сделка инвалидирует ее вместе с ними
         self.cache_ttl = timedelta(minutes=1)
+        self._assessment_cache = (cache or get_shared_cache()).namespace(
+            "risk_assessment", ttl=self.cache_ttl.total_seconds()
+        )
         
         # Логирование
         self.logger = logging.getLogger(__name__)
@@ -171,16 +177,17 @@ class RiskManagementService:
             
             # Проверяем кэш
             cache_key = self._get_cache_key(signal)
-            cached_result = self._get_cached_assessment(cache_key)
+            cached_result = await self._get_cached_assessment(cache_key)
             if cached_result:
                 self.logger.debug("💾 Использован кэшированный результат оценки")
                 return cached_result
             
             # Выполняем оценку
+            cache_version = self._assessment_cache.version
             result = await self._perform_risk_assessment(signal, context)
             
             # Кэшируем результат
-            self._cache_assessment(cache_key, result)
+            await self._cache_assessment(cache_key, signal, result, cache_version)
             
             # Сохраняем в историю
             self.assessment_history.append(result)
@@ -628,25 +635,24 @@ class RiskManagementService:
         """🔑 Генерация ключа кэша"""
         return f"{signal.signal_type}_{signal.pair}_{signal.quantity}_{signal.confidence}"
     
-    def _get_cached_assessment(self, cache_key: str) -> Optional[RiskAssessmentResult]:
+    async def _get_cached_assessment(self, cache_key: str) -> Optional[RiskAssessmentResult]:
         """💾 Получение кэшированной оценки"""
-        if cache_key in self._assessment_cache:
-            result, timestamp = self._assessment_cache[cache_key]
-            if datetime.now() - timestamp < self.cache_ttl:
-                return result
-            else:
-                del self._assessment_cache[cache_key]
-        return None
+        return await self._assessment_cache.get(cache_key)
     
-    def _cache_assessment(self, cache_key: str, result: RiskAssessmentResult) -> None:
-        """💾 Кэширование оценки"""
-        self._assessment_cache[cache_key] = (result, datetime.now())
-        
-        # Ограничиваем размер кэша
-        if len(self._assessment_cache) > 100:
-            oldest_key = min(self._assessment_cache.keys(), 
-                           key=lambda k: self._assessment_cache[k][1])
-            del self._assessment_cache[oldest_key]
+    async def _cache_assessment(
+        self,
+        cache_key: str,
+        signal: TradeSignal,
+        result: RiskAssessmentResult,
+        cache_version: int
+    ) -> None:
+        """💾 Кэширование оценки (если во время оценки не было сделки)"""
+        # Размер ограничивает L1 общего кэша, истечение - его TTL
+        await self._assessment_cache.set(
+            cache_key, result,
+            tags=[pair_tag(signal.pair), BALANCE_TAG],
+            if_version=cache_version
+        )
     
     def _validate_authorization(self, code: str) -> bool:
         """🔐 Валидация кода авторизации"""
@@ -48,6 +48,36 @@ class APISettings:
     retry_delay_seconds: float = 1.0
     rate_limit_per_minute: int = 600
     rate_limit_per_second: int = 10
+    rate_limit_per_hour: int = 36000
+    adaptive_rate_limiting: bool = True
+    # "sliding_window" - общее FIFO окно, "priority" - token bucket с приоритетными полосами
+    rate_limiter_type: str = "sliding_window"
+
+    # HTTP транспорт ("requests" - блокирующая сессия в executor, "aiohttp" - нативный async)
+    http_transport: str = "requests"
+    http_pool_limit: int = 100
+    http_pool_limit_per_host: int = 10
+    http_dns_cache_ttl: int = 300
+    http_keepalive_timeout: float = 30.0
+    # Разбор ответов: "json" - точный Decimal из текста, "orjson" - быстрее, но через float (17 цифр)
+    json_decoder: str = "json"
+
+    # Кассета HTTP обменов: "off", "record" - запись, "replay" - воспроизведение без сети
+    http_cassette_mode: str = "off"
+    http_cassette_path: str = "data/cassettes/exmo_session.jsonl.gz"
+    http_cassette_replay_speed: float = 0.0  # 0 - максимально быстро, 1 - записанный темп
+
+    # WebSocket поток публичных данных
+    exmo_ws_url: str = "wss://ws-api.exmo.com:443/v1/public"
+    ws_reconnect_max_delay: float = 30.0
+
+    # Справочник пар (pair_settings): загружается при старте и обновляется в фоне
+    pair_settings_refresh_interval: float = 300.0
+
+    # Кэш ответов биржи
+    cache_enabled: bool = True
+    cache_price_ttl: int = 10
+    cache_balance_ttl: int = 30
 
     def __post_init__(self):
         # Загрузка из переменных окружения
@@ -74,6 +104,54 @@ class APISettings:
                 field="timeout_seconds",
                 value=self.timeout_seconds
             )
+        if self.rate_limit_per_minute <= 0 or self.rate_limit_per_hour <= 0:
+            raise ValidationError(
+                "Rate limits must be positive",
+                field="rate_limit_per_minute",
+                value=self.rate_limit_per_minute
+            )
+        if self.rate_limiter_type not in ("sliding_window", "priority"):
+            raise ValidationError(
+                f"Unknown rate limiter type: {self.rate_limiter_type}",
+                field="rate_limiter_type",
+                value=self.rate_limiter_type
+            )
+        if self.http_transport not in ("requests", "aiohttp"):
+            raise ValidationError(
+                f"Unknown HTTP transport: {self.http_transport}",
+                field="http_transport",
+                value=self.http_transport
+            )
+        if self.json_decoder not in ("json", "orjson"):
+            raise ValidationError(
+                f"Unknown JSON decoder: {self.json_decoder}",
+                field="json_decoder",
+                value=self.json_decoder
+            )
+        if self.http_pool_limit <= 0 or self.http_pool_limit_per_host <= 0:
+            raise ValidationError(
+                "Connection pool limits must be positive",
+                field="http_pool_limit",
+                value=self.http_pool_limit
+            )
+        if self.http_cassette_mode not in ("off", "record", "replay"):
+            raise ValidationError(
+                f"Unknown cassette mode: {self.http_cassette_mode}",
+                field="http_cassette_mode",
+                value=self.http_cassette_mode
+            )
+        if self.http_cassette_replay_speed < 0:
+            raise ValidationError(
+                "Cassette replay speed cannot be negative",
+                field="http_cassette_replay_speed",
+                value=self.http_cassette_replay_speed
+            )
+        if self.ws_reconnect_max_delay <= 0 or self.pair_settings_refresh_interval <= 0:
+            raise ValidationError(
+                "WebSocket reconnect delay and pair settings refresh interval must be positive",
+                field="pair_settings_refresh_interval",
+                value=self.pair_settings_refresh_interval
+            )
 
 
 @dataclass
@@ -229,8 +307,19 @@ class SystemSettings:
     max_log_file_size_mb: int = 100
     backup_count: int = 5
     update_interval_seconds: int = 60
+    adaptive_polling_enabled: bool = True
+    # Границы адаптивного интервала - внутри [MIN_UPDATE_INTERVAL, MAX_UPDATE_INTERVAL]
+    min_update_interval_seconds: int = 10
+    max_update_interval_seconds: int = 300
+    volatility_halflife_seconds: int = 300
+    target_move_percent: float = 0.5
     cache_enabled: bool = True
     cache_ttl_seconds: int = 300
+    cache_snapshot_file: str = "data/cache_snapshot.bin"
+    storage_path: str = "data"
+    journal_enabled: bool = False
+    journal_fsync: str = "interval"  # always / interval / never
+    journal_fsync_interval: float = 1.0
     metrics_enabled: bool = True
     health_check_interval_seconds: int = 300
 
@@ -251,6 +340,46 @@ class SystemSettings:
                 value=self.update_interval_seconds
             )
 
+        # Границы и параметры волатильности нужны только адаптивному интервалу;
+        # без него цикл спит ровно update_interval_seconds
+        if self.adaptive_polling_enabled:
+            if not (ConfigConstants.MIN_UPDATE_INTERVAL <= self.min_update_interval_seconds
+                    and self.max_update_interval_seconds <= ConfigConstants.MAX_UPDATE_INTERVAL):
+                raise ValidationError(
+                    f"Adaptive interval bounds must be within "
+                    f"[{ConfigConstants.MIN_UPDATE_INTERVAL}, {ConfigConstants.MAX_UPDATE_INTERVAL}]",
+                    field="min_update_interval_seconds",
+                    value=(self.min_update_interval_seconds, self.max_update_interval_seconds)
+                )
+
+            if not self.min_update_interval_seconds <= self.update_interval_seconds <= self.max_update_interval_seconds:
+                raise ValidationError(
+                    "Update interval must be within [min_update_interval_seconds, max_update_interval_seconds]",
+                    field="update_interval_seconds",
+                    value=self.update_interval_seconds
+                )
+
+            if self.volatility_halflife_seconds <= 0 or self.target_move_percent <= 0:
+                raise ValidationError(
+                    "Volatility halflife and target move must be positive",
+                    field="target_move_percent",
+                    value=self.target_move_percent
+                )
+
+        if self.journal_fsync not in ("always", "interval", "never"):
+            raise ValidationError(
+                f"Invalid journal fsync mode: {self.journal_fsync}",
+                field="journal_fsync",
+                value=self.journal_fsync
+            )
+
+        if self.journal_fsync_interval <= 0:
+            raise ValidationError(
+                "Journal fsync interval must be positive",
+                field="journal_fsync_interval",
+                value=self.journal_fsync_interval
+            )
+
 
 # ================= ОСНОВНЫЕ НАСТРОЙКИ =================
 
@@ -347,7 +476,25 @@ class TradingSystemSettings:
                 'retry_attempts': self.api.retry_attempts,
                 'retry_delay_seconds': self.api.retry_delay_seconds,
                 'rate_limit_per_minute': self.api.rate_limit_per_minute,
-                'rate_limit_per_second': self.api.rate_limit_per_second
+                'rate_limit_per_second': self.api.rate_limit_per_second,
+                'rate_limit_per_hour': self.api.rate_limit_per_hour,
+                'adaptive_rate_limiting': self.api.adaptive_rate_limiting,
+                'rate_limiter_type': self.api.rate_limiter_type,
+                'http_transport': self.api.http_transport,
+                'http_pool_limit': self.api.http_pool_limit,
+                'http_pool_limit_per_host': self.api.http_pool_limit_per_host,
+                'http_dns_cache_ttl': self.api.http_dns_cache_ttl,
+                'http_keepalive_timeout': self.api.http_keepalive_timeout,
+                'json_decoder': self.api.json_decoder,
+                'http_cassette_mode': self.api.http_cassette_mode,
+                'http_cassette_path': self.api.http_cassette_path,
+                'http_cassette_replay_speed': self.api.http_cassette_replay_speed,
+                'exmo_ws_url': self.api.exmo_ws_url,
+                'ws_reconnect_max_delay': self.api.ws_reconnect_max_delay,
+                'pair_settings_refresh_interval': self.api.pair_settings_refresh_interval,
+                'cache_enabled': self.api.cache_enabled,
+                'cache_price_ttl': self.api.cache_price_ttl,
+                'cache_balance_ttl': self.api.cache_balance_ttl
             },
             'trading': {
                 'trading_pair': self.trading.trading_pair,
@@ -393,8 +540,18 @@ class TradingSystemSettings:
                 'max_log_file_size_mb': self.system.max_log_file_size_mb,
                 'backup_count': self.system.backup_count,
                 'update_interval_seconds': self.system.update_interval_seconds,
+                'adaptive_polling_enabled': self.system.adaptive_polling_enabled,
+                'min_update_interval_seconds': self.system.min_update_interval_seconds,
+                'max_update_interval_seconds': self.system.max_update_interval_seconds,
+                'volatility_halflife_seconds': self.system.volatility_halflife_seconds,
+                'target_move_percent': self.system.target_move_percent,
                 'cache_enabled': self.system.cache_enabled,
                 'cache_ttl_seconds': self.system.cache_ttl_seconds,
+                'cache_snapshot_file': self.system.cache_snapshot_file,
+                'storage_path': self.system.storage_path,
+                'journal_enabled': self.system.journal_enabled,
+                'journal_fsync': self.system.journal_fsync,
+                'journal_fsync_interval': self.system.journal_fsync_interval,
                 'metrics_enabled': self.system.metrics_enabled,
                 'health_check_interval_seconds': self.system.health_check_interval_seconds
             },
@@ -514,6 +671,12 @@ class ConfigProvider:
         if dry_run := os.getenv(f"{self._env_prefix}DRY_RUN"):
             self._settings.dry_run = dry_run.lower() in ('true', '1', 'yes')
 
+        if journal_enabled := os.getenv(f"{self._env_prefix}JOURNAL_ENABLED"):
+            self._settings.system.journal_enabled = journal_enabled.lower() in ('true', '1', 'yes')
+
+        if journal_fsync := os.getenv(f"{self._env_prefix}JOURNAL_FSYNC"):
+            self._settings.system.journal_fsync = journal_fsync.lower()
+
         return self
 
     def load_from_dotenv(self, env_file: str = ".env") -> 'ConfigProvider':
@@ -0,0 +1,272 @@
+from typing import Optional, Dict, Any, Callable, Awaitable, Tuple
+from dataclasses import dataclass
+from enum import Enum
+import asyncio
+import logging
+
+
+# ================= СОСТОЯНИЯ СВЕЖЕСТИ =================
+
+class FreshnessState(Enum):
+    """🕒 Состояние значения относительно TTL"""
+    FRESH = "fresh"                  # в пределах TTL
+    REFRESH_AHEAD = "refresh_ahead"  # в пределах TTL, но пора обновить заранее
+    STALE = "stale"                  # TTL истек, но значение в окне grace
+    EXPIRED = "expired"              # за пределами grace - нужно ждать источник
+
+
+@dataclass
+class Freshness:
+    """🕒 Метаданные свежести значения, отданного вызывающему"""
+    state: FreshnessState
+    source: str                      # exchange_api / cached / fallback
+    age_seconds: float
+    expires_in_seconds: float        # отрицательное - TTL уже истек
+    refreshing: bool = False         # идет фоновое обновление
+
+    @property
+    def is_stale(self) -> bool:
+        return self.state in (FreshnessState.STALE, FreshnessState.EXPIRED)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'state': self.state.value,
+            'source': self.source,
+            'age_seconds': round(self.age_seconds, 3),
+            'expires_in_seconds': round(self.expires_in_seconds, 3),
+            'refreshing': self.refreshing
+        }
+
+
+@dataclass
+class RevalidationStats:
+    """📊 Статистика stale-while-revalidate"""
+    fresh_hits: int = 0
+    stale_served: int = 0
+    blocking_fetches: int = 0
+    coalesced_fetches: int = 0
+    refresh_ahead: int = 0
+    background_refreshes: int = 0
+    background_failures: int = 0
+    discarded_results: int = 0
+
+
+# ================= КООРДИНАТОР ОБНОВЛЕНИЙ =================
+
+class StaleWhileRevalidate:
+    """🔄 Stale-while-revalidate и refresh-ahead поверх кэша сервиса
+
+    Хранение остается у сервиса - координатор только решает, можно ли отдать
+    значение, и ведет загрузки: не больше одной на ключ (single-flight), и
+    для блокирующих чтений, и для фоновых. После TTL значение еще
+    grace_seconds отдается сразу, а обновление идет в фоне. Горячий ключ
+    (hot_access_threshold обращений с последнего сохранения) обновляется
+    заранее - после refresh_ahead_ratio доли TTL. invalidate() делает
+    результаты уже начатых загрузок ключа недействительными: они не
+    перезапишут значение, сохраненное после сделки или резервирования.
+    """
+
+    def __init__(
+        self,
+        grace_seconds: float = 30.0,
+        refresh_ahead_ratio: float = 0.8,
+        hot_access_threshold: int = 2,
+        name: str = "cache"
+    ):
+        if grace_seconds < 0:
+            raise ValueError("grace_seconds не может быть отрицательным")
+        if not 0 < refresh_ahead_ratio <= 1:
+            raise ValueError("refresh_ahead_ratio должен быть в (0, 1]")
+
+        self.grace_seconds = grace_seconds
+        self.refresh_ahead_ratio = refresh_ahead_ratio
+        self.hot_access_threshold = hot_access_threshold
+        self.name = name
+
+        self._inflight: Dict[str, asyncio.Task] = {}
+        self._access_counts: Dict[str, int] = {}
+        self._generations: Dict[str, int] = {}
+        self._epoch = 0
+
+        self.stats = RevalidationStats()
+        self.logger = logging.getLogger(__name__)
+
+    # ================= РЕШЕНИЕ =================
+
+    def decide(self, key: str, age_seconds: float, ttl_seconds: float) -> FreshnessState:
+        """🕒 Состояние закэшированного значения при обращении"""
+        count = self._access_counts.get(key, 0) + 1
+        self._access_counts[key] = count
+
+        if age_seconds <= ttl_seconds:
+            if (self.refresh_ahead_ratio < 1 and count >= self.hot_access_threshold
+                    and age_seconds >= ttl_seconds * self.refresh_ahead_ratio):
+                return FreshnessState.REFRESH_AHEAD
+            return FreshnessState.FRESH
+        if age_seconds <= ttl_seconds + self.grace_seconds:
+            return FreshnessState.STALE
+        return FreshnessState.EXPIRED
+
+    def serve(
+        self,
+        key: str,
+        state: FreshnessState,
+        fetch: Callable[[], Awaitable[Any]],
+        store: Callable[[Any], Awaitable[None]]
+    ) -> bool:
+        """📤 Учет отданного из кэша значения; при необходимости - фоновое обновление
+
+        Возвращает True, если по ключу идет обновление.
+        """
+        if state is FreshnessState.FRESH:
+            self.stats.fresh_hits += 1
+        elif state is FreshnessState.REFRESH_AHEAD:
+            self.stats.fresh_hits += 1
+            if key not in self._inflight:
+                self.stats.refresh_ahead += 1
+            self.refresh_in_background(key, fetch, store)
+        elif state is FreshnessState.STALE:
+            self.stats.stale_served += 1
+            self.refresh_in_background(key, fetch, store)
+        return key in self._inflight
+
+    def freshness(
+        self,
+        key: str,
+        state: FreshnessState,
+        source: str,
+        age_seconds: float,
+        ttl_seconds: float
+    ) -> Freshness:
+        """🕒 Метаданные для вызывающего"""
+        return Freshness(
+            state=state,
+            source=source,
+            age_seconds=age_seconds,
+            expires_in_seconds=ttl_seconds - age_seconds,
+            refreshing=key in self._inflight
+        )
+
+    # ================= ЗАГРУЗКИ =================
+
+    def refresh_in_background(
+        self,
+        key: str,
+        fetch: Callable[[], Awaitable[Any]],
+        store: Callable[[Any], Awaitable[None]]
+    ) -> bool:
+        """🔄 Фоновое обновление; False - по ключу уже идет загрузка"""
+        if key in self._inflight:
+            return False
+
+        self.stats.background_refreshes += 1
+        task = self._start(key, fetch, store)
+        task.add_done_callback(self._on_background_done)
+        return True
+
+    async def fetch(
+        self,
+        key: str,
+        fetch: Callable[[], Awaitable[Any]],
+        store: Callable[[Any], Awaitable[None]]
+    ) -> Any:
+        """⏳ Блокирующая загрузка; параллельные вызовы ждут одну и ту же"""
+        task = self._inflight.get(key)
+        if task is None:
+            self.stats.blocking_fetches += 1
+            task = self._start(key, fetch, store)
+        else:
+            self.stats.coalesced_fetches += 1
+
+        # shield: отмена одного ожидающего не отменяет общую загрузку
+        return await asyncio.shield(task)
+
+    def invalidate(self, key: str) -> None:
+        """🗑️ Значение ключа изменилось - начатые загрузки не сохраняются"""
+        self._generations[key] = self._generations.get(key, 0) + 1
+        self._access_counts.pop(key, None)
+        self._inflight.pop(key, None)
+
+    def invalidate_all(self) -> None:
+        """🗑️ Инвалидация всех ключей"""
+        self._epoch += 1
+        self._generations.clear()
+        self._access_counts.clear()
+        self._inflight.clear()
+
+    def is_refreshing(self, key: str) -> bool:
+        return key in self._inflight
+
+    async def close(self) -> None:
+        """🛑 Отмена фоновых загрузок"""
+        tasks = list(self._inflight.values())
+        self._inflight.clear()
+        for task in tasks:
+            task.cancel()
+        if tasks:
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+    def _generation(self, key: str) -> Tuple[int, int]:
+        return self._epoch, self._generations.get(key, 0)
+
+    def _start(
+        self,
+        key: str,
+        fetch: Callable[[], Awaitable[Any]],
+        store: Callable[[Any], Awaitable[None]]
+    ) -> asyncio.Task:
+        task = asyncio.ensure_future(self._run(key, fetch, store, self._generation(key)))
+        self._inflight[key] = task
+        task.add_done_callback(lambda done: self._release(key, done))
+        return task
+
+    async def _run(
+        self,
+        key: str,
+        fetch: Callable[[], Awaitable[Any]],
+        store: Callable[[Any], Awaitable[None]],
+        generation: Tuple[int, int]
+    ) -> Any:
+        value = await fetch()
+        if self._generation(key) == generation:
+            await store(value)
+            self._access_counts[key] = 0
+        else:
+            # Ключ инвалидирован во время загрузки - результат мог устареть
+            self.stats.discarded_results += 1
+        return value
+
+    def _release(self, key: str, task: asyncio.Task) -> None:
+        if self._inflight.get(key) is task:
+            del self._inflight[key]
+
+    def _on_background_done(self, task: asyncio.Task) -> None:
+        if task.cancelled():
+            return
+        error = task.exception()
+        if error is not None:
+            # Старое значение остается в кэше до конца окна grace
+            self.stats.background_failures += 1
+            self.logger.warning(f"⚠️ Фоновое обновление {self.name} не удалось: {error}")
+
+    # ================= МЕТРИКИ =================
+
+    def get_status(self) -> Dict[str, Any]:
+        """📊 Параметры и счетчики"""
+        stats = self.stats
+        served = stats.fresh_hits + stats.stale_served
+        return {
+            'grace_seconds': self.grace_seconds,
+            'refresh_ahead_ratio': self.refresh_ahead_ratio,
+            'hot_access_threshold': self.hot_access_threshold,
+            'inflight': len(self._inflight),
+            'fresh_hits': stats.fresh_hits,
+            'stale_served': stats.stale_served,
+            'stale_served_percent': round(stats.stale_served / served * 100, 2) if served else 0.0,
+            'blocking_fetches': stats.blocking_fetches,
+            'coalesced_fetches': stats.coalesced_fetches,
+            'refresh_ahead': stats.refresh_ahead,
+            'background_refreshes': stats.background_refreshes,
+            'background_failures': stats.background_failures,
+            'discarded_results': stats.discarded_results
+        }
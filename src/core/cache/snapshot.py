@@ -0,0 +1,144 @@
+from typing import Optional, Dict, Any, Iterable, List
+from dataclasses import dataclass
+from pathlib import Path
+import os
+import time
+import zlib
+import pickle
+import logging
+
+from .tiered_cache import TieredCache, CacheRecord
+
+
+SNAPSHOT_FORMAT_VERSION = 1
+
+
+@dataclass
+class SnapshotStats:
+    """📊 Результат последнего сохранения и восстановления"""
+    saved: int = 0
+    save_skipped: int = 0            # значения, которые не удалось сериализовать
+    save_bytes: int = 0
+    save_seconds: float = 0.0
+    restored: int = 0
+    expired: int = 0                 # истекли, пока процесс не работал
+    restore_skipped: int = 0         # не удалось прочитать (например, класс изменился)
+    restore_seconds: float = 0.0
+    snapshot_age_seconds: Optional[float] = None
+
+
+class CacheSnapshot:
+    """📸 Снимок общего кэша для теплого старта
+
+    При остановке живые записи L1 (user_info, рыночные данные, балансы,
+    справочник пар...) пишутся одним сжатым файлом вместе с тегами и
+    сроками в unix time. При старте восстанавливаются только записи, чей
+    TTL еще не истек, - на оставшийся срок. Значения сериализуются по
+    одному: несериализуемые пропускаются, а не ломают весь снимок.
+    """
+
+    def __init__(self, path: str, namespaces: Optional[Iterable[str]] = None):
+        self.path = Path(path)
+        self.namespaces = list(namespaces) if namespaces is not None else None
+        self.stats = SnapshotStats()
+        self.logger = logging.getLogger(__name__)
+
+    def save(self, cache: TieredCache) -> int:
+        """💾 Запись снимка (атомарно: временный файл + замена)"""
+        started = time.perf_counter()
+        rows = []
+        skipped = 0
+        for record in cache.export_records(self.namespaces):
+            try:
+                payload = pickle.dumps(record.value, protocol=pickle.HIGHEST_PROTOCOL)
+            except Exception as e:
+                skipped += 1
+                self.logger.debug(f"Пропускаем {record.key} в снимке кэша: {e}")
+                continue
+            rows.append((record.key, payload, record.tags, record.created_at, record.expires_at))
+
+        data = zlib.compress(pickle.dumps({
+            'version': SNAPSHOT_FORMAT_VERSION,
+            'written_at': time.time(),
+            'records': rows
+        }, protocol=pickle.HIGHEST_PROTOCOL))
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        temp_path = self.path.with_suffix(self.path.suffix + '.tmp')
+        with open(temp_path, 'wb') as f:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temp_path, self.path)
+
+        self.stats.saved = len(rows)
+        self.stats.save_skipped = skipped
+        self.stats.save_bytes = len(data)
+        self.stats.save_seconds = time.perf_counter() - started
+        self.logger.info(
+            f"📸 Снимок кэша: {len(rows)} записей, {len(data) / 1024:.1f} КБ "
+            f"за {self.stats.save_seconds * 1000:.1f}мс"
+        )
+        return len(rows)
+
+    def restore(self, cache: TieredCache) -> int:
+        """📥 Восстановление записей, чей TTL не истек; число восстановленных"""
+        started = time.perf_counter()
+        if not self.path.exists():
+            self.logger.info("📸 Снимка кэша нет - холодный старт")
+            return 0
+
+        try:
+            with open(self.path, 'rb') as f:
+                snapshot = pickle.loads(zlib.decompress(f.read()))
+        except Exception as e:
+            self.logger.warning(f"⚠️ Снимок кэша поврежден, холодный старт: {e}")
+            return 0
+
+        if snapshot.get('version') != SNAPSHOT_FORMAT_VERSION:
+            self.logger.warning(f"⚠️ Неизвестная версия снимка кэша: {snapshot.get('version')}")
+            return 0
+
+        now = time.time()
+        records: List[CacheRecord] = []
+        expired = skipped = 0
+        for key, payload, tags, created_at, expires_at in snapshot['records']:
+            if expires_at is not None and expires_at <= now:
+                expired += 1
+                continue
+            try:
+                records.append(CacheRecord(key, pickle.loads(payload), tuple(tags), created_at, expires_at))
+            except Exception as e:
+                skipped += 1
+                self.logger.debug(f"Пропускаем {key} из снимка кэша: {e}")
+
+        restored = cache.import_records(records)
+
+        self.stats.restored = restored
+        self.stats.expired = expired
+        self.stats.restore_skipped = skipped
+        self.stats.restore_seconds = time.perf_counter() - started
+        self.stats.snapshot_age_seconds = now - snapshot['written_at']
+        self.logger.info(
+            f"📸 Теплый старт: восстановлено {restored} записей кэша, истекло {expired}, "
+            f"снимку {self.stats.snapshot_age_seconds:.0f}с, {self.stats.restore_seconds * 1000:.1f}мс"
+        )
+        return restored
+
+    def get_status(self) -> Dict[str, Any]:
+        """📊 Статистика снимка"""
+        stats = self.stats
+        return {
+            'path': str(self.path),
+            'saved': stats.saved,
+            'save_skipped': stats.save_skipped,
+            'save_bytes': stats.save_bytes,
+            'save_seconds': round(stats.save_seconds, 4),
+            'restored': stats.restored,
+            'expired': stats.expired,
+            'restore_skipped': stats.restore_skipped,
+            'restore_seconds': round(stats.restore_seconds, 4),
+            'snapshot_age_seconds': (
+                round(stats.snapshot_age_seconds, 1) if stats.snapshot_age_seconds is not None else None
+            )
+        }
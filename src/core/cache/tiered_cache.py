@@ -0,0 +1,587 @@
+from typing import Optional, Dict, Any, Callable, List, Set, Tuple, Iterable, NamedTuple
+from collections import OrderedDict
+from dataclasses import dataclass
+import time
+import logging
+
+from ..interfaces import ICacheService
+
+
+# ================= ТЕГИ ИНВАЛИДАЦИИ =================
+
+BALANCE_TAG = "balance"
+NAMESPACE_SEPARATOR = ":"
+
+_ABSENT = object()
+
+
+def pair_tag(pair: Any) -> str:
+    """🏷️ Тег данных, зависящих от пары"""
+    return f"pair:{pair}"
+
+
+def trade_invalidation_tags(pair: Optional[Any] = None) -> List[str]:
+    """🏷️ Теги, которые сделка делает неактуальными: все балансы и данные пары"""
+    tags = [BALANCE_TAG]
+    if pair:
+        tags.append(pair_tag(pair))
+    return tags
+
+
+class CacheRecord(NamedTuple):
+    """📦 Запись общего кэша вне процесса (время - unix time)"""
+    key: str
+    value: Any
+    tags: Tuple[str, ...]
+    created_at: float
+    expires_at: Optional[float]
+
+
+# ================= L1 ПО УМОЛЧАНИЮ =================
+
+class MemoryTier(ICacheService):
+    """🧠 L1 по умолчанию: словарь с TTL и LRU-вытеснением
+
+    Используется, когда уровень памяти не передан явно (тесты, скрипты,
+    сервисы без инфраструктуры); в приложении L1 - InMemoryCache.
+    """
+
+    def __init__(self, max_size: int = 10000, default_ttl: float = 300, clock: Callable[[], float] = time.monotonic):
+        self.max_size = max_size
+        self.default_ttl = default_ttl
+        self._clock = clock
+        self._data: 'OrderedDict[str, Tuple[Any, Optional[float], float]]' = OrderedDict()
+        self.evictions = 0
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def get_nowait(self, key: str, default: Any = None) -> Any:
+        item = self._data.get(key)
+        if item is None:
+            return default
+        value, expires_at, _ = item
+        if expires_at is not None and self._clock() >= expires_at:
+            del self._data[key]
+            return default
+        self._data.move_to_end(key)
+        return value
+
+    def set_nowait(self, key: str, value: Any, ttl: Optional[float] = None) -> None:
+        ttl = self.default_ttl if ttl is None else ttl
+        now = self._clock()
+        self._data[key] = (value, now + ttl if ttl > 0 else None, now)
+        self._data.move_to_end(key)
+        while len(self._data) > self.max_size:
+            self._data.popitem(last=False)
+            self.evictions += 1
+
+    def delete_nowait(self, key: str) -> bool:
+        return self._data.pop(key, None) is not None
+
+    def exists_nowait(self, key: str) -> bool:
+        return self.get_nowait(key, _ABSENT) is not _ABSENT
+
+    def entries_nowait(self) -> List[Tuple[str, Any, float, Optional[float]]]:
+        """📋 Живые записи: (ключ, значение, возраст, остаток TTL или None)"""
+        now = self._clock()
+        return [
+            (key, value, now - created_at, expires_at - now if expires_at is not None else None)
+            for key, (value, expires_at, created_at) in self._data.items()
+            if expires_at is None or now < expires_at
+        ]
+
+    async def get(self, key: str, default: Any = None) -> Any:
+        return self.get_nowait(key, default)
+
+    async def set(self, key: str, value: Any, ttl: Optional[float] = None) -> None:
+        self.set_nowait(key, value, ttl)
+
+    async def delete(self, key: str) -> bool:
+        return self.delete_nowait(key)
+
+    async def exists(self, key: str) -> bool:
+        return self.exists_nowait(key)
+
+    async def clear(self) -> None:
+        self._data.clear()
+
+    async def get_info(self) -> Dict[str, Any]:
+        return {
+            "type": "MemoryTier",
+            "entries": len(self._data),
+            "max_size": self.max_size,
+            "evictions": self.evictions
+        }
+
+
+# ================= ПРОСТРАНСТВА ИМЕН =================
+
+@dataclass
+class NamespaceStats:
+    """📊 Статистика пространства имен"""
+    hits: int = 0
+    l2_hits: int = 0
+    misses: int = 0
+    sets: int = 0
+    skipped_sets: int = 0
+    deletes: int = 0
+    invalidated: int = 0
+
+    @property
+    def hit_rate(self) -> float:
+        total = self.hits + self.misses
+        return (self.hits / total * 100) if total > 0 else 0.0
+
+
+class CacheNamespace(ICacheService):
+    """🗂️ Пространство имен общего кэша: префикс ключей, TTL по умолчанию и теги
+
+    Каждая запись автоматически получает тег пространства (ns:<имя>), поэтому
+    clear() и items() не затрагивают чужие ключи. Синхронные *_nowait методы
+    работают только с L1 - для кода без event loop.
+    """
+
+    def __init__(self, owner: 'TieredCache', name: str, default_ttl: float, persistent: bool = False):
+        if NAMESPACE_SEPARATOR in name:
+            raise ValueError(f"Имя пространства не может содержать '{NAMESPACE_SEPARATOR}': {name}")
+        self.owner = owner
+        self.name = name
+        self.default_ttl = default_ttl
+        self.persistent = persistent
+        self.tag = f"ns:{name}"
+        self.stats = NamespaceStats()
+        self._listeners: List[Callable[[str], None]] = []
+
+    def __len__(self) -> int:
+        """Число записей пространства в индексе (истекшие могут учитываться до очистки)"""
+        return len(self.owner._tag_index.get(self.tag, ()))
+
+    def full_key(self, key: str) -> str:
+        return f"{self.name}{NAMESPACE_SEPARATOR}{key}"
+
+    def add_invalidation_listener(self, listener: Callable[[str], None]) -> None:
+        """👂 Вызов listener(key) при удалении ключа по тегу"""
+        self._listeners.append(listener)
+
+    def _notify_invalidated(self, key: str) -> None:
+        self.stats.invalidated += 1
+        for listener in self._listeners:
+            listener(key)
+
+    def _tags(self, tags: Iterable[str]) -> Tuple[str, ...]:
+        return (self.tag,) + tuple(tags)
+
+    # ================= АСИНХРОННЫЙ ИНТЕРФЕЙС =================
+
+    async def get(self, key: str, default: Any = None) -> Any:
+        """📖 Получение из L1, затем из L2"""
+        value, tier = await self.owner._get(self.full_key(key), self.persistent)
+        return self._count(value, tier, default)
+
+    @property
+    def version(self) -> int:
+        """🔢 Номер инвалидации общего кэша - снимать до запроса к источнику"""
+        return self.owner.invalidation_version
+
+    async def set(
+        self,
+        key: str,
+        value: Any,
+        ttl: Optional[float] = None,
+        tags: Iterable[str] = (),
+        if_version: Optional[int] = None
+    ) -> bool:
+        """💾 Сохранение с тегами
+
+        if_version - версия, снятая до запроса: если с тех пор прошла
+        инвалидация (например, сделка), ответ мог устареть и не сохраняется.
+        """
+        if if_version is not None and if_version != self.owner.invalidation_version:
+            self.stats.skipped_sets += 1
+            return False
+        self.stats.sets += 1
+        await self.owner._set(
+            self.full_key(key), value, self.default_ttl if ttl is None else ttl,
+            self._tags(tags), self.persistent
+        )
+        return True
+
+    async def delete(self, key: str) -> bool:
+        """🗑️ Удаление ключа"""
+        self.stats.deletes += 1
+        return await self.owner._delete(self.full_key(key), self.persistent)
+
+    async def clear(self) -> None:
+        """🧹 Очистка только этого пространства"""
+        await self.owner.invalidate_tags(self.tag)
+
+    async def invalidate_tags(self, *tags: str) -> int:
+        """🏷️ Инвалидация по тегам во всех пространствах"""
+        return await self.owner.invalidate_tags(*tags)
+
+    async def items(self) -> List[Tuple[str, Any]]:
+        """📋 Живые записи пространства (из L1)"""
+        return self.items_nowait()
+
+    # ================= СИНХРОННЫЙ ИНТЕРФЕЙС (L1) =================
+
+    def get_nowait(self, key: str, default: Any = None) -> Any:
+        value = self.owner.l1.get_nowait(self.full_key(key), _ABSENT)
+        return self._count(value, 1 if value is not _ABSENT else None, default)
+
+    def set_nowait(self, key: str, value: Any, ttl: Optional[float] = None, tags: Iterable[str] = ()) -> None:
+        if self.persistent:
+            raise RuntimeError(f"Пространство {self.name} хранится на диске - нужен асинхронный set()")
+        self.stats.sets += 1
+        self.owner._set_l1(self.full_key(key), value, self.default_ttl if ttl is None else ttl, self._tags(tags))
+
+    def delete_nowait(self, key: str) -> bool:
+        self.stats.deletes += 1
+        full_key = self.full_key(key)
+        self.owner._untag(full_key)
+        return self.owner.l1.delete_nowait(full_key)
+
+    def invalidate_tags_nowait(self, *tags: str) -> int:
+        return self.owner.invalidate_tags_nowait(*tags)
+
+    def items_nowait(self) -> List[Tuple[str, Any]]:
+        prefix_length = len(self.name) + len(NAMESPACE_SEPARATOR)
+        items = []
+        for full_key in list(self.owner._tag_index.get(self.tag, ())):
+            value = self.owner.l1.get_nowait(full_key, _ABSENT)
+            if value is not _ABSENT:
+                items.append((full_key[prefix_length:], value))
+            elif full_key not in self.owner._persistent_keys:
+                # Истекла или вытеснена из L1 - убираем из индекса
+                self.owner._untag(full_key)
+        return items
+
+    def _count(self, value: Any, tier: Optional[int], default: Any) -> Any:
+        if value is _ABSENT:
+            self.stats.misses += 1
+            return default
+        self.stats.hits += 1
+        if tier == 2:
+            self.stats.l2_hits += 1
+        return value
+
+    def get_stats(self) -> Dict[str, Any]:
+        stats = self.stats
+        return {
+            'default_ttl': self.default_ttl,
+            'persistent': self.persistent,
+            'entries': len(self),
+            'hits': stats.hits,
+            'l2_hits': stats.l2_hits,
+            'misses': stats.misses,
+            'hit_rate': round(stats.hit_rate, 2),
+            'sets': stats.sets,
+            'skipped_sets': stats.skipped_sets,
+            'deletes': stats.deletes,
+            'invalidated': stats.invalidated
+        }
+
+
+# ================= МНОГОУРОВНЕВЫЙ КЭШ =================
+
+class TieredCache(ICacheService):
+    """🗄️ Общий кэш процесса: L1 в памяти, опционально L2 на диске
+
+    Вместо отдельных словарей в клиенте API, сервисах рынка, балансов и
+    риска - пространства имен одного кэша с общей статистикой. Теги
+    связывают записи разных слоев: сделка (trade_executed) инвалидирует
+    тег balance и тег пары во всех пространствах сразу.
+
+    L1 должен поддерживать *_nowait методы (MemoryTier, InMemoryCache);
+    L2 - любой ICacheService (PersistentCache), в него пишутся только
+    пространства с persistent=True.
+    """
+
+    def __init__(
+        self,
+        l1: Optional[Any] = None,
+        l2: Optional[ICacheService] = None,
+        default_ttl: float = 300,
+        tracked_keys_limit: int = 10000
+    ):
+        self.l1 = l1 if l1 is not None else MemoryTier(default_ttl=default_ttl)
+        self.l2 = l2
+        self.default_ttl = default_ttl
+
+        self._namespaces: Dict[str, CacheNamespace] = {}
+
+        # Индекс тегов: записи, вытесненные из L1 без уведомления, чистятся при переполнении
+        self._tag_index: Dict[str, Set[str]] = {}
+        self._key_tags: Dict[str, Tuple[str, ...]] = {}
+        self._persistent_keys: Set[str] = set()
+        self._pending_l2_deletes: Set[str] = set()
+        self.tracked_keys_limit = tracked_keys_limit
+        self._prune_at = tracked_keys_limit
+
+        self.invalidation_version = 0
+        self.tag_invalidations = 0
+        self.trade_invalidations = 0
+        self._subscription_id: Optional[str] = None
+
+        self.logger = logging.getLogger(__name__)
+
+    def namespace(self, name: str, ttl: Optional[float] = None, persistent: bool = False) -> CacheNamespace:
+        """🗂️ Пространство имен (создается при первом обращении)"""
+        namespace = self._namespaces.get(name)
+        if namespace is None:
+            if persistent and self.l2 is None:
+                raise ValueError(f"Для пространства {name} нужен L2")
+            namespace = CacheNamespace(self, name, self.default_ttl if ttl is None else ttl, persistent)
+            self._namespaces[name] = namespace
+        return namespace
+
+    async def start(self) -> None:
+        """🚀 Запуск уровней (фоновая очистка L1, синхронизация L2)"""
+        for tier in (self.l1, self.l2):
+            if tier is not None and hasattr(tier, 'start'):
+                await tier.start()
+
+    async def stop(self) -> None:
+        """🛑 Остановка уровней"""
+        await self._flush_l2_deletes()
+        for tier in (self.l2, self.l1):
+            if tier is not None and hasattr(tier, 'stop'):
+                await tier.stop()
+
+    # ================= ICacheService (полные ключи) =================
+
+    async def get(self, key: str, default: Any = None) -> Any:
+        value, _ = await self._get(key, self.l2 is not None)
+        return default if value is _ABSENT else value
+
+    async def set(self, key: str, value: Any, ttl: Optional[float] = None, tags: Iterable[str] = ()) -> None:
+        await self._set(key, value, self.default_ttl if ttl is None else ttl, tuple(tags), False)
+
+    async def delete(self, key: str) -> bool:
+        return await self._delete(key, key in self._persistent_keys)
+
+    async def clear(self) -> None:
+        await self.l1.clear()
+        if self.l2 is not None:
+            await self.l2.clear()
+        self._tag_index.clear()
+        self._key_tags.clear()
+        self._persistent_keys.clear()
+        self._pending_l2_deletes.clear()
+
+    # ================= ИНВАЛИДАЦИЯ =================
+
+    def invalidate_tags_nowait(self, *tags: str) -> int:
+        """🏷️ Удаление записей с любым из тегов из L1; L2 - при следующей асинхронной операции"""
+        keys: Set[str] = set()
+        for tag in tags:
+            keys.update(self._tag_index.get(tag, ()))
+
+        for full_key in keys:
+            self._untag(full_key)
+            self.l1.delete_nowait(full_key)
+            if full_key in self._persistent_keys:
+                self._persistent_keys.discard(full_key)
+                self._pending_l2_deletes.add(full_key)
+
+            name, _, key = full_key.partition(NAMESPACE_SEPARATOR)
+            namespace = self._namespaces.get(name)
+            if namespace is not None:
+                namespace._notify_invalidated(key)
+
+        self.invalidation_version += 1
+        self.tag_invalidations += 1
+        return len(keys)
+
+    async def invalidate_tags(self, *tags: str) -> int:
+        """🏷️ Удаление записей с любым из тегов из всех уровней"""
+        removed = self.invalidate_tags_nowait(*tags)
+        await self._flush_l2_deletes()
+        return removed
+
+    async def on_trade_executed(self, event: Any) -> None:
+        """📈 Обработчик trade_executed: балансы и данные пары во всех слоях"""
+        metadata = getattr(event, 'metadata', None) or {}
+        pair = getattr(event, 'pair', None) or metadata.get('pair')
+        removed = await self.invalidate_tags(*trade_invalidation_tags(pair))
+        self.trade_invalidations += 1
+        self.logger.debug(f"🗑️ Сделка {pair or ''}: инвалидировано {removed} записей кэша")
+
+    async def subscribe_to_trades(self, event_bus: Optional[Any] = None) -> str:
+        """📥 Подписка на trade_executed (по умолчанию - глобальная шина)"""
+        if self._subscription_id is None:
+            if event_bus is None:
+                from ..events import get_global_event_bus
+                event_bus = await get_global_event_bus()
+            self._subscription_id = await event_bus.subscribe("trade_executed", self.on_trade_executed)
+        return self._subscription_id
+
+    # ================= ТЕПЛЫЙ СТАРТ =================
+
+    def export_records(self, namespaces: Optional[Iterable[str]] = None) -> List[CacheRecord]:
+        """📤 Живые записи L1 пространств с тегами и сроками (для снимка)
+
+        Пространства с persistent=True пропускаются - они уже в L2.
+        """
+        wanted = set(namespaces) if namespaces is not None else None
+        now = time.time()
+        records = []
+        for key, value, age, remaining in self.l1.entries_nowait():
+            tags = self._key_tags.get(key)
+            if not tags or key in self._persistent_keys:
+                continue
+            if wanted is not None and key.partition(NAMESPACE_SEPARATOR)[0] not in wanted:
+                continue
+            records.append(CacheRecord(
+                key, value, tags, now - age, now + remaining if remaining is not None else None
+            ))
+        return records
+
+    def import_records(self, records: Iterable[CacheRecord]) -> int:
+        """📥 Загрузка записей в L1 на оставшийся срок
+
+        Истекшие записи и ключи, уже записанные в этом процессе, пропускаются.
+        """
+        now = time.time()
+        imported = 0
+        for record in records:
+            if record.expires_at is None:
+                ttl = self._namespace_ttl(record.key)
+            else:
+                ttl = record.expires_at - now
+                if ttl <= 0:
+                    continue
+            if self.l1.exists_nowait(record.key):
+                continue
+            self._set_l1(record.key, record.value, ttl, tuple(record.tags))
+            imported += 1
+        return imported
+
+    # ================= УРОВНИ =================
+
+    async def _get(self, key: str, use_l2: bool) -> Tuple[Any, Optional[int]]:
+        value = self.l1.get_nowait(key, _ABSENT)
+        if value is not _ABSENT:
+            return value, 1
+        if not use_l2 or self.l2 is None:
+            return _ABSENT, None
+
+        await self._flush_l2_deletes()
+        value = await self.l2.get(key, _ABSENT)
+        if value is None or value is _ABSENT:
+            return _ABSENT, None
+        # Подъем в L1: TTL пространства, теги восстановятся при следующем set
+        self.l1.set_nowait(key, value, self._namespace_ttl(key))
+        return value, 2
+
+    async def _set(self, key: str, value: Any, ttl: float, tags: Tuple[str, ...], persistent: bool) -> None:
+        self._set_l1(key, value, ttl, tags)
+        if persistent and self.l2 is not None:
+            self._pending_l2_deletes.discard(key)
+            self._persistent_keys.add(key)
+            await self.l2.set(key, value, ttl)
+
+    def _set_l1(self, key: str, value: Any, ttl: float, tags: Tuple[str, ...]) -> None:
+        self.l1.set_nowait(key, value, ttl)
+        self._tag(key, tags)
+
+    async def _delete(self, key: str, persistent: bool) -> bool:
+        self._untag(key)
+        removed = self.l1.delete_nowait(key)
+        if persistent and self.l2 is not None:
+            self._persistent_keys.discard(key)
+            removed = await self.l2.delete(key) or removed
+        return bool(removed)
+
+    async def _flush_l2_deletes(self) -> None:
+        if not self._pending_l2_deletes or self.l2 is None:
+            return
+        keys = list(self._pending_l2_deletes)
+        self._pending_l2_deletes.clear()
+        for key in keys:
+            await self.l2.delete(key)
+
+    def _namespace_ttl(self, key: str) -> float:
+        namespace = self._namespaces.get(key.partition(NAMESPACE_SEPARATOR)[0])
+        return namespace.default_ttl if namespace is not None else self.default_ttl
+
+    # ================= ИНДЕКС ТЕГОВ =================
+
+    def _tag(self, key: str, tags: Tuple[str, ...]) -> None:
+        if self._key_tags.get(key) == tags:
+            return
+        self._untag(key)
+        if not tags:
+            return
+        self._key_tags[key] = tags
+        for tag in tags:
+            self._tag_index.setdefault(tag, set()).add(key)
+
+        if len(self._key_tags) > self._prune_at:
+            self._prune_tags()
+
+    def _untag(self, key: str) -> None:
+        tags = self._key_tags.pop(key, None)
+        if not tags:
+            return
+        for tag in tags:
+            keys = self._tag_index.get(tag)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._tag_index[tag]
+
+    def _prune_tags(self) -> None:
+        """🧹 Удаление из индекса ключей, истекших или вытесненных из L1"""
+        for key in list(self._key_tags):
+            if key not in self._persistent_keys and not self.l1.exists_nowait(key):
+                self._untag(key)
+        # Порог растет вместе с живыми ключами - очистка амортизированно O(1)
+        self._prune_at = max(self.tracked_keys_limit, 2 * len(self._key_tags))
+
+    # ================= МЕТРИКИ =================
+
+    def get_stats(self) -> Dict[str, Any]:
+        """📊 Единая статистика по пространствам"""
+        namespaces = {name: namespace.get_stats() for name, namespace in sorted(self._namespaces.items())}
+        hits = sum(namespace.stats.hits for namespace in self._namespaces.values())
+        misses = sum(namespace.stats.misses for namespace in self._namespaces.values())
+        return {
+            'namespaces': namespaces,
+            'hits': hits,
+            'misses': misses,
+            'hit_rate': round(hits / (hits + misses) * 100, 2) if hits + misses else 0.0,
+            'tracked_keys': len(self._key_tags),
+            'tags': len(self._tag_index),
+            'tag_invalidations': self.tag_invalidations,
+            'trade_invalidations': self.trade_invalidations,
+            'subscribed_to_trades': self._subscription_id is not None
+        }
+
+    async def get_info(self) -> Dict[str, Any]:
+        """ℹ️ Статистика пространств и уровней"""
+        info = self.get_stats()
+        info['l1'] = await self.l1.get_info() if hasattr(self.l1, 'get_info') else {}
+        if self.l2 is not None and hasattr(self.l2, 'get_info'):
+            info['l2'] = await self.l2.get_info()
+        return info
+
+
+# ================= ОБЩИЙ ЭКЗЕМПЛЯР =================
+
+_shared_cache: Optional[TieredCache] = None
+
+
+def get_shared_cache() -> TieredCache:
+    """🌍 Общий кэш процесса"""
+    global _shared_cache
+    if _shared_cache is None:
+        _shared_cache = TieredCache()
+    return _shared_cache
+
+
+def set_shared_cache(cache: TieredCache) -> None:
+    """🌍 Замена общего кэша (например, на L1 InMemoryCache + L2 PersistentCache)"""
+    global _shared_cache
+    _shared_cache = cache
@@ -53,7 +53,7 @@ class ValidationError(TradingSystemError):
         value: Optional[Any] = None,
         **kwargs
     ):
-        context = kwargs.get('context', {})
+        context = kwargs.pop('context', {})
         if field:
             context['field'] = field
         if value is not None:
@@ -73,7 +73,7 @@ class ConfigurationError(TradingSystemError):
         config_key: Optional[str] = None,
         **kwargs
     ):
-        context = kwargs.get('context', {})
+        context = kwargs.pop('context', {})
         if config_key:
             context['config_key'] = config_key
 
@@ -93,7 +93,7 @@ class APIError(TradingSystemError):
         response_data: Optional[Dict[str, Any]] = None,
         **kwargs
     ):
-        context = kwargs.get('context', {})
+        context = kwargs.pop('context', {})
         if status_code:
             context['status_code'] = status_code
         if response_data:
@@ -116,7 +116,7 @@ class RateLimitExceededError(APIError):
         retry_after: Optional[int] = None,
         **kwargs
     ):
-        context = kwargs.get('context', {})
+        context = kwargs.pop('context', {})
         if retry_after:
             context['retry_after'] = retry_after
 
@@ -134,7 +134,7 @@ class ExchangeError(APIError):
         exchange_code: Optional[str] = None,
         **kwargs
     ):
-        context = kwargs.get('context', {})
+        context = kwargs.pop('context', {})
         if exchange_code:
             context['exchange_code'] = exchange_code
 
@@ -171,7 +171,7 @@ class TradingError(TradingSystemError):
         price: Optional[Decimal] = None,
         **kwargs
     ):
-        context = kwargs.get('context', {})
+        context = kwargs.pop('context', {})
         if pair:
             context['pair'] = pair
         if quantity:
@@ -196,7 +196,7 @@ class InsufficientBalanceError(TradingError):
         **kwargs
     ):
         message = f"Недостаточно {currency}: требуется {required}, доступно {available}"
-        context = kwargs.get('context', {})
+        context = kwargs.pop('context', {})
         context.update({
             'required': str(required),
             'available': str(available),
@@ -220,7 +220,7 @@ class OrderExecutionError(TradingError):
         order_status: Optional[str] = None,
         **kwargs
     ):
-        context = kwargs.get('context', {})
+        context = kwargs.pop('context', {})
         if order_id:
             context['order_id'] = order_id
         if order_status:
@@ -240,7 +240,7 @@ class PositionError(TradingError):
         currency: Optional[str] = None,
         **kwargs
     ):
-        context = kwargs.get('context', {})
+        context = kwargs.pop('context', {})
         if currency:
             context['currency'] = currency
 
@@ -266,7 +266,7 @@ class InvalidSignalError(TradingError):
         strategy_name: Optional[str] = None,
         **kwargs
     ):
-        context = kwargs.get('context', {})
+        context = kwargs.pop('context', {})
         if signal_id:
             context['signal_id'] = signal_id
         if strategy_name:
@@ -289,7 +289,7 @@ class RiskManagementError(TradingSystemError):
         risk_factor: Optional[str] = None,
         **kwargs
     ):
-        context = kwargs.get('context', {})
+        context = kwargs.pop('context', {})
         if risk_level:
             context['risk_level'] = risk_level
         if risk_factor:
@@ -311,7 +311,7 @@ class RiskLimitExceededError(RiskManagementError):
         limit_value: Optional[Decimal] = None,
         **kwargs
     ):
-        context = kwargs.get('context', {})
+        context = kwargs.pop('context', {})
         context['limit_type'] = limit_type
         if current_value:
             context['current_value'] = str(current_value)
@@ -333,7 +333,7 @@ class EmergencyStopError(RiskManagementError):
         trigger_reason: Optional[str] = None,
         **kwargs
     ):
-        context = kwargs.get('context', {})
+        context = kwargs.pop('context', {})
         if trigger_reason:
             context['trigger_reason'] = trigger_reason
 
@@ -354,7 +354,7 @@ class StrategyError(TradingSystemError):
         strategy_type: Optional[str] = None,
         **kwargs
     ):
-        context = kwargs.get('context', {})
+        context = kwargs.pop('context', {})
         if strategy_name:
             context['strategy_name'] = strategy_name
         if strategy_type:
@@ -388,7 +388,7 @@ class SystemError(TradingSystemError):
         component: Optional[str] = None,
         **kwargs
     ):
-        context = kwargs.get('context', {})
+        context = kwargs.pop('context', {})
         if component:
             context['component'] = component
 
@@ -405,7 +405,7 @@ class DependencyError(SystemError):
         dependency_name: Optional[str] = None,
         **kwargs
     ):
-        context = kwargs.get('context', {})
+        context = kwargs.pop('context', {})
         if dependency_name:
             context['dependency_name'] = dependency_name
 
@@ -443,7 +443,7 @@ class DataError(TradingSystemError):
         data_type: Optional[str] = None,
         **kwargs
     ):
-        context = kwargs.get('context', {})
+        context = kwargs.pop('context', {})
         if data_type:
             context['data_type'] = data_type
 
@@ -460,7 +460,7 @@ class DataIntegrityError(DataError):
         constraint: Optional[str] = None,
         **kwargs
     ):
-        context = kwargs.get('context', {})
+        context = kwargs.pop('context', {})
         if constraint:
             context['constraint'] = constraint
 
@@ -472,7 +472,7 @@ class CacheError(DataError):
     """🗄️ Ошибка кэша"""
 
     def __init__(self, message: str, cache_key: Optional[str] = None, **kwargs):
-        context = kwargs.get('context', {})
+        context = kwargs.pop('context', {})
         if cache_key:
             context['cache_key'] = cache_key
 
@@ -481,6 +481,18 @@ class CacheError(DataError):
         self.cache_key = cache_key
 
 
+class PersistenceError(DataError):
+    """💾 Ошибка хранилища"""
+
+    def __init__(self, message: str, storage_path: Optional[str] = None, **kwargs):
+        context = kwargs.pop('context', {})
+        if storage_path:
+            context['storage_path'] = storage_path
+
+        super().__init__(message, context=context, **kwargs)
+        self.storage_path = storage_path
+
+
 # ================= УТИЛИТЫ ОБРАБОТКИ ИСКЛЮЧЕНИЙ =================
 
 class ExceptionHandler:
@@ -1,5 +1,5 @@
 from abc import ABC, abstractmethod
-from typing import Protocol, Dict, Any, Optional, List, Union, AsyncIterator
+from typing import Protocol, Dict, Any, Optional, List, Union, AsyncIterator, Generic, Type, TypeVar
 from decimal import Decimal
 from datetime import datetime
 
@@ -221,6 +221,22 @@ class ITradeExecutor(Protocol):
         """❌ Отмена ордера"""
         ...
 
+    async def execute_batch(
+        self,
+        signals: List['TradeSignal'],
+        max_concurrency: Optional[int] = None
+    ) -> List['OrderResult']:
+        """📦 Конкурентное исполнение пачки сигналов"""
+        ...
+
+    async def cancel_many(
+        self,
+        order_ids: List[str],
+        max_concurrency: Optional[int] = None
+    ) -> Dict[str, bool]:
+        """❌ Конкурентная отмена ордеров"""
+        ...
+
     async def get_active_orders(self) -> List[Dict[str, Any]]:
         """📋 Получение активных ордеров"""
         ...
@@ -445,6 +461,67 @@ class IPersistenceService(Protocol):
         ...
 
 
+T = TypeVar('T')
+
+
+class IRepository(ABC, Generic[T]):
+    """🗄️ Интерфейс репозитория сущностей"""
+
+    @abstractmethod
+    async def save(self, entity: T) -> T:
+        """💾 Сохранение (новой сущности назначается ID)"""
+        pass
+
+    @abstractmethod
+    async def find_by_id(self, entity_id: str) -> Optional[T]:
+        """🔍 Поиск по ID"""
+        pass
+
+    @abstractmethod
+    async def find_all(self) -> List[T]:
+        """📋 Все сущности"""
+        pass
+
+    @abstractmethod
+    async def find_by_criteria(self, criteria: Dict[str, Any]) -> List[T]:
+        """🔎 Поиск по равенству полей"""
+        pass
+
+    @abstractmethod
+    async def delete(self, entity_id: str) -> bool:
+        """🗑️ Удаление по ID"""
+        pass
+
+    @abstractmethod
+    async def count(self) -> int:
+        """🔢 Количество сущностей"""
+        pass
+
+    @abstractmethod
+    async def exists(self, entity_id: str) -> bool:
+        """✅ Есть ли сущность с ID"""
+        pass
+
+
+class IUnitOfWork(ABC):
+    """🔄 Интерфейс единицы работы над несколькими репозиториями"""
+
+    @abstractmethod
+    async def commit(self) -> None:
+        """✅ Фиксация изменений"""
+        pass
+
+    @abstractmethod
+    async def rollback(self) -> None:
+        """🔄 Откат изменений"""
+        pass
+
+    @abstractmethod
+    def get_repository(self, entity_type: Type[T]) -> IRepository[T]:
+        """📂 Репозиторий по типу сущности"""
+        pass
+
+
 # ================= СЛУЖЕБНЫЕ ИНТЕРФЕЙСЫ =================
 
 class IConfigurationService(Protocol):
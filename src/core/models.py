@@ -341,10 +341,14 @@ class MarketData:
     spread: Optional[Decimal] = None
     timestamp: datetime = field(default_factory=datetime.now)
     metadata: Dict[str, Any] = field(default_factory=dict)
+    # Живой стакан пары (domain.market.order_book.OrderBook), если поддерживается
+    order_book: Optional[Any] = field(default=None, repr=False, compare=False)
 
     @property
     def mid_price(self) -> Optional[Decimal]:
         """Средняя цена между bid и ask"""
+        if self.order_book is not None and self.order_book.mid_price is not None:
+            return self.order_book.mid_price
         if self.bid and self.ask:
             return (self.bid + self.ask) / Decimal('2')
         return None
@@ -352,6 +356,8 @@ class MarketData:
     @property
     def spread_percentage(self) -> Optional[float]:
         """Спред в процентах"""
+        if self.order_book is not None and self.order_book.spread_percentage is not None:
+            return self.order_book.spread_percentage
         if self.bid and self.ask and self.ask > 0:
             spread = self.ask - self.bid
             return float(spread / self.ask * 100)
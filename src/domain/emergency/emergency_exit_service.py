@@ -333,19 +333,9 @@ class EmergencyExitService(IEmergencyExitStrategy):
                 description=f"Emergency exit triggered by {trigger.value}"
             )
 
-            # Исполняем выход для каждой позиции
-            results = []
-
-            for position in positions:
-                try:
-                    result = await self._execute_position_exit(position, action)
-                    if result:
-                        results.append(result)
-                        action.execution_results.append(result)
-
-                except Exception as e:
-                    self.logger.error(f"❌ Ошибка выхода из позиции {position.currency}: {e}")
-                    continue
+            # Исполняем выход по всем позициям одной конкурентной пачкой
+            results = await self._execute_position_exits(positions, action)
+            action.execution_results.extend(results)
 
             # Завершаем действие
             action.executed_at = datetime.now()
@@ -508,6 +498,47 @@ class EmergencyExitService(IEmergencyExitStrategy):
         for condition in default_conditions:
             self.emergency_conditions[condition.id] = condition
 
+    async def _execute_position_exits(
+        self,
+        positions: List[Position],
+        action: EmergencyAction
+    ) -> List[OrderResult]:
+        """🏃 Выход из позиций пачкой: N ордеров за время одного раунда"""
+
+        exits = []
+        for position in positions:
+            try:
+                signal = self._create_exit_signal(position, action)
+                if signal:
+                    exits.append((position, signal))
+            except Exception as e:
+                self.logger.error(f"❌ Ошибка выхода из позиции {position.currency}: {e}")
+
+        if not exits:
+            return []
+
+        if not hasattr(self.trade_executor, 'execute_batch'):
+            # Исполнитель без пакетного API - по одной позиции
+            results = []
+            for position, _ in exits:
+                result = await self._execute_position_exit(position, action)
+                if result:
+                    results.append(result)
+            return results
+
+        results = await self.trade_executor.execute_batch(
+            [signal for _, signal in exits],
+            max_concurrency=self.max_concurrent_exits
+        )
+
+        for (position, signal), result in zip(exits, results):
+            if result.success:
+                self.logger.warning(f"🏃 Аварийный выход из {position.currency}: {signal.quantity}")
+            else:
+                self.logger.error(f"❌ Ошибка выхода из позиции {position.currency}: {result.error_message}")
+
+        return results
+
     async def _execute_position_exit(
         self,
         position: Position,
@@ -516,32 +547,15 @@ class EmergencyExitService(IEmergencyExitStrategy):
         """🏃 Исполнение выхода из позиции"""
 
         try:
-            # Рассчитываем количество для продажи
-            exit_quantity = position.quantity * Decimal(str(action.exit_percentage / 100))
+            emergency_signal = self._create_exit_signal(position, action)
 
-            if exit_quantity <= 0:
+            if emergency_signal is None:
                 return None
 
-            # Получаем цену выхода
-            current_price = Decimal('0.1')  # Заглушка - должна быть получена от market data
-            exit_price = current_price * (Decimal('1') - action.max_slippage)
-
-            # Создаем сигнал для аварийного выхода
-            emergency_signal = TradeSignal(
-                signal_type=StrategySignalType.EMERGENCY_EXIT,
-                pair=TradingPair(position.currency, 'EUR'),
-                quantity=exit_quantity,
-                price=exit_price,
-                confidence=1.0,
-                strategy_name="emergency_exit",
-                reason=action.description,
-                risk_level=RiskLevel.CRITICAL
-            )
-
             # Исполняем через trade executor
             result = await self.trade_executor.execute_signal(emergency_signal)
 
-            self.logger.warning(f"🏃 Аварийный выход из {position.currency}: {exit_quantity}")
+            self.logger.warning(f"🏃 Аварийный выход из {position.currency}: {emergency_signal.quantity}")
 
             return result
 
@@ -549,6 +563,35 @@ class EmergencyExitService(IEmergencyExitStrategy):
             self.logger.error(f"❌ Ошибка выхода из позиции {position.currency}: {e}")
             return None
 
+    def _create_exit_signal(
+        self,
+        position: Position,
+        action: EmergencyAction
+    ) -> Optional[TradeSignal]:
+        """📝 Сигнал аварийного выхода из позиции"""
+
+        # Рассчитываем количество для продажи
+        exit_quantity = position.quantity * Decimal(str(action.exit_percentage / 100))
+
+        if exit_quantity <= 0:
+            return None
+
+        # Получаем цену выхода
+        current_price = Decimal('0.1')  # Заглушка - должна быть получена от market data
+        exit_price = current_price * (Decimal('1') - action.max_slippage)
+
+        # Создаем сигнал для аварийного выхода
+        return TradeSignal(
+            signal_type=StrategySignalType.EMERGENCY_EXIT,
+            pair=TradingPair(position.currency, 'EUR'),
+            quantity=exit_quantity,
+            price=exit_price,
+            confidence=1.0,
+            strategy_name="emergency_exit",
+            reason=action.description,
+            risk_level=RiskLevel.CRITICAL
+        )
+
     async def _update_position_conditions(
         self,
         position: Position,
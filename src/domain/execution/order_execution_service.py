@@ -69,6 +69,7 @@ class ExecutionConfig:
     rate_limit_requests_per_minute: int = 60
     min_order_value_eur: Decimal = Decimal('5.0')
     emergency_stop_enabled: bool = True
+    batch_concurrency: int = 10  # одновременных запросов в execute_batch/cancel_many
 
     def validate(self) -> bool:
         """✅ Валидация конфигурации"""
@@ -76,7 +77,8 @@ class ExecutionConfig:
             self.max_slippage_percent >= 0 and
             self.timeout_seconds > 0 and
             self.retry_attempts >= 0 and
-            self.min_order_value_eur > 0
+            self.min_order_value_eur > 0 and
+            self.batch_concurrency > 0
         )
 
 
@@ -130,11 +132,15 @@ class OrderExecutionService(ITradeExecutor):
     def __init__(
         self,
         exchange_api: Optional[IExchangeAPI] = None,
-        config: Optional[ExecutionConfig] = None
+        config: Optional[ExecutionConfig] = None,
+        order_books: Optional[Any] = None
     ):
         self.exchange_api = exchange_api
         self.config = config or ExecutionConfig()
 
+        # Реестр стаканов (OrderBookRegistry) для оценки цены исполнения без перезапроса
+        self.order_books = order_books
+
         # Очередь запросов
         self.execution_queue: List[ExecutionRequest] = []
         self.active_orders: Dict[str, Dict[str, Any]] = {}
@@ -245,6 +251,76 @@ class OrderExecutionService(ITradeExecutor):
             self.logger.error(f"❌ Ошибка исполнения лимитного ордера: {e}")
             raise OrderExecutionError(f"Limit order failed: {e}")
 
+    async def execute_batch(
+        self,
+        signals: List[TradeSignal],
+        max_concurrency: Optional[int] = None
+    ) -> List[OrderResult]:
+        """📦 Конкурентное исполнение пачки сигналов
+
+        Результаты возвращаются в порядке сигналов; ошибка одного сигнала
+        не прерывает остальные и попадает в его OrderResult.
+        """
+
+        if not signals:
+            return []
+
+        semaphore = asyncio.Semaphore(max_concurrency or self.config.batch_concurrency)
+
+        async def execute_one(signal: TradeSignal) -> OrderResult:
+            async with semaphore:
+                return await self.execute_signal(signal)
+
+        started = datetime.now()
+        outcomes = await asyncio.gather(
+            *(execute_one(signal) for signal in signals),
+            return_exceptions=True
+        )
+
+        results = []
+        for signal, outcome in zip(signals, outcomes):
+            if isinstance(outcome, Exception):
+                self.metrics.failed_executions += 1
+                outcome = self._create_error_result(signal, str(outcome))
+            results.append(outcome)
+
+        successful = sum(1 for result in results if result.success)
+        elapsed = (datetime.now() - started).total_seconds()
+        self.logger.info(f"📦 Пачка из {len(signals)} сигналов: {successful} успешно за {elapsed:.2f}с")
+
+        return results
+
+    async def cancel_many(
+        self,
+        order_ids: List[str],
+        max_concurrency: Optional[int] = None
+    ) -> Dict[str, bool]:
+        """❌ Конкурентная отмена ордеров: order_id -> отменен ли"""
+
+        if not order_ids:
+            return {}
+
+        semaphore = asyncio.Semaphore(max_concurrency or self.config.batch_concurrency)
+
+        async def cancel_one(order_id: str) -> bool:
+            async with semaphore:
+                return await self.cancel_order(order_id)
+
+        outcomes = await asyncio.gather(
+            *(cancel_one(order_id) for order_id in order_ids),
+            return_exceptions=True
+        )
+
+        results = {
+            order_id: outcome is True
+            for order_id, outcome in zip(order_ids, outcomes)
+        }
+
+        cancelled = sum(1 for success in results.values() if success)
+        self.logger.info(f"❌ Отменено {cancelled} из {len(order_ids)} ордеров")
+
+        return results
+
     async def cancel_order(self, order_id: str) -> bool:
         """❌ Отмена ордера"""
 
@@ -263,7 +339,7 @@ class OrderExecutionService(ITradeExecutor):
                     raise RateLimitExceededError("Rate limit exceeded for cancel order")
 
                 # Отменяем через API
-                success = await self.exchange_api.cancel_order(order_id)
+                success = self._is_cancelled(await self.exchange_api.cancel_order(order_id))
 
                 if success and order_id in self.active_orders:
                     del self.active_orders[order_id]
@@ -278,6 +354,17 @@ class OrderExecutionService(ITradeExecutor):
             self.logger.error(f"❌ Ошибка отмены ордера {order_id}: {e}")
             return False
 
+    @staticmethod
+    def _is_cancelled(result: Any) -> bool:
+        """✅ Успех отмены по ответу API
+
+        ExmoAPIClient.cancel_order возвращает словарь {"success": ..., ...},
+        сырой ответ EXMO - {"result": ...}; прочие реализации - bool.
+        """
+        if isinstance(result, dict):
+            return bool(result.get("success", result.get("result", False)))
+        return result is True
+
     async def get_active_orders(self) -> List[Dict[str, Any]]:
         """📋 Получение активных ордеров"""
 
@@ -316,6 +403,8 @@ class OrderExecutionService(ITradeExecutor):
                 if not await self._check_rate_limit():
                     raise RateLimitExceededError("Rate limit exceeded")
 
+                await self._check_market_slippage(signal, "buy")
+
                 # Исполняем через API
                 order_data = await self.exchange_api.create_order(
                     pair=str(signal.pair),
@@ -388,6 +477,8 @@ class OrderExecutionService(ITradeExecutor):
                 if not await self._check_rate_limit():
                     raise RateLimitExceededError("Rate limit exceeded")
 
+                await self._check_market_slippage(signal, "sell")
+
                 order_data = await self.exchange_api.create_order(
                     pair=str(signal.pair),
                     order_type="sell",
@@ -461,12 +552,16 @@ class OrderExecutionService(ITradeExecutor):
 
         signal = request.signal
 
-        # Имитируем получение текущей цены
-        simulated_price = signal.price or Decimal('0.1')  # Заглушка
+        # По стакану цена исполнения уже включает проскальзывание
+        executed_price = await self._estimate_fill_price(signal, "buy")
 
-        # Имитируем небольшой слиппаж
-        slippage = Decimal('0.001')  # 0.1%
-        executed_price = simulated_price * (Decimal('1') + slippage)
+        if executed_price is None:
+            # Имитируем получение текущей цены
+            simulated_price = signal.price or Decimal('0.1')  # Заглушка
+
+            # Имитируем небольшой слиппаж
+            slippage = Decimal('0.001')  # 0.1%
+            executed_price = simulated_price * (Decimal('1') + slippage)
 
         total_cost = signal.quantity * executed_price
         commission = total_cost * Decimal('0.003')  # 0.3% комиссия
@@ -490,12 +585,16 @@ class OrderExecutionService(ITradeExecutor):
 
         signal = request.signal
 
-        # Имитируем получение текущей цены
-        simulated_price = signal.price or Decimal('0.1')  # Заглушка
+        # По стакану цена исполнения уже включает проскальзывание
+        executed_price = await self._estimate_fill_price(signal, "sell")
+
+        if executed_price is None:
+            # Имитируем получение текущей цены
+            simulated_price = signal.price or Decimal('0.1')  # Заглушка
 
-        # Имитируем небольшой слиппаж (для продажи в минус)
-        slippage = Decimal('0.001')  # 0.1%
-        executed_price = simulated_price * (Decimal('1') - slippage)
+            # Имитируем небольшой слиппаж (для продажи в минус)
+            slippage = Decimal('0.001')  # 0.1%
+            executed_price = simulated_price * (Decimal('1') - slippage)
 
         total_cost = signal.quantity * executed_price
         commission = total_cost * Decimal('0.003')  # 0.3% комиссия
@@ -539,6 +638,47 @@ class OrderExecutionService(ITradeExecutor):
 
     # ================= ВСПОМОГАТЕЛЬНЫЕ МЕТОДЫ =================
 
+    async def _estimate_fill_price(self, signal: TradeSignal, order_type: str) -> Optional[Decimal]:
+        """📖 VWAP исполнения объема сигнала по живому стакану"""
+
+        if self.order_books is None:
+            return None
+
+        try:
+            book = await self.order_books.get_fresh_book(str(signal.pair))
+            return book.vwap_to_fill(order_type, signal.quantity)
+        except Exception as e:
+            self.logger.warning(f"⚠️ Не удалось оценить цену по стакану {signal.pair}: {e}")
+            return None
+
+    async def _check_market_slippage(self, signal: TradeSignal, order_type: str) -> None:
+        """📉 Проверка ожидаемого слиппажа рыночного ордера по стакану"""
+
+        if self.order_books is None:
+            return
+
+        book = await self.order_books.get_fresh_book(str(signal.pair))
+        best_price = book.best_ask if order_type == "buy" else book.best_bid
+        estimate = book.estimate_fill(order_type, signal.quantity)
+
+        if best_price is None or estimate.vwap is None:
+            return
+
+        if not estimate.fully_filled:
+            raise OrderExecutionError(
+                f"Недостаточно ликвидности в стакане {signal.pair}: "
+                f"{estimate.filled_quantity} из {signal.quantity}"
+            )
+
+        slippage_percent = abs(estimate.vwap - best_price) / best_price * 100
+        if slippage_percent > self.config.max_slippage_percent:
+            raise OrderExecutionError(
+                f"Ожидаемый слиппаж {slippage_percent:.3f}% превышает "
+                f"{self.config.max_slippage_percent}%"
+            )
+
+        self.metrics.total_slippage += slippage_percent
+
     def _validate_signal(self, signal: TradeSignal) -> None:
         """✅ Валидация торгового сигнала"""
 
@@ -710,7 +850,8 @@ class OrderExecutionService(ITradeExecutor):
                 'max_slippage_percent': float(self.config.max_slippage_percent),
                 'timeout_seconds': self.config.timeout_seconds,
                 'min_order_value_eur': float(self.config.min_order_value_eur),
-                'rate_limit_per_minute': self.config.rate_limit_requests_per_minute
+                'rate_limit_per_minute': self.config.rate_limit_requests_per_minute,
+                'batch_concurrency': self.config.batch_concurrency
             },
             'active_orders_count': len(self.active_orders),
             'queue_size': len(self.execution_queue)
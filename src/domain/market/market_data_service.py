@@ -1,8 +1,8 @@
-from typing import Optional, List, Dict, Any, AsyncIterator
+from typing import Optional, List, Dict, Any, AsyncIterator, Tuple
 from decimal import Decimal
 from datetime import datetime, timedelta
 import logging
-from dataclasses import dataclass, field
+from dataclasses import dataclass, field, replace
 from enum import Enum
 import asyncio
 
@@ -32,6 +32,9 @@ except ImportError:
     def publish_event(event): pass
     def get_current_config(): return None
 
+from ...core.cache.revalidation import StaleWhileRevalidate, FreshnessState, Freshness
+from ...core.cache.tiered_cache import TieredCache, get_shared_cache, pair_tag
+
 
 # ================= ТИПЫ ДАННЫХ =================
 
@@ -96,6 +99,11 @@ class CachedMarketData:
         """Возраст данных в секундах"""
         return (datetime.now() - self.cached_at).total_seconds()
 
+    @property
+    def ttl_seconds(self) -> float:
+        """TTL записи в секундах"""
+        return (self.expires_at - self.cached_at).total_seconds()
+
 
 # ================= ОСНОВНОЙ СЕРВИС =================
 
@@ -106,18 +114,43 @@ class MarketDataService(IMarketDataProvider):
         self,
         exchange_provider: Optional[IMarketDataProvider] = None,
         cache_ttl_seconds: int = 60,
-        max_cache_size: int = 1000
+        max_cache_size: int = 1000,
+        price_feed: Optional[Any] = None,
+        order_books: Optional[Any] = None,
+        stale_grace_seconds: float = 30.0,
+        refresh_ahead_ratio: float = 0.8,
+        cache: Optional[TieredCache] = None
     ):
         self.exchange_provider = exchange_provider
         self.cache_ttl = timedelta(seconds=cache_ttl_seconds)
         self.max_cache_size = max_cache_size
 
-        # Кэш данных
-        self.cache: Dict[str, CachedMarketData] = {}
+        # Пространство общего кэша: записи пары помечены тегом pair:<пара>
+        self.cache = (cache or get_shared_cache()).namespace("market_data", ttl=cache_ttl_seconds)
+
+        # Stale-while-revalidate: просроченные данные отдаются в окне grace,
+        # горячие пары обновляются в фоне до истечения TTL
+        self.revalidation = StaleWhileRevalidate(
+            grace_seconds=stale_grace_seconds,
+            refresh_ahead_ratio=refresh_ahead_ratio,
+            name="market_data"
+        )
+        self.freshness: Dict[str, Freshness] = {}
+        # Инвалидация по тегу отменяет и начатые фоновые обновления
+        self.cache.add_invalidation_listener(self.revalidation.invalidate)
 
         # Подписки на обновления
         self.price_subscriptions: Dict[str, List[callable]] = {}
 
+        # Push-поток цен (ExmoPriceStream): тики сразу уходят подписчикам
+        self.price_feed = price_feed
+        self.last_ticks: Dict[str, Any] = {}
+        if price_feed is not None:
+            price_feed.add_listener(self._on_price_tick)
+
+        # Реестр стаканов (OrderBookRegistry): mid/spread берутся из живого стакана
+        self.order_books = order_books
+
         # Метрики
         self.metrics = MarketDataMetrics()
 
@@ -131,36 +164,59 @@ class MarketDataService(IMarketDataProvider):
     async def get_market_data(self, pair: str) -> MarketData:
         """📈 Получение рыночных данных"""
 
+        market_data, _ = await self.get_market_data_with_freshness(pair)
+        return market_data
+
+    async def get_market_data_with_freshness(self, pair: str) -> Tuple[MarketData, Freshness]:
+        """📈 Рыночные данные и их свежесть (возраст, источник, идет ли обновление)"""
+
         try:
             self.metrics.total_requests += 1
             start_time = datetime.now()
 
             # Проверяем кэш
             cached_data = await self._get_from_cache(pair)
-            if cached_data and not cached_data.is_expired:
-                self.metrics.cache_hits += 1
-                cached_data.access_count += 1
-
-                self.logger.debug(f"📊 Данные из кэша для {pair}")
-                return cached_data.data
+            if cached_data:
+                state = self.revalidation.decide(pair, cached_data.age_seconds, cached_data.ttl_seconds)
+
+                # Заглушку не отдаем после TTL - и не обновляем без провайдера
+                can_revalidate = self.exchange_provider is not None and cached_data.source != DataSource.FALLBACK
+                if state is FreshnessState.FRESH or (
+                    can_revalidate and state in (FreshnessState.REFRESH_AHEAD, FreshnessState.STALE)
+                ):
+                    self.metrics.cache_hits += 1
+                    cached_data.access_count += 1
+
+                    if can_revalidate:
+                        self.revalidation.serve(
+                            pair, state,
+                            lambda: self._fetch_from_exchange(pair),
+                            lambda data: self._cache_data(pair, data, DataSource.EXCHANGE_API)
+                        )
+
+                    self.logger.debug(f"📊 Данные из кэша для {pair} ({state.value})")
+                    freshness = self._record_freshness(pair, state, DataSource.CACHED, cached_data)
+                    return self._attach_order_book(pair, cached_data.data), freshness
 
             self.metrics.cache_misses += 1
 
             # Получаем данные из внешнего источника
             if self.exchange_provider:
                 try:
-                    self.metrics.api_calls += 1
-                    market_data = await self.exchange_provider.get_market_data(pair)
-
-                    # Кэшируем данные
-                    await self._cache_data(pair, market_data, DataSource.EXCHANGE_API)
+                    # Одновременные промахи по паре ждут один запрос
+                    market_data = await self.revalidation.fetch(
+                        pair,
+                        lambda: self._fetch_from_exchange(pair),
+                        lambda data: self._cache_data(pair, data, DataSource.EXCHANGE_API)
+                    )
 
                     # Обновляем метрики
                     response_time = (datetime.now() - start_time).total_seconds()
                     self._update_response_time(response_time)
 
                     self.logger.debug(f"📊 Данные из API для {pair}")
-                    return market_data
+                    freshness = self._record_freshness(pair, FreshnessState.FRESH, DataSource.EXCHANGE_API)
+                    return self._attach_order_book(pair, market_data), freshness
 
                 except Exception as e:
                     self.logger.warning(f"⚠️ Ошибка получения данных из API для {pair}: {e}")
@@ -169,20 +225,26 @@ class MarketDataService(IMarketDataProvider):
             # Пытаемся использовать устаревшие кэшированные данные
             if cached_data:
                 self.logger.warning(f"⚠️ Используем устаревшие данные для {pair}")
-                return cached_data.data
+                freshness = self._record_freshness(pair, FreshnessState.EXPIRED, DataSource.CACHED, cached_data)
+                return cached_data.data, freshness
 
             # Создаем заглушку если ничего нет
             fallback_data = await self._create_fallback_data(pair)
             await self._cache_data(pair, fallback_data, DataSource.FALLBACK)
 
             self.logger.warning(f"⚠️ Используем fallback данные для {pair}")
-            return fallback_data
+            freshness = self._record_freshness(pair, FreshnessState.FRESH, DataSource.FALLBACK)
+            return fallback_data, freshness
 
         except Exception as e:
             self.metrics.failed_requests += 1
             self.logger.error(f"❌ Ошибка получения рыночных данных для {pair}: {e}")
             raise DataError(f"Не удалось получить данные для {pair}: {e}") from e
 
+    def get_freshness(self, pair: str) -> Optional[Freshness]:
+        """🕒 Свежесть последних отданных данных по паре"""
+        return self.freshness.get(pair)
+
     async def get_historical_data(
         self,
         pair: str,
@@ -235,7 +297,12 @@ class MarketDataService(IMarketDataProvider):
             if pair not in self.price_subscriptions:
                 self.price_subscriptions[pair] = []
 
-            self.price_subscriptions[pair].append(callback)
+            # Повторная подписка того же callback не дублирует уведомления
+            if callback not in self.price_subscriptions[pair]:
+                self.price_subscriptions[pair].append(callback)
+
+            if self.price_feed is not None:
+                await self.price_feed.subscribe(pair)
 
             self.logger.info(f"🔔 Подписка на обновления {pair} создана")
 
@@ -246,7 +313,11 @@ class MarketDataService(IMarketDataProvider):
         """🌊 Поток цен в реальном времени"""
 
         try:
-            if self.exchange_provider and hasattr(self.exchange_provider, 'get_price_stream'):
+            if self.price_feed is not None:
+                # Кэш и подписчики обновляются слушателем потока
+                async for price in self.price_feed.get_price_stream(pair):
+                    yield price
+            elif self.exchange_provider and hasattr(self.exchange_provider, 'get_price_stream'):
                 async for price in self.exchange_provider.get_price_stream(pair):
                     # Кэшируем цену
                     await self._cache_price(pair, price)
@@ -271,13 +342,32 @@ class MarketDataService(IMarketDataProvider):
 
     # ================= КЭШИРОВАНИЕ =================
 
+    async def _fetch_from_exchange(self, pair: str) -> MarketData:
+        """📡 Запрос к бирже (блокирующий или фоновый)"""
+        self.metrics.api_calls += 1
+        return await self.exchange_provider.get_market_data(pair)
+
+    def _record_freshness(
+        self,
+        pair: str,
+        state: FreshnessState,
+        source: DataSource,
+        cached_data: Optional[CachedMarketData] = None
+    ) -> Freshness:
+        """🕒 Свежесть отданных данных"""
+        if cached_data is not None:
+            age, ttl = cached_data.age_seconds, cached_data.ttl_seconds
+        else:
+            age, ttl = 0.0, self.cache_ttl.total_seconds()
+        freshness = self.revalidation.freshness(pair, state, source.value, age, ttl)
+        self.freshness[pair] = freshness
+        return freshness
+
     async def _get_from_cache(self, key: str) -> Optional[CachedMarketData]:
         """📖 Получение из кэша"""
 
         try:
-            if key in self.cache:
-                return self.cache[key]
-            return None
+            return await self.cache.get(key)
 
         except Exception as e:
             self.logger.error(f"❌ Ошибка чтения кэша для {key}: {e}")
@@ -287,7 +377,8 @@ class MarketDataService(IMarketDataProvider):
         self,
         pair: str,
         data: MarketData,
-        source: DataSource
+        source: DataSource,
+        tag_pair: Optional[str] = None
     ) -> None:
         """💾 Кэширование данных"""
 
@@ -307,8 +398,12 @@ class MarketDataService(IMarketDataProvider):
             # Проверяем размер кэша
             await self._ensure_cache_size()
 
-            # Сохраняем в кэш
-            self.cache[pair] = cached_data
+            # Сохраняем в кэш: запись живет еще окно grace после TTL
+            await self.cache.set(
+                pair, cached_data,
+                ttl=self.cache_ttl.total_seconds() + self.revalidation.grace_seconds,
+                tags=[pair_tag(tag_pair or pair)]
+            )
 
         except Exception as e:
             self.logger.error(f"❌ Ошибка кэширования данных для {pair}: {e}")
@@ -331,25 +426,39 @@ class MarketDataService(IMarketDataProvider):
             )
 
             await self._ensure_cache_size()
-            self.cache[key] = cached_data
+            await self.cache.set(key, cached_data, ttl=ttl.total_seconds())
 
         except Exception as e:
             self.logger.error(f"❌ Ошибка кэширования исторических данных: {e}")
 
-    async def _cache_price(self, pair: str, price: Price) -> None:
-        """💰 Кэширование цены"""
+    async def _cache_price(
+        self,
+        pair: str,
+        price: Price,
+        bid: Optional[Decimal] = None,
+        ask: Optional[Decimal] = None,
+        timestamp: Optional[datetime] = None
+    ) -> None:
+        """💰 Кэширование цены в запись пары, которую читает get_market_data"""
 
         try:
-            price_key = f"{pair}_price"
+            cached = await self._get_from_cache(pair)
+            if cached is not None and cached.source != DataSource.FALLBACK:
+                # Объем и суточные поля остаются из последнего ответа API
+                market_data = replace(cached.data, current_price=price, timestamp=timestamp or datetime.now())
+            else:
+                market_data = MarketData(
+                    pair=TradingPair.from_string(pair),
+                    current_price=price,
+                    timestamp=timestamp or datetime.now()
+                )
 
-            # Создаем минимальные market data только с ценой
-            market_data = MarketData(
-                pair=TradingPair.from_string(pair),
-                price=price,
-                timestamp=price.timestamp
-            )
+            if bid is not None and ask is not None:
+                market_data.bid = bid
+                market_data.ask = ask
+                market_data.spread = ask - bid
 
-            await self._cache_data(price_key, market_data, DataSource.EXCHANGE_API)
+            await self._cache_data(pair, market_data, DataSource.EXCHANGE_API)
 
         except Exception as e:
             self.logger.error(f"❌ Ошибка кэширования цены для {pair}: {e}")
@@ -361,7 +470,7 @@ class MarketDataService(IMarketDataProvider):
             if len(self.cache) >= self.max_cache_size:
                 # Удаляем самые старые записи
                 sorted_items = sorted(
-                    self.cache.items(),
+                    await self.cache.items(),
                     key=lambda x: x[1].cached_at
                 )
 
@@ -369,7 +478,7 @@ class MarketDataService(IMarketDataProvider):
                 items_to_remove = len(sorted_items) // 5
                 for i in range(items_to_remove):
                     key_to_remove = sorted_items[i][0]
-                    del self.cache[key_to_remove]
+                    await self.cache.delete(key_to_remove)
 
                 self.logger.debug(f"🧹 Очищен кэш: удалено {items_to_remove} записей")
 
@@ -446,6 +555,23 @@ class MarketDataService(IMarketDataProvider):
         except Exception as e:
             self.logger.error(f"❌ Ошибка уведомления подписчиков для {pair}: {e}")
 
+    def _attach_order_book(self, pair: str, market_data: MarketData) -> MarketData:
+        """📖 Привязка живого стакана к рыночным данным"""
+
+        if self.order_books is not None and pair in self.order_books.books:
+            market_data.order_book = self.order_books.books[pair]
+        return market_data
+
+    async def _on_price_tick(self, tick: Any) -> None:
+        """📍 Тик из push-потока: обновляем кэш пары и уведомляем подписчиков"""
+
+        self.last_ticks[tick.pair] = tick
+        self.metrics.last_update = datetime.now()
+
+        await self._cache_price(tick.pair, tick.price, tick.bid, tick.ask, tick.timestamp)
+
+        await self._notify_price_subscribers(tick.pair, tick.price)
+
     def _update_response_time(self, response_time: float) -> None:
         """⏱️ Обновление среднего времени ответа"""
 
@@ -466,7 +592,9 @@ class MarketDataService(IMarketDataProvider):
 
         try:
             cleared_items = len(self.cache)
-            self.cache.clear()
+            await self.cache.clear()
+            self.freshness.clear()
+            self.revalidation.invalidate_all()
 
             self.logger.info(f"🧹 Кэш очищен: удалено {cleared_items} записей")
 
@@ -477,13 +605,14 @@ class MarketDataService(IMarketDataProvider):
         """📊 Статистика кэша"""
 
         try:
-            total_items = len(self.cache)
-            expired_items = sum(1 for item in self.cache.values() if item.is_expired)
+            cached_items = [cached_data for _, cached_data in await self.cache.items()]
+            total_items = len(cached_items)
+            expired_items = sum(1 for item in cached_items if item.is_expired)
 
             quality_stats = {}
             source_stats = {}
 
-            for cached_data in self.cache.values():
+            for cached_data in cached_items:
                 # Статистика по качеству
                 quality = cached_data.quality.value
                 quality_stats[quality] = quality_stats.get(quality, 0) + 1
@@ -518,7 +647,8 @@ class MarketDataService(IMarketDataProvider):
             'cache': {
                 'hits': self.metrics.cache_hits,
                 'misses': self.metrics.cache_misses,
-                'hit_rate': self.metrics.cache_hit_rate
+                'hit_rate': self.metrics.cache_hit_rate,
+                'namespace': self.cache.get_stats()
             },
             'api': {
                 'calls': self.metrics.api_calls,
@@ -528,6 +658,8 @@ class MarketDataService(IMarketDataProvider):
                 'active_pairs': len(self.price_subscriptions),
                 'total_subscribers': sum(len(subs) for subs in self.price_subscriptions.values())
             },
+            'revalidation': self.revalidation.get_status(),
+            'stream': self.price_feed.get_status() if self.price_feed is not None else None,
             'last_update': self.metrics.last_update.isoformat() if self.metrics.last_update else None
         }
 
@@ -535,13 +667,15 @@ class MarketDataService(IMarketDataProvider):
         """🧹 Очистка истекших записей кэша"""
 
         try:
+            # Записи в окне grace еще отдаются, пока идет фоновое обновление
+            grace = self.revalidation.grace_seconds
             expired_keys = [
-                key for key, cached_data in self.cache.items()
-                if cached_data.is_expired
+                key for key, cached_data in await self.cache.items()
+                if cached_data.age_seconds > cached_data.ttl_seconds + grace
             ]
 
             for key in expired_keys:
-                del self.cache[key]
+                await self.cache.delete(key)
 
             if expired_keys:
                 self.logger.debug(f"🧹 Удалено {len(expired_keys)} истекших записей")
@@ -0,0 +1,367 @@
+from bisect import bisect_left, bisect_right, insort
+from decimal import Decimal, InvalidOperation
+from typing import Optional, List, Dict, Any, Tuple, Iterable, Iterator
+import time
+import logging
+from dataclasses import dataclass
+from enum import Enum
+
+
+# ================= ТИПЫ ДАННЫХ =================
+
+class BookSide(Enum):
+    """📗📕 Сторона стакана"""
+    BID = "bid"
+    ASK = "ask"
+
+
+Level = Tuple[Decimal, Decimal]  # (цена, количество)
+
+
+@dataclass
+class FillEstimate:
+    """🧮 Оценка исполнения заданного объема по стакану"""
+    requested_quantity: Decimal
+    filled_quantity: Decimal
+    total_cost: Decimal
+    vwap: Optional[Decimal]
+    worst_price: Optional[Decimal]
+    levels_consumed: int
+
+    @property
+    def fully_filled(self) -> bool:
+        """Хватает ли ликвидности на весь объем"""
+        return self.filled_quantity >= self.requested_quantity
+
+
+@dataclass
+class OrderBookStats:
+    """📊 Статистика обновлений стакана"""
+    snapshots: int = 0
+    diffs: int = 0
+    level_updates: int = 0
+    sequence_gaps: int = 0
+    last_update: Optional[float] = None
+
+
+class OrderBookSide:
+    """📚 Одна сторона стакана: отсортированный массив цен + количества по цене"""
+
+    def __init__(self, side: BookSide):
+        self.side = side
+        # Цены всегда по возрастанию: лучший bid в конце, лучший ask в начале
+        self._prices: List[Decimal] = []
+        self._quantities: Dict[Decimal, Decimal] = {}
+
+    def __len__(self) -> int:
+        return len(self._prices)
+
+    def clear(self) -> None:
+        self._prices.clear()
+        self._quantities.clear()
+
+    def load(self, levels: Iterable[Level]) -> None:
+        """Полная загрузка стороны из снимка"""
+        self._quantities = {price: quantity for price, quantity in levels if quantity > 0}
+        self._prices = sorted(self._quantities)
+
+    def update(self, price: Decimal, quantity: Decimal) -> None:
+        """Обновление уровня: quantity == 0 удаляет уровень"""
+        if quantity <= 0:
+            if self._quantities.pop(price, None) is not None:
+                index = bisect_left(self._prices, price)
+                del self._prices[index]
+            return
+
+        if price not in self._quantities:
+            insort(self._prices, price)
+        self._quantities[price] = quantity
+
+    @property
+    def best(self) -> Optional[Level]:
+        """Лучший уровень за O(1)"""
+        if not self._prices:
+            return None
+        price = self._prices[-1] if self.side is BookSide.BID else self._prices[0]
+        return price, self._quantities[price]
+
+    def quantity_at(self, price: Decimal) -> Decimal:
+        """Количество на уровне цены"""
+        return self._quantities.get(price, Decimal('0'))
+
+    def rank_of(self, price: Decimal) -> int:
+        """Позиция цены от лучшего уровня за O(log n) (0 - лучший)"""
+        index = bisect_left(self._prices, price)
+        if self.side is BookSide.ASK:
+            return index
+        # Для bid считаем от конца массива
+        if index < len(self._prices) and self._prices[index] == price:
+            return len(self._prices) - 1 - index
+        return len(self._prices) - index
+
+    def levels(self, limit: Optional[int] = None) -> Iterator[Level]:
+        """Уровни от лучшего к худшему"""
+        prices = reversed(self._prices) if self.side is BookSide.BID else iter(self._prices)
+        for count, price in enumerate(prices):
+            if limit is not None and count >= limit:
+                return
+            yield price, self._quantities[price]
+
+    def volume_to_price(self, price: Decimal) -> Decimal:
+        """Суммарный объем от лучшего уровня до цены включительно"""
+        if self.side is BookSide.ASK:
+            prices = self._prices[:bisect_right(self._prices, price)]
+        else:
+            prices = self._prices[bisect_left(self._prices, price):]
+        return sum((self._quantities[p] for p in prices), Decimal('0'))
+
+
+# ================= СТАКАН =================
+
+class OrderBook:
+    """📖 Инкрементально поддерживаемый стакан пары"""
+
+    def __init__(self, pair: str):
+        self.pair = pair
+        self.bids = OrderBookSide(BookSide.BID)
+        self.asks = OrderBookSide(BookSide.ASK)
+
+        self.sequence: Optional[int] = None
+        self.stats = OrderBookStats()
+
+        self.logger = logging.getLogger(__name__)
+
+    # ================= ОБНОВЛЕНИЕ =================
+
+    def apply_snapshot(
+        self,
+        bids: Iterable[Level],
+        asks: Iterable[Level],
+        sequence: Optional[int] = None
+    ) -> None:
+        """📸 Полная замена содержимого стакана"""
+        self.bids.load(bids)
+        self.asks.load(asks)
+
+        self.sequence = sequence
+        self.stats.snapshots += 1
+        self.stats.last_update = time.monotonic()
+
+    def apply_diff(
+        self,
+        bids: Iterable[Level] = (),
+        asks: Iterable[Level] = (),
+        sequence: Optional[int] = None
+    ) -> bool:
+        """🔄 Применение изменений уровней; False - разрыв, нужен новый снимок"""
+        if sequence is not None and self.sequence is not None:
+            if sequence <= self.sequence:
+                return True
+            if sequence != self.sequence + 1:
+                self.stats.sequence_gaps += 1
+                self.logger.warning(f"⚠️ Разрыв последовательности стакана {self.pair}: "
+                                    f"{self.sequence} -> {sequence}")
+                return False
+
+        updates = 0
+        for price, quantity in bids:
+            self.bids.update(price, quantity)
+            updates += 1
+        for price, quantity in asks:
+            self.asks.update(price, quantity)
+            updates += 1
+
+        if sequence is not None:
+            self.sequence = sequence
+        self.stats.diffs += 1
+        self.stats.level_updates += updates
+        self.stats.last_update = time.monotonic()
+        return True
+
+    # ================= ЗАПРОСЫ =================
+
+    @property
+    def best_bid(self) -> Optional[Decimal]:
+        """Лучшая цена покупки"""
+        best = self.bids.best
+        return best[0] if best else None
+
+    @property
+    def best_ask(self) -> Optional[Decimal]:
+        """Лучшая цена продажи"""
+        best = self.asks.best
+        return best[0] if best else None
+
+    @property
+    def mid_price(self) -> Optional[Decimal]:
+        """Средняя цена между лучшими bid и ask"""
+        bid, ask = self.best_bid, self.best_ask
+        if bid and ask:
+            return (bid + ask) / Decimal('2')
+        return None
+
+    @property
+    def spread(self) -> Optional[Decimal]:
+        """Абсолютный спред"""
+        bid, ask = self.best_bid, self.best_ask
+        if bid and ask:
+            return ask - bid
+        return None
+
+    @property
+    def spread_percentage(self) -> Optional[float]:
+        """Спред в процентах от ask"""
+        bid, ask = self.best_bid, self.best_ask
+        if bid and ask and ask > 0:
+            return float((ask - bid) / ask * 100)
+        return None
+
+    @property
+    def age_seconds(self) -> Optional[float]:
+        """Возраст последнего обновления"""
+        if self.stats.last_update is None:
+            return None
+        return time.monotonic() - self.stats.last_update
+
+    @property
+    def is_empty(self) -> bool:
+        return not self.bids and not self.asks
+
+    def side_for(self, order_type: str) -> OrderBookSide:
+        """Сторона, которую съедает ордер: покупка - asks, продажа - bids"""
+        return self.asks if order_type.lower() == "buy" else self.bids
+
+    def estimate_fill(self, order_type: str, quantity: Decimal) -> FillEstimate:
+        """🧮 VWAP и худшая цена для исполнения объема по рынку"""
+        remaining = quantity
+        total_cost = Decimal('0')
+        worst_price = None
+        consumed = 0
+
+        for price, level_quantity in self.side_for(order_type).levels():
+            if remaining <= 0:
+                break
+            take = min(remaining, level_quantity)
+            total_cost += take * price
+            remaining -= take
+            worst_price = price
+            consumed += 1
+
+        filled = quantity - remaining
+        return FillEstimate(
+            requested_quantity=quantity,
+            filled_quantity=filled,
+            total_cost=total_cost,
+            vwap=(total_cost / filled) if filled > 0 else None,
+            worst_price=worst_price,
+            levels_consumed=consumed
+        )
+
+    def vwap_to_fill(self, order_type: str, quantity: Decimal) -> Optional[Decimal]:
+        """Средневзвешенная цена исполнения объема (None - не хватает ликвидности)"""
+        estimate = self.estimate_fill(order_type, quantity)
+        return estimate.vwap if estimate.fully_filled else None
+
+    def depth(self, limit: int = 10) -> Dict[str, List[Level]]:
+        """Верхние уровни обеих сторон"""
+        return {
+            "bid": list(self.bids.levels(limit)),
+            "ask": list(self.asks.levels(limit))
+        }
+
+    def get_status(self) -> Dict[str, Any]:
+        """📊 Статус стакана"""
+        return {
+            "pair": self.pair,
+            "bid_levels": len(self.bids),
+            "ask_levels": len(self.asks),
+            "best_bid": str(self.best_bid) if self.best_bid is not None else None,
+            "best_ask": str(self.best_ask) if self.best_ask is not None else None,
+            "spread_percentage": self.spread_percentage,
+            "sequence": self.sequence,
+            "age_seconds": self.age_seconds,
+            "snapshots": self.stats.snapshots,
+            "diffs": self.stats.diffs,
+            "level_updates": self.stats.level_updates,
+            "sequence_gaps": self.stats.sequence_gaps
+        }
+
+
+def parse_levels(raw_levels: Iterable[Iterable[Any]]) -> List[Level]:
+    """Разбор уровней EXMO: [[price, quantity, amount], ...]"""
+    levels = []
+    for raw in raw_levels or ():
+        try:
+            levels.append((Decimal(str(raw[0])), Decimal(str(raw[1]))))
+        except (IndexError, InvalidOperation):
+            continue
+    return levels
+
+
+# ================= РЕЕСТР СТАКАНОВ =================
+
+class OrderBookRegistry:
+    """🗂️ Стаканы по парам: снимки из REST, изменения из потока"""
+
+    def __init__(self, exchange_api: Optional[Any] = None, max_age_seconds: float = 5.0, depth: int = 100):
+        self.exchange_api = exchange_api
+        self.max_age_seconds = max_age_seconds
+        self.depth = depth
+
+        self.books: Dict[str, OrderBook] = {}
+
+        self.logger = logging.getLogger(__name__)
+
+    def get_book(self, pair: str) -> OrderBook:
+        """Стакан пары (создается пустым при первом обращении)"""
+        book = self.books.get(pair)
+        if book is None:
+            book = self.books[pair] = OrderBook(pair)
+        return book
+
+    async def get_fresh_book(self, pair: str) -> OrderBook:
+        """📖 Стакан не старше max_age_seconds; иначе берется снимок из REST"""
+        book = self.get_book(pair)
+        age = book.age_seconds
+
+        if self.exchange_api is not None and (age is None or age > self.max_age_seconds):
+            await self.refresh(pair)
+
+        return book
+
+    async def refresh(self, pair: str) -> OrderBook:
+        """📸 Снимок стакана через ExmoAPIClient.get_order_book"""
+        payload = await self.exchange_api.get_order_book(pair, limit=self.depth)
+        return self.apply_exmo_snapshot(pair, (payload or {}).get(pair, {}))
+
+    def apply_exmo_snapshot(self, pair: str, data: Dict[str, Any], sequence: Optional[int] = None) -> OrderBook:
+        """Снимок в формате order_book EXMO"""
+        book = self.get_book(pair)
+        book.apply_snapshot(parse_levels(data.get("bid")), parse_levels(data.get("ask")), sequence)
+        return book
+
+    def apply_stream_message(self, message: Dict[str, Any]) -> Optional[OrderBook]:
+        """🌊 Сообщение канала spot/order_book_updates (snapshot или update)"""
+        topic = message.get("topic", "")
+        if ":" not in topic:
+            return None
+
+        pair = topic.split(":", 1)[1]
+        data = message.get("data") or {}
+        sequence = message.get("seq")
+
+        if message.get("event") == "snapshot":
+            return self.apply_exmo_snapshot(pair, data, sequence)
+
+        if message.get("event") == "update":
+            book = self.get_book(pair)
+            if not book.apply_diff(parse_levels(data.get("bid")), parse_levels(data.get("ask")), sequence):
+                # Стакан после разрыва недостоверен - помечаем для нового снимка
+                book.stats.last_update = None
+            return book
+
+        return None
+
+    def get_status(self) -> Dict[str, Any]:
+        """📊 Статус всех стаканов"""
+        return {pair: book.get_status() for pair, book in self.books.items()}
@@ -31,6 +31,9 @@ except ImportError:
     def publish_event(event): pass
     def get_current_config(): return None
 
+from ...core.cache.revalidation import StaleWhileRevalidate, FreshnessState, Freshness
+from ...core.cache.tiered_cache import TieredCache, get_shared_cache, trade_invalidation_tags, BALANCE_TAG
+
 
 # ================= ТИПЫ БАЛАНСОВ =================
 
@@ -137,13 +140,31 @@ class BalanceService:
     def __init__(
         self,
         exchange_api: Optional[IExchangeAPI] = None,
-        cache_ttl_seconds: int = 30
+        cache_ttl_seconds: int = 30,
+        stale_grace_seconds: float = 10.0,
+        refresh_ahead_ratio: float = 0.8,
+        cache: Optional[TieredCache] = None
     ):
         self.exchange_api = exchange_api
         self.cache_ttl = timedelta(seconds=cache_ttl_seconds)
 
-        # Кэш балансов
-        self.balance_cache: Dict[str, Tuple[datetime, BalanceInfo]] = {}
+        # Кэш балансов - пространство общего кэша, записи (время, BalanceInfo)
+        # с тегом balance живут еще окно grace после TTL
+        self.balance_cache = (cache or get_shared_cache()).namespace(
+            "balance", ttl=cache_ttl_seconds + stale_grace_seconds
+        )
+
+        # Stale-while-revalidate: после сделки и резервирования запись
+        # инвалидируется, поэтому в окне grace отдается только баланс,
+        # который бот сам не менял
+        self.revalidation = StaleWhileRevalidate(
+            grace_seconds=stale_grace_seconds,
+            refresh_ahead_ratio=refresh_ahead_ratio,
+            name="balance"
+        )
+        self.freshness: Dict[str, Freshness] = {}
+        # Сделка в любом слое инвалидирует тег balance - и начатые обновления
+        self.balance_cache.add_invalidation_listener(self.revalidation.invalidate)
 
         # Резервирования
         self.reservations: Dict[str, BalanceReservation] = {}
@@ -171,30 +192,53 @@ class BalanceService:
     async def get_balance(self, currency: str) -> BalanceInfo:
         """💰 Получение баланса валюты"""
 
+        balance, _ = await self.get_balance_with_freshness(currency)
+        return balance
+
+    async def get_balance_with_freshness(self, currency: str) -> Tuple[BalanceInfo, Freshness]:
+        """💰 Баланс валюты и его свежесть (возраст, источник, идет ли обновление)"""
+
         try:
             currency = currency.upper()
+            ttl = self.cache_ttl.total_seconds()
 
             # Проверяем кэш
-            if currency in self.balance_cache:
-                cached_time, cached_balance = self.balance_cache[currency]
-                if datetime.now() - cached_time < self.cache_ttl:
-                    return cached_balance
-
-            # Получаем актуальный баланс
-            balance = await self._fetch_balance(currency)
-
-            # Применяем резервирования
-            balance = await self._apply_reservations(balance)
-
-            # Кэшируем
-            self.balance_cache[currency] = (datetime.now(), balance)
+            cached = await self.balance_cache.get(currency)
+            if cached is not None:
+                cached_time, cached_balance = cached
+                age = (datetime.now() - cached_time).total_seconds()
+                state = self.revalidation.decide(currency, age, ttl)
+
+                if state is not FreshnessState.EXPIRED:
+                    self.revalidation.serve(
+                        currency, state,
+                        lambda: self._load_balance(currency),
+                        lambda balance: self._store_balance(currency, balance)
+                    )
+                    freshness = self.revalidation.freshness(currency, state, "cached", age, ttl)
+                    self.freshness[currency] = freshness
+                    return cached_balance, freshness
+
+            # Получаем актуальный баланс; параллельные запросы валюты ждут один
+            balance = await self.revalidation.fetch(
+                currency,
+                lambda: self._load_balance(currency),
+                lambda balance: self._store_balance(currency, balance)
+            )
 
-            return balance
+            source = "exchange_api" if self.exchange_api else "fallback"
+            freshness = self.revalidation.freshness(currency, FreshnessState.FRESH, source, 0.0, ttl)
+            self.freshness[currency] = freshness
+            return balance, freshness
 
         except Exception as e:
             self.logger.error(f"❌ Ошибка получения баланса {currency}: {e}")
             raise DataError(f"Failed to get balance for {currency}: {e}")
 
+    def get_freshness(self, currency: str) -> Optional[Freshness]:
+        """🕒 Свежесть последнего отданного баланса валюты"""
+        return self.freshness.get(currency.upper())
+
     async def get_all_balances(self) -> Dict[str, BalanceInfo]:
         """💰 Получение всех балансов"""
 
@@ -205,11 +249,14 @@ class BalanceService:
 
                 balances = {}
                 for currency, amount in raw_balances.items():
+                    # ExmoAPIClient уже отдает Decimal - повторная конвертация не нужна
+                    if not isinstance(amount, Decimal):
+                        amount = Decimal(str(amount))
                     balance_info = BalanceInfo(
                         currency=currency.upper(),
-                        available=Decimal(str(amount)),
+                        available=amount,
                         reserved=Decimal('0'),
-                        total=Decimal(str(amount))
+                        total=amount
                     )
 
                     # Применяем резервирования
@@ -218,7 +265,7 @@ class BalanceService:
 
                 # Обновляем кэш
                 for currency, balance in balances.items():
-                    self.balance_cache[currency] = (datetime.now(), balance)
+                    await self._store_balance(currency, balance)
 
                 return balances
 
@@ -292,8 +339,7 @@ class BalanceService:
             self.reservations[reservation_id] = reservation
 
             # Очищаем кэш для пересчета
-            if currency.upper() in self.balance_cache:
-                del self.balance_cache[currency.upper()]
+            await self._invalidate_balance(currency.upper())
 
             # Записываем в историю
             await self._record_balance_change(
@@ -322,8 +368,7 @@ class BalanceService:
             del self.reservations[reservation_id]
 
             # Очищаем кэш
-            if reservation.currency in self.balance_cache:
-                del self.balance_cache[reservation.currency]
+            await self._invalidate_balance(reservation.currency)
 
             # Записываем в историю
             await self._record_balance_change(
@@ -391,10 +436,8 @@ class BalanceService:
             base_currency = trade.pair.base
             quote_currency = trade.pair.quote
 
-            # Очищаем кэш для обеих валют
-            for currency in [base_currency, quote_currency]:
-                if currency in self.balance_cache:
-                    del self.balance_cache[currency]
+            # Балансы и данные пары устарели во всех слоях общего кэша
+            await self.balance_cache.invalidate_tags(*trade_invalidation_tags(trade.pair))
 
             if trade.order_type.value.lower() == 'buy':
                 # Покупка: увеличиваем base, уменьшаем quote
@@ -425,6 +468,20 @@ class BalanceService:
 
     # ================= ПРИВАТНЫЕ МЕТОДЫ =================
 
+    async def _load_balance(self, currency: str) -> BalanceInfo:
+        """📥 Баланс от биржи с учетом резервирований"""
+        balance = await self._fetch_balance(currency)
+        return await self._apply_reservations(balance)
+
+    async def _store_balance(self, currency: str, balance: BalanceInfo) -> None:
+        """💾 Кэширование баланса"""
+        await self.balance_cache.set(currency, (datetime.now(), balance), tags=[BALANCE_TAG])
+
+    async def _invalidate_balance(self, currency: str) -> None:
+        """🗑️ Баланс изменился - кэш и начатые обновления недействительны"""
+        await self.balance_cache.delete(currency)
+        self.revalidation.invalidate(currency)
+
     async def _fetch_balance(self, currency: str) -> BalanceInfo:
         """📥 Получение баланса от биржи"""
 
@@ -609,7 +666,8 @@ class BalanceService:
 
         try:
             # Очищаем кэш
-            self.balance_cache.clear()
+            await self.balance_cache.clear()
+            self.revalidation.invalidate_all()
 
             # Получаем актуальные балансы
             await self.get_all_balances()
@@ -686,17 +744,17 @@ class BalanceService:
     def get_service_statistics(self) -> Dict[str, Any]:
         """📊 Статистика сервиса"""
 
+        cached_times = [cached_time for _, (cached_time, _) in self.balance_cache.items_nowait()]
         return {
-            'cache_entries': len(self.balance_cache),
+            'cache_entries': len(cached_times),
             'active_reservations': len(self.reservations),
             'history_records': len(self.balance_history),
             'supported_currencies': len(self.exchange_rates),
             'cache_ttl_seconds': self.cache_ttl.total_seconds(),
             'has_exchange_api': self.exchange_api is not None,
-            'oldest_cache_entry': (
-                min(cached_time for cached_time, _ in self.balance_cache.values()).isoformat()
-                if self.balance_cache else None
-            )
+            'oldest_cache_entry': min(cached_times).isoformat() if cached_times else None,
+            'cache': self.balance_cache.get_stats(),
+            'revalidation': self.revalidation.get_status()
         }
 
     def set_exchange_rate(self, currency: str, rate_to_eur: Decimal) -> None:
@@ -729,7 +787,8 @@ class BalanceService:
 
             # Проверяем кэш
             expired_cache = []
-            for currency, (cached_time, _) in self.balance_cache.items():
+            cached_items = await self.balance_cache.items()
+            for currency, (cached_time, _) in cached_items:
                 if datetime.now() - cached_time > self.cache_ttl:
                     expired_cache.append(currency)
 
@@ -738,7 +797,7 @@ class BalanceService:
                 'issues': issues,
                 'expired_cache_entries': expired_cache,
                 'total_reservations': len(self.reservations),
-                'cache_entries': len(self.balance_cache)
+                'cache_entries': len(cached_items)
             }
 
         except Exception as e:
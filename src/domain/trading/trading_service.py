@@ -538,6 +538,7 @@ class TradingService:
             event.metadata = {
                 'strategy': decision.strategy_name,
                 'signal_type': decision.signal.signal_type,
+                'pair': str(decision.signal.pair),
                 'order_id': result.order_id,
                 'success': result.is_successful
             }
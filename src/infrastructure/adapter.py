@@ -1,14 +1,16 @@
 import asyncio
 import logging
-from typing import Dict, Any, Optional
+from typing import Dict, Any, Optional, TYPE_CHECKING
 from pathlib import Path
 
-from .api.client import ExmoAPIClient, APIClientFactory
-from .cache.cache import CacheFactory, InMemoryCache
-from .persistence.repository import RepositoryFactory, RepositoryConfig
-from .monitoring.service import MonitoringFactory, MonitoringService
+from .api.infrastructure_api import ExmoAPIClient, APIClientFactory
+from .cache.infrastructure_cache import CacheFactory, InMemoryCache
+from .persistence.infrastructure_persistence import RepositoryFactory, RepositoryConfig
 from ..config.settings import get_settings
 
+if TYPE_CHECKING:
+    from .monitoring.infrastructure_monitoring import MonitoringService
+
 
 class InfrastructureAdapter:
     """🔗 Адаптер инфраструктуры"""
@@ -20,7 +22,7 @@ class InfrastructureAdapter:
         # Компоненты инфраструктуры
         self.api_client: Optional[ExmoAPIClient] = None
         self.cache: Optional[InMemoryCache] = None
-        self.monitoring: Optional[MonitoringService] = None
+        self.monitoring: Optional['MonitoringService'] = None
         self.repositories = {}
 
         # Флаги инициализации
@@ -54,16 +56,8 @@ class InfrastructureAdapter:
     async def _init_api_client(self) -> None:
         """🌐 Инициализация API клиента"""
         try:
-            from ..config.settings import APISettings
-
-            api_settings = APISettings(
-                exmo_api_key=self.settings.exmo_api_key,
-                exmo_api_secret=self.settings.exmo_api_secret,
-                calls_per_minute=getattr(self.settings, 'api_calls_per_minute', 30),
-                calls_per_hour=getattr(self.settings, 'api_calls_per_hour', 300)
-            )
-
-            self.api_client = APIClientFactory.create_exmo_client(api_settings)
+            self.api_client = APIClientFactory.create_exmo_client(self.settings.api)
+            await self.api_client.start()
             self.logger.info("✅ API клиент инициализирован")
 
         except Exception as e:
@@ -86,14 +80,17 @@ class InfrastructureAdapter:
     async def _init_repositories(self) -> None:
         """🗄️ Инициализация репозиториев"""
         try:
+            system = self.settings.system
             config = RepositoryConfig(
                 storage_type=getattr(self.settings, 'storage_type', 'json'),
-                storage_path=getattr(self.settings, 'storage_path', 'data'),
-                backup_enabled=getattr(self.settings, 'backup_enabled', True)
+                storage_path=system.storage_path,
+                backup_enabled=getattr(self.settings, 'backup_enabled', True),
+                journal_enabled=system.journal_enabled,
+                journal_fsync=system.journal_fsync,
+                journal_fsync_interval=system.journal_fsync_interval
             )
 
             # Создаем репозитории
-            from ..core.models import Position, TradeResult
             self.repositories['positions'] = RepositoryFactory.create_position_repository(config)
             self.repositories['trades'] = RepositoryFactory.create_trade_repository(config)
 
@@ -106,6 +103,8 @@ class InfrastructureAdapter:
         """📊 Инициализация мониторинга"""
         try:
             if getattr(self.settings, 'monitoring_enabled', True):
+                from .monitoring.infrastructure_monitoring import MonitoringFactory
+
                 self.monitoring = MonitoringFactory.create_monitoring_service(
                     notification_type=getattr(self.settings, 'notification_type', 'console'),
                     export_path=getattr(self.settings, 'export_path', 'monitoring_data')
@@ -119,9 +118,15 @@ class InfrastructureAdapter:
     async def shutdown(self) -> None:
         """🛑 Корректное завершение"""
         try:
+            if self.api_client:
+                await self.api_client.close()
+
             if self.cache:
                 await self.cache.stop()
 
+            for repository in self.repositories.values():
+                await repository.close()
+
             if self.monitoring:
                 await self.monitoring.stop()
 
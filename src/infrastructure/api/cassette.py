@@ -0,0 +1,232 @@
+import gzip
+import json
+import time
+import logging
+from collections import deque
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, Any, Optional, List, Tuple, Deque
+
+
+# Параметры, которые меняются от запуска к запуску и не участвуют в сопоставлении
+VOLATILE_PARAMS = frozenset({"nonce"})
+
+CASSETTE_VERSION = 1
+
+
+@dataclass
+class CassetteEntry:
+    """📼 Записанная пара запрос/ответ"""
+    method: str
+    endpoint: str
+    params: Dict[str, str]
+    offset: float           # секунды от начала записи
+    duration: float         # время ответа
+    status_code: int = 200
+    body: str = ""
+    error_type: Optional[str] = None
+    error_message: Optional[str] = None
+
+    @property
+    def key(self) -> Tuple:
+        """Ключ сопоставления запроса"""
+        return make_request_key(self.method, self.endpoint, self.params)
+
+    def to_record(self) -> Dict[str, Any]:
+        """Компактная запись для файла"""
+        record = {
+            "m": self.method, "e": self.endpoint, "p": self.params,
+            "t": round(self.offset, 6), "d": round(self.duration, 6),
+            "s": self.status_code, "b": self.body
+        }
+        if self.error_type:
+            record["x"] = self.error_type
+            record["xm"] = self.error_message
+        return record
+
+    @classmethod
+    def from_record(cls, record: Dict[str, Any]) -> 'CassetteEntry':
+        return cls(
+            method=record["m"],
+            endpoint=record["e"],
+            params=record.get("p", {}),
+            offset=record.get("t", 0.0),
+            duration=record.get("d", 0.0),
+            status_code=record.get("s", 200),
+            body=record.get("b", ""),
+            error_type=record.get("x"),
+            error_message=record.get("xm")
+        )
+
+
+def normalize_params(params: Optional[Dict[str, Any]]) -> Dict[str, str]:
+    """Параметры строками, без nonce"""
+    return {
+        str(name): str(value)
+        for name, value in (params or {}).items()
+        if name not in VOLATILE_PARAMS
+    }
+
+
+def make_request_key(method: str, endpoint: str, params: Optional[Dict[str, Any]]) -> Tuple:
+    """🔑 Ключ запроса: метод + эндпоинт + отсортированные параметры"""
+    return (method.upper(), endpoint.lstrip("/")) + tuple(sorted(normalize_params(params).items()))
+
+
+@dataclass
+class CassetteStats:
+    """📊 Статистика воспроизведения"""
+    exact_hits: int = 0
+    endpoint_fallbacks: int = 0
+    misses: int = 0
+
+
+class Cassette:
+    """📼 Набор записанных обменов с биржей (gzip JSONL)"""
+
+    def __init__(self, entries: Optional[List[CassetteEntry]] = None, metadata: Optional[Dict[str, Any]] = None):
+        self.entries: List[CassetteEntry] = list(entries or [])
+        self.metadata: Dict[str, Any] = dict(metadata or {})
+
+        self._by_key: Dict[Tuple, Deque[CassetteEntry]] = {}
+        self._by_endpoint: Dict[Tuple[str, str], Deque[CassetteEntry]] = {}
+        self._last_by_key: Dict[Tuple, CassetteEntry] = {}
+        self.stats = CassetteStats()
+
+        self.rewind()
+
+    def append(self, entry: CassetteEntry) -> None:
+        """Добавление записи"""
+        self.entries.append(entry)
+
+    def rewind(self) -> None:
+        """⏮️ Сброс позиции воспроизведения"""
+        self._by_key.clear()
+        self._by_endpoint.clear()
+        self._last_by_key.clear()
+        self.stats = CassetteStats()
+
+        for entry in self.entries:
+            self._by_key.setdefault(entry.key, deque()).append(entry)
+            self._by_endpoint.setdefault((entry.method, entry.endpoint), deque()).append(entry)
+
+    def match(self, method: str, endpoint: str, params: Optional[Dict[str, Any]]) -> Optional[CassetteEntry]:
+        """🎯 Следующая запись для запроса
+
+        Точное совпадение отдается в порядке записи; когда они закончились,
+        повторяется последнее. Без точного совпадения берется следующая
+        запись того же эндпоинта (например, ордер с другой ценой).
+        """
+        key = make_request_key(method, endpoint, params)
+
+        queue = self._by_key.get(key)
+        if queue:
+            entry = queue.popleft()
+            self._discard(self._by_endpoint.get((entry.method, entry.endpoint)), entry)
+            self._last_by_key[key] = entry
+            self.stats.exact_hits += 1
+            return entry
+
+        if key in self._last_by_key:
+            self.stats.exact_hits += 1
+            return self._last_by_key[key]
+
+        fallback = self._by_endpoint.get((method.upper(), endpoint.lstrip("/")))
+        if fallback:
+            entry = fallback.popleft()
+            self._discard(self._by_key.get(entry.key), entry)
+            self.stats.endpoint_fallbacks += 1
+            return entry
+
+        self.stats.misses += 1
+        return None
+
+    @staticmethod
+    def _discard(queue: Optional[Deque[CassetteEntry]], entry: CassetteEntry) -> None:
+        if queue:
+            try:
+                queue.remove(entry)
+            except ValueError:
+                pass
+
+    @property
+    def duration(self) -> float:
+        """Длительность записи"""
+        # Записи идут в порядке завершения, поэтому берем максимум
+        return max((entry.offset + entry.duration for entry in self.entries), default=0.0)
+
+    def save(self, path: Path) -> None:
+        """💾 Сохранение: заголовок + одна запись на строку"""
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+
+        header = dict(self.metadata, version=CASSETTE_VERSION, entries=len(self.entries))
+        with gzip.open(path, "wt", encoding="utf-8") as f:
+            f.write(json.dumps(header, ensure_ascii=False) + "\n")
+            for entry in self.entries:
+                f.write(json.dumps(entry.to_record(), ensure_ascii=False, separators=(",", ":")) + "\n")
+
+    @classmethod
+    def load(cls, path: Path) -> 'Cassette':
+        """📂 Загрузка кассеты"""
+        with gzip.open(Path(path), "rt", encoding="utf-8") as f:
+            header = json.loads(f.readline() or "{}")
+            if header.get("version", CASSETTE_VERSION) != CASSETTE_VERSION:
+                raise ValueError(f"Неподдерживаемая версия кассеты: {header.get('version')}")
+            entries = [CassetteEntry.from_record(json.loads(line)) for line in f if line.strip()]
+
+        return cls(entries, metadata=header)
+
+    def get_status(self) -> Dict[str, Any]:
+        """📊 Статус кассеты"""
+        return {
+            "entries": len(self.entries),
+            "duration_seconds": self.duration,
+            "exact_hits": self.stats.exact_hits,
+            "endpoint_fallbacks": self.stats.endpoint_fallbacks,
+            "misses": self.stats.misses
+        }
+
+
+class CassetteRecorder:
+    """⏺️ Накопление обменов с относительным временем"""
+
+    def __init__(self, path: Path, metadata: Optional[Dict[str, Any]] = None):
+        self.path = Path(path)
+        self.cassette = Cassette(metadata=dict(metadata or {}, recorded_at=time.time()))
+        self._started = time.monotonic()
+
+        self.logger = logging.getLogger(__name__)
+
+    def now(self) -> float:
+        """Секунды от начала записи"""
+        return time.monotonic() - self._started
+
+    def record(
+        self,
+        method: str,
+        endpoint: str,
+        params: Optional[Dict[str, Any]],
+        offset: float,
+        duration: float,
+        status_code: int = 200,
+        body: str = "",
+        error: Optional[Exception] = None
+    ) -> None:
+        """Запись одного обмена"""
+        self.cassette.append(CassetteEntry(
+            method=method.upper(),
+            endpoint=endpoint.lstrip("/"),
+            params=normalize_params(params),
+            offset=offset,
+            duration=duration,
+            status_code=status_code,
+            body=body,
+            error_type=type(error).__name__ if error else None,
+            error_message=str(error) if error else None
+        ))
+
+    def save(self) -> None:
+        """💾 Сохранение кассеты"""
+        self.cassette.save(self.path)
+        self.logger.info(f"📼 Кассета сохранена: {self.path} ({len(self.cassette.entries)} записей)")
@@ -0,0 +1,124 @@
+import json
+from decimal import Decimal
+from typing import Dict, Any, Union, Optional, NamedTuple
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+
+DECIMAL_ZERO = Decimal('0')
+
+
+def decode_json(content: Union[bytes, str], fast: bool = False) -> Any:
+    """⚡ Разбор тела ответа биржи: дробные числа всегда Decimal
+
+    По умолчанию json с parse_float=Decimal: число берется из текста
+    ответа без потерь.
+
+    fast=True (при установленном orjson) - разбор в C, но дробные числа
+    сначала становятся float и переводятся в Decimal через repr. Точность
+    ограничена 17 значащими цифрами: 0.12345678901234567890 превратится
+    в 0.12345678901234568. Подходит, только если биржа отдает суммы
+    строками (EXMO так и делает) - строки не затрагиваются.
+    """
+    if fast and ORJSON_AVAILABLE:
+        return _floats_to_decimal(orjson.loads(content))
+    return json.loads(content, parse_float=Decimal)
+
+
+def _floats_to_decimal(value: Any) -> Any:
+    """float -> Decimal на месте (контейнеры от orjson.loads новые, их можно менять)"""
+    value_type = type(value)
+    if value_type is dict:
+        for key, item in value.items():
+            item_type = type(item)
+            if item_type is float:
+                value[key] = Decimal(repr(item))
+            elif item_type is dict or item_type is list:
+                _floats_to_decimal(item)
+    elif value_type is list:
+        for index, item in enumerate(value):
+            item_type = type(item)
+            if item_type is float:
+                value[index] = Decimal(repr(item))
+            elif item_type is dict or item_type is list:
+                _floats_to_decimal(item)
+    elif value_type is float:
+        return Decimal(repr(value))
+    return value
+
+
+def to_decimal(value: Any) -> Decimal:
+    """🔢 Значение из JSON в Decimal без промежуточного str()
+
+    Некорректная строка поднимает InvalidOperation, как и Decimal(str(...)).
+    """
+    value_type = type(value)
+
+    if value_type is str:
+        return Decimal(value) if value else DECIMAL_ZERO
+    if value_type is Decimal:
+        return value
+    if value_type is int:
+        return Decimal(value)
+    if value_type is float:
+        return Decimal(repr(value))
+    if value is None:
+        return DECIMAL_ZERO
+    return Decimal(str(value))
+
+
+# ================= ТИПИЗИРОВАННЫЕ ЗАПИСИ =================
+
+class BalanceRecord(NamedTuple):
+    """💰 Баланс валюты из user_info"""
+    currency: str
+    available: Decimal
+    reserved: Decimal = DECIMAL_ZERO
+
+    @property
+    def total(self) -> Decimal:
+        """Доступно + в ордерах"""
+        return self.available + self.reserved
+
+
+class UserInfoRecord(NamedTuple):
+    """👤 Ответ user_info: сырые словари, Decimal создается только по запросу"""
+    uid: int
+    server_date: int
+    raw_balances: Dict[str, Any]
+    raw_reserved: Dict[str, Any]
+
+    @classmethod
+    def from_payload(cls, payload: Optional[Dict[str, Any]]) -> 'UserInfoRecord':
+        """Разбор словаря user_info без конвертации сумм"""
+        payload = payload or {}
+        return cls(
+            int(payload.get("uid") or 0),
+            int(payload.get("server_date") or 0),
+            payload.get("balances") or {},
+            payload.get("reserved") or {}
+        )
+
+    def available(self, currency: str) -> Decimal:
+        """Доступный баланс валюты"""
+        return to_decimal(self.raw_balances.get(currency))
+
+    def balance(self, currency: str) -> BalanceRecord:
+        """Баланс валюты вместе с резервом"""
+        return BalanceRecord(
+            currency,
+            to_decimal(self.raw_balances.get(currency)),
+            to_decimal(self.raw_reserved.get(currency))
+        )
+
+    def available_map(self) -> Dict[str, Decimal]:
+        """Доступные балансы всех валют"""
+        return {currency: to_decimal(amount) for currency, amount in self.raw_balances.items()}
+
+    def balances(self) -> Dict[str, BalanceRecord]:
+        """Все балансы с резервами"""
+        return {currency: self.balance(currency) for currency in self.raw_balances}
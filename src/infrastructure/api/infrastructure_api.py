@@ -3,9 +3,10 @@ import logging
 import hashlib
 import hmac
 import asyncio
+import threading
 from abc import ABC, abstractmethod
 from dataclasses import dataclass, field
-from typing import Dict, Any, Optional, List, Union, Protocol
+from typing import Dict, Any, Optional, List, Union, Protocol, Callable, Awaitable
 from decimal import Decimal
 from datetime import datetime, timedelta
 from collections import deque
@@ -14,34 +15,24 @@ import requests
 from requests.adapters import HTTPAdapter
 from urllib3.util.retry import Retry
 
-from ..core.interfaces import IExchangeAPI, ICacheService, IMonitoringService
-from ..core.models import TradeOrder, TradingPair, APIResponse, ErrorInfo
-from ..core.exceptions import APIError, RateLimitError, ConnectionError
-from ..core.constants import API, Trading
-from ..config.settings import APISettings
+try:
+    import aiohttp
+    AIOHTTP_AVAILABLE = True
+except ImportError:
+    AIOHTTP_AVAILABLE = False
 
-
-@dataclass
-class APIMetrics:
-    """📊 Метрики API"""
-    total_requests: int = 0
-    successful_requests: int = 0
-    failed_requests: int = 0
-    average_response_time: float = 0.0
-    rate_limit_hits: int = 0
-    last_request_time: datetime = field(default_factory=datetime.now)
-    
-    @property
-    def success_rate(self) -> float:
-        """Процент успешных запросов"""
-        if self.total_requests == 0:
-            return 100.0
-        return (self.successful_requests / self.total_requests) * 100
-    
-    @property
-    def error_rate(self) -> float:
-        """Процент ошибочных запросов"""
-        return 100.0 - self.success_rate
+from ...core.interfaces import IExchangeAPI
+from ...core.models import MIN_TRADE_AMOUNT, MIN_PRICE
+from ...core.exceptions import APIError, RateLimitExceededError, ConnectionError
+from ...core.cache.tiered_cache import TieredCache, get_shared_cache, trade_invalidation_tags, BALANCE_TAG
+from ...config.settings import APISettings
+from .ticker_snapshot import TickerSnapshot
+from .request_coalescer import RequestCoalescer
+from .cassette import Cassette, CassetteRecorder
+from .decoding import decode_json, UserInfoRecord
+from .pair_registry import PairRegistry
+from .latency import LatencyRecorder, status_class
+from .rate_limiter import APIMetrics, EndpointClass, LaneState, PriorityRateLimiter
 
 
 class RateLimiter:
@@ -117,9 +108,12 @@ class RateLimiter:
         if "rate_limit" in error_type.lower() or "429" in error_type:
             self.metrics.rate_limit_hits += 1
             self.error_count += 1
-            self.last_error_time = time.time()
+            current_time = time.time()
+            # Пачка 429 от запросов, ушедших одновременно, - одно увеличение задержки
+            escalate = current_time - self.last_error_time >= self.adaptive_delay
+            self.last_error_time = current_time
             
-            if self.adaptive:
+            if self.adaptive and escalate:
                 # Увеличиваем задержку при ошибках rate limit
                 self.adaptive_delay = min(30.0, self.adaptive_delay + 2.0)
                 self.logger.warning(f"🚨 Rate limit hit, увеличиваем задержку до {self.adaptive_delay:.1f}с")
@@ -205,7 +199,7 @@ class HTTPClient:
         retry_strategy = Retry(
             total=max_retries,
             status_forcelist=[429, 500, 502, 503, 504],
-            method_whitelist=["HEAD", "GET", "OPTIONS", "POST"],
+            allowed_methods=["HEAD", "GET", "OPTIONS", "POST"],
             backoff_factor=1
         )
         
@@ -247,70 +241,305 @@ class HTTPClient:
             raise ConnectionError(f"Ошибка соединения с {url}") from e
         except requests.exceptions.HTTPError as e:
             if e.response.status_code == 429:
-                raise RateLimitError("Превышен лимит запросов") from e
-            raise APIError(f"HTTP ошибка {e.response.status_code}: {e.response.text}") from e
+                raise RateLimitExceededError("Превышен лимит запросов") from e
+            raise APIError(f"HTTP ошибка {e.response.status_code}: {e.response.text}",
+                           status_code=e.response.status_code) from e
         except Exception as e:
             raise APIError(f"Неожиданная ошибка при запросе: {str(e)}") from e
 
+    async def close(self) -> None:
+        """🔒 Закрытие сессии"""
+        self.session.close()
+
+
+@dataclass
+class HTTPResponse:
+    """📨 Прочитанный HTTP ответ (совместим с requests.Response по json/text/status_code)"""
+    status_code: int
+    content: bytes
+    headers: Dict[str, str] = field(default_factory=dict)
+
+    @property
+    def text(self) -> str:
+        """Тело ответа строкой"""
+        return self.content.decode('utf-8', errors='replace')
+
+    def json(self) -> Any:
+        """Тело ответа как JSON"""
+        return decode_json(self.content)
+
+
+class AiohttpHTTPClient:
+    """⚡ Нативный асинхронный HTTP клиент на aiohttp с пулом keep-alive соединений"""
+
+    RETRY_STATUSES = (500, 502, 503, 504)
+
+    def __init__(
+        self,
+        base_url: str,
+        timeout: int = 10,
+        max_retries: int = 3,
+        pool_limit: int = 100,
+        pool_limit_per_host: int = 10,
+        dns_cache_ttl: int = 300,
+        keepalive_timeout: float = 30.0,
+        backoff_factor: float = 1.0
+    ):
+        if not AIOHTTP_AVAILABLE:
+            raise ImportError("aiohttp не установлен, используйте http_transport='requests'")
+
+        self.base_url = base_url.rstrip('/')
+        self.timeout = timeout
+        self.max_retries = max_retries
+        self.pool_limit = pool_limit
+        self.pool_limit_per_host = pool_limit_per_host
+        self.dns_cache_ttl = dns_cache_ttl
+        self.keepalive_timeout = keepalive_timeout
+        self.backoff_factor = backoff_factor
+
+        # Сессия создается лениво внутри работающего event loop
+        self._session: Optional["aiohttp.ClientSession"] = None
+
+        self.logger = logging.getLogger(__name__)
+
+    async def get(self, endpoint: str, params: Optional[Dict] = None) -> HTTPResponse:
+        """GET запрос"""
+        url = f"{self.base_url}/{endpoint.lstrip('/')}"
+        return await self._make_request("GET", url, params=params)
+
+    async def post(self, endpoint: str, data: Optional[Dict] = None, headers: Optional[Dict] = None) -> HTTPResponse:
+        """POST запрос"""
+        url = f"{self.base_url}/{endpoint.lstrip('/')}"
+        return await self._make_request("POST", url, data=data, headers=headers)
+
+    async def close(self) -> None:
+        """🔒 Закрытие сессии и пула соединений"""
+        if self._session and not self._session.closed:
+            await self._session.close()
+        self._session = None
+
+    def _get_session(self) -> "aiohttp.ClientSession":
+        """🔌 Получение сессии с настроенным коннектором"""
+        if self._session is None or self._session.closed:
+            # TCP_NODELAY asyncio выставляет на сокете транспорта сам,
+            # здесь настраиваем пул, DNS кэш и keep-alive
+            connector = aiohttp.TCPConnector(
+                limit=self.pool_limit,
+                limit_per_host=self.pool_limit_per_host,
+                use_dns_cache=True,
+                ttl_dns_cache=self.dns_cache_ttl,
+                keepalive_timeout=self.keepalive_timeout,
+                enable_cleanup_closed=True
+            )
+            self._session = aiohttp.ClientSession(
+                connector=connector,
+                timeout=aiohttp.ClientTimeout(total=self.timeout)
+            )
+        return self._session
+
+    async def _make_request(self, method: str, url: str, **kwargs) -> HTTPResponse:
+        """Выполнение запроса с retry для 5xx и обрывов соединения"""
+        session = self._get_session()
+        attempt = 0
+
+        while True:
+            try:
+                async with session.request(method, url, **kwargs) as response:
+                    content = await response.read()
+                    result = HTTPResponse(response.status, content, dict(response.headers))
+            except asyncio.TimeoutError as e:
+                raise ConnectionError(f"Timeout при запросе к {url}") from e
+            except aiohttp.ClientConnectionError as e:
+                if attempt < self.max_retries:
+                    await self._backoff(attempt)
+                    attempt += 1
+                    continue
+                raise ConnectionError(f"Ошибка соединения с {url}") from e
+            except Exception as e:
+                raise APIError(f"Неожиданная ошибка при запросе: {str(e)}") from e
+
+            if result.status_code in self.RETRY_STATUSES and attempt < self.max_retries:
+                await self._backoff(attempt)
+                attempt += 1
+                continue
+
+            break
+
+        # Проверяем статус ответа
+        if result.status_code == 429:
+            raise RateLimitExceededError("Превышен лимит запросов")
+        if result.status_code >= 400:
+            raise APIError(f"HTTP ошибка {result.status_code}: {result.text}", status_code=result.status_code)
+
+        return result
+
+    async def _backoff(self, attempt: int) -> None:
+        """⏳ Экспоненциальная задержка перед повтором"""
+        delay = self.backoff_factor * (2 ** attempt)
+        self.logger.debug(f"🔁 Повтор запроса через {delay:.1f}с (попытка {attempt + 1})")
+        await asyncio.sleep(delay)
+
+
+class RecordingHTTPClient:
+    """⏺️ Транспорт-обертка: записывает запросы и ответы в кассету"""
+
+    def __init__(self, inner: Union[HTTPClient, AiohttpHTTPClient], recorder: CassetteRecorder):
+        self.inner = inner
+        self.recorder = recorder
+
+        self.logger = logging.getLogger(__name__)
+
+    async def get(self, endpoint: str, params: Optional[Dict] = None) -> Any:
+        """GET запрос с записью"""
+        return await self._record("GET", endpoint, params, self.inner.get(endpoint, params))
+
+    async def post(self, endpoint: str, data: Optional[Dict] = None, headers: Optional[Dict] = None) -> Any:
+        """POST запрос с записью (заголовки с ключом и подписью не сохраняются)"""
+        return await self._record("POST", endpoint, data, self.inner.post(endpoint, data=data, headers=headers))
+
+    async def close(self) -> None:
+        """🔒 Сохранение кассеты и закрытие транспорта"""
+        self.recorder.save()
+        await self.inner.close()
+
+    async def _record(self, method: str, endpoint: str, params: Optional[Dict], request: Awaitable[Any]) -> Any:
+        offset = self.recorder.now()
+        started = time.perf_counter()
+
+        try:
+            response = await request
+        except Exception as e:
+            self.recorder.record(method, endpoint, params, offset, time.perf_counter() - started,
+                                 status_code=0, error=e)
+            raise
+
+        self.recorder.record(method, endpoint, params, offset, time.perf_counter() - started,
+                             status_code=response.status_code, body=response.text)
+        return response
+
+
+class ReplayHTTPClient:
+    """⏯️ Транспорт воспроизведения кассеты без сети"""
+
+    ERROR_TYPES = {
+        "RateLimitExceededError": RateLimitExceededError,
+        "ConnectionError": ConnectionError,
+    }
+
+    def __init__(self, cassette: Cassette, speed: float = 0.0):
+        self.cassette = cassette
+        # 0 - без задержек, 1 - записанное время ответа, 2 - вдвое быстрее и т.д.
+        self.speed = speed
+
+        self.logger = logging.getLogger(__name__)
+
+    async def get(self, endpoint: str, params: Optional[Dict] = None) -> HTTPResponse:
+        """GET из кассеты"""
+        return await self._replay("GET", endpoint, params)
+
+    async def post(self, endpoint: str, data: Optional[Dict] = None, headers: Optional[Dict] = None) -> HTTPResponse:
+        """POST из кассеты"""
+        return await self._replay("POST", endpoint, data)
+
+    async def close(self) -> None:
+        """Нечего закрывать"""
+        self.logger.debug(f"📼 Воспроизведение завершено: {self.cassette.get_status()}")
+
+    async def _replay(self, method: str, endpoint: str, params: Optional[Dict]) -> HTTPResponse:
+        entry = self.cassette.match(method, endpoint, params)
+        if entry is None:
+            raise APIError(f"Нет записи в кассете для {method} {endpoint}")
+
+        if self.speed > 0 and entry.duration > 0:
+            await asyncio.sleep(entry.duration / self.speed)
+
+        if entry.error_type:
+            raise self.ERROR_TYPES.get(entry.error_type, APIError)(entry.error_message)
+
+        return HTTPResponse(entry.status_code, entry.body.encode('utf-8'))
+
 
 class ExmoAPIClient(IExchangeAPI):
     """🏛️ EXMO API клиент с полной функциональностью"""
     
-    def __init__(self, settings: APISettings, rate_limiter: Optional[RateLimiter] = None):
+    def __init__(
+        self,
+        settings: APISettings,
+        rate_limiter: Optional[Union[RateLimiter, PriorityRateLimiter]] = None,
+        cache: Optional[TieredCache] = None
+    ):
         self.settings = settings
-        self.rate_limiter = rate_limiter or RateLimiter(
-            settings.calls_per_minute,
-            settings.calls_per_hour,
-            settings.adaptive_rate_limiting
-        )
-        
-        self.http_client = HTTPClient(
-            settings.exmo_base_url,
-            settings.exmo_timeout,
-            settings.exmo_max_retries
-        )
+        self.rate_limiter = rate_limiter or APIClientFactory.create_rate_limiter(settings)
         
+        self.http_client = self._create_http_client(settings)
+        self._fast_json = settings.json_decoder == "orjson"
+
         self.logger = logging.getLogger(__name__)
         
-        # Кэш для минимизации повторных запросов
-        self._cache: Dict[str, Any] = {}
-        self._cache_timestamps: Dict[str, datetime] = {}
+        # Пространство общего кэша: снимок user_info на все валюты,
+        # сделка инвалидирует его вместе с балансами остальных слоев
+        self.cache = (cache or get_shared_cache()).namespace("exchange", ttl=settings.cache_balance_ttl)
+        
+        # Объединение идентичных конкурентных запросов
+        self.coalescer = RequestCoalescer()
+        
+        # Гистограммы задержек: ожидание лимитера и сеть по эндпоинтам
+        self.latency = LatencyRecorder()
+        
+        # nonce подписанных запросов: EXMO отклоняет повтор и убывание
+        self._nonce_lock = threading.Lock()
+        self._last_nonce = 0
+        
+        # Общий снимок ticker: один запрос на окно обновления для всех пар
+        self.ticker_snapshot = TickerSnapshot(
+            lambda: self._public_request("ticker"),
+            refresh_interval=settings.cache_price_ttl
+        )
+        
+        # Справочник пар: валидация ордеров без сетевых запросов;
+        # ответ хранится в общем кэше и переживает перезапуск через снимок
+        self.pair_registry = PairRegistry(
+            lambda: self._public_request("pair_settings"),
+            refresh_interval=settings.pair_settings_refresh_interval,
+            cache=self.cache if settings.cache_enabled else None
+        )
+    
+    async def start(self) -> None:
+        """▶️ Загрузка справочника пар и запуск его фонового обновления"""
+        await self.pair_registry.start()
     
     async def get_balance(self, currency: str) -> Decimal:
         """💰 Получение баланса валюты"""
         try:
-            user_info = await self._authenticated_request("user_info")
-            
-            if user_info and "balances" in user_info:
-                balance_str = user_info["balances"].get(currency, "0")
-                return Decimal(str(balance_str))
-            
-            return Decimal("0")
+            user_info = await self._get_user_info()
+            return user_info.available(currency)
             
         except Exception as e:
             self.logger.error(f"Ошибка получения баланса {currency}: {e}")
             return Decimal("0")
     
+    async def get_balances(self) -> Dict[str, Decimal]:
+        """💰 Доступные балансы всех валют одним запросом user_info"""
+        user_info = await self._get_user_info()
+        return user_info.available_map()
+    
+    async def _get_user_info(self) -> UserInfoRecord:
+        """👤 user_info из общего кэша: один запрос на TTL для всех валют"""
+        if not self.settings.cache_enabled:
+            return UserInfoRecord.from_payload(await self._authenticated_request("user_info"))
+        
+        user_info = await self.cache.get("user_info")
+        if user_info is None:
+            version = self.cache.version
+            user_info = UserInfoRecord.from_payload(await self._authenticated_request("user_info"))
+            await self.cache.set("user_info", user_info, tags=[BALANCE_TAG], if_version=version)
+        return user_info
+    
     async def get_current_price(self, pair: str) -> Decimal:
         """💱 Получение текущей цены пары"""
         try:
-            # Проверяем кэш
-            cache_key = f"price_{pair}"
-            if self._is_cache_valid(cache_key, self.settings.cache_price_ttl):
-                return Decimal(str(self._cache[cache_key]))
-            
-            ticker_data = await self._public_request("ticker")
-            
-            if ticker_data and pair in ticker_data:
-                price_str = ticker_data[pair]["last_trade"]
-                price = Decimal(str(price_str))
-                
-                # Сохраняем в кэш
-                self._update_cache(cache_key, float(price))
-                
-                return price
-            
-            raise APIError(f"Пара {pair} не найдена в ticker данных")
+            table = await self.ticker_snapshot.get_table()
+            return table.price(pair)
             
         except Exception as e:
             self.logger.error(f"Ошибка получения цены {pair}: {e}")
@@ -325,6 +554,12 @@ class ExmoAPIClient(IExchangeAPI):
     ) -> Dict[str, Any]:
         """📝 Создание ордера"""
         try:
+            # Приводим к точности пары из справочника
+            spec = self.pair_registry.get(pair)
+            if spec is not None:
+                price = spec.round_price(price)
+                quantity = spec.round_quantity(quantity)
+            
             # Валидация параметров
             await self._validate_order_params(pair, quantity, price, order_type)
             
@@ -342,8 +577,8 @@ class ExmoAPIClient(IExchangeAPI):
             if result and result.get("result"):
                 self.logger.info(f"✅ Ордер создан: ID {result.get('order_id')}")
                 
-                # Инвалидируем кэш баланса
-                self._invalidate_balance_cache()
+                # Балансы изменились во всех слоях кэша
+                await self._invalidate_balance_cache(pair)
                 
                 return {
                     "success": True,
@@ -380,24 +615,36 @@ class ExmoAPIClient(IExchangeAPI):
             self.logger.error(f"Ошибка получения стакана {pair}: {e}")
             raise APIError(f"Не удалось получить стакан для {pair}") from e
     
-    async def get_trades_history(self, pair: str, limit: int = 100) -> List[Dict[str, Any]]:
-        """📈 Получение истории сделок"""
+    async def get_trades_history(self, pair: str, limit: int = 100, offset: int = 0) -> List[Dict[str, Any]]:
+        """📈 Получение истории сделок (от новых к старым); при ошибке - пустой список"""
         try:
-            params = {"pair": pair}
-            if limit != 100:
-                params["limit"] = str(limit)
-            
-            result = await self._authenticated_request("user_trades", params)
-            
-            if result and pair in result:
-                return result[pair]
-            
-            return []
+            return await self.get_trades_page(pair, limit, offset)
             
         except Exception as e:
             self.logger.error(f"Ошибка получения истории сделок {pair}: {e}")
             return []
     
+    async def get_trades_page(self, pair: str, limit: int = 100, offset: int = 0) -> List[Dict[str, Any]]:
+        """📄 Страница user_trades для постраничного обхода
+        
+        В отличие от get_trades_history ошибка запроса поднимает исключение:
+        пустой список здесь всегда означает, что сделок больше нет.
+        """
+        params = {"pair": pair}
+        if limit != 100:
+            params["limit"] = str(limit)
+        if offset:
+            params["offset"] = str(offset)
+        
+        result = await self._authenticated_request("user_trades", params)
+        
+        if not isinstance(result, dict):
+            raise APIError(f"Пустой ответ user_trades для {pair}")
+        if result.get("result") is False or result.get("error"):
+            raise APIError(f"Ошибка user_trades для {pair}: {result.get('error', 'неизвестная ошибка')}")
+        
+        return result.get(pair, [])
+    
     async def get_open_orders(self) -> Dict[str, Any]:
         """📋 Получение открытых ордеров"""
         try:
@@ -423,60 +670,143 @@ class ExmoAPIClient(IExchangeAPI):
             self.logger.error(f"Ошибка отмены ордера {order_id}: {e}")
             return {"success": False, "error": str(e)}
     
+    async def create_orders(self, orders: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """📦 Конкурентное создание ордеров (очередь - торговая полоса rate limiter)"""
+        return list(await asyncio.gather(*(
+            self.create_order(order["pair"], order["quantity"], order["price"], order["order_type"])
+            for order in orders
+        )))
+    
+    async def cancel_orders(self, order_ids: List[str]) -> Dict[str, Dict[str, Any]]:
+        """❌ Конкурентная отмена ордеров: order_id -> результат"""
+        results = await asyncio.gather(*(self.cancel_order(order_id) for order_id in order_ids))
+        return dict(zip(order_ids, results))
+    
+    async def close(self) -> None:
+        """🔒 Освобождение HTTP соединений"""
+        await self.pair_registry.stop()
+        await self.http_client.close()
+    
+    @staticmethod
+    def _create_http_client(settings: APISettings) -> Union[HTTPClient, AiohttpHTTPClient, RecordingHTTPClient, ReplayHTTPClient]:
+        """🔌 Выбор HTTP транспорта по настройкам (с записью/воспроизведением кассеты)"""
+        if settings.http_cassette_mode == "replay":
+            return ReplayHTTPClient(
+                Cassette.load(settings.http_cassette_path),
+                speed=settings.http_cassette_replay_speed
+            )
+        
+        transport = ExmoAPIClient._create_network_client(settings)
+        
+        if settings.http_cassette_mode == "record":
+            recorder = CassetteRecorder(
+                settings.http_cassette_path,
+                metadata={"base_url": settings.base_url, "transport": settings.http_transport}
+            )
+            return RecordingHTTPClient(transport, recorder)
+        
+        return transport
+    
+    @staticmethod
+    def _create_network_client(settings: APISettings) -> Union[HTTPClient, AiohttpHTTPClient]:
+        """🔌 Сетевой транспорт по настройкам"""
+        if settings.http_transport == "aiohttp":
+            return AiohttpHTTPClient(
+                settings.base_url,
+                settings.timeout_seconds,
+                settings.retry_attempts,
+                pool_limit=settings.http_pool_limit,
+                pool_limit_per_host=settings.http_pool_limit_per_host,
+                dns_cache_ttl=settings.http_dns_cache_ttl,
+                keepalive_timeout=settings.http_keepalive_timeout
+            )
+        
+        return HTTPClient(
+            settings.base_url,
+            settings.timeout_seconds,
+            settings.retry_attempts
+        )
+    
     async def _public_request(self, endpoint: str, params: Optional[Dict] = None) -> Optional[Dict]:
-        """🔓 Публичный API запрос"""
-        try:
-            await self.rate_limiter.acquire_permit(endpoint)
-            
-            start_time = time.time()
-            response = await self.http_client.get(endpoint, params)
-            response_time = time.time() - start_time
+        """🔓 Публичный API запрос (идентичные конкурентные запросы объединяются)"""
+        return await self.coalescer.run(
+            endpoint, params, lambda: self._send_public_request(endpoint, params)
+        )
+    
+    async def _authenticated_request(self, endpoint: str, params: Optional[Dict] = None) -> Optional[Dict]:
+        """🔐 Аутентифицированный API запрос (идентичные конкурентные запросы объединяются)"""
+        return await self.coalescer.run(
+            endpoint, params, lambda: self._send_authenticated_request(endpoint, dict(params or {}))
+        )
+    
+    async def _send_public_request(self, endpoint: str, params: Optional[Dict] = None) -> Optional[Dict]:
+        """🔓 Отправка публичного запроса"""
+        return await self._send_measured(endpoint, lambda: self.http_client.get(endpoint, params))
+    
+    async def _send_authenticated_request(self, endpoint: str, params: Dict) -> Optional[Dict]:
+        """🔐 Отправка подписанного запроса"""
+        def send() -> Awaitable[Any]:
+            # nonce и подпись - только после разрешения лимитера: запросы,
+            # ждавшие в очереди, уходят с nonce в порядке отправки
+            params["nonce"] = str(self._next_nonce())
             
-            self.rate_limiter.register_success(response_time)
+            # Создаем подпись
+            post_data = "&".join([f"{k}={v}" for k, v in params.items()])
+            signature = hmac.new(
+                self.settings.api_secret.encode(),
+                post_data.encode(),
+                hashlib.sha512
+            ).hexdigest()
             
-            return response.json()
+            headers = {
+                "Key": self.settings.api_key,
+                "Sign": signature,
+                "Content-Type": "application/x-www-form-urlencoded"
+            }
             
-        except Exception as e:
-            self.rate_limiter.register_error(str(e))
-            raise
-    
-    async def _authenticated_request(self, endpoint: str, params: Optional[Dict] = None) -> Optional[Dict]:
-        """🔐 Аутентифицированный API запрос"""
-        if params is None:
-            params = {}
-        
-        # Добавляем nonce
-        params["nonce"] = str(int(time.time() * 1000))
-        
-        # Создаем подпись
-        post_data = "&".join([f"{k}={v}" for k, v in params.items()])
-        signature = hmac.new(
-            self.settings.exmo_api_secret.encode(),
-            post_data.encode(),
-            hashlib.sha512
-        ).hexdigest()
-        
-        headers = {
-            "Key": self.settings.exmo_api_key,
-            "Sign": signature,
-            "Content-Type": "application/x-www-form-urlencoded"
-        }
+            return self.http_client.post(endpoint, data=params, headers=headers)
         
+        return await self._send_measured(endpoint, send)
+    
+    def _next_nonce(self) -> int:
+        """🔢 Строго возрастающий nonce (миллисекунды, но не меньше прошлого + 1)"""
+        with self._nonce_lock:
+            self._last_nonce = max(int(time.time() * 1000), self._last_nonce + 1)
+            return self._last_nonce
+    
+    async def _send_measured(self, endpoint: str, send: Callable[[], Awaitable[Any]]) -> Optional[Dict]:
+        """⏱️ Разрешение лимитера + запрос с записью задержек в гистограммы"""
+        name = endpoint.strip("/")
         try:
+            wait_started = time.perf_counter()
             await self.rate_limiter.acquire_permit(endpoint)
+            start_time = time.perf_counter()
+            self.latency.record_wait(name, start_time - wait_started)
             
-            start_time = time.time()
-            response = await self.http_client.post(endpoint, data=params, headers=headers)
-            response_time = time.time() - start_time
+            try:
+                response = await send()
+            except Exception as e:
+                self.latency.record(name, self._error_status_class(e), time.perf_counter() - start_time)
+                raise
             
+            response_time = time.perf_counter() - start_time
+            self.latency.record(name, status_class(getattr(response, "status_code", 200)), response_time)
             self.rate_limiter.register_success(response_time)
             
-            return response.json()
+            return decode_json(response.content, fast=self._fast_json)
             
         except Exception as e:
-            self.rate_limiter.register_error(str(e))
+            # Класс ответа в начале: лимитер узнает 429 не по тексту сообщения
+            self.rate_limiter.register_error(f"{self._error_status_class(e)} {e}")
             raise
     
+    @staticmethod
+    def _error_status_class(error: Exception) -> str:
+        """Класс ответа по исключению транспорта"""
+        if isinstance(error, RateLimitExceededError):
+            return status_class(429)
+        return status_class(getattr(error, "status_code", None))
+    
     async def _validate_order_params(self, pair: str, quantity: Decimal, price: Decimal, order_type: str) -> None:
         """✅ Валидация параметров ордера"""
         if quantity <= 0:
@@ -488,46 +818,43 @@ class ExmoAPIClient(IExchangeAPI):
         if order_type not in ["buy", "sell"]:
             raise APIError("Тип ордера должен быть 'buy' или 'sell'")
         
-        # Проверяем минимальные значения (можно расширить)
-        if quantity < Trading.MIN_QUANTITY:
-            raise APIError(f"Количество меньше минимального: {Trading.MIN_QUANTITY}")
+        # Лимиты пары из справочника (без обращения к сети)
+        spec = self.pair_registry.get(pair)
+        if spec is not None:
+            error = spec.check(quantity, price)
+            if error:
+                raise APIError(error)
+            return
         
-        if price < Trading.MIN_PRICE:
-            raise APIError(f"Цена меньше минимальной: {Trading.MIN_PRICE}")
-    
-    def _is_cache_valid(self, key: str, ttl_seconds: int) -> bool:
-        """🕒 Проверка валидности кэша"""
-        if key not in self._cache or key not in self._cache_timestamps:
-            return False
+        # Справочник еще не загружен - общие минимальные значения
+        if quantity < MIN_TRADE_AMOUNT:
+            raise APIError(f"Количество меньше минимального: {MIN_TRADE_AMOUNT}")
         
-        age = datetime.now() - self._cache_timestamps[key]
-        return age.total_seconds() < ttl_seconds
-    
-    def _update_cache(self, key: str, value: Any) -> None:
-        """💾 Обновление кэша"""
-        self._cache[key] = value
-        self._cache_timestamps[key] = datetime.now()
+        if price < MIN_PRICE:
+            raise APIError(f"Цена меньше минимальной: {MIN_PRICE}")
     
-    def _invalidate_balance_cache(self) -> None:
-        """🗑️ Инвалидация кэша балансов"""
-        keys_to_remove = [key for key in self._cache.keys() if key.startswith("balance_")]
-        for key in keys_to_remove:
-            self._cache.pop(key, None)
-            self._cache_timestamps.pop(key, None)
+    async def _invalidate_balance_cache(self, pair: Optional[str] = None) -> None:
+        """🗑️ Инвалидация балансов и данных пары во всех пространствах общего кэша"""
+        await self.cache.invalidate_tags(*trade_invalidation_tags(pair))
     
     def get_status(self) -> Dict[str, Any]:
         """📊 Получение статуса API клиента"""
         return {
             "client_type": "ExmoAPIClient",
             "rate_limiter": self.rate_limiter.get_status(),
-            "cache": {
-                "entries": len(self._cache),
-                "cache_keys": list(self._cache.keys())
-            },
+            "cache": self.cache.get_stats(),
+            "ticker_snapshot": self.ticker_snapshot.get_status(),
+            "pair_registry": self.pair_registry.get_status(),
+            "latency": self.latency.get_status(),
+            "coalescing": self.coalescer.get_stats(),
+            "cassette": self.http_client.cassette.get_status() if isinstance(self.http_client, ReplayHTTPClient) else None,
             "settings": {
-                "base_url": self.settings.exmo_base_url,
-                "timeout": self.settings.exmo_timeout,
-                "max_retries": self.settings.exmo_max_retries,
+                "base_url": self.settings.base_url,
+                "http_transport": self.settings.http_transport,
+                "http_cassette_mode": self.settings.http_cassette_mode,
+                "json_decoder": self.settings.json_decoder,
+                "timeout": self.settings.timeout_seconds,
+                "max_retries": self.settings.retry_attempts,
                 "cache_enabled": self.settings.cache_enabled
             }
         }
@@ -538,13 +865,25 @@ class APIClientFactory:
     """🏭 Фабрика API клиентов"""
     
     @staticmethod
-    def create_exmo_client(settings: APISettings) -> ExmoAPIClient:
-        """Создание EXMO клиента"""
-        rate_limiter = RateLimiter(
-            settings.calls_per_minute,
-            settings.calls_per_hour,
+    def create_rate_limiter(settings: APISettings) -> Union[RateLimiter, PriorityRateLimiter]:
+        """Создание rate limiter по настройкам"""
+        if settings.rate_limiter_type == "priority":
+            return PriorityRateLimiter(
+                settings.rate_limit_per_minute,
+                settings.rate_limit_per_hour,
+                settings.adaptive_rate_limiting
+            )
+        
+        return RateLimiter(
+            settings.rate_limit_per_minute,
+            settings.rate_limit_per_hour,
             settings.adaptive_rate_limiting
         )
+    
+    @staticmethod
+    def create_exmo_client(settings: APISettings) -> ExmoAPIClient:
+        """Создание EXMO клиента"""
+        rate_limiter = APIClientFactory.create_rate_limiter(settings)
         
         return ExmoAPIClient(settings, rate_limiter)
     
@@ -0,0 +1,163 @@
+from typing import Dict, Any, List, Optional, Tuple
+
+
+# Логарифмически-линейные корзины (как в HdrHistogram): до SUB_BUCKETS мкс
+# шаг 1 мкс, дальше каждая октава делится на HALF_BUCKETS равных корзин -
+# относительная ошибка не больше 1/HALF_BUCKETS (~3%)
+SUB_BUCKET_BITS = 6
+SUB_BUCKETS = 1 << SUB_BUCKET_BITS
+HALF_BUCKETS = SUB_BUCKETS >> 1
+
+MAX_TRACKED_SECONDS = 120.0
+
+
+def _bucket_index(micros: int) -> int:
+    if micros < SUB_BUCKETS:
+        return micros
+    shift = micros.bit_length() - SUB_BUCKET_BITS
+    return SUB_BUCKETS + (shift - 1) * HALF_BUCKETS + (micros >> shift) - HALF_BUCKETS
+
+
+def _bucket_upper_bound(index: int) -> int:
+    """Верхняя граница корзины в мкс (включительно)"""
+    if index < SUB_BUCKETS:
+        return index
+    shift = (index - SUB_BUCKETS) // HALF_BUCKETS + 1
+    mantissa = (index - SUB_BUCKETS) % HALF_BUCKETS + HALF_BUCKETS
+    return ((mantissa + 1) << shift) - 1
+
+
+class LatencyHistogram:
+    """📊 Гистограмма задержек с фиксированными корзинами
+
+    Запись - O(1) без аллокаций: индекс корзины считается битовыми операциями.
+    Значения больше MAX_TRACKED_SECONDS попадают в последнюю корзину, но max
+    остается точным.
+    """
+
+    __slots__ = ("counts", "count", "total", "min", "max")
+
+    BUCKET_COUNT = _bucket_index(int(MAX_TRACKED_SECONDS * 1_000_000)) + 1
+
+    def __init__(self):
+        self.counts: List[int] = [0] * self.BUCKET_COUNT
+        self.count = 0
+        self.total = 0.0
+        self.min: Optional[float] = None
+        self.max = 0.0
+
+    def record(self, seconds: float) -> None:
+        """Запись одного значения в секундах"""
+        if seconds < 0:
+            seconds = 0.0
+        index = _bucket_index(int(seconds * 1_000_000))
+        if index >= self.BUCKET_COUNT:
+            index = self.BUCKET_COUNT - 1
+        self.counts[index] += 1
+
+        self.count += 1
+        self.total += seconds
+        if self.min is None or seconds < self.min:
+            self.min = seconds
+        if seconds > self.max:
+            self.max = seconds
+
+    def percentiles(self, *targets: float) -> List[float]:
+        """Перцентили в секундах за один проход по корзинам"""
+        if not self.count:
+            return [0.0 for _ in targets]
+
+        ranks = sorted((max(1, int(round(target / 100 * self.count))), i) for i, target in enumerate(targets))
+        values = [0.0] * len(targets)
+        position = 0
+
+        cumulative = 0
+        for index, bucket_count in enumerate(self.counts):
+            if not bucket_count:
+                continue
+            cumulative += bucket_count
+            while position < len(ranks) and cumulative >= ranks[position][0]:
+                # Верхняя граница корзины, но не больше реального максимума
+                values[ranks[position][1]] = min(_bucket_upper_bound(index) / 1_000_000, self.max)
+                position += 1
+            if position == len(ranks):
+                break
+
+        return values
+
+    def summary(self) -> Dict[str, Any]:
+        """📋 count/mean/p50/p90/p99/max в миллисекундах"""
+        p50, p90, p99 = self.percentiles(50, 90, 99)
+        return {
+            "count": self.count,
+            "mean_ms": round(self.total / self.count * 1000, 3) if self.count else 0.0,
+            "min_ms": round((self.min or 0.0) * 1000, 3),
+            "p50_ms": round(p50 * 1000, 3),
+            "p90_ms": round(p90 * 1000, 3),
+            "p99_ms": round(p99 * 1000, 3),
+            "max_ms": round(self.max * 1000, 3)
+        }
+
+    def merge(self, other: 'LatencyHistogram') -> None:
+        """Сложение гистограмм"""
+        for index, bucket_count in enumerate(other.counts):
+            if bucket_count:
+                self.counts[index] += bucket_count
+        self.count += other.count
+        self.total += other.total
+        if other.min is not None and (self.min is None or other.min < self.min):
+            self.min = other.min
+        self.max = max(self.max, other.max)
+
+
+def status_class(status_code: Optional[int]) -> str:
+    """Класс ответа: 2xx/4xx/5xx, 429 отдельно, None - ошибка сети"""
+    if status_code is None:
+        return "network_error"
+    if status_code == 429:
+        return "429"
+    return f"{status_code // 100}xx"
+
+
+class LatencyRecorder:
+    """⏱️ Гистограммы по эндпоинтам: ожидание разрешения лимитера и сетевое время по классам ответа"""
+
+    def __init__(self):
+        self._network: Dict[Tuple[str, str], LatencyHistogram] = {}
+        self._wait: Dict[str, LatencyHistogram] = {}
+
+    def record(self, endpoint: str, response_class: str, seconds: float) -> None:
+        """Сетевое время запроса"""
+        key = (endpoint, response_class)
+        histogram = self._network.get(key)
+        if histogram is None:
+            histogram = self._network[key] = LatencyHistogram()
+        histogram.record(seconds)
+
+    def record_wait(self, endpoint: str, seconds: float) -> None:
+        """Время ожидания разрешения лимитера"""
+        histogram = self._wait.get(endpoint)
+        if histogram is None:
+            histogram = self._wait[endpoint] = LatencyHistogram()
+        histogram.record(seconds)
+
+    def network_histogram(self, endpoint: Optional[str] = None) -> LatencyHistogram:
+        """Сетевое время по эндпоинту (или по всем) без разбивки на классы"""
+        combined = LatencyHistogram()
+        for (name, _), histogram in self._network.items():
+            if endpoint is None or name == endpoint:
+                combined.merge(histogram)
+        return combined
+
+    def reset(self) -> None:
+        self._network.clear()
+        self._wait.clear()
+
+    def get_status(self) -> Dict[str, Any]:
+        """📊 Перцентили по эндпоинтам"""
+        status: Dict[str, Dict[str, Any]] = {}
+        for (endpoint, response_class), histogram in sorted(self._network.items()):
+            status.setdefault(endpoint, {"network": {}})["network"][response_class] = histogram.summary()
+        for endpoint, histogram in sorted(self._wait.items()):
+            status.setdefault(endpoint, {"network": {}})["permit_wait"] = histogram.summary()
+        return status
@@ -0,0 +1,262 @@
+import time
+import asyncio
+import logging
+import threading
+from dataclasses import dataclass
+from decimal import Decimal, ROUND_DOWN, ROUND_HALF_UP, InvalidOperation
+from types import MappingProxyType
+from typing import Dict, Any, Optional, Callable, Mapping
+
+from ...core.exceptions import APIError
+from ...core.cache.tiered_cache import CacheNamespace
+from .decoding import to_decimal, DECIMAL_ZERO
+
+
+# EXMO принимает количество с точностью до 8 знаков
+QUANTITY_PRECISION = 8
+
+
+@dataclass(frozen=True)
+class PairSpec:
+    """📐 Параметры пары из pair_settings с готовыми шагами квантования"""
+    pair: str
+    min_quantity: Decimal
+    max_quantity: Decimal
+    min_price: Decimal
+    max_price: Decimal
+    min_amount: Decimal
+    max_amount: Decimal
+    price_precision: int
+    price_step: Decimal
+    quantity_step: Decimal
+    commission_taker_percent: Decimal = DECIMAL_ZERO
+    commission_maker_percent: Decimal = DECIMAL_ZERO
+
+    @classmethod
+    def from_payload(cls, pair: str, data: Dict[str, Any]) -> 'PairSpec':
+        """Разбор записи pair_settings одной пары"""
+        # 0 - допустимая точность (целые цены), по умолчанию только при отсутствии поля
+        raw_precision = data.get("price_precision")
+        price_precision = 8 if raw_precision is None or raw_precision == "" else int(raw_precision)
+        return cls(
+            pair=pair,
+            min_quantity=to_decimal(data.get("min_quantity")),
+            max_quantity=to_decimal(data.get("max_quantity")),
+            min_price=to_decimal(data.get("min_price")),
+            max_price=to_decimal(data.get("max_price")),
+            min_amount=to_decimal(data.get("min_amount")),
+            max_amount=to_decimal(data.get("max_amount")),
+            price_precision=price_precision,
+            price_step=Decimal(1).scaleb(-price_precision),
+            quantity_step=Decimal(1).scaleb(-QUANTITY_PRECISION),
+            commission_taker_percent=to_decimal(data.get("commission_taker_percent")),
+            commission_maker_percent=to_decimal(data.get("commission_maker_percent"))
+        )
+
+    def round_price(self, price: Decimal, rounding: str = ROUND_HALF_UP) -> Decimal:
+        """Цена с точностью пары"""
+        return price.quantize(self.price_step, rounding)
+
+    def round_quantity(self, quantity: Decimal) -> Decimal:
+        """Количество с точностью биржи (вниз - не превышаем баланс)"""
+        return quantity.quantize(self.quantity_step, ROUND_DOWN)
+
+    def check(self, quantity: Decimal, price: Decimal) -> Optional[str]:
+        """✅ Проверка ордера по лимитам пары; None - ордер допустим
+
+        Нулевой максимум в pair_settings означает отсутствие ограничения.
+        """
+        if quantity < self.min_quantity:
+            return f"Количество {quantity} меньше минимального для {self.pair}: {self.min_quantity}"
+        if self.max_quantity and quantity > self.max_quantity:
+            return f"Количество {quantity} больше максимального для {self.pair}: {self.max_quantity}"
+        if price < self.min_price:
+            return f"Цена {price} меньше минимальной для {self.pair}: {self.min_price}"
+        if self.max_price and price > self.max_price:
+            return f"Цена {price} больше максимальной для {self.pair}: {self.max_price}"
+
+        amount = quantity * price
+        if amount < self.min_amount:
+            return f"Сумма {amount} меньше минимальной для {self.pair}: {self.min_amount}"
+        if self.max_amount and amount > self.max_amount:
+            return f"Сумма {amount} больше максимальной для {self.pair}: {self.max_amount}"
+        return None
+
+
+class PairRegistry:
+    """🗂️ Справочник пар: один запрос pair_settings при старте и фоновое обновление
+
+    Чтение (get) никогда не ходит в сеть; при ошибке обновления остается
+    прежний справочник. С cache ответ pair_settings хранится в общем кэше:
+    после перезапуска (снимок кэша) первая загрузка берется оттуда.
+    """
+
+    CACHE_KEY = "pair_settings"
+
+    def __init__(
+        self,
+        fetcher: Callable[[], Any],
+        refresh_interval: float = 300.0,
+        clock: Callable[[], float] = time.monotonic,
+        cache: Optional[CacheNamespace] = None,
+        cache_ttl: float = 3600.0
+    ):
+        self._fetcher = fetcher
+        self.refresh_interval = refresh_interval
+        self._clock = clock
+        self.cache = cache
+        self.cache_ttl = cache_ttl
+
+        self._specs: Mapping[str, PairSpec] = MappingProxyType({})
+        self.loaded_at: Optional[float] = None
+
+        self._refresh_task: Optional[asyncio.Task] = None
+        self._refresh_thread: Optional[threading.Thread] = None
+        self._stop_event = threading.Event()
+
+        # Статистика
+        self.load_count = 0
+        self.cache_loads = 0
+        self.error_count = 0
+        self.lookups = 0
+        self.misses = 0
+
+        self.logger = logging.getLogger(__name__)
+
+    @property
+    def is_loaded(self) -> bool:
+        return self.loaded_at is not None
+
+    def get(self, pair: str) -> Optional[PairSpec]:
+        """📐 Параметры пары без сетевого запроса"""
+        self.lookups += 1
+        spec = self._specs.get(pair)
+        if spec is None:
+            self.misses += 1
+        return spec
+
+    def __contains__(self, pair: str) -> bool:
+        return pair in self._specs
+
+    def __len__(self) -> int:
+        return len(self._specs)
+
+    # ================= ЗАГРУЗКА =================
+
+    async def refresh(self) -> int:
+        """🔄 Загрузка pair_settings (асинхронный fetcher)"""
+        payload = self._fetcher()
+        if asyncio.iscoroutine(payload):
+            payload = await payload
+        count = self._apply_payload(payload)
+        if self.cache is not None:
+            await self.cache.set(self.CACHE_KEY, payload, ttl=self.cache_ttl)
+        return count
+
+    def refresh_sync(self) -> int:
+        """🔄 Загрузка pair_settings (синхронный fetcher)"""
+        return self._apply_payload(self._fetcher())
+
+    async def start(self) -> None:
+        """▶️ Первая загрузка и фоновое обновление в event loop"""
+        if not await self._load_from_cache():
+            await self._safe_refresh()
+        if self._refresh_task is None or self._refresh_task.done():
+            self._refresh_task = asyncio.create_task(self._refresh_loop())
+
+    async def stop(self) -> None:
+        """⏹️ Остановка фонового обновления"""
+        if self._refresh_task:
+            self._refresh_task.cancel()
+            try:
+                await self._refresh_task
+            except asyncio.CancelledError:
+                pass
+            self._refresh_task = None
+
+    def start_thread(self) -> None:
+        """▶️ Первая загрузка и фоновое обновление в потоке (для синхронного кода)"""
+        self._safe_refresh_sync()
+        if self._refresh_thread is None or not self._refresh_thread.is_alive():
+            self._stop_event.clear()
+            self._refresh_thread = threading.Thread(
+                target=self._refresh_thread_loop, name="pair-registry-refresh", daemon=True
+            )
+            self._refresh_thread.start()
+
+    def stop_thread(self) -> None:
+        """⏹️ Остановка потока обновления"""
+        self._stop_event.set()
+        if self._refresh_thread:
+            self._refresh_thread.join(timeout=5)
+            self._refresh_thread = None
+
+    async def _refresh_loop(self) -> None:
+        while True:
+            await asyncio.sleep(self.refresh_interval)
+            await self._safe_refresh()
+
+    def _refresh_thread_loop(self) -> None:
+        while not self._stop_event.wait(self.refresh_interval):
+            self._safe_refresh_sync()
+
+    async def _load_from_cache(self) -> bool:
+        """📥 Справочник из общего кэша (теплый старт) вместо запроса"""
+        if self.cache is None:
+            return False
+        payload = await self.cache.get(self.CACHE_KEY)
+        if not payload:
+            return False
+        try:
+            self._apply_payload(payload)
+        except APIError:
+            return False
+        self.cache_loads += 1
+        self.logger.info(f"🗂️ Справочник пар из кэша: {len(self._specs)} пар")
+        return True
+
+    async def _safe_refresh(self) -> None:
+        try:
+            await self.refresh()
+        except Exception as e:
+            self._register_error(e)
+
+    def _safe_refresh_sync(self) -> None:
+        try:
+            self.refresh_sync()
+        except Exception as e:
+            self._register_error(e)
+
+    def _register_error(self, error: Exception) -> None:
+        self.error_count += 1
+        self.logger.warning(f"⚠️ Не удалось обновить справочник пар ({len(self._specs)} пар в памяти): {error}")
+
+    def _apply_payload(self, payload: Optional[Dict[str, Any]]) -> int:
+        """🧩 Разбор pair_settings и атомарная замена справочника"""
+        if not payload:
+            raise APIError("Пустой ответ pair_settings")
+
+        specs: Dict[str, PairSpec] = {}
+        for pair, data in payload.items():
+            try:
+                specs[pair] = PairSpec.from_payload(pair, data)
+            except (InvalidOperation, TypeError, ValueError, AttributeError) as e:
+                self.logger.debug(f"Пропускаем некорректную запись pair_settings {pair}: {e}")
+
+        self._specs = MappingProxyType(specs)
+        self.loaded_at = self._clock()
+        self.load_count += 1
+        return len(specs)
+
+    def get_status(self) -> Dict[str, Any]:
+        """📊 Статус справочника"""
+        return {
+            "pairs": len(self._specs),
+            "age_seconds": self._clock() - self.loaded_at if self.loaded_at is not None else None,
+            "refresh_interval": self.refresh_interval,
+            "load_count": self.load_count,
+            "cache_loads": self.cache_loads,
+            "error_count": self.error_count,
+            "lookups": self.lookups,
+            "misses": self.misses
+        }
@@ -0,0 +1,407 @@
+import json
+import time
+import random
+import asyncio
+import logging
+from dataclasses import dataclass
+from datetime import datetime
+from decimal import Decimal, InvalidOperation
+from typing import Dict, Any, Optional, List, Set, Callable, Awaitable, AsyncIterator
+
+try:
+    import aiohttp
+    AIOHTTP_AVAILABLE = True
+except ImportError:
+    AIOHTTP_AVAILABLE = False
+
+from ...core.models import Price
+
+
+@dataclass(frozen=True)
+class PriceTick:
+    """📍 Тик цены из push-потока"""
+    pair: str
+    price: Price
+    bid: Optional[Decimal]
+    ask: Optional[Decimal]
+    timestamp: datetime
+    sequence: Optional[int] = None
+    resynced: bool = False
+
+
+@dataclass
+class StreamStats:
+    """📊 Статистика push-потока"""
+    connections: int = 0
+    reconnects: int = 0
+    resubscriptions: int = 0
+    messages: int = 0
+    ticks: int = 0
+    sequence_gaps: int = 0
+    missed_messages: int = 0
+    out_of_order: int = 0
+    slow_consumer_drops: int = 0
+    resyncs: int = 0
+    last_message_at: Optional[float] = None
+
+
+class ExmoPriceStream:
+    """🌊 Push-поток цен через публичные каналы EXMO WebSocket"""
+
+    TOPIC_PREFIX = "spot/ticker:"
+
+    def __init__(
+        self,
+        ws_url: str,
+        resync: Optional[Callable[[str], Awaitable[Decimal]]] = None,
+        reconnect_max_delay: float = 30.0,
+        heartbeat: float = 20.0,
+        queue_size: int = 100
+    ):
+        if not AIOHTTP_AVAILABLE:
+            raise ImportError("aiohttp не установлен, WebSocket поток цен недоступен")
+
+        self.ws_url = ws_url
+        self.resync = resync
+        self.reconnect_max_delay = reconnect_max_delay
+        self.heartbeat = heartbeat
+        self.queue_size = queue_size
+
+        self._pairs: Set[str] = set()
+        self._queues: Dict[str, List[asyncio.Queue]] = {}
+        self._listeners: List[Callable[[PriceTick], Any]] = []
+        # Подписчики на цену пары: callback регистрируется один раз на пару
+        self._price_callbacks: Dict[str, List[Callable[[Price], Any]]] = {}
+        self._last_sequence: Dict[str, int] = {}
+
+        self._session: Optional["aiohttp.ClientSession"] = None
+        self._ws: Optional["aiohttp.ClientWebSocketResponse"] = None
+        self._task: Optional[asyncio.Task] = None
+        self._running = False
+        self._request_id = 0
+
+        self.stats = StreamStats()
+
+        self.logger = logging.getLogger(__name__)
+
+    # ================= ИНТЕРФЕЙС ПОСТАВЩИКА =================
+
+    async def get_price_stream(self, pair: str) -> AsyncIterator[Price]:
+        """🌊 Поток цен: каждый потребитель получает свою очередь"""
+        queue: asyncio.Queue = asyncio.Queue(maxsize=self.queue_size)
+        self._queues.setdefault(pair, []).append(queue)
+
+        try:
+            await self.subscribe(pair)
+            while True:
+                tick = await queue.get()
+                yield tick.price
+        finally:
+            self._queues[pair].remove(queue)
+            if not self._queues[pair]:
+                del self._queues[pair]
+
+    async def subscribe_to_price_updates(
+        self,
+        pair: str,
+        callback: Callable[[Price], Any]
+    ) -> Callable[[], Awaitable[None]]:
+        """🔔 Подписка на цены пары через callback
+
+        Повторная подписка той же пары и callback ничего не добавляет.
+        Возвращает корутинную функцию отписки.
+        """
+        callbacks = self._price_callbacks.setdefault(pair, [])
+        if callback not in callbacks:
+            callbacks.append(callback)
+        await self.subscribe(pair)
+
+        async def unsubscribe() -> None:
+            await self.unsubscribe_from_price_updates(pair, callback)
+
+        return unsubscribe
+
+    async def unsubscribe_from_price_updates(self, pair: str, callback: Callable[[Price], Any]) -> None:
+        """🔕 Отписка callback (канал пары остается - его читают и другие потребители)"""
+        callbacks = self._price_callbacks.get(pair)
+        if callbacks and callback in callbacks:
+            callbacks.remove(callback)
+            if not callbacks:
+                del self._price_callbacks[pair]
+
+    def add_listener(self, callback: Callable[[PriceTick], Any]) -> None:
+        """👂 Слушатель всех тиков (синхронный или корутина)"""
+        self._listeners.append(callback)
+
+    # ================= УПРАВЛЕНИЕ ПОДКЛЮЧЕНИЕМ =================
+
+    async def start(self) -> None:
+        """🚀 Запуск цикла подключения"""
+        if self._running:
+            return
+
+        self._running = True
+        self._session = aiohttp.ClientSession()
+        self._task = asyncio.ensure_future(self._connection_loop())
+
+    async def stop(self) -> None:
+        """🛑 Остановка потока"""
+        self._running = False
+
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+        if self._session:
+            await self._session.close()
+            self._session = None
+
+    async def subscribe(self, pair: str) -> None:
+        """➕ Подписка на пару (переживает переподключения)"""
+        if pair in self._pairs:
+            return
+
+        self._pairs.add(pair)
+        await self.start()
+
+        if self._ws is not None and not self._ws.closed:
+            await self._send_subscription("subscribe", [pair])
+
+    async def unsubscribe(self, pair: str) -> None:
+        """➖ Отписка от пары"""
+        if pair not in self._pairs:
+            return
+
+        self._pairs.discard(pair)
+        self._last_sequence.pop(pair, None)
+
+        if self._ws is not None and not self._ws.closed:
+            await self._send_subscription("unsubscribe", [pair])
+
+    @property
+    def is_connected(self) -> bool:
+        """Есть ли активное соединение"""
+        return self._ws is not None and not self._ws.closed
+
+    async def _connection_loop(self) -> None:
+        """🔁 Подключение с переподключением и повторной подпиской"""
+        delay = 1.0
+
+        while self._running:
+            try:
+                async with self._session.ws_connect(self.ws_url, heartbeat=self.heartbeat) as ws:
+                    self._ws = ws
+                    delay = 1.0
+                    await self._on_connected()
+
+                    async for message in ws:
+                        if message.type == aiohttp.WSMsgType.TEXT:
+                            await self._handle_message(json.loads(message.data))
+                        elif message.type in (aiohttp.WSMsgType.CLOSED, aiohttp.WSMsgType.ERROR):
+                            break
+
+                self.logger.warning("⚠️ WebSocket соединение закрыто сервером")
+
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                self.logger.warning(f"⚠️ Ошибка WebSocket соединения: {e}")
+            finally:
+                self._ws = None
+
+            if not self._running:
+                break
+
+            # Экспоненциальная задержка с джиттером, чтобы не переподключаться синхронно
+            await asyncio.sleep(delay * random.uniform(0.5, 1.0))
+            delay = min(delay * 2, self.reconnect_max_delay)
+
+    async def _on_connected(self) -> None:
+        """🔌 Новая сессия: повторная подписка и досинхронизация"""
+        reconnect = self.stats.connections > 0
+        self.stats.connections += 1
+        if reconnect:
+            self.stats.reconnects += 1
+
+        # Нумерация сообщений начинается заново в каждой сессии
+        self._last_sequence.clear()
+
+        if not self._pairs:
+            return
+
+        await self._send_subscription("subscribe", sorted(self._pairs))
+
+        if reconnect:
+            self.stats.resubscriptions += len(self._pairs)
+            self.logger.info(f"🔁 Переподключение: повторная подписка на {len(self._pairs)} пар")
+
+            # Пока соединения не было, тики пропущены - берем текущую цену из REST
+            for pair in sorted(self._pairs):
+                await self._resync_pair(pair)
+
+    async def _send_subscription(self, method: str, pairs: List[str]) -> None:
+        """📨 Отправка subscribe/unsubscribe"""
+        self._request_id += 1
+        await self._ws.send_json({
+            "id": self._request_id,
+            "method": method,
+            "topics": [f"{self.TOPIC_PREFIX}{pair}" for pair in pairs]
+        })
+
+    # ================= ОБРАБОТКА СООБЩЕНИЙ =================
+
+    async def _handle_message(self, message: Dict[str, Any]) -> None:
+        """📥 Разбор сообщения канала"""
+        self.stats.messages += 1
+        self.stats.last_message_at = time.monotonic()
+
+        event = message.get("event")
+        if event == "error":
+            self.logger.error(f"❌ Ошибка WebSocket канала: {message.get('message')}")
+            return
+
+        if event not in ("update", "snapshot"):
+            return
+
+        topic = message.get("topic", "")
+        if not topic.startswith(self.TOPIC_PREFIX):
+            return
+
+        pair = topic[len(self.TOPIC_PREFIX):]
+        if pair not in self._pairs:
+            return
+
+        sequence = message.get("seq")
+        if sequence is not None and not self._check_sequence(pair, int(sequence)):
+            return
+
+        tick = self._parse_tick(pair, message.get("data") or {}, message.get("ts"), sequence)
+        if tick is not None:
+            await self._dispatch(tick)
+
+    def _check_sequence(self, pair: str, sequence: int) -> bool:
+        """🔢 Проверка разрывов нумерации; False - сообщение устарело"""
+        last = self._last_sequence.get(pair)
+
+        if last is not None and sequence <= last:
+            self.stats.out_of_order += 1
+            return False
+
+        if last is not None and sequence > last + 1:
+            # Ticker несет полное состояние, поэтому разрыв не портит цену,
+            # но означает пропущенные тики - фиксируем для мониторинга
+            missed = sequence - last - 1
+            self.stats.sequence_gaps += 1
+            self.stats.missed_messages += missed
+            self.logger.warning(f"⚠️ Разрыв последовательности {pair}: пропущено {missed} сообщений")
+
+        self._last_sequence[pair] = sequence
+        return True
+
+    def _parse_tick(
+        self,
+        pair: str,
+        data: Dict[str, Any],
+        ts: Optional[int],
+        sequence: Optional[int]
+    ) -> Optional[PriceTick]:
+        """🔄 Преобразование данных ticker в тик"""
+        try:
+            value = Decimal(str(data["last_trade"]))
+            bid = Decimal(str(data["buy_price"])) if "buy_price" in data else None
+            ask = Decimal(str(data["sell_price"])) if "sell_price" in data else None
+        except (KeyError, InvalidOperation) as e:
+            self.logger.warning(f"⚠️ Некорректный тик {pair}: {e}")
+            return None
+
+        timestamp = datetime.fromtimestamp(ts / 1000) if ts else datetime.now()
+        quote_currency = pair.split("_")[-1]
+
+        return PriceTick(
+            pair=pair,
+            price=Price(value=value, currency=quote_currency),
+            bid=bid,
+            ask=ask,
+            timestamp=timestamp,
+            sequence=sequence
+        )
+
+    async def _resync_pair(self, pair: str) -> None:
+        """🩹 Досинхронизация пары через REST"""
+        if self.resync is None:
+            return
+
+        try:
+            value = await self.resync(pair)
+        except Exception as e:
+            self.logger.warning(f"⚠️ Не удалось досинхронизировать {pair}: {e}")
+            return
+
+        self.stats.resyncs += 1
+        await self._dispatch(PriceTick(
+            pair=pair,
+            price=Price(value=Decimal(str(value)), currency=pair.split("_")[-1]),
+            bid=None,
+            ask=None,
+            timestamp=datetime.now(),
+            resynced=True
+        ))
+
+    async def _dispatch(self, tick: PriceTick) -> None:
+        """📤 Раздача тика очередям потребителей и слушателям"""
+        self.stats.ticks += 1
+
+        for queue in self._queues.get(tick.pair, []):
+            if queue.full():
+                # Медленный потребитель получает самую свежую цену, старые отбрасываются
+                queue.get_nowait()
+                self.stats.slow_consumer_drops += 1
+            queue.put_nowait(tick)
+
+        for listener in self._listeners:
+            try:
+                result = listener(tick)
+                if asyncio.iscoroutine(result):
+                    await result
+            except Exception as e:
+                self.logger.error(f"❌ Ошибка в слушателе потока цен: {e}")
+
+        # Копия: callback может отписаться во время раздачи
+        for callback in list(self._price_callbacks.get(tick.pair, ())):
+            try:
+                result = callback(tick.price)
+                if asyncio.iscoroutine(result):
+                    await result
+            except Exception as e:
+                self.logger.error(f"❌ Ошибка в подписчике цен {tick.pair}: {e}")
+
+    def get_status(self) -> Dict[str, Any]:
+        """📊 Статус потока"""
+        last_message_age = (
+            time.monotonic() - self.stats.last_message_at
+            if self.stats.last_message_at is not None else None
+        )
+
+        return {
+            "url": self.ws_url,
+            "connected": self.is_connected,
+            "pairs": sorted(self._pairs),
+            "consumers": sum(len(queues) for queues in self._queues.values()),
+            "listeners": len(self._listeners),
+            "price_callbacks": sum(len(callbacks) for callbacks in self._price_callbacks.values()),
+            "connections": self.stats.connections,
+            "reconnects": self.stats.reconnects,
+            "resubscriptions": self.stats.resubscriptions,
+            "messages": self.stats.messages,
+            "ticks": self.stats.ticks,
+            "sequence_gaps": self.stats.sequence_gaps,
+            "missed_messages": self.stats.missed_messages,
+            "out_of_order": self.stats.out_of_order,
+            "slow_consumer_drops": self.stats.slow_consumer_drops,
+            "resyncs": self.stats.resyncs,
+            "last_message_age_seconds": last_message_age
+        }
@@ -0,0 +1,365 @@
+import time
+import asyncio
+import logging
+from collections import deque
+from dataclasses import dataclass, field
+from datetime import datetime
+from enum import Enum
+from typing import Dict, Optional, List, Callable, Awaitable, Any
+
+
+@dataclass
+class APIMetrics:
+    """📊 Метрики API"""
+    total_requests: int = 0
+    successful_requests: int = 0
+    failed_requests: int = 0
+    average_response_time: float = 0.0
+    rate_limit_hits: int = 0
+    last_request_time: datetime = field(default_factory=datetime.now)
+    
+    @property
+    def success_rate(self) -> float:
+        """Процент успешных запросов"""
+        if self.total_requests == 0:
+            return 100.0
+        return (self.successful_requests / self.total_requests) * 100
+    
+    @property
+    def error_rate(self) -> float:
+        """Процент ошибочных запросов"""
+        return 100.0 - self.success_rate
+
+
+class EndpointClass(Enum):
+    """🚦 Классы эндпоинтов в порядке приоритета"""
+    TRADING = "trading"
+    ACCOUNT = "account"
+    MARKET_DATA = "market_data"
+    HISTORY = "history"
+
+
+@dataclass
+class LaneState:
+    """🛣️ Полоса приоритетного лимитера: свой token bucket и очередь ожидающих"""
+    endpoint_class: EndpointClass
+    rate: float
+    capacity: float
+    tokens: float
+    waiters: deque = field(default_factory=deque)
+    granted: int = 0
+    delayed: int = 0
+    total_wait: float = 0.0
+    max_wait: float = 0.0
+
+
+class PriorityRateLimiter:
+    """🚦 Token bucket лимитер с приоритетными полосами
+
+    Бюджет calls_per_minute делится между полосами по весам: каждая полоса
+    пополняется своей долей и держит свой резерв. Переполнение полосы
+    перетекает вниз по приоритету, поэтому простаивающий бюджет не теряется.
+    Полоса может занимать токены у менее приоритетных полос, но не у более
+    приоритетных, а ожидающие обслуживаются по приоритету, а не по времени
+    прихода. Часы и sleep подменяемые - для детерминированной проверки на
+    виртуальном времени.
+    """
+
+    EPSILON = 1e-9
+
+    ENDPOINT_CLASSES: Dict[str, EndpointClass] = {
+        "order_create": EndpointClass.TRADING,
+        "order_cancel": EndpointClass.TRADING,
+        "stop_market_order_create": EndpointClass.TRADING,
+        "stop_market_order_cancel": EndpointClass.TRADING,
+        "user_info": EndpointClass.ACCOUNT,
+        "user_open_orders": EndpointClass.ACCOUNT,
+        "required_amount": EndpointClass.ACCOUNT,
+        "ticker": EndpointClass.MARKET_DATA,
+        "order_book": EndpointClass.MARKET_DATA,
+        "trades": EndpointClass.MARKET_DATA,
+        "pair_settings": EndpointClass.MARKET_DATA,
+        "currency": EndpointClass.MARKET_DATA,
+        "user_trades": EndpointClass.HISTORY,
+        "user_cancelled_orders": EndpointClass.HISTORY,
+        "order_trades": EndpointClass.HISTORY,
+        "candles_history": EndpointClass.HISTORY,
+        "wallet_history": EndpointClass.HISTORY,
+    }
+
+    DEFAULT_SHARES: Dict[EndpointClass, float] = {
+        EndpointClass.TRADING: 0.4,
+        EndpointClass.ACCOUNT: 0.25,
+        EndpointClass.MARKET_DATA: 0.25,
+        EndpointClass.HISTORY: 0.1,
+    }
+
+    def __init__(
+        self,
+        calls_per_minute: int = 30,
+        calls_per_hour: int = 300,
+        adaptive: bool = True,
+        shares: Optional[Dict[EndpointClass, float]] = None,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], Awaitable[None]] = asyncio.sleep
+    ):
+        self.calls_per_minute = calls_per_minute
+        self.calls_per_hour = calls_per_hour
+        self.adaptive = adaptive
+        self._clock = clock
+        self._sleep = sleep
+
+        # Полосы в порядке приоритета
+        shares = shares or self.DEFAULT_SHARES
+        total_share = sum(shares.values())
+        total_rate = calls_per_minute / 60
+
+        self._order: List[EndpointClass] = list(EndpointClass)
+        self.lanes: Dict[EndpointClass, LaneState] = {}
+        for endpoint_class in self._order:
+            share = shares.get(endpoint_class, 0.0) / total_share
+            capacity = max(1.0, calls_per_minute * share)
+            self.lanes[endpoint_class] = LaneState(
+                endpoint_class=endpoint_class,
+                rate=total_rate * share,
+                capacity=capacity,
+                tokens=capacity
+            )
+
+        # Общий часовой бюджет
+        self.hour_rate = calls_per_hour / 3600
+        self.hour_tokens = float(calls_per_hour)
+
+        self._last_refill = clock()
+        self._dispatcher: Optional[asyncio.Task] = None
+
+        # Адаптивное управление
+        self.adaptive_delay = 0.0
+        self.error_count = 0
+        self.last_error_time = 0.0
+        self._paused_until = 0.0
+
+        # Статистика
+        self.metrics = APIMetrics()
+
+        self.logger = logging.getLogger(__name__)
+
+    def classify(self, endpoint: str) -> EndpointClass:
+        """🏷️ Класс эндпоинта"""
+        return self.ENDPOINT_CLASSES.get(endpoint.strip('/'), EndpointClass.MARKET_DATA)
+
+    async def acquire_permit(self, endpoint: str = "unknown") -> float:
+        """🎫 Получение разрешения на запрос"""
+        lane = self.lanes[self.classify(endpoint)]
+        self._refill()
+
+        # Быстрый путь: нет более приоритетных ожидающих и есть токен
+        if not self._has_waiters(up_to=lane.endpoint_class) and self._try_take(lane):
+            lane.granted += 1
+            return 0.0
+
+        started = self._clock()
+        future = asyncio.get_running_loop().create_future()
+        lane.waiters.append(future)
+        lane.delayed += 1
+        self._ensure_dispatcher()
+
+        await future
+
+        waited = self._clock() - started
+        lane.granted += 1
+        lane.total_wait += waited
+        lane.max_wait = max(lane.max_wait, waited)
+
+        if waited > 0:
+            self.logger.debug(f"⏳ Rate limit: ожидание {waited:.1f}с для {endpoint}")
+
+        return waited
+
+    def register_success(self, response_time: float) -> None:
+        """✅ Регистрация успешного запроса"""
+        self.metrics.successful_requests += 1
+        self.metrics.total_requests += 1
+        self.metrics.last_request_time = datetime.now()
+
+        # Обновляем среднее время ответа
+        total_time = self.metrics.average_response_time * (self.metrics.successful_requests - 1)
+        self.metrics.average_response_time = (total_time + response_time) / self.metrics.successful_requests
+
+        # Уменьшаем адаптивную задержку при успешных запросах
+        if self.adaptive and self.adaptive_delay > 0:
+            self.adaptive_delay = max(0, self.adaptive_delay - 0.1)
+
+    def register_error(self, error_type: str) -> None:
+        """❌ Регистрация ошибки"""
+        self.metrics.failed_requests += 1
+        self.metrics.total_requests += 1
+        self.metrics.last_request_time = datetime.now()
+
+        if "rate_limit" in error_type.lower() or "429" in error_type:
+            self.metrics.rate_limit_hits += 1
+            self.error_count += 1
+            self.last_error_time = self._clock()
+
+            # 429 запросов, отправленных до начала паузы, ее не наращивают
+            if self.adaptive and self.last_error_time >= self._paused_until:
+                # Пауза для всех полос кроме торговой: ордера не должны ждать аналитику
+                self.adaptive_delay = min(30.0, self.adaptive_delay + 2.0)
+                self._paused_until = self.last_error_time + self.adaptive_delay
+                self.logger.warning(f"🚨 Rate limit hit, пауза неторговых запросов {self.adaptive_delay:.1f}с")
+
+    def _refill(self) -> None:
+        """🪣 Пополнение полос с переливом излишка вниз по приоритету"""
+        now = self._clock()
+        elapsed = now - self._last_refill
+        if elapsed <= 0:
+            return
+        self._last_refill = now
+
+        self.hour_tokens = min(float(self.calls_per_hour), self.hour_tokens + elapsed * self.hour_rate)
+
+        overflow = 0.0
+        for endpoint_class in self._order:
+            lane = self.lanes[endpoint_class]
+            lane.tokens += elapsed * lane.rate + overflow
+            overflow = max(0.0, lane.tokens - lane.capacity)
+            lane.tokens -= overflow
+
+    def _try_take(self, lane: LaneState) -> bool:
+        """🎟️ Взять токен своей полосы или занять у менее приоритетных"""
+        if self.hour_tokens < 1 - self.EPSILON:
+            return False
+
+        if lane.endpoint_class is not EndpointClass.TRADING and self._clock() < self._paused_until:
+            return False
+
+        start = self._order.index(lane.endpoint_class)
+        for endpoint_class in self._order[start:]:
+            bucket = self.lanes[endpoint_class]
+            if bucket.tokens >= 1 - self.EPSILON:
+                bucket.tokens -= 1
+                self.hour_tokens -= 1
+                return True
+
+        return False
+
+    def _has_waiters(self, up_to: Optional[EndpointClass] = None) -> bool:
+        """Есть ли ожидающие в полосах с приоритетом не ниже up_to"""
+        classes = self._order if up_to is None else self._order[:self._order.index(up_to) + 1]
+        return any(
+            not future.done()
+            for endpoint_class in classes
+            for future in self.lanes[endpoint_class].waiters
+        )
+
+    def _ensure_dispatcher(self) -> None:
+        """🚀 Запуск диспетчера ожидающих"""
+        if self._dispatcher is None or self._dispatcher.done():
+            self._dispatcher = asyncio.ensure_future(self._dispatch_loop())
+
+    async def _dispatch_loop(self) -> None:
+        """🔄 Выдача разрешений ожидающим строго по приоритету"""
+        while True:
+            self._refill()
+            self._grant_waiters()
+
+            if not self._has_waiters():
+                break
+
+            await self._sleep(self._next_delay())
+
+    def _grant_waiters(self) -> None:
+        """🎟️ Выдача токенов ожидающим от высокого приоритета к низкому"""
+        for endpoint_class in self._order:
+            lane = self.lanes[endpoint_class]
+            while lane.waiters:
+                future = lane.waiters[0]
+                if future.done():
+                    lane.waiters.popleft()
+                    continue
+
+                # Если более приоритетной полосе токена нет, менее приоритетным тоже
+                if not self._try_take(lane):
+                    return
+
+                lane.waiters.popleft()
+                future.set_result(None)
+
+    def _next_delay(self) -> float:
+        """⏱️ Время до появления токена для самой приоритетной ожидающей полосы"""
+        index = next(
+            i for i, endpoint_class in enumerate(self._order)
+            if any(not f.done() for f in self.lanes[endpoint_class].waiters)
+        )
+
+        # Токен берется целиком из одной полосы (своей или менее приоритетной),
+        # поэтому ждем, пока хотя бы в одной из них накопится 1. Заполненная
+        # полоса передает весь свой приток следующей.
+        delay = float('inf')
+        overflow = 0.0
+        for i, endpoint_class in enumerate(self._order):
+            lane = self.lanes[endpoint_class]
+            inflow = lane.rate + overflow
+            full = lane.tokens >= lane.capacity - self.EPSILON
+            overflow = inflow if full else 0.0
+
+            if i < index:
+                continue
+            if lane.tokens >= 1 - self.EPSILON:
+                delay = 0.0
+            elif inflow > 0:
+                delay = min(delay, (1 - lane.tokens) / inflow)
+
+        if delay == float('inf'):
+            delay = 1.0
+
+        if self.hour_tokens < 1:
+            delay = max(delay, (1 - self.hour_tokens) / self.hour_rate)
+
+        if self._order[index] is not EndpointClass.TRADING:
+            delay = max(delay, self._paused_until - self._clock())
+
+        return max(delay, self.EPSILON)
+
+    def get_status(self) -> Dict[str, Any]:
+        """📊 Получение статуса rate limiter"""
+        self._refill()
+        current_time = self._clock()
+
+        return {
+            "limits": {
+                "calls_per_minute": self.calls_per_minute,
+                "calls_per_hour": self.calls_per_hour
+            },
+            "current_load": {
+                "hour_tokens_left": self.hour_tokens,
+                "load_percentage_hour": (1 - self.hour_tokens / self.calls_per_hour) * 100
+            },
+            "lanes": {
+                endpoint_class.value: {
+                    "tokens": lane.tokens,
+                    "capacity": lane.capacity,
+                    "rate_per_minute": lane.rate * 60,
+                    "waiting": sum(1 for f in lane.waiters if not f.done()),
+                    "granted": lane.granted,
+                    "delayed": lane.delayed,
+                    "average_wait": lane.total_wait / lane.delayed if lane.delayed else 0.0,
+                    "max_wait": lane.max_wait
+                }
+                for endpoint_class, lane in self.lanes.items()
+            },
+            "adaptive": {
+                "enabled": self.adaptive,
+                "current_delay": self.adaptive_delay,
+                "paused_for": max(0.0, self._paused_until - current_time),
+                "error_count": self.error_count,
+                "minutes_since_last_error": (current_time - self.last_error_time) / 60 if self.last_error_time > 0 else None
+            },
+            "metrics": {
+                "total_requests": self.metrics.total_requests,
+                "success_rate": self.metrics.success_rate,
+                "error_rate": self.metrics.error_rate,
+                "average_response_time": self.metrics.average_response_time,
+                "rate_limit_hits": self.metrics.rate_limit_hits
+            }
+        }
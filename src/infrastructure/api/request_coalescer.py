@@ -0,0 +1,128 @@
+import asyncio
+import logging
+from dataclasses import dataclass
+from typing import Dict, Any, Optional, Callable, Awaitable, Iterable, Tuple
+
+
+# Эндпоинты только на чтение: повтор идентичного запроса дает тот же ответ.
+# order_create/order_cancel сюда не входят никогда.
+COALESCABLE_ENDPOINTS = frozenset({
+    "ticker",
+    "order_book",
+    "trades",
+    "pair_settings",
+    "currency",
+    "user_info",
+    "user_open_orders",
+    "user_trades",
+})
+
+# Параметры, которые не влияют на ответ и не участвуют в ключе
+IGNORED_PARAMS = frozenset({"nonce"})
+
+
+@dataclass
+class CoalescingStats:
+    """📊 Статистика объединения запросов по эндпоинту"""
+    issued: int = 0
+    coalesced: int = 0
+    failed: int = 0
+
+    @property
+    def total(self) -> int:
+        """Всего обращений"""
+        return self.issued + self.coalesced
+
+    @property
+    def saved_percent(self) -> float:
+        """Процент сэкономленных запросов"""
+        return (self.coalesced / self.total * 100) if self.total > 0 else 0.0
+
+
+class RequestCoalescer:
+    """🔗 Single-flight: конкурентные идентичные запросы ждут один и тот же future"""
+
+    def __init__(self, coalescable_endpoints: Optional[Iterable[str]] = None):
+        self.coalescable_endpoints = frozenset(
+            coalescable_endpoints if coalescable_endpoints is not None else COALESCABLE_ENDPOINTS
+        )
+
+        self._in_flight: Dict[Tuple, asyncio.Future] = {}
+        self.stats: Dict[str, CoalescingStats] = {}
+
+        self.logger = logging.getLogger(__name__)
+
+    async def run(
+        self,
+        endpoint: str,
+        params: Optional[Dict[str, Any]],
+        factory: Callable[[], Awaitable[Any]]
+    ) -> Any:
+        """🎯 Выполнение запроса с объединением идентичных"""
+        stats = self.stats.setdefault(endpoint, CoalescingStats())
+
+        if endpoint not in self.coalescable_endpoints:
+            stats.issued += 1
+            return await factory()
+
+        key = self.make_key(endpoint, params)
+        future = self._in_flight.get(key)
+
+        if future is not None:
+            stats.coalesced += 1
+            self.logger.debug(f"🔗 Запрос {endpoint} объединен с выполняющимся")
+            return await asyncio.shield(future)
+
+        stats.issued += 1
+        future = asyncio.ensure_future(factory())
+        self._in_flight[key] = future
+        future.add_done_callback(lambda done: self._on_done(key, endpoint, done))
+
+        # shield: отмена одного ожидающего не отменяет запрос для остальных
+        return await asyncio.shield(future)
+
+    @staticmethod
+    def make_key(endpoint: str, params: Optional[Dict[str, Any]]) -> Tuple:
+        """🔑 Ключ запроса: эндпоинт + нормализованные параметры"""
+        if not params:
+            return (endpoint,)
+        return (endpoint,) + tuple(sorted(
+            (name, str(value)) for name, value in params.items()
+            if name not in IGNORED_PARAMS
+        ))
+
+    @property
+    def in_flight_count(self) -> int:
+        """Количество выполняющихся запросов"""
+        return len(self._in_flight)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """📊 Статистика по эндпоинтам"""
+        issued = sum(s.issued for s in self.stats.values())
+        coalesced = sum(s.coalesced for s in self.stats.values())
+        total = issued + coalesced
+
+        return {
+            "in_flight": len(self._in_flight),
+            "issued": issued,
+            "coalesced": coalesced,
+            "saved_percent": (coalesced / total * 100) if total > 0 else 0.0,
+            "endpoints": {
+                endpoint: {
+                    "issued": s.issued,
+                    "coalesced": s.coalesced,
+                    "failed": s.failed,
+                    "saved_percent": s.saved_percent
+                }
+                for endpoint, s in self.stats.items()
+            }
+        }
+
+    def _on_done(self, key: Tuple, endpoint: str, future: asyncio.Future) -> None:
+        """🧹 Снятие завершенного запроса из таблицы выполняющихся"""
+        if self._in_flight.get(key) is future:
+            del self._in_flight[key]
+
+        # Помечаем исключение как полученное, даже если все ожидающие отменены
+        if not future.cancelled() and future.exception() is not None:
+            self.stats[endpoint].failed += 1
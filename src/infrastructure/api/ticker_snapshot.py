@@ -0,0 +1,201 @@
+import time
+import asyncio
+import logging
+from dataclasses import dataclass, field
+from decimal import Decimal, InvalidOperation
+from types import MappingProxyType
+from typing import Dict, Any, Optional, Callable, Mapping, FrozenSet, NamedTuple
+
+from ...core.exceptions import APIError
+from .decoding import to_decimal, DECIMAL_ZERO
+
+
+class TickerQuote(NamedTuple):
+    """💱 Котировка одной пары из ticker (кортеж без __dict__: ~в 2 раза меньше памяти)"""
+    pair: str
+    last_trade: Decimal
+    buy_price: Decimal
+    sell_price: Decimal
+    high: Decimal = DECIMAL_ZERO
+    low: Decimal = DECIMAL_ZERO
+    avg: Decimal = DECIMAL_ZERO
+    vol: Decimal = DECIMAL_ZERO
+    vol_curr: Decimal = DECIMAL_ZERO
+    updated: int = 0
+
+    @classmethod
+    def from_payload(cls, pair: str, data: Dict[str, Any]) -> 'TickerQuote':
+        """Разбор записи ticker одной пары"""
+        get = data.get
+        return cls(
+            pair,
+            to_decimal(get("last_trade")),
+            to_decimal(get("buy_price")),
+            to_decimal(get("sell_price")),
+            to_decimal(get("high")),
+            to_decimal(get("low")),
+            to_decimal(get("avg")),
+            to_decimal(get("vol")),
+            to_decimal(get("vol_curr")),
+            int(get("updated") or 0)
+        )
+
+    @property
+    def price_key(self) -> tuple:
+        """Ценовые поля, изменение которых поднимает версию снимка"""
+        return (self.last_trade, self.buy_price, self.sell_price)
+
+
+@dataclass(frozen=True)
+class TickerTable:
+    """📋 Неизменяемый снимок всего рынка, индексированный по паре"""
+    quotes: Mapping[str, TickerQuote]
+    version: int
+    fetched_at: float
+    changed_pairs: FrozenSet[str] = field(default_factory=frozenset)
+
+    def get(self, pair: str) -> Optional[TickerQuote]:
+        """Котировка пары или None"""
+        return self.quotes.get(pair)
+
+    def price(self, pair: str) -> Decimal:
+        """Последняя цена пары"""
+        quote = self.quotes.get(pair)
+        if quote is None:
+            raise APIError(f"Пара {pair} не найдена в ticker данных")
+        return quote.last_trade
+
+    def __contains__(self, pair: str) -> bool:
+        return pair in self.quotes
+
+    def __len__(self) -> int:
+        return len(self.quotes)
+
+
+class TickerSnapshot:
+    """📸 Общий снимок ticker: один запрос на окно обновления для всех пар"""
+
+    def __init__(
+        self,
+        fetcher: Callable[[], Any],
+        refresh_interval: float = 2.0,
+        clock: Callable[[], float] = time.monotonic
+    ):
+        self._fetcher = fetcher
+        self.refresh_interval = refresh_interval
+        self._clock = clock
+
+        self._table: Optional[TickerTable] = None
+        self._refresh_task: Optional[asyncio.Future] = None
+
+        # Статистика
+        self.fetch_count = 0
+        self.read_count = 0
+
+        self.logger = logging.getLogger(__name__)
+
+    @property
+    def version(self) -> int:
+        """Версия цен: растет только при реальном изменении котировок"""
+        return self._table.version if self._table else 0
+
+    def peek(self) -> Optional[TickerTable]:
+        """👀 Текущий снимок без сетевого запроса"""
+        return self._table
+
+    def is_fresh(self) -> bool:
+        """Снимок в пределах окна обновления"""
+        return (
+            self._table is not None
+            and self._clock() - self._table.fetched_at < self.refresh_interval
+        )
+
+    async def get_table(self) -> TickerTable:
+        """📋 Актуальный снимок (асинхронный fetcher)"""
+        self.read_count += 1
+        if self.is_fresh():
+            return self._table
+
+        # Конкурентные читатели ждут одно и то же обновление
+        if self._refresh_task is None or self._refresh_task.done():
+            self._refresh_task = asyncio.ensure_future(self._refresh())
+
+        return await asyncio.shield(self._refresh_task)
+
+    def get_table_sync(self) -> TickerTable:
+        """📋 Актуальный снимок (синхронный fetcher)"""
+        self.read_count += 1
+        if self.is_fresh():
+            return self._table
+
+        self.fetch_count += 1
+        return self._apply_payload(self._fetcher())
+
+    async def get_quote(self, pair: str) -> Optional[TickerQuote]:
+        """💱 Котировка пары"""
+        return (await self.get_table()).get(pair)
+
+    async def get_price(self, pair: str) -> Decimal:
+        """💱 Последняя цена пары"""
+        return (await self.get_table()).price(pair)
+
+    def invalidate(self) -> None:
+        """🗑️ Принудительное обновление при следующем чтении"""
+        if self._table is not None:
+            self._table = TickerTable(
+                quotes=self._table.quotes,
+                version=self._table.version,
+                fetched_at=float('-inf'),
+                changed_pairs=self._table.changed_pairs
+            )
+
+    def get_status(self) -> Dict[str, Any]:
+        """📊 Статус снимка"""
+        return {
+            "version": self.version,
+            "pairs": len(self._table) if self._table else 0,
+            "age_seconds": self._clock() - self._table.fetched_at if self._table else None,
+            "refresh_interval": self.refresh_interval,
+            "fetch_count": self.fetch_count,
+            "read_count": self.read_count
+        }
+
+    async def _refresh(self) -> TickerTable:
+        """🔄 Загрузка и разбор ticker"""
+        self.fetch_count += 1
+        payload = self._fetcher()
+        if asyncio.iscoroutine(payload):
+            payload = await payload
+        return self._apply_payload(payload)
+
+    def _apply_payload(self, payload: Optional[Dict[str, Any]]) -> TickerTable:
+        """🧩 Разбор ответа ticker и публикация новой версии"""
+        if not payload:
+            raise APIError("Пустой ответ ticker")
+
+        quotes: Dict[str, TickerQuote] = {}
+        for pair, data in payload.items():
+            try:
+                quotes[pair] = TickerQuote.from_payload(pair, data)
+            except (InvalidOperation, TypeError, ValueError, AttributeError) as e:
+                self.logger.debug(f"Пропускаем некорректную запись ticker {pair}: {e}")
+
+        previous = self._table
+        if previous is None:
+            version = 1
+            changed = frozenset(quotes)
+        else:
+            changed = frozenset(
+                pair for pair, quote in quotes.items()
+                if pair not in previous.quotes or previous.quotes[pair].price_key != quote.price_key
+            ) | frozenset(pair for pair in previous.quotes if pair not in quotes)
+            version = previous.version + 1 if changed else previous.version
+
+        self._table = TickerTable(
+            quotes=MappingProxyType(quotes),
+            version=version,
+            fetched_at=self._clock(),
+            changed_pairs=changed
+        )
+        return self._table
+
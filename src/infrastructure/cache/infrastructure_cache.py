@@ -1,48 +1,175 @@
+import re
 import time
 import asyncio
 import pickle
 import json
+import hashlib
+import inspect
+import functools
 import logging
 from abc import ABC, abstractmethod
+from collections import OrderedDict, deque
 from dataclasses import dataclass, field
-from typing import Dict, Any, Optional, Union, TypeVar, Generic, Callable, List
-from datetime import datetime, timedelta
+from itertools import islice
+from typing import Dict, Any, Optional, Union, TypeVar, Generic, Callable, List, Tuple, NamedTuple
+from datetime import datetime, date, timedelta
+from decimal import Decimal
+from enum import Enum
 from pathlib import Path
-from threading import RLock
+from threading import RLock, Lock
 
-from ..core.interfaces import ICacheService
-from ..core.exceptions import CacheError
-from ..core.constants import Timing
+from ...core.interfaces import ICacheService
+from ...core.exceptions import CacheError
+from ...core.cache.tiered_cache import TieredCache
+from .log_store import LogStructuredStore
 
 T = TypeVar('T')
 
+_MISSING = object()
+
+# Деление байтовых счетчиков пополам одним bytes.translate
+_HALVE_TABLE = bytes(value >> 1 for value in range(256))
+
 
 @dataclass
 class CacheEntry(Generic[T]):
-    """📦 Запись в кэше"""
+    """📦 Запись в кэше (метки времени - time.monotonic())"""
     value: T
-    created_at: datetime
-    expires_at: Optional[datetime] = None
+    created_at: float
+    expires_at: Optional[float] = None
     access_count: int = 0
-    last_accessed: datetime = field(default_factory=datetime.now)
+    last_accessed: float = field(default_factory=time.monotonic)
     metadata: Dict[str, Any] = field(default_factory=dict)
+    size: int = 0                   # оценка размера в байтах, считается один раз при вставке
     
     @property
     def is_expired(self) -> bool:
         """Проверка истечения срока действия"""
-        if self.expires_at is None:
-            return False
-        return datetime.now() > self.expires_at
+        return self.expires_at is not None and time.monotonic() > self.expires_at
+    
+    def is_expired_at(self, now: float) -> bool:
+        """Проверка истечения на заданный момент (без вызова часов)"""
+        return self.expires_at is not None and now > self.expires_at
     
     @property
     def age_seconds(self) -> float:
         """Возраст записи в секундах"""
-        return (datetime.now() - self.created_at).total_seconds()
+        return time.monotonic() - self.created_at
     
-    def access(self) -> None:
+    def access(self, now: Optional[float] = None) -> None:
         """Обновление статистики доступа"""
         self.access_count += 1
-        self.last_accessed = datetime.now()
+        self.last_accessed = time.monotonic() if now is None else now
+
+
+class TimerWheel:
+    """⏲️ Иерархическое колесо таймеров для истечения записей
+    
+    LEVELS колес по SLOTS ячеек: нижнее колесо - шаг tick, каждое следующее
+    в SLOTS раз грубее. Таймер кладется в ячейку по абсолютному номеру тика
+    истечения; когда нижнее колесо делает оборот, ячейка следующего уровня
+    раскладывается вниз. Постановка и отмена - O(1), продвижение времени -
+    амортизированно O(1) на тик и истекший ключ, без обхода всех записей.
+    Ключ срабатывает не раньше своего срока и не позже чем через один tick.
+    """
+    
+    SLOT_BITS = 6
+    SLOTS = 1 << SLOT_BITS
+    SLOT_MASK = SLOTS - 1
+    LEVELS = 4
+    
+    def __init__(self, tick: float = 1.0, now: float = 0.0):
+        self.tick = tick
+        self._wheels: List[List[Dict[str, float]]] = [
+            [{} for _ in range(self.SLOTS)] for _ in range(self.LEVELS)
+        ]
+        # Ключ -> ячейка, где лежит его таймер
+        self._slots: Dict[str, Dict[str, float]] = {}
+        self._current_tick = int(now / tick)
+        self.next_tick_time = (self._current_tick + 1) * tick
+        self.cascades = 0
+    
+    def __len__(self) -> int:
+        return len(self._slots)
+    
+    def schedule(self, key: str, expires_at: float) -> None:
+        """Постановка (или перенос) таймера ключа"""
+        self.cancel(key)
+        self._place(key, expires_at)
+    
+    def cancel(self, key: str) -> None:
+        """Снятие таймера ключа"""
+        slot = self._slots.pop(key, None)
+        if slot is not None:
+            slot.pop(key, None)
+    
+    def clear(self) -> None:
+        for wheel in self._wheels:
+            for slot in wheel:
+                slot.clear()
+        self._slots.clear()
+    
+    def advance(self, now: float) -> List[str]:
+        """Продвижение времени; ключи, чей срок истек"""
+        target_tick = int(now / self.tick)
+        expired: List[str] = []
+        
+        if not self._slots:
+            # Пустое колесо - просто переносим текущий тик
+            self._current_tick = max(self._current_tick, target_tick)
+        
+        while self._current_tick < target_tick:
+            self._current_tick += 1
+            tick = self._current_tick
+            
+            # Оборот нижнего колеса - раскладываем ячейки верхних уровней
+            level = 1
+            while level < self.LEVELS and (tick >> (self.SLOT_BITS * (level - 1))) & self.SLOT_MASK == 0:
+                self._cascade(level, (tick >> (self.SLOT_BITS * level)) & self.SLOT_MASK)
+                level += 1
+            
+            slot = self._wheels[0][tick & self.SLOT_MASK]
+            if slot:
+                expired.extend(slot)
+                for key in slot:
+                    del self._slots[key]
+                slot.clear()
+            
+            if not self._slots:
+                self._current_tick = target_tick
+        
+        self.next_tick_time = (self._current_tick + 1) * self.tick
+        return expired
+    
+    def _cascade(self, level: int, index: int) -> None:
+        slot = self._wheels[level][index]
+        if not slot:
+            return
+        self.cascades += 1
+        entries = list(slot.items())
+        slot.clear()
+        for key, expires_at in entries:
+            # Ячейка текущего тика нижнего колеса еще не обработана
+            self._place(key, expires_at, self._current_tick)
+    
+    def _place(self, key: str, expires_at: float, earliest_tick: Optional[int] = None) -> None:
+        # Срабатывание на тике после срока: к этому моменту now > expires_at
+        if earliest_tick is None:
+            earliest_tick = self._current_tick + 1
+        expire_tick = max(int(expires_at / self.tick) + 1, earliest_tick)
+        delta = expire_tick - self._current_tick
+        
+        level = 0
+        while level < self.LEVELS - 1 and delta >= 1 << (self.SLOT_BITS * (level + 1)):
+            level += 1
+        if delta >= 1 << (self.SLOT_BITS * self.LEVELS):
+            # Дальше горизонта колеса - в последнюю ячейку верхнего уровня,
+            # при раскладке таймер будет поставлен заново
+            expire_tick = self._current_tick + (self.SLOT_MASK << (self.SLOT_BITS * level))
+        
+        slot = self._wheels[level][(expire_tick >> (self.SLOT_BITS * level)) & self.SLOT_MASK]
+        slot[key] = expires_at
+        self._slots[key] = slot
 
 
 @dataclass
@@ -68,7 +195,12 @@ class CacheStats:
 
 
 class EvictionPolicy(ABC):
-    """🗑️ Политика вытеснения записей из кэша"""
+    """🗑️ Политика вытеснения записей из кэша
+
+    Кэш сообщает политике о вставках, обращениях и удалениях ключей, чтобы
+    она могла вести свою структуру и выбирать жертву за O(1), не сортируя
+    все записи.
+    """
     
     @abstractmethod
     def should_evict(self, entry: CacheEntry, cache_size: int, max_size: int) -> bool:
@@ -79,10 +211,37 @@ class EvictionPolicy(ABC):
     def select_victims(self, entries: Dict[str, CacheEntry], count: int) -> List[str]:
         """Выбор записей для вытеснения"""
         pass
+    
+    def set_capacity(self, max_size: int) -> None:
+        """Размер кэша, которому служит политика"""
+        pass
+    
+    def on_insert(self, key: str) -> None:
+        """Новый ключ в кэше"""
+        pass
+    
+    def on_access(self, key: str) -> None:
+        """Обращение к ключу (чтение или перезапись)"""
+        pass
+    
+    def on_remove(self, key: str) -> None:
+        """Ключ удален из кэша (вытеснение, истечение, delete)"""
+        pass
+    
+    def clear(self) -> None:
+        """Сброс состояния вместе с кэшем"""
+        pass
 
 
 class LRUEvictionPolicy(EvictionPolicy):
-    """🔄 Политика вытеснения LRU (Least Recently Used)"""
+    """🔄 Политика вытеснения LRU (Least Recently Used)
+    
+    Порядок обращений хранится в OrderedDict: обращение - move_to_end,
+    жертва - первый ключ, все операции O(1).
+    """
+    
+    def __init__(self):
+        self._order: 'OrderedDict[str, None]' = OrderedDict()
     
     def should_evict(self, entry: CacheEntry, cache_size: int, max_size: int) -> bool:
         """Вытесняем если кэш переполнен"""
@@ -90,11 +249,206 @@ class LRUEvictionPolicy(EvictionPolicy):
     
     def select_victims(self, entries: Dict[str, CacheEntry], count: int) -> List[str]:
         """Выбираем наименее недавно использованные записи"""
-        sorted_entries = sorted(
-            entries.items(),
-            key=lambda x: x[1].last_accessed
-        )
-        return [key for key, _ in sorted_entries[:count]]
+        if not self._order and entries:
+            # Политика не получала событий - порядок только по времени доступа
+            sorted_entries = sorted(entries.items(), key=lambda x: x[1].last_accessed)
+            return [key for key, _ in sorted_entries[:count]]
+        return list(islice(self._order, count))
+    
+    def on_insert(self, key: str) -> None:
+        self._order[key] = None
+        self._order.move_to_end(key)
+    
+    def on_access(self, key: str) -> None:
+        try:
+            self._order.move_to_end(key)
+        except KeyError:
+            self._order[key] = None
+    
+    def on_remove(self, key: str) -> None:
+        self._order.pop(key, None)
+    
+    def clear(self) -> None:
+        self._order.clear()
+
+
+class CountMinSketch:
+    """📈 Count-Min Sketch с 4-битными счетчиками и периодическим старением
+    
+    Оценка частоты ключа - минимум по depth строкам. После sample_size
+    увеличений все счетчики делятся пополам, чтобы частоты отражали
+    недавнюю популярность.
+    """
+    
+    DEPTH = 4
+    MAX_COUNT = 15
+    # Нечетные 64-битные множители для независимых хешей строк
+    SEEDS = (0x9E3779B97F4A7C15, 0xC2B2AE3D27D4EB4F, 0x165667B19E3779F9, 0xD6E8FEB86659FD93)
+    MASK64 = (1 << 64) - 1
+    
+    def __init__(self, capacity: int, sample_factor: int = 10):
+        width = 16
+        while width < capacity:
+            width <<= 1
+        self.width = width
+        self._shift = 64 - (width.bit_length() - 1)
+        self._table = [bytearray(width) for _ in range(self.DEPTH)]
+        self.sample_size = max(capacity, 1) * sample_factor
+        self.additions = 0
+        self.reset_count = 0
+    
+    def _indexes(self, key: str):
+        h = hash(key) & self.MASK64
+        shift = self._shift
+        mask = self.MASK64
+        return [((h * seed) & mask) >> shift for seed in self.SEEDS]
+    
+    def increment(self, key: str) -> None:
+        """Учет обращения к ключу"""
+        added = False
+        maximum = self.MAX_COUNT
+        for row, index in zip(self._table, self._indexes(key)):
+            count = row[index]
+            if count < maximum:
+                row[index] = count + 1
+                added = True
+        
+        if added:
+            self.additions += 1
+            if self.additions >= self.sample_size:
+                self._reset()
+    
+    def frequency(self, key: str) -> int:
+        """Оценка частоты ключа"""
+        return min(row[index] for row, index in zip(self._table, self._indexes(key)))
+    
+    def _reset(self) -> None:
+        for row in self._table:
+            row[:] = row.translate(_HALVE_TABLE)
+        self.additions //= 2
+        self.reset_count += 1
+
+
+class WTinyLFUEvictionPolicy(EvictionPolicy):
+    """🏆 Политика W-TinyLFU: окно LRU + сегментированный LRU с фильтром допуска
+    
+    Новые ключи попадают в маленькое окно (window_percent емкости). Ключ,
+    вытесненный из окна, допускается в основную область, только если по
+    Count-Min Sketch он встречался чаще, чем кандидат на вытеснение из
+    испытательного сегмента. Основная область - SLRU: повторное обращение
+    переводит ключ из probation в protected. Так разовые запросы (история
+    сделок) не вымывают часто читаемые тикеры.
+    """
+    
+    def __init__(self, window_percent: float = 1.0, protected_percent: float = 80.0):
+        self.window_percent = window_percent
+        self.protected_percent = protected_percent
+        
+        self._window: 'OrderedDict[str, None]' = OrderedDict()
+        self._probation: 'OrderedDict[str, None]' = OrderedDict()
+        self._protected: 'OrderedDict[str, None]' = OrderedDict()
+        
+        self.sketch: Optional[CountMinSketch] = None
+        self.max_window = 1
+        self.max_protected = 0
+        
+        # Статистика допуска
+        self.admitted = 0
+        self.rejected = 0
+    
+    def set_capacity(self, max_size: int) -> None:
+        self.max_window = max(1, int(max_size * self.window_percent / 100))
+        max_main = max(max_size - self.max_window, 0)
+        self.max_protected = int(max_main * self.protected_percent / 100)
+        self.sketch = CountMinSketch(max_size)
+    
+    def should_evict(self, entry: CacheEntry, cache_size: int, max_size: int) -> bool:
+        """Вытесняем если кэш переполнен"""
+        return cache_size >= max_size
+    
+    def on_insert(self, key: str) -> None:
+        if self.sketch is not None:
+            self.sketch.increment(key)
+        self._window[key] = None
+    
+    def on_access(self, key: str) -> None:
+        if self.sketch is not None:
+            self.sketch.increment(key)
+        
+        if key in self._window:
+            self._window.move_to_end(key)
+        elif key in self._protected:
+            self._protected.move_to_end(key)
+        elif key in self._probation:
+            # Повторное обращение - в защищенный сегмент
+            del self._probation[key]
+            self._protected[key] = None
+            if len(self._protected) > self.max_protected:
+                demoted, _ = self._protected.popitem(last=False)
+                self._probation[demoted] = None
+        else:
+            self.on_insert(key)
+    
+    def on_remove(self, key: str) -> None:
+        if self._window.pop(key, _MISSING) is _MISSING:
+            if self._probation.pop(key, _MISSING) is _MISSING:
+                self._protected.pop(key, None)
+    
+    def clear(self) -> None:
+        self._window.clear()
+        self._probation.clear()
+        self._protected.clear()
+    
+    def select_victims(self, entries: Dict[str, CacheEntry], count: int) -> List[str]:
+        """Жертвы: проигравшие в сравнении частот кандидат из окна или жертва probation"""
+        victims = []
+        for _ in range(count):
+            victim = self._select_victim()
+            if victim is None:
+                break
+            victims.append(victim)
+        return victims
+    
+    def _select_victim(self) -> Optional[str]:
+        candidate = None
+        while len(self._window) > self.max_window:
+            candidate, _ = self._window.popitem(last=False)
+            self._probation[candidate] = None
+        
+        if not self._probation:
+            if self._protected:
+                return self._protected.popitem(last=False)[0]
+            if self._window:
+                return self._window.popitem(last=False)[0]
+            return None
+        
+        victim = next(iter(self._probation))
+        if candidate is None or victim == candidate or self.sketch is None:
+            del self._probation[victim]
+            return victim
+        
+        # Допуск: кандидат из окна вытесняет жертву, только если встречался чаще
+        if self.sketch.frequency(candidate) > self.sketch.frequency(victim):
+            self.admitted += 1
+            del self._probation[victim]
+            return victim
+        
+        self.rejected += 1
+        del self._probation[candidate]
+        return candidate
+    
+    def get_status(self) -> Dict[str, Any]:
+        """📊 Заполнение сегментов и статистика допуска"""
+        return {
+            "window": len(self._window),
+            "probation": len(self._probation),
+            "protected": len(self._protected),
+            "max_window": self.max_window,
+            "max_protected": self.max_protected,
+            "admitted": self.admitted,
+            "rejected": self.rejected,
+            "sketch_resets": self.sketch.reset_count if self.sketch else 0
+        }
 
 
 class TTLEvictionPolicy(EvictionPolicy):
@@ -114,23 +468,63 @@ class TTLEvictionPolicy(EvictionPolicy):
 
 
 class InMemoryCache(ICacheService):
-    """🧠 Кэш в памяти с расширенной функциональностью"""
+    """🧠 Кэш в памяти с расширенной функциональностью
+    
+    Емкость ограничивается числом записей (max_size) и, опционально,
+    суммарным оценочным размером (max_bytes). Размер записи оценивается
+    один раз при вставке и учитывается в счетчике при удалении, поэтому
+    статистика читается за O(1).
+    
+    Блокировки: чтение идет без них, изменения ключа сериализуются
+    полосой блокировок по хешу ключа (lock_stripes), а словарь, политика
+    вытеснения, колесо таймеров и счетчик байт меняются под короткой
+    структурной блокировкой - без await и без вызова пользовательского кода.
+    Поэтому кэш можно одновременно использовать из event loop и из потоков
+    executor'а, и поток не держит loop дольше одной O(1) операции.
+    """
+    
+    READ_BUFFER_DRAIN = 64          # обращений чтения до применения к политике
+    READ_BUFFER_LIMIT = 1024        # при переполнении обращения теряются
     
     def __init__(
         self,
         max_size: int = 1000,
         default_ttl: int = 300,
         eviction_policy: Optional[EvictionPolicy] = None,
-        enable_stats: bool = True
+        enable_stats: bool = True,
+        timer_tick: float = 1.0,
+        clock: Callable[[], float] = time.monotonic,
+        max_bytes: Optional[int] = None,
+        lock_stripes: int = 16
     ):
+        if lock_stripes < 1 or lock_stripes & (lock_stripes - 1):
+            raise ValueError("lock_stripes должно быть степенью двойки")
+        
         self.max_size = max_size
+        self.max_bytes = max_bytes
         self.default_ttl = default_ttl
         self.eviction_policy = eviction_policy or LRUEvictionPolicy()
+        self.eviction_policy.set_capacity(max_size)
         self.enable_stats = enable_stats
         
         # Хранилище данных
         self._cache: Dict[str, CacheEntry] = {}
-        self._lock = RLock()
+        self._memory_bytes = 0
+        
+        # Полосы - RLock: фабрика get_or_set может снова обратиться к ключу
+        self._stripes = [RLock() for _ in range(lock_stripes)]
+        self._stripe_mask = lock_stripes - 1
+        self._structure_lock = Lock()
+        
+        # Чтения не трогают политику сразу - ключи копятся в буфере
+        self._read_buffer: deque = deque()
+        
+        # Загрузки get_or_set с async-фабрикой: (event loop, ключ) -> задача
+        self._loading: Dict[Tuple[asyncio.AbstractEventLoop, str], asyncio.Task] = {}
+        
+        # Истечение TTL по колесу таймеров
+        self._clock = clock
+        self._timers = TimerWheel(timer_tick, clock())
         
         # Статистика
         self.stats = CacheStats()
@@ -161,28 +555,39 @@ class InMemoryCache(ICacheService):
     
     async def get(self, key: str, default: Optional[T] = None) -> Optional[T]:
         """🔍 Получение значения из кэша"""
-        with self._lock:
-            if key not in self._cache:
-                if self.enable_stats:
-                    self.stats.miss_count += 1
-                return default
-            
-            entry = self._cache[key]
-            
-            # Проверяем истечение
-            if entry.is_expired:
-                del self._cache[key]
-                if self.enable_stats:
-                    self.stats.miss_count += 1
-                    self.stats.expired_count += 1
-                return default
-            
-            # Обновляем статистику доступа
-            entry.access()
+        return self.get_nowait(key, default)
+    
+    def get_nowait(self, key: str, default: Optional[T] = None) -> Optional[T]:
+        """🔍 Синхронное чтение (для кода без event loop и TieredCache)
+        
+        Без блокировок: поиск в dict атомарен под GIL, а запись после вставки
+        не меняется - set заменяет ее целиком. Обращение попадает в буфер
+        политики, просроченная запись удаляется под блокировкой.
+        """
+        now = self._clock()
+        if now >= self._timers.next_tick_time:
+            self._try_maintenance(now)
+        
+        entry = self._cache.get(key)
+        if entry is None:
             if self.enable_stats:
-                self.stats.hit_count += 1
-            
-            return entry.value
+                self.stats.miss_count += 1
+            return default
+        
+        # Проверяем истечение (колесо срабатывает с точностью до тика)
+        if entry.is_expired_at(now):
+            self._expire_entry(key, entry)
+            if self.enable_stats:
+                self.stats.miss_count += 1
+            return default
+        
+        # Обновляем статистику доступа
+        entry.access(now)
+        self._record_read(key)
+        if self.enable_stats:
+            self.stats.hit_count += 1
+        
+        return entry.value
     
     async def set(
         self,
@@ -192,59 +597,85 @@ class InMemoryCache(ICacheService):
         metadata: Optional[Dict[str, Any]] = None
     ) -> None:
         """💾 Сохранение значения в кэш"""
-        with self._lock:
-            # Определяем время истечения
-            expires_at = None
-            if ttl is not None:
-                expires_at = datetime.now() + timedelta(seconds=ttl)
-            elif self.default_ttl > 0:
-                expires_at = datetime.now() + timedelta(seconds=self.default_ttl)
-            
-            # Создаем запись
-            entry = CacheEntry(
-                value=value,
-                created_at=datetime.now(),
-                expires_at=expires_at,
-                metadata=metadata or {}
-            )
-            
-            # Проверяем необходимость вытеснения
-            if len(self._cache) >= self.max_size and key not in self._cache:
-                await self._evict_entries(1)
-            
-            self._cache[key] = entry
-            
-            if self.enable_stats:
-                self.stats.total_entries = len(self._cache)
-                self.stats.memory_usage_bytes = self._calculate_memory_usage()
+        self.set_nowait(key, value, ttl, metadata)
+    
+    def set_nowait(
+        self,
+        key: str,
+        value: T,
+        ttl: Optional[float] = None,
+        metadata: Optional[Dict[str, Any]] = None
+    ) -> None:
+        """💾 Синхронное сохранение"""
+        now = self._clock()
+        
+        # Определяем время истечения
+        expires_at = None
+        if ttl is not None:
+            expires_at = now + ttl
+        elif self.default_ttl > 0:
+            expires_at = now + self.default_ttl
+        
+        # Создаем запись (оценка размера - вне блокировок)
+        entry = CacheEntry(
+            value=value,
+            created_at=now,
+            expires_at=expires_at,
+            last_accessed=now,
+            metadata=metadata or {},
+            size=self._estimate_entry_size(key, value)
+        )
+        
+        with self._stripe(key):
+            self._store(key, entry, now)
     
     async def delete(self, key: str) -> bool:
         """🗑️ Удаление ключа из кэша"""
-        with self._lock:
+        return self.delete_nowait(key)
+    
+    def delete_nowait(self, key: str) -> bool:
+        """🗑️ Синхронное удаление"""
+        with self._stripe(key), self._structure_lock:
             if key in self._cache:
-                del self._cache[key]
-                if self.enable_stats:
-                    self.stats.total_entries = len(self._cache)
+                self._remove_entry(key)
                 return True
             return False
     
     async def exists(self, key: str) -> bool:
         """❓ Проверка существования ключа"""
-        with self._lock:
-            if key not in self._cache:
-                return False
-            
-            entry = self._cache[key]
-            if entry.is_expired:
-                del self._cache[key]
-                return False
-            
-            return True
+        return self.exists_nowait(key)
+    
+    def exists_nowait(self, key: str) -> bool:
+        """❓ Синхронная проверка существования"""
+        entry = self._cache.get(key)
+        if entry is None:
+            return False
+        
+        if entry.is_expired_at(self._clock()):
+            self._expire_entry(key, entry)
+            return False
+        
+        return True
+    
+    def entries_nowait(self) -> List[Tuple[str, Any, float, Optional[float]]]:
+        """📋 Живые записи: (ключ, значение, возраст, остаток TTL или None)"""
+        now = self._clock()
+        with self._structure_lock:
+            return [
+                (key, entry.value, now - entry.created_at,
+                 entry.expires_at - now if entry.expires_at is not None else None)
+                for key, entry in self._cache.items()
+                if not entry.is_expired_at(now)
+            ]
     
     async def clear(self) -> None:
         """🧹 Очистка всего кэша"""
-        with self._lock:
+        with self._structure_lock:
+            self._read_buffer.clear()
             self._cache.clear()
+            self.eviction_policy.clear()
+            self._timers.clear()
+            self._memory_bytes = 0
             if self.enable_stats:
                 self.stats = CacheStats()
     
@@ -254,25 +685,48 @@ class InMemoryCache(ICacheService):
         factory: Callable[[], T],
         ttl: Optional[int] = None
     ) -> T:
-        """🎯 Получение или создание значения"""
-        value = await self.get(key)
-        if value is not None:
+        """🎯 Получение или создание значения
+        
+        Фабрика вызывается один раз на промах: async-фабрику параллельные
+        задачи одного event loop ждут общей задачей, синхронную - потоки
+        на полосе блокировок ключа.
+        """
+        value = self.get_nowait(key, _MISSING)
+        if value is not _MISSING:
             return value
         
-        # Создаем значение
-        new_value = factory() if not asyncio.iscoroutinefunction(factory) else await factory()
-        await self.set(key, new_value, ttl)
-        return new_value
+        if not asyncio.iscoroutinefunction(factory):
+            with self._stripe(key):
+                value = self._peek(key)
+                if value is _MISSING:
+                    value = factory()
+                    self.set_nowait(key, value, ttl)
+                return value
+        
+        loop = asyncio.get_running_loop()
+        loading_key = (loop, key)
+        task = self._loading.get(loading_key)
+        if task is None:
+            task = loop.create_task(self._load(key, factory, ttl))
+            self._loading[loading_key] = task
+            task.add_done_callback(lambda done: self._loading_done(loading_key, done))
+        
+        # shield: отмена одного ожидающего не отменяет общую загрузку
+        return await asyncio.shield(task)
     
     async def increment(self, key: str, delta: int = 1, initial: int = 0) -> int:
         """➕ Атомарное увеличение значения"""
-        with self._lock:
-            current = await self.get(key, initial)
+        return self.increment_nowait(key, delta, initial)
+    
+    def increment_nowait(self, key: str, delta: int = 1, initial: int = 0) -> int:
+        """➕ Синхронное атомарное увеличение (в том числе из потоков)"""
+        with self._stripe(key):
+            current = self._peek(key)
             if not isinstance(current, (int, float)):
                 current = initial
             
             new_value = int(current) + delta
-            await self.set(key, new_value)
+            self.set_nowait(key, new_value)
             return new_value
     
     async def get_stats(self) -> CacheStats:
@@ -280,14 +734,13 @@ class InMemoryCache(ICacheService):
         if not self.enable_stats:
             return CacheStats()
         
-        with self._lock:
-            self.stats.total_entries = len(self._cache)
-            self.stats.memory_usage_bytes = self._calculate_memory_usage()
+        with self._structure_lock:
+            self._sync_size_stats()
             return self.stats
     
     async def get_keys(self, pattern: Optional[str] = None) -> List[str]:
         """🔑 Получение списка ключей"""
-        with self._lock:
+        with self._structure_lock:
             keys = list(self._cache.keys())
             
             if pattern:
@@ -300,21 +753,32 @@ class InMemoryCache(ICacheService):
         """ℹ️ Подробная информация о кэше"""
         stats = await self.get_stats()
         
-        with self._lock:
-            expired_count = sum(1 for entry in self._cache.values() if entry.is_expired)
-            avg_age = sum(entry.age_seconds for entry in self._cache.values()) / len(self._cache) if self._cache else 0
+        with self._structure_lock:
+            now = self._clock()
+            expired_count = sum(1 for entry in self._cache.values() if entry.is_expired_at(now))
+            avg_age = sum(now - entry.created_at for entry in self._cache.values()) / len(self._cache) if self._cache else 0
             
             return {
                 "type": "InMemoryCache",
                 "config": {
                     "max_size": self.max_size,
+                    "max_bytes": self.max_bytes,
                     "default_ttl": self.default_ttl,
                     "eviction_policy": type(self.eviction_policy).__name__,
-                    "stats_enabled": self.enable_stats
+                    "stats_enabled": self.enable_stats,
+                    "timer_tick": self._timers.tick
+                },
+                "timers": {
+                    "scheduled": len(self._timers),
+                    "cascades": self._timers.cascades
                 },
+                "eviction": (
+                    self.eviction_policy.get_status()
+                    if hasattr(self.eviction_policy, 'get_status') else {}
+                ),
                 "stats": {
                     "total_entries": stats.total_entries,
-                    "memory_usage_mb": stats.memory_usage_bytes / 1024 / 1024,
+                    "memory_usage_mb": self._memory_bytes / 1024 / 1024,
                     "hit_rate": stats.hit_rate,
                     "miss_rate": stats.miss_rate,
                     "expired_entries": expired_count,
@@ -323,25 +787,138 @@ class InMemoryCache(ICacheService):
                 "running": self._running
             }
     
-    async def _evict_entries(self, count: int) -> None:
-        """🗑️ Вытеснение записей"""
+    def _stripe(self, key: str) -> RLock:
+        """🔒 Полоса блокировок ключа"""
+        return self._stripes[hash(key) & self._stripe_mask]
+    
+    def _peek(self, key: str) -> Any:
+        """Значение без учета в статистике и политике; _MISSING - нет или истекло"""
+        entry = self._cache.get(key)
+        if entry is None or entry.is_expired_at(self._clock()):
+            return _MISSING
+        return entry.value
+    
+    async def _load(self, key: str, factory: Callable[[], Any], ttl: Optional[int]) -> Any:
+        value = await factory()
+        self.set_nowait(key, value, ttl)
+        return value
+    
+    def _loading_done(self, loading_key: Tuple[asyncio.AbstractEventLoop, str], task: asyncio.Task) -> None:
+        if self._loading.get(loading_key) is task:
+            del self._loading[loading_key]
+    
+    def _store(self, key: str, entry: CacheEntry, now: float) -> None:
+        """💾 Вставка записи (полоса ключа уже захвачена)"""
+        with self._structure_lock:
+            self._drain_reads()
+            if now >= self._timers.next_tick_time:
+                self._expire_due(now)
+            
+            previous = self._cache.get(key)
+            if self.max_bytes is not None and entry.size > self.max_bytes:
+                # Запись больше всего бюджета - не кэшируем, старое значение неактуально
+                self.logger.debug(f"Запись {key} ({entry.size} байт) больше max_bytes={self.max_bytes}")
+                if previous is not None:
+                    self._remove_entry(key)
+                return
+            
+            if entry.expires_at is not None:
+                self._timers.schedule(key, entry.expires_at)
+            else:
+                self._timers.cancel(key)
+            
+            self._cache[key] = entry
+            if previous is not None:
+                self._memory_bytes += entry.size - previous.size
+                self.eviction_policy.on_access(key)
+            else:
+                self._memory_bytes += entry.size
+                self.eviction_policy.on_insert(key)
+            
+            # Вытеснение после вставки: политика с фильтром допуска
+            # может отклонить и сам новый ключ
+            if len(self._cache) > self.max_size:
+                self._evict_entries(len(self._cache) - self.max_size)
+            while self.max_bytes is not None and self._memory_bytes > self.max_bytes and self._cache:
+                if not self._evict_entries(1):
+                    break
+            
+            self._sync_size_stats()
+    
+    def _record_read(self, key: str) -> None:
+        """📥 Обращение в буфер; политика обновляется пачкой, если блокировка свободна"""
+        buffer = self._read_buffer
+        if len(buffer) < self.READ_BUFFER_LIMIT:
+            buffer.append(key)
+        if len(buffer) >= self.READ_BUFFER_DRAIN and self._structure_lock.acquire(blocking=False):
+            try:
+                self._drain_reads()
+            finally:
+                self._structure_lock.release()
+    
+    def _drain_reads(self) -> None:
+        """Применение отложенных обращений к политике (под структурной блокировкой)"""
+        buffer = self._read_buffer
+        cache = self._cache
+        for _ in range(len(buffer)):
+            key = buffer.popleft()
+            if key in cache:
+                self.eviction_policy.on_access(key)
+    
+    def _try_maintenance(self, now: float) -> None:
+        """⏲️ Продвижение колеса из чтения - только если никто не держит блокировку"""
+        if self._structure_lock.acquire(blocking=False):
+            try:
+                self._drain_reads()
+                self._expire_due(now)
+            finally:
+                self._structure_lock.release()
+    
+    def _expire_entry(self, key: str, entry: CacheEntry) -> None:
+        """Удаление просроченной записи, если ее не успели заменить"""
+        with self._structure_lock:
+            if self._cache.get(key) is entry:
+                self._remove_entry(key)
+                if self.enable_stats:
+                    self.stats.expired_count += 1
+    
+    def _evict_entries(self, count: int) -> int:
+        """🗑️ Вытеснение записей; число вытесненных"""
         if not self._cache:
-            return
+            return 0
         
         victims = self.eviction_policy.select_victims(self._cache, count)
         
+        evicted = 0
         for key in victims:
             if key in self._cache:
-                del self._cache[key]
+                self._remove_entry(key)
+                evicted += 1
                 if self.enable_stats:
                     self.stats.eviction_count += 1
+        return evicted
+    
+    def _remove_entry(self, key: str) -> None:
+        """Удаление записи с уведомлением политики вытеснения и снятием таймера"""
+        entry = self._cache.pop(key)
+        self._memory_bytes -= entry.size
+        self.eviction_policy.on_remove(key)
+        self._timers.cancel(key)
+        if self.enable_stats:
+            self.stats.total_entries = len(self._cache)
+            self.stats.memory_usage_bytes = self._memory_bytes
+    
+    def _sync_size_stats(self) -> None:
+        if self.enable_stats:
+            self.stats.total_entries = len(self._cache)
+            self.stats.memory_usage_bytes = self._memory_bytes
     
     async def _cleanup_loop(self) -> None:
         """🧹 Фоновая очистка истекших записей"""
         while self._running:
             try:
                 await self._cleanup_expired()
-                await asyncio.sleep(60)  # Проверяем каждую минуту
+                await asyncio.sleep(self._timers.tick)  # Продвигаем колесо каждый тик
             except asyncio.CancelledError:
                 break
             except Exception as e:
@@ -350,55 +927,67 @@ class InMemoryCache(ICacheService):
     
     async def _cleanup_expired(self) -> None:
         """🧹 Очистка истекших записей"""
-        with self._lock:
-            expired_keys = [
-                key for key, entry in self._cache.items()
-                if entry.is_expired
-            ]
-            
-            for key in expired_keys:
-                del self._cache[key]
-                if self.enable_stats:
-                    self.stats.expired_count += 1
+        with self._structure_lock:
+            self._drain_reads()
+            self._expire_due(self._clock())
+    
+    def _expire_due(self, now: float) -> None:
+        """⏲️ Удаление записей, чьи таймеры сработали к моменту now"""
+        for key in self._timers.advance(now):
+            entry = self._cache.get(key)
+            if entry is None:
+                continue
+            if not entry.is_expired_at(now):
+                # Срок продлен мимо колеса - ставим таймер заново
+                if entry.expires_at is not None:
+                    self._timers.schedule(key, entry.expires_at)
+                continue
+            self._remove_entry(key)
+            if self.enable_stats:
+                self.stats.expired_count += 1
     
-    def _calculate_memory_usage(self) -> int:
-        """🧮 Приблизительный расчет использования памяти"""
+    @staticmethod
+    def _estimate_entry_size(key: str, value: Any) -> int:
+        """🧮 Приблизительный размер записи (один раз при вставке)"""
+        # Размер ключа
+        total_size = len(key.encode('utf-8'))
+        
+        # Размер значения (примерно)
         try:
-            total_size = 0
-            for key, entry in self._cache.items():
-                # Размер ключа
-                total_size += len(key.encode('utf-8'))
-                
-                # Размер значения (примерно)
-                try:
-                    if isinstance(entry.value, str):
-                        total_size += len(entry.value.encode('utf-8'))
-                    elif isinstance(entry.value, (int, float)):
-                        total_size += 8  # Примерный размер числа
-                    elif isinstance(entry.value, (list, dict)):
-                        total_size += len(pickle.dumps(entry.value))
-                    else:
-                        total_size += 64  # Фиксированный размер для остальных типов
-                except:
-                    total_size += 64
-                
-                # Размер метаданных
-                total_size += 64  # Примерный размер CacheEntry
-            
-            return total_size
-        except:
-            return 0
+            if isinstance(value, str):
+                total_size += len(value.encode('utf-8'))
+            elif isinstance(value, (int, float)):
+                total_size += 8  # Примерный размер числа
+            elif isinstance(value, (list, dict)):
+                total_size += len(pickle.dumps(value))
+            else:
+                total_size += 64  # Фиксированный размер для остальных типов
+        except Exception:
+            total_size += 64
+        
+        # Размер метаданных
+        total_size += 64  # Примерный размер CacheEntry
+        return total_size
 
 
 class PersistentCache(ICacheService):
-    """💽 Персистентный кэш с сохранением на диск"""
+    """💽 Персистентный кэш с сохранением на диск
+    
+    Память - InMemoryCache, диск - журнальный файл LogStructuredStore
+    (cache.log): измененные ключи пачкой дописываются раз в sync_interval,
+    удаление пишет надгробие сразу. Старт читает только индекс из
+    hint-файла, уплотнение запускается в фоне при накоплении мусора.
+    """
+    
+    DATA_FILE = "cache.log"
     
     def __init__(
         self,
         storage_path: str,
         max_size: int = 10000,
         default_ttl: int = 3600,
-        sync_interval: int = 300
+        sync_interval: int = 300,
+        fsync: bool = False
     ):
         self.storage_path = Path(storage_path)
         self.max_size = max_size
@@ -411,25 +1000,26 @@ class PersistentCache(ICacheService):
         # In-memory слой для быстрого доступа
         self.memory_cache = InMemoryCache(max_size, default_ttl)
         
-        # Метаданные для отслеживания файлов
-        self._metadata_file = self.storage_path / "cache_metadata.json"
-        self._metadata: Dict[str, Dict[str, Any]] = {}
+        # Дисковый слой: один файл данных + hint-файл индекса
+        self.store = LogStructuredStore(str(self.storage_path / self.DATA_FILE), fsync=fsync)
         
         # Синхронизация
         self._sync_task: Optional[asyncio.Task] = None
-        self._dirty_keys: set = set()
+        self._dirty_keys: Dict[str, Optional[float]] = {}   # ключ -> срок (unix time)
         self._lock = RLock()
         
         self.logger = logging.getLogger(__name__)
         
-        # Загружаем метаданные при инициализации
-        self._load_metadata()
+        self._migrate_legacy_files()
     
     async def start(self) -> None:
         """🚀 Запуск персистентного кэша"""
         await self.memory_cache.start()
         self._sync_task = asyncio.create_task(self._sync_loop())
-        self.logger.info("💽 Персистентный кэш запущен")
+        self.logger.info(
+            f"💽 Персистентный кэш запущен: {len(self.store)} ключей, "
+            f"индекс за {self.store.startup_seconds * 1000:.1f}мс"
+        )
     
     async def stop(self) -> None:
         """🛑 Остановка кэша"""
@@ -441,6 +1031,7 @@ class PersistentCache(ICacheService):
                 pass
         
         await self._sync_to_disk()  # Финальная синхронизация
+        self.store.close()
         await self.memory_cache.stop()
         self.logger.info("💽 Персистентный кэш остановлен")
     
@@ -454,8 +1045,10 @@ class PersistentCache(ICacheService):
         # Загружаем с диска
         disk_value = await self._load_from_disk(key)
         if disk_value is not None:
-            # Кэшируем в памяти
-            await self.memory_cache.set(key, disk_value)
+            # Кэшируем в памяти на оставшийся срок
+            expires_at = self.store.get_expires_at(key)
+            ttl = max(expires_at - time.time(), 0) if expires_at is not None else None
+            await self.memory_cache.set(key, disk_value, ttl)
             return disk_value
         
         return default
@@ -473,27 +1066,18 @@ class PersistentCache(ICacheService):
         
         # Отмечаем как требующий синхронизации
         with self._lock:
-            self._dirty_keys.add(key)
-            
-            # Обновляем метаданные
-            self._metadata[key] = {
-                "created_at": datetime.now().isoformat(),
-                "expires_at": (datetime.now() + timedelta(seconds=ttl or self.default_ttl)).isoformat(),
-                "metadata": metadata or {}
-            }
+            self._dirty_keys[key] = time.time() + (ttl or self.default_ttl)
     
     async def delete(self, key: str) -> bool:
         """🗑️ Удаление ключа"""
         # Удаляем из памяти
         memory_deleted = await self.memory_cache.delete(key)
         
-        # Удаляем с диска
-        disk_deleted = await self._delete_from_disk(key)
-        
-        # Очищаем метаданные
         with self._lock:
-            self._metadata.pop(key, None)
-            self._dirty_keys.discard(key)
+            self._dirty_keys.pop(key, None)
+        
+        # Надгробие на диске
+        disk_deleted = await self._delete_from_disk(key)
         
         return memory_deleted or disk_deleted
     
@@ -503,29 +1087,22 @@ class PersistentCache(ICacheService):
         if await self.memory_cache.exists(key):
             return True
         
-        # Проверяем диск
-        return await self._exists_on_disk(key)
+        # Проверяем диск (только индекс)
+        return key in self.store
     
     async def clear(self) -> None:
         """🧹 Полная очистка"""
         await self.memory_cache.clear()
         
-        # Очищаем диск
-        for file in self.storage_path.glob("cache_*.pkl"):
-            file.unlink(missing_ok=True)
-        
         with self._lock:
-            self._metadata.clear()
             self._dirty_keys.clear()
         
-        await self._save_metadata()
+        self.store.clear()
     
     async def get_stats(self) -> Dict[str, Any]:
         """📊 Статистика кэша"""
         memory_stats = await self.memory_cache.get_stats()
-        
-        disk_files = list(self.storage_path.glob("cache_*.pkl"))
-        disk_size = sum(f.stat().st_size for f in disk_files)
+        store_status = self.store.get_status()
         
         return {
             "memory": {
@@ -534,155 +1111,307 @@ class PersistentCache(ICacheService):
                 "memory_usage_mb": memory_stats.memory_usage_bytes / 1024 / 1024
             },
             "disk": {
-                "files": len(disk_files),
-                "size_mb": disk_size / 1024 / 1024,
-                "dirty_keys": len(self._dirty_keys)
+                "files": 1,
+                "size_mb": store_status["file_bytes"] / 1024 / 1024,
+                "dirty_keys": len(self._dirty_keys),
+                "dead_ratio": store_status["dead_ratio"],
+                "compactions": store_status["compactions"],
+                "startup": store_status["startup"]
             },
-            "total_keys": len(self._metadata)
+            "total_keys": len(self.store)
         }
     
     async def _load_from_disk(self, key: str) -> Optional[T]:
         """💽 Загрузка с диска"""
         try:
-            file_path = self._get_file_path(key)
-            if not file_path.exists():
-                return None
-            
-            # Проверяем метаданные на истечение
-            if key in self._metadata:
-                expires_str = self._metadata[key].get("expires_at")
-                if expires_str:
-                    expires_at = datetime.fromisoformat(expires_str)
-                    if datetime.now() > expires_at:
-                        # Удаляем истекший файл
-                        await self._delete_from_disk(key)
-                        return None
-            
-            with open(file_path, 'rb') as f:
-                return pickle.load(f)
-                
+            return self.store.get(key)
         except Exception as e:
             self.logger.error(f"Ошибка загрузки {key} с диска: {e}")
             return None
     
-    async def _save_to_disk(self, key: str, value: T) -> None:
-        """💾 Сохранение на диск"""
-        try:
-            file_path = self._get_file_path(key)
-            
-            # Сохраняем в временный файл, потом переименовываем (атомарно)
-            temp_path = file_path.with_suffix('.tmp')
-            
-            with open(temp_path, 'wb') as f:
-                pickle.dump(value, f)
-            
-            temp_path.replace(file_path)
-            
-        except Exception as e:
-            self.logger.error(f"Ошибка сохранения {key} на диск: {e}")
-    
     async def _delete_from_disk(self, key: str) -> bool:
         """🗑️ Удаление с диска"""
         try:
-            file_path = self._get_file_path(key)
-            if file_path.exists():
-                file_path.unlink()
-                return True
-            return False
+            return self.store.delete(key)
         except Exception as e:
             self.logger.error(f"Ошибка удаления {key} с диска: {e}")
             return False
     
-    async def _exists_on_disk(self, key: str) -> bool:
-        """❓ Проверка существования на диске"""
-        file_path = self._get_file_path(key)
-        return file_path.exists()
-    
-    def _get_file_path(self, key: str) -> Path:
-        """📁 Получение пути к файлу для ключа"""
-        # Безопасное имя файла
-        safe_key = key.replace('/', '_').replace('\\', '_').replace(':', '_')
-        return self.storage_path / f"cache_{safe_key}.pkl"
-    
     async def _sync_loop(self) -> None:
-        """🔄 Цикл синхронизации с диском"""
+        """🔄 Цикл синхронизации с диском и фонового уплотнения"""
         while True:
             try:
                 await asyncio.sleep(self.sync_interval)
                 await self._sync_to_disk()
+                if self.store.needs_compaction():
+                    await asyncio.get_running_loop().run_in_executor(None, self.store.compact)
             except asyncio.CancelledError:
                 break
             except Exception as e:
                 self.logger.error(f"Ошибка в sync_loop: {e}")
     
     async def _sync_to_disk(self) -> None:
-        """💾 Синхронизация измененных ключей на диск"""
+        """💾 Дозапись измененных ключей одной пачкой"""
         with self._lock:
-            keys_to_sync = self._dirty_keys.copy()
-            self._dirty_keys.clear()
+            keys_to_sync = self._dirty_keys
+            self._dirty_keys = {}
         
-        for key in keys_to_sync:
+        items = []
+        for key, expires_at in keys_to_sync.items():
             value = await self.memory_cache.get(key)
             if value is not None:
-                await self._save_to_disk(key, value)
+                items.append((key, value, expires_at))
         
-        if keys_to_sync:
-            await self._save_metadata()
-            self.logger.debug(f"Синхронизировано {len(keys_to_sync)} ключей")
+        if items:
+            try:
+                self.store.put_many(items)
+                self.logger.debug(f"Синхронизировано {len(items)} ключей")
+            except Exception as e:
+                self.logger.error(f"Ошибка синхронизации кэша на диск: {e}")
     
-    def _load_metadata(self) -> None:
-        """📋 Загрузка метаданных"""
+    def _migrate_legacy_files(self) -> None:
+        """📦 Перенос кэша из прежнего формата (файл на ключ + cache_metadata.json)"""
+        metadata_file = self.storage_path / "cache_metadata.json"
+        if not metadata_file.exists():
+            return
+        
         try:
-            if self._metadata_file.exists():
-                with open(self._metadata_file, 'r') as f:
-                    self._metadata = json.load(f)
+            with open(metadata_file, 'r') as f:
+                legacy_metadata: Dict[str, Dict[str, Any]] = json.load(f)
         except Exception as e:
             self.logger.error(f"Ошибка загрузки метаданных: {e}")
-            self._metadata = {}
-    
-    async def _save_metadata(self) -> None:
-        """💾 Сохранение метаданных"""
-        try:
-            with open(self._metadata_file, 'w') as f:
-                json.dump(self._metadata, f, indent=2)
-        except Exception as e:
-            self.logger.error(f"Ошибка сохранения метаданных: {e}")
+            legacy_metadata = {}
+        
+        now = datetime.now()
+        items = []
+        for key, meta in legacy_metadata.items():
+            safe_key = key.replace('/', '_').replace('\\', '_').replace(':', '_')
+            file_path = self.storage_path / f"cache_{safe_key}.pkl"
+            try:
+                expires_at = datetime.fromisoformat(meta["expires_at"]) if meta.get("expires_at") else None
+                if (expires_at is not None and expires_at <= now) or not file_path.exists():
+                    continue
+                with open(file_path, 'rb') as f:
+                    items.append((key, pickle.load(f), expires_at.timestamp() if expires_at else None))
+            except Exception as e:
+                self.logger.debug(f"Пропускаем {key} при переносе кэша: {e}")
+        
+        self.store.put_many(items)
+        self.store.flush()
+        
+        for file in self.storage_path.glob("cache_*.pkl"):
+            file.unlink(missing_ok=True)
+        metadata_file.unlink(missing_ok=True)
+        self.logger.info(f"📦 Перенесено {len(items)} ключей в {self.DATA_FILE}")
 
 
 # Декоратор для кэширования результатов функций
+
+@dataclass
+class CachedFunctionStats:
+    """📊 Счетчики функции под @cached"""
+    hits: int = 0
+    negative_hits: int = 0          # попадания в закэшированное "не найдено"
+    misses: int = 0
+    coalesced: int = 0              # промахи, дождавшиеся чужого вычисления
+    errors: int = 0
+    
+    @property
+    def hit_rate(self) -> float:
+        """Процент попаданий (включая отрицательные)"""
+        total = self.hits + self.negative_hits + self.misses + self.coalesced
+        return ((self.hits + self.negative_hits) / total * 100) if total > 0 else 0.0
+    
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'hits': self.hits,
+            'negative_hits': self.negative_hits,
+            'misses': self.misses,
+            'coalesced': self.coalesced,
+            'errors': self.errors,
+            'hit_rate': round(self.hit_rate, 2)
+        }
+
+
+class NegativeResult(NamedTuple):
+    """🚫 Закэшированный отрицательный результат (None не отличить от промаха)"""
+    value: Any
+
+
+# Счетчики всех декорированных функций: имя функции -> статистика
+_cached_functions: Dict[str, CachedFunctionStats] = {}
+
+
+def get_cached_functions_stats() -> Dict[str, Dict[str, Any]]:
+    """📊 Счетчики всех функций под @cached"""
+    return {name: stats.to_dict() for name, stats in _cached_functions.items()}
+
+
+# repr по умолчанию (object.__repr__, функции) содержит адрес объекта
+_ADDRESS_REPR = re.compile(r" at 0x[0-9a-fA-F]+>")
+
+
+def _normalize_key_part(value: Any) -> Any:
+    """Аргумент -> JSON-совместимое значение, одинаковое для равных аргументов"""
+    if hasattr(type(value), "__cache_key__") and not isinstance(value, type):
+        return [type(value).__qualname__, _normalize_key_part(value.__cache_key__())]
+    if value is None or isinstance(value, (bool, int, str)):
+        return value
+    if isinstance(value, float):
+        return repr(value)
+    if isinstance(value, Decimal):
+        # Decimal('1.50') и Decimal('1.5') - один ключ
+        return ["Decimal", str(value.normalize())]
+    if isinstance(value, Enum):
+        return [type(value).__qualname__, value.name]
+    if isinstance(value, (datetime, date)):
+        return [type(value).__name__, value.isoformat()]
+    if isinstance(value, (list, tuple)):
+        return [_normalize_key_part(item) for item in value]
+    if isinstance(value, (set, frozenset)):
+        return ["set", sorted(json.dumps(_normalize_key_part(item)) for item in value)]
+    if isinstance(value, dict):
+        return ["dict", sorted(
+            (json.dumps(_normalize_key_part(k)), _normalize_key_part(v)) for k, v in value.items()
+        )]
+    text = repr(value)
+    if _ADDRESS_REPR.search(text):
+        raise TypeError(
+            f"Аргумент {type(value).__qualname__} без стабильного repr не годится для ключа кэша: "
+            f"задайте key_func или __cache_key__()"
+        )
+    return [type(value).__qualname__, text]
+
+
+def make_cache_key(
+    func: Callable,
+    args: tuple,
+    kwargs: Dict[str, Any],
+    prefix: Optional[str] = None,
+    share_across_instances: bool = False
+) -> str:
+    """🔑 Стабильный ключ вызова: префикс функции + blake2b от аргументов
+    
+    Аргументы связываются с сигнатурой, поэтому f(1, b=2) и f(1, 2) дают
+    один ключ. Ключ не зависит от процесса (нет hash() и id()), так что
+    годится и для PersistentCache: аргументы, чей repr содержит адрес
+    объекта, отклоняются (TypeError) - для них нужен key_func.
+    
+    Ключ метода различает экземпляры через self.__cache_key__() (например,
+    id аккаунта); без него - TypeError. share_across_instances=True
+    заменяет self именем класса - экземпляры делят результаты. cls - всегда
+    имя класса.
+    """
+    try:
+        bound = inspect.signature(func).bind(*args, **kwargs)
+        bound.apply_defaults()
+        arguments = dict(bound.arguments)
+    except (TypeError, ValueError):
+        arguments = {"args": args, "kwargs": kwargs}
+    
+    for name in ("self", "cls"):
+        if name not in arguments:
+            continue
+        owner = arguments[name]
+        owner_type = owner if isinstance(owner, type) else type(owner)
+        if isinstance(owner, type) or share_across_instances:
+            arguments[name] = f"{owner_type.__module__}.{owner_type.__qualname__}"
+        elif not hasattr(owner_type, "__cache_key__"):
+            raise TypeError(
+                f"{owner_type.__qualname__}.{func.__name__}: для ключа метода нужен "
+                f"__cache_key__(), key_func или share_across_instances=True"
+            )
+    
+    payload = json.dumps(_normalize_key_part(arguments), separators=(",", ":"))
+    digest = hashlib.blake2b(payload.encode("utf-8"), digest_size=16).hexdigest()
+    return f"{prefix or func.__module__ + '.' + func.__qualname__}:{digest}"
+
+
 def cached(
     cache: ICacheService,
     ttl: Optional[int] = None,
-    key_func: Optional[Callable] = None
+    key_func: Optional[Callable] = None,
+    negative_ttl: Optional[float] = None,
+    is_negative: Optional[Callable[[Any], bool]] = None,
+    prefix: Optional[str] = None,
+    share_across_instances: bool = False
 ):
-    """🎯 Декоратор для кэширования результатов функций"""
+    """🎯 Декоратор для кэширования результатов функций
+    
+    Промахи одного ключа в одном event loop делят одно вычисление.
+    Отрицательный результат (по умолчанию None, иначе - is_negative)
+    кэшируется на negative_ttl секунд; без negative_ttl не кэшируется.
+    Исключения не кэшируются. Счетчики - в wrapper.stats и
+    get_cached_functions_stats(). Ключи методов - см. make_cache_key.
+    """
+    negative = is_negative or (lambda result: result is None)
+    
     def decorator(func):
-        async def async_wrapper(*args, **kwargs):
-            # Генерируем ключ
+        name = prefix or f"{func.__module__}.{func.__qualname__}"
+        stats = CachedFunctionStats()
+        _cached_functions[name] = stats
+        inflight: Dict[Tuple[asyncio.AbstractEventLoop, str], asyncio.Task] = {}
+        
+        def cache_key(*args, **kwargs) -> str:
             if key_func:
-                cache_key = key_func(*args, **kwargs)
-            else:
-                cache_key = f"{func.__name__}:{hash(str(args) + str(sorted(kwargs.items())))}"
-            
-            # Пытаемся получить из кэша
-            result = await cache.get(cache_key)
-            if result is not None:
-                return result
-            
-            # Вычисляем результат
+                return key_func(*args, **kwargs)
+            return make_cache_key(func, args, kwargs, name, share_across_instances)
+        
+        async def compute(key: str, args: tuple, kwargs: Dict[str, Any]) -> Any:
             if asyncio.iscoroutinefunction(func):
                 result = await func(*args, **kwargs)
             else:
                 result = func(*args, **kwargs)
             
-            # Сохраняем в кэш
-            await cache.set(cache_key, result, ttl)
+            if negative(result):
+                if negative_ttl is not None:
+                    await cache.set(key, NegativeResult(result), negative_ttl)
+            else:
+                await cache.set(key, result, ttl)
             return result
         
-        def sync_wrapper(*args, **kwargs):
-            return asyncio.run(async_wrapper(*args, **kwargs))
+        def release(flight_key: Tuple[asyncio.AbstractEventLoop, str], task: asyncio.Task) -> None:
+            if inflight.get(flight_key) is task:
+                del inflight[flight_key]
+            if not task.cancelled() and task.exception() is not None:
+                stats.errors += 1
         
-        return async_wrapper if asyncio.iscoroutinefunction(func) else sync_wrapper
+        @functools.wraps(func)
+        async def async_wrapper(*args, **kwargs):
+            key = cache_key(*args, **kwargs)
+            
+            cached_value = await cache.get(key)
+            if isinstance(cached_value, NegativeResult):
+                stats.negative_hits += 1
+                return cached_value.value
+            if cached_value is not None:
+                stats.hits += 1
+                return cached_value
+            
+            loop = asyncio.get_running_loop()
+            flight_key = (loop, key)
+            task = inflight.get(flight_key)
+            if task is None:
+                stats.misses += 1
+                task = loop.create_task(compute(key, args, kwargs))
+                inflight[flight_key] = task
+                task.add_done_callback(lambda done: release(flight_key, done))
+            else:
+                stats.coalesced += 1
+            
+            # shield: отмена одного ожидающего не отменяет общее вычисление
+            return await asyncio.shield(task)
+        
+        if asyncio.iscoroutinefunction(func):
+            wrapper = async_wrapper
+        else:
+            @functools.wraps(func)
+            def wrapper(*args, **kwargs):
+                return asyncio.run(async_wrapper(*args, **kwargs))
+        
+        wrapper.stats = stats
+        wrapper.cache_key = cache_key
+        return wrapper
     
     return decorator
 
@@ -695,26 +1424,42 @@ class CacheFactory:
     def create_memory_cache(
         max_size: int = 1000,
         default_ttl: int = 300,
-        eviction_policy: str = "lru"
+        eviction_policy: str = "lru",
+        max_bytes: Optional[int] = None
     ) -> InMemoryCache:
         """Создание кэша в памяти"""
         policy_map = {
-            "lru": LRUEvictionPolicy(),
-            "ttl": TTLEvictionPolicy()
+            "lru": LRUEvictionPolicy,
+            "ttl": TTLEvictionPolicy,
+            "tinylfu": WTinyLFUEvictionPolicy
         }
         
-        policy = policy_map.get(eviction_policy, LRUEvictionPolicy())
-        return InMemoryCache(max_size, default_ttl, policy)
+        policy = policy_map.get(eviction_policy, LRUEvictionPolicy)()
+        return InMemoryCache(max_size, default_ttl, policy, max_bytes=max_bytes)
     
     @staticmethod
     def create_persistent_cache(
         storage_path: str,
         max_memory_size: int = 1000,
         default_ttl: int = 3600,
-        sync_interval: int = 300
+        sync_interval: int = 300,
+        fsync: bool = False
     ) -> PersistentCache:
         """Создание персистентного кэша"""
-        return PersistentCache(storage_path, max_memory_size, default_ttl, sync_interval)
+        return PersistentCache(storage_path, max_memory_size, default_ttl, sync_interval, fsync)
+    
+    @staticmethod
+    def create_tiered_cache(
+        max_size: int = 10000,
+        default_ttl: int = 300,
+        eviction_policy: str = "tinylfu",
+        max_bytes: Optional[int] = None,
+        storage_path: Optional[str] = None
+    ) -> TieredCache:
+        """Создание общего кэша: L1 InMemoryCache, L2 PersistentCache если задан storage_path"""
+        l1 = CacheFactory.create_memory_cache(max_size, default_ttl, eviction_policy, max_bytes)
+        l2 = CacheFactory.create_persistent_cache(storage_path, default_ttl=default_ttl) if storage_path else None
+        return TieredCache(l1, l2, default_ttl=default_ttl, tracked_keys_limit=max_size)
     
     @staticmethod
     def create_from_settings(cache_type: str, **kwargs) -> ICacheService:
@@ -723,5 +1468,7 @@ class CacheFactory:
             return CacheFactory.create_memory_cache(**kwargs)
         elif cache_type == "persistent":
             return CacheFactory.create_persistent_cache(**kwargs)
+        elif cache_type == "tiered":
+            return CacheFactory.create_tiered_cache(**kwargs)
         else:
             raise ValueError(f"Неподдерживаемый тип кэша: {cache_type}")
@@ -0,0 +1,540 @@
+import os
+import mmap
+import time
+import zlib
+import pickle
+import struct
+import logging
+import threading
+from array import array
+from pathlib import Path
+from typing import Dict, Any, Optional, List, Tuple, NamedTuple, Iterable, Iterator, Callable
+
+from ...core.exceptions import CacheError
+
+
+# Файл данных: заголовок (магия, версия, поколение) и записи подряд
+FILE_MAGIC = b"TBLS"
+FILE_VERSION = 1
+FILE_HEADER = struct.Struct("<4sHQ")
+
+# Запись: crc32 остатка, expires_at (unix time, 0 - без срока), длины ключа и значения, флаги
+RECORD_HEADER = struct.Struct("<IdHIB")
+FLAG_TOMBSTONE = 1
+
+# Hint-файл: снимок индекса для старта без чтения данных. После заголовка -
+# pickle (ключи, смещения, длины, сроки) с колонками в виде байтов array
+HINT_MAGIC = b"TBLH"
+HINT_HEADER = struct.Struct("<4sHQQI")
+
+
+class IndexEntry(NamedTuple):
+    """📍 Положение актуальной записи ключа в файле данных"""
+    offset: int
+    length: int
+    expires_at: float
+
+
+class ColumnarIndex:
+    """🗂️ Индекс ключ -> слот; смещения, длины и сроки лежат в колонках array
+
+    Колонки не создают объект на каждое поле: загрузка из hint-файла - это
+    frombytes и один dict(zip(...)), без разбора записей в Python.
+    Освободившиеся слоты переиспользуются.
+    """
+
+    def __init__(self):
+        self.slots: Dict[str, int] = {}
+        self.offsets = array("Q")
+        self.lengths = array("I")
+        self.expires = array("d")
+        self._free: List[int] = []
+
+    @classmethod
+    def from_columns(cls, keys: List[str], offsets: array, lengths: array, expires: array) -> 'ColumnarIndex':
+        index = cls()
+        index.slots = dict(zip(keys, range(len(keys))))
+        index.offsets, index.lengths, index.expires = offsets, lengths, expires
+        return index
+
+    def __len__(self) -> int:
+        return len(self.slots)
+
+    def __contains__(self, key: str) -> bool:
+        return key in self.slots
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.slots)
+
+    def get(self, key: str) -> Optional[IndexEntry]:
+        slot = self.slots.get(key)
+        if slot is None:
+            return None
+        return IndexEntry(self.offsets[slot], self.lengths[slot], self.expires[slot])
+
+    def items(self) -> Iterator[Tuple[str, IndexEntry]]:
+        for key, slot in self.slots.items():
+            yield key, IndexEntry(self.offsets[slot], self.lengths[slot], self.expires[slot])
+
+    def set(self, key: str, offset: int, length: int, expires_at: float) -> int:
+        """Запись положения ключа; длина вытесненной записи (0 - ключ новый)"""
+        slot = self.slots.get(key)
+        if slot is not None:
+            previous = self.lengths[slot]
+            self.offsets[slot], self.lengths[slot], self.expires[slot] = offset, length, expires_at
+            return previous
+
+        if self._free:
+            slot = self._free.pop()
+            self.offsets[slot], self.lengths[slot], self.expires[slot] = offset, length, expires_at
+        else:
+            slot = len(self.offsets)
+            self.offsets.append(offset)
+            self.lengths.append(length)
+            self.expires.append(expires_at)
+        self.slots[key] = slot
+        return 0
+
+    def pop(self, key: str) -> int:
+        """Удаление ключа; длина его записи (0 - ключа не было)"""
+        slot = self.slots.pop(key, None)
+        if slot is None:
+            return 0
+        self._free.append(slot)
+        return self.lengths[slot]
+
+    def live_bytes(self) -> int:
+        if not self._free:
+            return sum(self.lengths)
+        lengths = self.lengths
+        return sum(lengths[slot] for slot in self.slots.values())
+
+    def to_columns(self) -> Tuple[List[str], array, array, array]:
+        """Плотные колонки в порядке ключей (для hint-файла)"""
+        slots = list(self.slots.values())
+        return (
+            list(self.slots),
+            array("Q", map(self.offsets.__getitem__, slots)),
+            array("I", map(self.lengths.__getitem__, slots)),
+            array("d", map(self.expires.__getitem__, slots))
+        )
+
+
+def _encode_record(key: bytes, payload: bytes, expires_at: float, flags: int = 0) -> bytes:
+    body = RECORD_HEADER.pack(0, expires_at, len(key), len(payload), flags)[4:] + key + payload
+    return struct.pack("<I", zlib.crc32(body)) + body
+
+
+class LogStructuredStore:
+    """📜 Журнальное хранилище ключ-значение в одном файле
+
+    Запись - только дописывание в конец (crc32 на каждую запись), удаление -
+    запись-надгробие. В памяти - колоночный индекс ключ -> (смещение, длина, срок);
+    чтение - срез memory-mapped файла. При закрытии и после уплотнения индекс
+    сохраняется в hint-файл: старт читает его и досканирует только записи,
+    дописанные после снимка. Оборванная при сбое последняя запись
+    отбрасывается. Уплотнение переписывает живые записи в новый файл и
+    атомарно подменяет старый.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        fsync: bool = False,
+        compaction_ratio: float = 0.5,
+        compaction_min_bytes: int = 1 << 20,
+        clock: Callable[[], float] = time.time
+    ):
+        self.path = Path(path)
+        self.hint_path = self.path.with_name(self.path.name + ".hint")
+        self.fsync = fsync
+        self.compaction_ratio = compaction_ratio
+        self.compaction_min_bytes = compaction_min_bytes
+        self._clock = clock
+
+        self._lock = threading.RLock()
+        self._index = ColumnarIndex()
+        self._file = None
+        self._mmap: Optional[mmap.mmap] = None
+        self._size = 0
+        self.generation = 0
+
+        # Статистика
+        self.live_bytes = 0
+        self.dead_bytes = 0
+        self.compactions = 0
+        self.truncated_bytes = 0
+        self.startup_seconds = 0.0
+        self.loaded_from_hint = False
+        self.scanned_records = 0
+
+        self.logger = logging.getLogger(__name__)
+
+        started = time.perf_counter()
+        self._open()
+        self.startup_seconds = time.perf_counter() - started
+
+    def __len__(self) -> int:
+        return len(self._index)
+
+    def __contains__(self, key: str) -> bool:
+        with self._lock:
+            entry = self._index.get(key)
+        return entry is not None and not self._is_expired(entry, self._clock())
+
+    def keys(self) -> List[str]:
+        return list(self._index.slots)
+
+    # ================= ЧТЕНИЕ / ЗАПИСЬ =================
+
+    def get(self, key: str, default: Any = None) -> Any:
+        """🔍 Значение ключа (None/default - нет или истек)
+
+        Индекс и файл читаются под одной блокировкой: compact() подменяет их
+        вместе, и смещение из старого индекса указывало бы в новый файл.
+        """
+        encoded_key = key.encode("utf-8")
+        with self._lock:
+            entry = self._index.get(key)
+            if entry is None or self._is_expired(entry, self._clock()):
+                return default
+            record = self._read(entry)
+
+        if len(record) < RECORD_HEADER.size or zlib.crc32(record[4:]) != struct.unpack_from("<I", record)[0]:
+            raise CacheError(f"Поврежденная запись {key} в {self.path}")
+        key_length = RECORD_HEADER.unpack_from(record)[2]
+        # Целая запись другого ключа (crc сходится) - индекс не соответствует файлу
+        if record[RECORD_HEADER.size:RECORD_HEADER.size + key_length] != encoded_key:
+            raise CacheError(f"Запись по смещению {entry.offset} в {self.path} принадлежит другому ключу")
+        return pickle.loads(record[RECORD_HEADER.size + key_length:])
+
+    def get_expires_at(self, key: str) -> Optional[float]:
+        """⏰ Срок записи (unix time); None - без срока или нет ключа"""
+        with self._lock:
+            entry = self._index.get(key)
+        if entry is None or not entry.expires_at:
+            return None
+        return entry.expires_at
+
+    def put(self, key: str, value: Any, expires_at: Optional[float] = None) -> None:
+        """💾 Дописывание значения"""
+        self.put_many([(key, value, expires_at)])
+
+    def put_many(self, items: Iterable[Tuple[str, Any, Optional[float]]]) -> int:
+        """💾 Пакетная запись одним write (и одним fsync)"""
+        encoded = []
+        for key, value, expires_at in items:
+            encoded.append((key, _encode_record(
+                key.encode("utf-8"), pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL), expires_at or 0.0
+            ), expires_at or 0.0))
+        if not encoded:
+            return 0
+
+        with self._lock:
+            offset = self._size
+            self._append(b"".join(record for _, record, _ in encoded))
+            for key, record, expires_at in encoded:
+                self._set_index(key, offset, len(record), expires_at)
+                offset += len(record)
+        return len(encoded)
+
+    def delete(self, key: str) -> bool:
+        """🗑️ Надгробие для ключа"""
+        with self._lock:
+            if key not in self._index:
+                return False
+            tombstone = _encode_record(key.encode("utf-8"), b"", 0.0, FLAG_TOMBSTONE)
+            self._append(tombstone)
+            self._drop_index(key)
+            self.dead_bytes += len(tombstone)
+            return True
+
+    def clear(self) -> None:
+        """🧹 Пустой файл с новым поколением"""
+        with self._lock:
+            self._close_handles()
+            self._create_data_file(self.path)
+            self.hint_path.unlink(missing_ok=True)
+            self._index = ColumnarIndex()
+            self._open_handles()
+            self.live_bytes = self.dead_bytes = 0
+
+    def flush(self) -> None:
+        """💽 Сброс буфера (и fsync при включенной политике)"""
+        with self._lock:
+            self._flush()
+
+    def close(self) -> None:
+        """🛑 Сброс, сохранение индекса в hint-файл, закрытие"""
+        with self._lock:
+            if self._file is None:
+                return
+            self._flush(force_fsync=True)
+            self._write_hint()
+            self._close_handles()
+
+    # ================= УПЛОТНЕНИЕ =================
+
+    def needs_compaction(self) -> bool:
+        """Доля мертвых байт превысила порог"""
+        data_bytes = self.live_bytes + self.dead_bytes
+        return (
+            self.dead_bytes >= self.compaction_min_bytes
+            and data_bytes > 0
+            and self.dead_bytes / data_bytes >= self.compaction_ratio
+        )
+
+    def compact(self) -> Dict[str, int]:
+        """🗜️ Перезапись живых записей в новый файл
+
+        Основной объем копируется без блокировки по снимку индекса; под
+        блокировкой - только записи, дописанные за время копирования, и
+        подмена файла.
+        """
+        now = self._clock()
+        with self._lock:
+            self._flush()
+            snapshot = list(self._index.items())
+            snapshot_end = self._size
+            before = self._size
+
+        temp_path = self.path.with_name(self.path.name + ".compact")
+        generation = self._create_data_file(temp_path, sync=False)
+        new_index = ColumnarIndex()
+
+        with open(temp_path, "r+b") as target:
+            target.seek(0, os.SEEK_END)
+            offset = target.tell()
+
+            with open(self.path, "rb") as source:
+                view = mmap.mmap(source.fileno(), snapshot_end, access=mmap.ACCESS_READ)
+                try:
+                    for key, entry in snapshot:
+                        if self._is_expired(entry, now):
+                            continue
+                        target.write(view[entry.offset:entry.offset + entry.length])
+                        new_index.set(key, offset, entry.length, entry.expires_at)
+                        offset += entry.length
+                finally:
+                    view.close()
+
+            with self._lock:
+                # Дописанное за время копирования - переносим как есть
+                self._flush()
+                if self._size > snapshot_end:
+                    with open(self.path, "rb") as source:
+                        view = mmap.mmap(source.fileno(), self._size, access=mmap.ACCESS_READ)
+                        try:
+                            for record_offset, record_length, key, expires_at, flags in self._iter_records(view, snapshot_end, self._size):
+                                target.write(view[record_offset:record_offset + record_length])
+                                if flags & FLAG_TOMBSTONE:
+                                    new_index.pop(key)
+                                else:
+                                    new_index.set(key, offset, record_length, expires_at)
+                                offset += record_length
+                        finally:
+                            view.close()
+
+                target.flush()
+                os.fsync(target.fileno())
+                target.close()
+
+                self._close_handles()
+                os.replace(temp_path, self.path)
+                self._open_handles()
+                self.generation = generation
+                self._index = new_index
+                self.live_bytes = new_index.live_bytes()
+                self.dead_bytes = self._size - FILE_HEADER.size - self.live_bytes
+                self._write_hint()
+                self.compactions += 1
+
+        self.logger.info(f"🗜️ Уплотнение {self.path.name}: {before} -> {self._size} байт, {len(new_index)} ключей")
+        return {"before_bytes": before, "after_bytes": self._size, "entries": len(new_index)}
+
+    # ================= СТАТУС =================
+
+    def get_status(self) -> Dict[str, Any]:
+        """📊 Размеры, доля мусора и параметры старта"""
+        data_bytes = self.live_bytes + self.dead_bytes
+        return {
+            "entries": len(self._index),
+            "file_bytes": self._size,
+            "live_bytes": self.live_bytes,
+            "dead_bytes": self.dead_bytes,
+            "dead_ratio": round(self.dead_bytes / data_bytes, 3) if data_bytes else 0.0,
+            "generation": self.generation,
+            "compactions": self.compactions,
+            "truncated_bytes": self.truncated_bytes,
+            "startup": {
+                "seconds": round(self.startup_seconds, 4),
+                "from_hint": self.loaded_from_hint,
+                "scanned_records": self.scanned_records
+            }
+        }
+
+    # ================= ВНУТРЕННЕЕ =================
+
+    @staticmethod
+    def _is_expired(entry: IndexEntry, now: float) -> bool:
+        return bool(entry.expires_at) and now > entry.expires_at
+
+    def _set_index(self, key: str, offset: int, length: int, expires_at: float) -> None:
+        previous = self._index.set(key, offset, length, expires_at)
+        self.live_bytes += length - previous
+        self.dead_bytes += previous
+
+    def _drop_index(self, key: str) -> None:
+        previous = self._index.pop(key)
+        self.live_bytes -= previous
+        self.dead_bytes += previous
+
+    def _append(self, data: bytes) -> None:
+        self._file.write(data)
+        self._size += len(data)
+        self._flush()
+
+    def _flush(self, force_fsync: bool = False) -> None:
+        self._file.flush()
+        if self.fsync or force_fsync:
+            os.fsync(self._file.fileno())
+
+    def _read(self, entry: IndexEntry) -> bytes:
+        end = entry.offset + entry.length
+        if self._mmap is None or end > len(self._mmap):
+            # Запись дописана после отображения файла
+            self._remap()
+        return self._mmap[entry.offset:end]
+
+    def _remap(self) -> None:
+        if self._mmap is not None:
+            self._mmap.close()
+        self._mmap = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+
+    def _create_data_file(self, path: Path, sync: bool = True) -> int:
+        generation = int.from_bytes(os.urandom(8), "little")
+        with open(path, "wb") as f:
+            f.write(FILE_HEADER.pack(FILE_MAGIC, FILE_VERSION, generation))
+            f.flush()
+            if sync:
+                os.fsync(f.fileno())
+        return generation
+
+    def _open_handles(self) -> None:
+        self._file = open(self.path, "r+b")
+        self._file.seek(0, os.SEEK_END)
+        self._size = self._file.tell()
+        self._remap()
+
+    def _close_handles(self) -> None:
+        if self._mmap is not None:
+            self._mmap.close()
+            self._mmap = None
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def _open(self) -> None:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        if not self.path.exists():
+            self._create_data_file(self.path)
+
+        self._open_handles()
+        header = self._mmap[:FILE_HEADER.size]
+        if len(header) < FILE_HEADER.size or header[:4] != FILE_MAGIC:
+            # Кэш восстановим с нуля, испорченный файл оставляем для разбора
+            self.logger.error(f"❌ Неизвестный формат {self.path}, файл переименован в .corrupt")
+            self._close_handles()
+            os.replace(self.path, self.path.with_name(self.path.name + ".corrupt"))
+            self._create_data_file(self.path)
+            self._open_handles()
+            header = self._mmap[:FILE_HEADER.size]
+        self.generation = FILE_HEADER.unpack(header)[2]
+
+        scan_from = self._load_hint()
+        self._scan(scan_from)
+
+        self.live_bytes = self._index.live_bytes()
+        self.dead_bytes = self._size - FILE_HEADER.size - self.live_bytes
+
+    def _load_hint(self) -> int:
+        """Индекс из hint-файла; смещение, с которого нужно досканировать данные"""
+        try:
+            with open(self.hint_path, "rb") as f:
+                data = f.read()
+        except FileNotFoundError:
+            return FILE_HEADER.size
+
+        try:
+            magic, version, generation, covered, count = HINT_HEADER.unpack_from(data)
+            if magic != HINT_MAGIC or generation != self.generation or covered > self._size:
+                return FILE_HEADER.size
+            if zlib.crc32(data[:-4]) != struct.unpack_from("<I", data, len(data) - 4)[0]:
+                return FILE_HEADER.size
+
+            keys, offsets_raw, lengths_raw, expires_raw = pickle.loads(data[HINT_HEADER.size:-4])
+            offsets, lengths, expires = array("Q"), array("I"), array("d")
+            offsets.frombytes(offsets_raw)
+            lengths.frombytes(lengths_raw)
+            expires.frombytes(expires_raw)
+            if not len(keys) == len(offsets) == len(lengths) == len(expires) == count:
+                return FILE_HEADER.size
+
+            index = ColumnarIndex.from_columns(keys, offsets, lengths, expires)
+        except (struct.error, pickle.UnpicklingError, ValueError, TypeError, EOFError):
+            return FILE_HEADER.size
+
+        self._index = index
+        self.loaded_from_hint = True
+        return covered
+
+    def _write_hint(self) -> None:
+        keys, offsets, lengths, expires = self._index.to_columns()
+        data = HINT_HEADER.pack(HINT_MAGIC, FILE_VERSION, self.generation, self._size, len(keys)) + pickle.dumps(
+            (keys, offsets.tobytes(), lengths.tobytes(), expires.tobytes()),
+            protocol=pickle.HIGHEST_PROTOCOL
+        )
+
+        temp_path = self.hint_path.with_name(self.hint_path.name + ".tmp")
+        with open(temp_path, "wb") as f:
+            f.write(data)
+            f.write(struct.pack("<I", zlib.crc32(data)))
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temp_path, self.hint_path)
+
+    def _scan(self, start: int) -> None:
+        """Применение записей [start, конец) к индексу; оборванный хвост отрезается"""
+        end = start
+        for offset, length, key, expires_at, flags in self._iter_records(self._mmap, start, self._size):
+            if flags & FLAG_TOMBSTONE:
+                self._index.pop(key)
+            else:
+                self._index.set(key, offset, length, expires_at)
+            self.scanned_records += 1
+            end = offset + length
+
+        if end < self._size:
+            self.logger.warning(f"⚠️ {self.path.name}: отброшен оборванный хвост {self._size - end} байт")
+            self.truncated_bytes += self._size - end
+            self._mmap.close()
+            self._mmap = None
+            self._file.truncate(end)
+            self._file.seek(end)
+            self._size = end
+            self._flush(force_fsync=True)
+            self._remap()
+
+    @staticmethod
+    def _iter_records(view, start: int, end: int):
+        """(смещение, длина, ключ, срок, флаги) целых записей с верным crc"""
+        position = start
+        header_size = RECORD_HEADER.size
+        while position + header_size <= end:
+            crc, expires_at, key_length, value_length, flags = RECORD_HEADER.unpack_from(view, position)
+            length = header_size + key_length + value_length
+            if position + length > end or zlib.crc32(view[position + 4:position + length]) != crc:
+                return
+            key = view[position + header_size:position + header_size + key_length].decode("utf-8")
+            yield position, length, key, expires_at, flags
+            position += length
@@ -0,0 +1,295 @@
+import os
+import json
+import time
+import logging
+from dataclasses import dataclass
+from enum import Enum
+from pathlib import Path
+from typing import Dict, Any, Optional, Callable, IO
+
+
+# ================= ПАРАМЕТРЫ =================
+
+class FsyncPolicy(Enum):
+    """💽 Когда журнал сбрасывается на диск"""
+    ALWAYS = "always"        # fsync на каждую запись
+    INTERVAL = "interval"    # не чаще раза в fsync_interval секунд (и при закрытии)
+    NEVER = "never"          # только flush в ОС: переживает падение процесса, но не питания
+
+
+@dataclass
+class JournalStats:
+    """📊 Статистика журнала"""
+    appends: int = 0
+    fsyncs: int = 0
+    compactions: int = 0
+    replayed_records: int = 0
+    skipped_records: int = 0
+    load_seconds: float = 0.0
+    last_compaction_seconds: float = 0.0
+
+
+# ================= ЖУРНАЛ =================
+
+class EntityJournal:
+    """📒 Хранилище сущностей репозитория: снимок + журнал изменений
+
+    Снимок - файл репозитория в прежнем формате ({id: сущность}), журнал
+    рядом (<файл>.journal) - по строке JSONL на изменение. Индекс в памяти
+    хранит компактный JSON каждой сущности: он неизменяем, поэтому копию
+    индекса можно писать в снимок из другого потока.
+
+    Уплотнение: rotate() переименовывает журнал в <файл>.journal.compacting
+    и открывает новый, write_snapshot() пишет снимок через временный файл и
+    удаляет старый журнал. Повторное применение записей идемпотентно, так
+    что падение на любом шаге восстанавливается при open().
+    """
+
+    def __init__(
+        self,
+        snapshot_path: Path,
+        fsync_policy: str = "interval",
+        fsync_interval: float = 1.0,
+        compaction_min_records: int = 10000,
+        clock: Callable[[], float] = time.monotonic
+    ):
+        self.snapshot_path = Path(snapshot_path)
+        self.journal_path = self.snapshot_path.with_name(self.snapshot_path.name + ".journal")
+        self.rotated_path = self.snapshot_path.with_name(self.snapshot_path.name + ".journal.compacting")
+        self.fsync_policy = FsyncPolicy(fsync_policy)
+        self.fsync_interval = fsync_interval
+        self.compaction_min_records = compaction_min_records
+        self._clock = clock
+
+        self._file: Optional[IO[bytes]] = None
+        self._last_fsync = 0.0
+        self._unsynced = False
+        self.records = 0                # записей в журнале после последнего снимка
+
+        self.stats = JournalStats()
+        self.logger = logging.getLogger(__name__)
+
+    # ================= ОТКРЫТИЕ =================
+
+    def open(self) -> Dict[str, str]:
+        """📥 Индекс id -> JSON сущности: снимок + недоуплотненный журнал + журнал"""
+        started = time.perf_counter()
+        index: Dict[str, str] = {}
+        self.records = 0
+
+        if self.snapshot_path.exists():
+            with open(self.snapshot_path, 'r', encoding='utf-8') as f:
+                data = f.read()
+            if not self._load_own_snapshot(data, index):
+                # Файл прежнего формата (indent=2) - полный разбор
+                index.clear()
+                raw_data = json.loads(data) if data.strip() else {}
+                if isinstance(raw_data, dict):
+                    for entity_id, entity_data in raw_data.items():
+                        index[entity_id] = _dumps(entity_data)
+
+        interrupted = self.rotated_path.exists()
+        if interrupted:
+            self.records += self._replay(self.rotated_path, index)
+        self._repair_tail(self.journal_path)
+        self.records += self._replay(self.journal_path, index)
+
+        self._file = open(self.journal_path, 'ab')
+        self._last_fsync = self._clock()
+
+        if interrupted:
+            # Уплотнение прервано - доводим его до конца сразу
+            self.logger.warning(f"🩹 {self.snapshot_path.name}: завершаем прерванное уплотнение")
+            self.rotate()
+            self.write_snapshot(dict(index))
+
+        self.stats.load_seconds = time.perf_counter() - started
+        self.logger.info(
+            f"📒 {self.snapshot_path.name}: {len(index)} сущностей, {self.records} записей журнала, "
+            f"загрузка {self.stats.load_seconds * 1000:.0f}мс"
+        )
+        return index
+
+    @staticmethod
+    def _load_own_snapshot(data: str, index: Dict[str, str]) -> bool:
+        """Снимок от write_snapshot(): строка на сущность, JSON берется как есть"""
+        lines = data.split("\n")
+        if len(lines) < 3 or lines[0] != "{" or lines[-2] != "}":
+            return False
+        decode = _decoder.raw_decode
+        for line in lines[1:-2]:
+            if not line.startswith('"'):
+                return False
+            try:
+                entity_id, end = decode(line)
+            except ValueError:
+                return False
+            if line[end:end + 1] != ":":
+                return False
+            index[entity_id] = line[end + 1:-1] if line.endswith(",") else line[end + 1:]
+        return True
+
+    def _replay(self, path: Path, index: Dict[str, str]) -> int:
+        if not path.exists():
+            return 0
+        count = 0
+        with open(path, 'rb') as f:
+            for line in f:
+                if not line.endswith(b"\n"):
+                    break
+                try:
+                    record = json.loads(line)
+                    if record["op"] == "put":
+                        index[record["id"]] = _dumps(record["data"])
+                    else:
+                        index.pop(record["id"], None)
+                except (ValueError, KeyError, TypeError) as e:
+                    self.stats.skipped_records += 1
+                    self.logger.warning(f"⚠️ {path.name}: пропущена поврежденная запись: {e}")
+                    continue
+                count += 1
+        self.stats.replayed_records += count
+        return count
+
+    def _repair_tail(self, path: Path) -> None:
+        """🩹 Обрезка недописанной последней строки, чтобы дозапись не склеилась с ней"""
+        if not path.exists():
+            return
+        size = path.stat().st_size
+        if size == 0:
+            return
+        with open(path, 'rb+') as f:
+            position = size
+            while position > 0:
+                step = min(4096, position)
+                f.seek(position - step)
+                chunk = f.read(step)
+                newline = chunk.rfind(b"\n")
+                if newline >= 0:
+                    position = position - step + newline + 1
+                    break
+                position -= step
+            if position != size:
+                self.logger.warning(f"🩹 {path.name}: обрезана недописанная запись ({size - position} байт)")
+                f.truncate(position)
+                f.flush()
+                os.fsync(f.fileno())
+
+    # ================= ЗАПИСЬ =================
+
+    def append_put(self, entity_id: str, entity_json: str) -> None:
+        """➕ Сохранение сущности (entity_json - результат JSONSerializer.serialize_compact)"""
+        self._append(f'{{"op":"put","id":{_dumps(entity_id)},"data":{entity_json}}}\n')
+
+    def append_delete(self, entity_id: str) -> None:
+        """➖ Удаление сущности"""
+        self._append(f'{{"op":"del","id":{_dumps(entity_id)}}}\n')
+
+    def _append(self, line: str) -> None:
+        self._file.write(line.encode('utf-8'))
+        self._file.flush()
+        self.records += 1
+        self.stats.appends += 1
+
+        if self.fsync_policy is FsyncPolicy.ALWAYS:
+            self._fsync()
+        elif self.fsync_policy is FsyncPolicy.INTERVAL:
+            self._unsynced = True
+            if self._clock() - self._last_fsync >= self.fsync_interval:
+                self._fsync()
+
+    def _fsync(self) -> None:
+        os.fsync(self._file.fileno())
+        self._last_fsync = self._clock()
+        self._unsynced = False
+        self.stats.fsyncs += 1
+
+    def sync(self) -> None:
+        """💽 Сброс несинхронизированных записей на диск"""
+        if self._file is not None and (self._unsynced or self.fsync_policy is FsyncPolicy.NEVER):
+            self._file.flush()
+            self._fsync()
+
+    # ================= УПЛОТНЕНИЕ =================
+
+    def needs_compaction(self, live_entities: int) -> bool:
+        """Журнал дорос до половины живых сущностей: уплотнение амортизированно O(1) на запись"""
+        return self.records >= max(self.compaction_min_records, live_entities // 2)
+
+    def rotate(self) -> None:
+        """🔄 Новый журнал для записей после снимка; старый ждет write_snapshot()"""
+        self.sync()
+        self._file.close()
+        if self.rotated_path.exists():
+            # Прошлое уплотнение не удалось - старый журнал дополняется текущим
+            with open(self.rotated_path, 'ab') as rotated, open(self.journal_path, 'rb') as current:
+                for chunk in iter(lambda: current.read(1 << 20), b""):
+                    rotated.write(chunk)
+                rotated.flush()
+                os.fsync(rotated.fileno())
+            os.remove(self.journal_path)
+        else:
+            os.replace(self.journal_path, self.rotated_path)
+        self._file = open(self.journal_path, 'ab')
+        self.records = 0
+
+    def write_snapshot(self, entities: Dict[str, str]) -> None:
+        """💾 Снимок из копии индекса (можно вызывать из потока executor'а)"""
+        started = time.perf_counter()
+        temp_path = self.snapshot_path.with_suffix('.tmp')
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            f.write("{")
+            separator = "\n"
+            for entity_id, entity_json in entities.items():
+                f.write(f"{separator}{_dumps(entity_id)}:{entity_json}")
+                separator = ",\n"
+            f.write("\n}\n")
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temp_path, self.snapshot_path)
+        if self.rotated_path.exists():
+            os.remove(self.rotated_path)
+
+        self.stats.compactions += 1
+        self.stats.last_compaction_seconds = time.perf_counter() - started
+
+    # ================= ЗАКРЫТИЕ =================
+
+    def reset(self) -> None:
+        """🧹 Удаление журналов (снимок заменен извне, например из резервной копии)"""
+        self.close()
+        for path in (self.journal_path, self.rotated_path):
+            if path.exists():
+                os.remove(path)
+        self.records = 0
+
+    def close(self) -> None:
+        """🛑 Сброс на диск и закрытие журнала"""
+        if self._file is not None:
+            self.sync()
+            self._file.close()
+            self._file = None
+
+    def get_status(self) -> Dict[str, Any]:
+        """📊 Состояние журнала"""
+        stats = self.stats
+        return {
+            'journal_records': self.records,
+            'journal_bytes': self.journal_path.stat().st_size if self.journal_path.exists() else 0,
+            'fsync_policy': self.fsync_policy.value,
+            'appends': stats.appends,
+            'fsyncs': stats.fsyncs,
+            'compactions': stats.compactions,
+            'compacting': self.rotated_path.exists(),
+            'replayed_records': stats.replayed_records,
+            'skipped_records': stats.skipped_records,
+            'load_seconds': round(stats.load_seconds, 3),
+            'last_compaction_seconds': round(stats.last_compaction_seconds, 3)
+        }
+
+
+_decoder = json.JSONDecoder()
+
+
+def _dumps(value: Any) -> str:
+    return json.dumps(value, ensure_ascii=False, separators=(",", ":"))
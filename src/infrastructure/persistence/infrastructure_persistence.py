@@ -2,7 +2,6 @@ import json
 import csv
 import sqlite3
 import asyncio
-import aiosqlite
 import logging
 from abc import ABC, abstractmethod
 from dataclasses import dataclass, asdict
@@ -13,10 +12,16 @@ from contextlib import asynccontextmanager
 from decimal import Decimal
 import pickle
 
-from ..core.interfaces import IRepository, IUnitOfWork
-from ..core.models import Position, TradeOrder, TradeResult, TradingPair
-from ..core.exceptions import PersistenceError, ValidationError
-from ..core.constants import Trading
+try:
+    import aiosqlite
+    AIOSQLITE_AVAILABLE = True
+except ImportError:
+    AIOSQLITE_AVAILABLE = False
+
+from ...core.interfaces import IRepository, IUnitOfWork
+from ...core.models import Position, TradeResult
+from ...core.exceptions import PersistenceError
+from .entity_journal import EntityJournal
 
 T = TypeVar('T')
 
@@ -30,6 +35,10 @@ class RepositoryConfig:
     backup_interval: int = 3600  # секунд
     auto_migrate: bool = True
     compression: bool = False
+    journal_enabled: bool = False             # дозапись изменений вместо перезаписи файла
+    journal_fsync: str = "interval"           # always / interval / never
+    journal_fsync_interval: float = 1.0       # секунд
+    journal_compaction_min_records: int = 10000
 
 
 class JSONSerializer:
@@ -38,16 +47,22 @@ class JSONSerializer:
     @staticmethod
     def serialize(obj: Any) -> str:
         """Сериализация объекта в JSON"""
-        def decimal_handler(obj):
-            if isinstance(obj, Decimal):
-                return str(obj)
-            elif isinstance(obj, datetime):
-                return obj.isoformat()
-            elif hasattr(obj, '__dict__'):
-                return asdict(obj) if hasattr(obj, '__dataclass_fields__') else obj.__dict__
-            raise TypeError(f"Объект типа {type(obj)} не сериализуем")
-        
-        return json.dumps(obj, default=decimal_handler, indent=2, ensure_ascii=False)
+        return json.dumps(obj, default=JSONSerializer._default, indent=2, ensure_ascii=False)
+    
+    @staticmethod
+    def serialize_compact(obj: Any) -> str:
+        """Сериализация в одну строку (записи журнала)"""
+        return json.dumps(obj, default=JSONSerializer._default, separators=(",", ":"), ensure_ascii=False)
+    
+    @staticmethod
+    def _default(obj: Any) -> Any:
+        if isinstance(obj, Decimal):
+            return str(obj)
+        elif isinstance(obj, datetime):
+            return obj.isoformat()
+        elif hasattr(obj, '__dict__'):
+            return asdict(obj) if hasattr(obj, '__dataclass_fields__') else obj.__dict__
+        raise TypeError(f"Объект типа {type(obj)} не сериализуем")
     
     @staticmethod
     def deserialize(data: str, target_type: Optional[Type] = None) -> Any:
@@ -89,7 +104,15 @@ class JSONSerializer:
 
 
 class FileRepository(IRepository[T], Generic[T]):
-    """📁 Файловый репозиторий"""
+    """📁 Файловый репозиторий
+    
+    По умолчанию каждая запись перечитывает и перезаписывает весь файл.
+    С journal_enabled изменения дописываются в журнал (EntityJournal),
+    чтение идет из индекса в памяти, а файл репозитория становится
+    снимком, который переписывается в фоне, когда журнал дорастает
+    до половины числа сущностей.
+    Формат снимка прежний: после compact() файл читается и без журнала.
+    """
     
     def __init__(
         self,
@@ -113,9 +136,25 @@ class FileRepository(IRepository[T], Generic[T]):
         
         self.logger = logging.getLogger(__name__)
         self._lock = asyncio.Lock()
+        
+        # Режим журнала: индекс id -> JSON сущности, загружается при первом обращении
+        self.journal: Optional[EntityJournal] = None
+        self._index: Optional[Dict[str, str]] = None
+        self._max_numeric_id: Optional[int] = None
+        self._compaction: Optional[asyncio.Future] = None
+        if config.journal_enabled:
+            self.journal = EntityJournal(
+                self.file_path,
+                fsync_policy=config.journal_fsync,
+                fsync_interval=config.journal_fsync_interval,
+                compaction_min_records=config.journal_compaction_min_records
+            )
     
     async def save(self, entity: T) -> T:
         """💾 Сохранение сущности"""
+        if self.journal is not None:
+            return await self._save_journaled(entity)
+        
         async with self._lock:
             entities = await self._load_all()
             
@@ -137,11 +176,23 @@ class FileRepository(IRepository[T], Generic[T]):
     
     async def find_by_id(self, entity_id: str) -> Optional[T]:
         """🔍 Поиск по ID"""
+        if self.journal is not None:
+            entity_json = (await self._journal_index()).get(entity_id)
+            return self._to_entity(entity_id, json.loads(entity_json)) if entity_json is not None else None
+        
         entities = await self._load_all()
         return entities.get(entity_id)
     
     async def find_all(self) -> List[T]:
         """📋 Получение всех сущностей"""
+        if self.journal is not None:
+            entities = []
+            for entity_id, entity_json in list((await self._journal_index()).items()):
+                entity = self._to_entity(entity_id, json.loads(entity_json))
+                if entity is not None:
+                    entities.append(entity)
+            return entities
+        
         entities = await self._load_all()
         return list(entities.values())
     
@@ -158,6 +209,9 @@ class FileRepository(IRepository[T], Generic[T]):
     
     async def delete(self, entity_id: str) -> bool:
         """🗑️ Удаление сущности"""
+        if self.journal is not None:
+            return await self._delete_journaled(entity_id)
+        
         async with self._lock:
             entities = await self._load_all()
             
@@ -171,11 +225,17 @@ class FileRepository(IRepository[T], Generic[T]):
     
     async def count(self) -> int:
         """🔢 Подсчет количества сущностей"""
+        if self.journal is not None:
+            return len(await self._journal_index())
+        
         entities = await self._load_all()
         return len(entities)
     
     async def exists(self, entity_id: str) -> bool:
         """❓ Проверка существования"""
+        if self.journal is not None:
+            return entity_id in await self._journal_index()
+        
         entities = await self._load_all()
         return entity_id in entities
     
@@ -188,6 +248,10 @@ class FileRepository(IRepository[T], Generic[T]):
         backup_filename = f"{self.filename}.{timestamp}.bak"
         backup_file = self.backup_path / backup_filename
         
+        if self.journal is not None:
+            # Копируется только снимок - сначала переносим в него журнал
+            await self.compact()
+        
         if self.file_path.exists():
             async with self._lock:
                 # Копируем файл
@@ -206,14 +270,23 @@ class FileRepository(IRepository[T], Generic[T]):
             if not backup_file.exists():
                 return False
             
+            # Создаем резервную копию текущего файла (backup берет блокировку сам)
+            await self.backup()
+            
+            if self.journal is not None:
+                # Дожидаемся уплотнения, чтобы оно не перезаписало восстановленный снимок
+                await self.close()
+            
             async with self._lock:
-                # Создаем резервную копию текущего файла
-                await self.backup()
-                
                 # Восстанавливаем из резервной копии
                 import shutil
                 shutil.copy2(backup_file, self.file_path)
                 
+                if self.journal is not None:
+                    # Журнал относится к прежнему снимку - индекс перечитается
+                    self.journal.reset()
+                    self._index = None
+                
                 self.logger.info(f"Восстановлено из резервной копии: {backup_path}")
                 return True
                 
@@ -242,15 +315,9 @@ class FileRepository(IRepository[T], Generic[T]):
             # Конвертируем в объекты
             entities = {}
             for entity_id, entity_data in raw_data.items():
-                try:
-                    if hasattr(self.entity_type, '__dataclass_fields__'):
-                        entity = JSONSerializer._dict_to_dataclass(entity_data, self.entity_type)
-                    else:
-                        entity = self.entity_type(**entity_data)
-                    
+                entity = self._to_entity(entity_id, entity_data)
+                if entity is not None:
                     entities[entity_id] = entity
-                except Exception as e:
-                    self.logger.warning(f"Не удалось загрузить сущность {entity_id}: {e}")
             
             return entities
             
@@ -262,14 +329,9 @@ class FileRepository(IRepository[T], Generic[T]):
         """💾 Сохранение всех данных"""
         try:
             # Конвертируем в сериализуемый формат
-            serializable_data = {}
-            for entity_id, entity in entities.items():
-                if hasattr(entity, '__dataclass_fields__'):
-                    serializable_data[entity_id] = asdict(entity)
-                elif hasattr(entity, '__dict__'):
-                    serializable_data[entity_id] = entity.__dict__
-                else:
-                    serializable_data[entity_id] = entity
+            serializable_data = {
+                entity_id: self._to_serializable(entity) for entity_id, entity in entities.items()
+            }
             
             # Сериализуем в JSON
             json_data = JSONSerializer.serialize(serializable_data)
@@ -287,6 +349,156 @@ class FileRepository(IRepository[T], Generic[T]):
             self.logger.error(f"Ошибка сохранения данных в {self.file_path}: {e}")
             raise PersistenceError(f"Не удалось сохранить данные: {e}")
     
+    def _to_entity(self, entity_id: str, entity_data: Any) -> Optional[T]:
+        """🧩 Сущность из разобранного JSON; None - не удалось"""
+        try:
+            if hasattr(self.entity_type, '__dataclass_fields__'):
+                return JSONSerializer._dict_to_dataclass(entity_data, self.entity_type)
+            return self.entity_type(**entity_data)
+        except Exception as e:
+            self.logger.warning(f"Не удалось загрузить сущность {entity_id}: {e}")
+            return None
+    
+    @staticmethod
+    def _to_serializable(entity: Any) -> Any:
+        if hasattr(entity, '__dataclass_fields__'):
+            return asdict(entity)
+        elif hasattr(entity, '__dict__'):
+            return entity.__dict__
+        return entity
+    
+    # ================= РЕЖИМ ЖУРНАЛА =================
+    
+    async def _journal_index(self) -> Dict[str, str]:
+        """📒 Индекс сущностей (снимок и журнал читаются при первом обращении)"""
+        if self._index is None:
+            async with self._lock:
+                if self._index is None:
+                    await self._open_journal()
+        return self._index
+    
+    async def _open_journal(self) -> None:
+        """Загрузка индекса в потоке executor'а (блокировка уже взята)"""
+        index = await asyncio.get_running_loop().run_in_executor(None, self.journal.open)
+        numeric_ids = [int(entity_id) for entity_id in index if entity_id.isdigit()]
+        self._max_numeric_id = max(numeric_ids) if numeric_ids else None
+        self._index = index
+    
+    async def _save_journaled(self, entity: T) -> T:
+        async with self._lock:
+            if self._index is None:
+                await self._open_journal()
+            
+            entity_id = self._get_entity_id(entity)
+            if entity_id is None:
+                # Новая сущность: числовой ID по счетчику вместо обхода всех ключей
+                if self._max_numeric_id is not None:
+                    entity_id = str(self._max_numeric_id + 1)
+                else:
+                    entity_id = self._generate_id({})
+                self._set_entity_id(entity, entity_id)
+            
+            entity_json = JSONSerializer.serialize_compact(self._to_serializable(entity))
+            try:
+                self.journal.append_put(entity_id, entity_json)
+            except Exception as e:
+                self.logger.error(f"Ошибка записи в журнал {self.journal.journal_path}: {e}")
+                raise PersistenceError(f"Не удалось сохранить данные: {e}")
+            
+            self._index[entity_id] = entity_json
+            if entity_id.isdigit() and (self._max_numeric_id is None or int(entity_id) > self._max_numeric_id):
+                self._max_numeric_id = int(entity_id)
+            
+            self._maybe_compact()
+            self.logger.debug(f"Сохранена сущность {self.entity_type.__name__} с ID {entity_id}")
+            return entity
+    
+    async def _delete_journaled(self, entity_id: str) -> bool:
+        async with self._lock:
+            if self._index is None:
+                await self._open_journal()
+            if entity_id not in self._index:
+                return False
+            
+            try:
+                self.journal.append_delete(entity_id)
+            except Exception as e:
+                self.logger.error(f"Ошибка записи в журнал {self.journal.journal_path}: {e}")
+                raise PersistenceError(f"Не удалось удалить данные: {e}")
+            
+            del self._index[entity_id]
+            self._maybe_compact()
+            self.logger.debug(f"Удалена сущность {self.entity_type.__name__} с ID {entity_id}")
+            return True
+    
+    def _maybe_compact(self) -> None:
+        """♻️ Фоновое уплотнение, когда журнал вырос (блокировка взята)"""
+        if self._compaction is not None and not self._compaction.done():
+            return
+        if self.journal.needs_compaction(len(self._index)):
+            self._compaction = self._start_compaction()
+    
+    def _start_compaction(self) -> asyncio.Future:
+        # Индекс хранит неизменяемые строки - снимок пишется из его копии,
+        # а новые записи тем временем идут в свежий журнал
+        self.journal.rotate()
+        entities = dict(self._index)
+        future = asyncio.get_running_loop().run_in_executor(None, self.journal.write_snapshot, entities)
+        future.add_done_callback(self._on_compaction_done)
+        return future
+    
+    def _on_compaction_done(self, future: asyncio.Future) -> None:
+        if future.cancelled():
+            return
+        error = future.exception()
+        if error is not None:
+            # Старый журнал остается и войдет в следующее уплотнение
+            self.logger.error(f"Ошибка уплотнения {self.file_path}: {error}")
+        else:
+            self.logger.debug(
+                f"♻️ {self.filename} уплотнен за {self.journal.stats.last_compaction_seconds:.2f}с"
+            )
+    
+    async def compact(self) -> None:
+        """♻️ Уплотнение сейчас: снимок будет содержать все изменения (режим журнала)"""
+        if self.journal is None:
+            return
+        
+        async with self._lock:
+            if self._index is None:
+                await self._open_journal()
+            previous = self._compaction
+        if previous is not None:
+            await asyncio.gather(previous, return_exceptions=True)
+        
+        async with self._lock:
+            if self._compaction is not None and not self._compaction.done():
+                # Уплотнение началось после нашего вызова - оно уже включает все записи
+                compaction = self._compaction
+            else:
+                compaction = self._compaction = self._start_compaction()
+        await compaction
+    
+    async def close(self) -> None:
+        """🛑 Ожидание фонового уплотнения и сброс журнала на диск"""
+        if self.journal is None:
+            return
+        if self._compaction is not None:
+            await asyncio.gather(self._compaction, return_exceptions=True)
+        async with self._lock:
+            self.journal.close()
+            self._index = None
+    
+    def get_journal_status(self) -> Dict[str, Any]:
+        """📊 Состояние журнала"""
+        if self.journal is None:
+            return {'enabled': False}
+        return {
+            'enabled': True,
+            'entities': len(self._index) if self._index is not None else None,
+            **self.journal.get_status()
+        }
+    
     def _get_entity_id(self, entity: T) -> Optional[str]:
         """🆔 Получение ID сущности"""
         if hasattr(entity, 'id'):
@@ -366,6 +578,9 @@ class SQLiteRepository(IRepository[T], Generic[T]):
         config: RepositoryConfig,
         table_name: Optional[str] = None
     ):
+        if not AIOSQLITE_AVAILABLE:
+            raise PersistenceError("Для SQLite хранилища нужен aiosqlite: pip install aiosqlite")
+        
         self.entity_type = entity_type
         self.config = config
         self.table_name = table_name or f"{entity_type.__name__.lower()}s"
@@ -0,0 +1,420 @@
+import os
+import json
+import time
+import asyncio
+import logging
+from dataclasses import dataclass, field, asdict
+from pathlib import Path
+from typing import Dict, Any, List, Optional, Callable, Awaitable, Iterator, Tuple
+
+
+# ================= СОСТОЯНИЕ =================
+
+@dataclass
+class TradeSyncState:
+    """📍 Курсор синхронизации пары
+
+    Все сделки с trade_id <= last_trade_id уже в журнале. Незавершенный проход
+    (pending_*) хранит следующий offset и диапазон id, записанных в этом проходе:
+    EXMO отдает user_trades от новых к старым, поэтому проход идет сверху вниз
+    до last_trade_id, а новые сделки только сдвигают offset вперед - при
+    продолжении с сохраненного offset сделки могут повториться, но не пропасть.
+    """
+    pair: str
+    last_trade_id: int = 0
+    pending_offset: Optional[int] = None
+    pending_newest_id: Optional[int] = None
+    pending_oldest_id: Optional[int] = None
+    journal_size: int = 0
+    total_trades: int = 0
+    last_sync: Optional[float] = None
+
+    def is_known(self, trade_id: int) -> bool:
+        """Сделка уже записана в журнал"""
+        if trade_id <= self.last_trade_id:
+            return True
+        return (
+            self.pending_oldest_id is not None
+            and self.pending_oldest_id <= trade_id <= self.pending_newest_id
+        )
+
+    def extend_pending(self, trade_id: int) -> None:
+        """Расширение диапазона текущего прохода"""
+        if self.pending_oldest_id is None:
+            self.pending_oldest_id = self.pending_newest_id = trade_id
+        else:
+            self.pending_oldest_id = min(self.pending_oldest_id, trade_id)
+            self.pending_newest_id = max(self.pending_newest_id, trade_id)
+
+
+class TradePageError(Exception):
+    """❌ Страница истории не получена: ошибка запроса, а не конец истории"""
+
+
+@dataclass
+class SyncResult:
+    """📊 Итог синхронизации пары"""
+    pair: str
+    new_trades: int = 0
+    pages: int = 0
+    duplicates: int = 0
+    resumed: bool = False
+    completed: bool = False
+    duration: float = 0.0
+    error: Optional[str] = None
+
+
+# ================= ЖУРНАЛ =================
+
+class TradeHistoryJournal:
+    """📒 Журнал сделок пары: только дозапись, одна сделка на строку (JSONL)"""
+
+    def __init__(self, base_path: Path, fsync: bool = True):
+        self.base_path = Path(base_path)
+        self.base_path.mkdir(parents=True, exist_ok=True)
+        self.fsync = fsync
+
+        self.logger = logging.getLogger(__name__)
+
+    def journal_path(self, pair: str) -> Path:
+        return self.base_path / f"{pair}.jsonl"
+
+    def state_path(self, pair: str) -> Path:
+        return self.base_path / f"{pair}.state.json"
+
+    def size(self, pair: str) -> int:
+        path = self.journal_path(pair)
+        return path.stat().st_size if path.exists() else 0
+
+    def append(self, pair: str, trades: List[Dict[str, Any]]) -> int:
+        """➕ Дозапись сделок; возвращает новый размер журнала"""
+        path = self.journal_path(pair)
+        if trades:
+            data = "".join(json.dumps(trade, ensure_ascii=False, separators=(",", ":")) + "\n" for trade in trades)
+            with open(path, "a", encoding="utf-8") as f:
+                f.write(data)
+                f.flush()
+                if self.fsync:
+                    os.fsync(f.fileno())
+        return self.size(pair)
+
+    def read(self, pair: str, start: int = 0) -> Iterator[Dict[str, Any]]:
+        """📖 Сделки журнала начиная с байтового смещения"""
+        path = self.journal_path(pair)
+        if not path.exists():
+            return
+        with open(path, "rb") as f:
+            f.seek(start)
+            for line in f:
+                if line.endswith(b"\n"):
+                    yield json.loads(line)
+
+    def repair_tail(self, pair: str) -> int:
+        """🩹 Обрезка недописанной последней строки после сбоя"""
+        path = self.journal_path(pair)
+        size = self.size(pair)
+        if size == 0:
+            return 0
+
+        with open(path, "rb+") as f:
+            # Ищем последний перевод строки с конца файла
+            position = size
+            while position > 0:
+                step = min(4096, position)
+                f.seek(position - step)
+                chunk = f.read(step)
+                newline = chunk.rfind(b"\n")
+                if newline >= 0:
+                    position = position - step + newline + 1
+                    break
+                position -= step
+
+            if position != size:
+                self.logger.warning(f"🩹 Журнал {pair}: обрезана недописанная строка ({size - position} байт)")
+                f.truncate(position)
+                f.flush()
+                os.fsync(f.fileno())
+        return position
+
+    def rewrite(self, pair: str, trades: List[Dict[str, Any]]) -> int:
+        """♻️ Атомарная перезапись журнала (временный файл + rename)"""
+        path = self.journal_path(pair)
+        temp_path = path.with_suffix(".jsonl.tmp")
+        with open(temp_path, "w", encoding="utf-8") as f:
+            for trade in trades:
+                f.write(json.dumps(trade, ensure_ascii=False, separators=(",", ":")) + "\n")
+            f.flush()
+            if self.fsync:
+                os.fsync(f.fileno())
+        os.replace(temp_path, path)
+        return self.size(pair)
+
+    def load_state(self, pair: str) -> TradeSyncState:
+        path = self.state_path(pair)
+        if not path.exists():
+            return TradeSyncState(pair=pair)
+        with open(path, "r", encoding="utf-8") as f:
+            return TradeSyncState(**json.load(f))
+
+    def save_state(self, state: TradeSyncState) -> None:
+        """💾 Атомарная запись курсора: временный файл + rename"""
+        path = self.state_path(state.pair)
+        temp_path = path.with_suffix(".tmp")
+        with open(temp_path, "w", encoding="utf-8") as f:
+            json.dump(asdict(state), f)
+            f.flush()
+            if self.fsync:
+                os.fsync(f.fileno())
+        os.replace(temp_path, path)
+
+
+# ================= СИНХРОНИЗАЦИЯ =================
+
+PageFetcher = Callable[[str, int, int], Any]
+PageCallback = Callable[[TradeSyncState, SyncResult], None]
+
+
+class IncrementalTradeSync:
+    """🔄 Инкрементальная синхронизация user_trades по offset
+
+    fetch_page при ошибке запроса должен поднимать исключение (или вернуть
+    None): пустой список означает конец истории и завершает проход.
+    Порядок записи: сначала журнал (с fsync), затем курсор. Если процесс
+    упал между ними, при загрузке сделки из хвоста журнала за пределами
+    сохраненного размера учитываются в курсоре - повторно они не пишутся.
+    """
+
+    def __init__(self, journal: TradeHistoryJournal, page_size: int = 100):
+        self.journal = journal
+        self.page_size = page_size
+
+        self.logger = logging.getLogger(__name__)
+
+    def begin(self, pair: str) -> TradeSyncState:
+        """▶️ Загрузка курсора с восстановлением после сбоя"""
+        state = self.journal.load_state(pair)
+        size = self.journal.repair_tail(pair)
+
+        if size > state.journal_size:
+            # Журнал дописан, а курсор нет - досчитываем хвост
+            recovered = 0
+            for trade in self.journal.read(pair, state.journal_size):
+                trade_id = _trade_id(trade)
+                if not state.is_known(trade_id):
+                    state.extend_pending(trade_id)
+                    recovered += 1
+            state.total_trades += recovered
+            state.journal_size = size
+            self.logger.info(f"🩹 {pair}: восстановлено {recovered} сделок из хвоста журнала")
+        elif size < state.journal_size:
+            self.logger.warning(f"⚠️ {pair}: журнал короче сохраненного ({size} < {state.journal_size})")
+            state.journal_size = size
+
+        if state.pending_offset is None:
+            state.pending_offset = 0
+        return state
+
+    def apply_page(self, state: TradeSyncState, raw_trades: List[Dict[str, Any]], result: SyncResult) -> bool:
+        """🧩 Обработка страницы; True - проход завершен
+
+        Конец прохода - только настоящая короткая страница. None вместо списка
+        (ошибка запроса) поднимает TradePageError, курсор не меняется.
+        """
+        if not isinstance(raw_trades, list):
+            raise TradePageError(
+                f"{state.pair}: страница с offset {state.pending_offset} не получена ({raw_trades!r})"
+            )
+        result.pages += 1
+
+        fresh = []
+        reached_known = False
+        for trade in raw_trades:
+            trade_id = _trade_id(trade)
+            if trade_id <= state.last_trade_id:
+                reached_known = True
+                continue
+            if state.is_known(trade_id):
+                result.duplicates += 1
+                continue
+            fresh.append(trade)
+
+        if fresh:
+            state.journal_size = self.journal.append(state.pair, fresh)
+            for trade in fresh:
+                state.extend_pending(_trade_id(trade))
+            state.total_trades += len(fresh)
+            result.new_trades += len(fresh)
+
+        completed = reached_known or len(raw_trades) < self.page_size
+        if completed:
+            if state.pending_newest_id is not None:
+                state.last_trade_id = max(state.last_trade_id, state.pending_newest_id)
+            state.pending_offset = state.pending_newest_id = state.pending_oldest_id = None
+            state.last_sync = time.time()
+        else:
+            state.pending_offset += len(raw_trades)
+
+        # Курсор сохраняется после каждой страницы - это и есть контрольная точка
+        self.journal.save_state(state)
+        result.completed = completed
+        return completed
+
+    def sync_pair(
+        self,
+        pair: str,
+        fetch_page: PageFetcher,
+        max_pages: Optional[int] = None,
+        on_page: Optional[PageCallback] = None
+    ) -> SyncResult:
+        """🔄 Синхронизация пары (синхронный fetch_page(pair, offset, limit))"""
+        state, result, started = self._start(pair)
+        while max_pages is None or result.pages < max_pages:
+            raw_trades = fetch_page(pair, state.pending_offset, self.page_size)
+            completed = self.apply_page(state, raw_trades, result)
+            if on_page:
+                on_page(state, result)
+            if completed:
+                break
+        return self._finish(result, started)
+
+    async def sync_pair_async(
+        self,
+        pair: str,
+        fetch_page: Callable[[str, int, int], Awaitable[List[Dict[str, Any]]]],
+        max_pages: Optional[int] = None,
+        on_page: Optional[PageCallback] = None
+    ) -> SyncResult:
+        """🔄 Синхронизация пары (асинхронный fetch_page)"""
+        state, result, started = self._start(pair)
+        while max_pages is None or result.pages < max_pages:
+            raw_trades = await fetch_page(pair, state.pending_offset, self.page_size)
+            completed = self.apply_page(state, raw_trades, result)
+            if on_page:
+                on_page(state, result)
+            if completed:
+                break
+        return self._finish(result, started)
+
+    def compact(self, pair: str) -> int:
+        """🗜️ Журнал пары по возрастанию trade_id без дублей
+
+        Выполняется только между проходами: незавершенный проход опирается на
+        байтовый размер журнала.
+        """
+        state = self.journal.load_state(pair)
+        if state.pending_offset is not None:
+            return state.total_trades
+
+        unique = {_trade_id(trade): trade for trade in self.journal.read(pair)}
+        ordered = [unique[trade_id] for trade_id in sorted(unique)]
+
+        state.journal_size = self.journal.rewrite(pair, ordered)
+        state.total_trades = len(ordered)
+        self.journal.save_state(state)
+        return len(ordered)
+
+    def _start(self, pair: str) -> Tuple[TradeSyncState, SyncResult, float]:
+        state = self.begin(pair)
+        resumed = state.pending_offset > 0 or state.pending_oldest_id is not None
+        if resumed:
+            self.logger.info(f"⏯️ {pair}: продолжение прохода с offset {state.pending_offset}")
+        return state, SyncResult(pair=pair, resumed=resumed), time.monotonic()
+
+    def _finish(self, result: SyncResult, started: float) -> SyncResult:
+        result.duration = time.monotonic() - started
+        self.logger.info(f"✅ {result.pair}: новых сделок {result.new_trades}, страниц {result.pages}"
+                         f"{'' if result.completed else ' (проход не завершен)'}")
+        return result
+
+    def load_trades(self, pair: str) -> List[Dict[str, Any]]:
+        """📖 Все сделки пары из журнала, от новых к старым"""
+        return sorted(self.journal.read(pair), key=_trade_id, reverse=True)
+
+    def get_status(self, pair: str) -> Dict[str, Any]:
+        """📊 Состояние курсора пары"""
+        return asdict(self.journal.load_state(pair))
+
+
+def _trade_id(trade: Dict[str, Any]) -> int:
+    return int(trade.get("trade_id", trade.get("id", 0)))
+
+
+# ================= ПАРАЛЛЕЛЬНАЯ ЗАГРУЗКА =================
+
+@dataclass
+class BackfillProgress:
+    """📈 Ход загрузки истории по всем парам"""
+    pairs_total: int
+    started: float = field(default_factory=time.monotonic)
+    pairs_done: int = 0
+    pages: int = 0
+    new_trades: int = 0
+    results: Dict[str, SyncResult] = field(default_factory=dict)
+
+    @property
+    def elapsed(self) -> float:
+        return time.monotonic() - self.started
+
+    @property
+    def pages_per_second(self) -> float:
+        return self.pages / self.elapsed if self.elapsed > 0 else 0.0
+
+
+class TradeHistoryBackfill:
+    """⚡ Загрузка истории нескольких пар параллельно
+
+    Пары обрабатываются конкурентно (не больше concurrency одновременно), а
+    общий бюджет запросов задает лимитер клиента, через который идет fetch_page.
+    Контрольные точки - курсоры IncrementalTradeSync: прерванная загрузка
+    продолжается с места остановки. По завершении пары журнал уплотняется.
+    """
+
+    def __init__(
+        self,
+        sync: IncrementalTradeSync,
+        concurrency: int = 4,
+        on_progress: Optional[Callable[[BackfillProgress, TradeSyncState, SyncResult], None]] = None
+    ):
+        self.sync = sync
+        self.concurrency = concurrency
+        self.on_progress = on_progress
+
+        self.logger = logging.getLogger(__name__)
+
+    async def run(
+        self,
+        pairs: List[str],
+        fetch_page: Callable[[str, int, int], Awaitable[List[Dict[str, Any]]]],
+        max_pages_per_pair: Optional[int] = None
+    ) -> BackfillProgress:
+        """🚀 Загрузка всех пар; ошибка одной пары не останавливает остальные"""
+        progress = BackfillProgress(pairs_total=len(pairs))
+        semaphore = asyncio.Semaphore(self.concurrency)
+
+        async def backfill_pair(pair: str) -> None:
+            async with semaphore:
+                last_pages = last_trades = 0
+
+                def on_page(state: TradeSyncState, result: SyncResult) -> None:
+                    nonlocal last_pages, last_trades
+                    progress.pages += result.pages - last_pages
+                    progress.new_trades += result.new_trades - last_trades
+                    last_pages, last_trades = result.pages, result.new_trades
+                    progress.results[pair] = result
+                    if self.on_progress:
+                        self.on_progress(progress, state, result)
+
+                try:
+                    result = await self.sync.sync_pair_async(pair, fetch_page, max_pages_per_pair, on_page)
+                    if result.completed and result.new_trades:
+                        self.sync.compact(pair)
+                except Exception as e:
+                    self.logger.error(f"❌ Ошибка загрузки истории {pair}: {e}")
+                    result = progress.results.get(pair) or SyncResult(pair=pair)
+                    result.error = str(e)
+
+                progress.results[pair] = result
+                progress.pairs_done += 1
+
+        await asyncio.gather(*(backfill_pair(pair) for pair in pairs))
+        return progress
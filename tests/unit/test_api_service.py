@@ -0,0 +1,81 @@
+"""🧪 APIService: без сетевых запросов до start()"""
+
+import threading
+
+from api_service import APIService
+from src.core.cache.tiered_cache import TieredCache
+
+
+PAIR_SETTINGS = {
+    "DOGE_EUR": {
+        "min_quantity": "10", "max_quantity": "100000000", "min_price": "0.00000001",
+        "max_price": "10000", "min_amount": "1", "max_amount": "500000",
+        "price_precision": 6, "commission_taker_percent": "0.3", "commission_maker_percent": "0.3"
+    }
+}
+
+
+class StubAPI:
+    """Синхронный клиент EXMO со счетчиком вызовов"""
+
+    def __init__(self):
+        self.calls = []
+
+    def get_pair_settings(self):
+        self.calls.append("pair_settings")
+        return PAIR_SETTINGS
+
+    def get_ticker(self):
+        self.calls.append("ticker")
+        return {}
+
+    def create_order(self, pair, quantity, price, order_type):
+        self.calls.append("order_create")
+        return {"result": True, "order_id": 1, "quantity": quantity, "price": price}
+
+
+def refresh_threads():
+    return [t for t in threading.enumerate() if t.name == "pair-registry-refresh"]
+
+
+class TestAPIServiceLifecycle:
+
+    def test_constructor_has_no_side_effects(self):
+        api = StubAPI()
+        service = APIService(api, config=None, cache=TieredCache())
+
+        assert api.calls == []
+        assert service.pair_registry._refresh_thread is None
+        assert not service.pair_registry.is_loaded
+
+    def test_start_and_stop(self):
+        api = StubAPI()
+        service = APIService(api, config=None, cache=TieredCache())
+        before = len(refresh_threads())
+
+        service.start()
+        try:
+            assert api.calls == ["pair_settings"]
+            assert service.pair_registry.get("DOGE_EUR").price_precision == 6
+            assert len(refresh_threads()) == before + 1
+        finally:
+            service.stop()
+
+        assert service.pair_registry._refresh_thread is None
+        assert len(refresh_threads()) == before
+        # Повторный запуск после остановки
+        service.start()
+        service.stop()
+        assert len(refresh_threads()) == before
+
+    def test_order_without_start_loads_pair_settings_once(self):
+        api = StubAPI()
+        service = APIService(api, config=None, cache=TieredCache())
+
+        first = service.create_order("DOGE_EUR", 1.0, 0.12345678, "buy")
+        service.create_order("DOGE_EUR", 20.0, 0.1, "buy")
+
+        # Минимум и точность пары из справочника
+        assert first["quantity"] == 10.0 and first["price"] == 0.123457
+        assert api.calls == ["pair_settings", "order_create", "order_create"]
+        assert service.pair_registry._refresh_thread is None
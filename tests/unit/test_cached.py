@@ -0,0 +1,110 @@
+"""🧪 Ключи @cached: экземпляры не делят результаты без явного разрешения"""
+
+import asyncio
+import subprocess
+import sys
+from decimal import Decimal
+
+import pytest
+
+from src.infrastructure.cache.infrastructure_cache import CacheFactory, cached, make_cache_key
+
+
+def run(coro):
+    return asyncio.run(coro)
+
+
+class TestMethodKeys:
+
+    def test_instances_with_cache_key_are_separate(self):
+        cache = CacheFactory.create_memory_cache()
+
+        class Client:
+            def __init__(self, account):
+                self.account = account
+                self.calls = 0
+
+            def __cache_key__(self):
+                return self.account
+
+            @cached(cache, ttl=60)
+            async def get_balance(self, currency):
+                self.calls += 1
+                return f"{self.account}:{currency}"
+
+        a, b, a_again = Client("A"), Client("B"), Client("A")
+
+        assert run(a.get_balance("EUR")) == "A:EUR"
+        assert run(b.get_balance("EUR")) == "B:EUR"
+        # Тот же аккаунт в другом экземпляре - тот же ключ
+        assert run(a_again.get_balance("EUR")) == "A:EUR"
+        assert (a.calls, b.calls, a_again.calls) == (1, 1, 0)
+
+    def test_method_without_identity_is_rejected(self):
+        cache = CacheFactory.create_memory_cache()
+
+        class Client:
+            @cached(cache, ttl=60)
+            async def get_balance(self, currency):
+                return currency
+
+        with pytest.raises(TypeError, match="share_across_instances"):
+            run(Client().get_balance("EUR"))
+
+    def test_share_across_instances_opt_in(self):
+        cache = CacheFactory.create_memory_cache()
+        calls = []
+
+        class Exchange:
+            @cached(cache, ttl=60, share_across_instances=True)
+            async def get_pair_settings(self):
+                calls.append(self)
+                return {"DOGE_EUR": {}}
+
+        run(Exchange().get_pair_settings())
+        run(Exchange().get_pair_settings())
+        assert len(calls) == 1
+
+    def test_key_func_for_methods(self):
+        cache = CacheFactory.create_memory_cache()
+
+        class Client:
+            def __init__(self, account):
+                self.account = account
+
+            @cached(cache, ttl=60, key_func=lambda self, currency: f"balance:{self.account}:{currency}")
+            async def get_balance(self, currency):
+                return f"{self.account}:{currency}"
+
+        assert run(Client("A").get_balance("EUR")) == "A:EUR"
+        assert run(Client("B").get_balance("EUR")) == "B:EUR"
+
+
+class TestArgumentKeys:
+
+    def test_default_repr_argument_is_rejected(self):
+        def price(source, pair):
+            return pair
+
+        with pytest.raises(TypeError, match="key_func"):
+            make_cache_key(price, (object(), "DOGE_EUR"), {})
+
+    def test_equal_calls_share_key(self):
+        def price(pair, amount=Decimal("1"), limit=10):
+            return pair
+
+        assert make_cache_key(price, ("DOGE_EUR", Decimal("1.50")), {}) == \
+            make_cache_key(price, ("DOGE_EUR",), {"amount": Decimal("1.5"), "limit": 10})
+
+    def test_key_is_stable_across_processes(self):
+        script = (
+            "from decimal import Decimal\n"
+            "from src.infrastructure.cache.infrastructure_cache import make_cache_key\n"
+            "def price(pair, amount, tags): pass\n"
+            "print(make_cache_key(price, ('DOGE_EUR', Decimal('1.5'), {'b', 'a'}), {}))\n"
+        )
+        keys = {
+            subprocess.run([sys.executable, "-c", script], capture_output=True, text=True, check=True).stdout
+            for _ in range(2)
+        }
+        assert len(keys) == 1
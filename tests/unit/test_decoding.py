@@ -0,0 +1,77 @@
+"""🧪 Разбор ответов биржи: точный Decimal по умолчанию, одинаковые типы с orjson"""
+
+from decimal import Decimal
+
+import pytest
+
+from src.infrastructure.api import decoding
+from src.infrastructure.api.decoding import decode_json, to_decimal
+
+
+PAYLOAD = (
+    b'{"DOGE_EUR": {"last_trade": "0.0712", "vol": 12.5, "updated": 1700000000,'
+    b' "levels": [[0.07, 100], {"price": 1e-8}]}, "ok": true, "none": null}'
+)
+
+
+def exact_types(value):
+    """Структура с типами листьев - для сравнения результатов двух путей"""
+    if isinstance(value, dict):
+        return {key: exact_types(item) for key, item in value.items()}
+    if isinstance(value, list):
+        return [exact_types(item) for item in value]
+    return type(value), value
+
+
+@pytest.fixture(params=[True, False], ids=["orjson", "json"])
+def fast(request):
+    if request.param:
+        pytest.importorskip("orjson")
+    return request.param
+
+
+class TestDecodeJson:
+
+    def test_fractional_numbers_are_decimal(self, fast):
+        data = decode_json(PAYLOAD, fast=fast)
+        pair = data["DOGE_EUR"]
+
+        assert pair["vol"] == Decimal("12.5") and type(pair["vol"]) is Decimal
+        assert pair["levels"][0][0] == Decimal("0.07") and type(pair["levels"][0][0]) is Decimal
+        assert pair["levels"][1]["price"] == Decimal("1E-8")
+        # Целые, строки и литералы не трогаем
+        assert type(pair["updated"]) is int
+        assert pair["last_trade"] == "0.0712"
+        assert data["ok"] is True and data["none"] is None
+
+    def test_top_level_float(self, fast):
+        assert decode_json(b"0.25", fast=fast) == Decimal("0.25")
+        assert type(decode_json(b"0.25", fast=fast)) is Decimal
+
+    def test_same_types_with_and_without_orjson(self):
+        pytest.importorskip("orjson")
+        assert exact_types(decode_json(PAYLOAD, fast=True)) == exact_types(decode_json(PAYLOAD))
+
+    def test_default_keeps_all_digits(self):
+        data = decode_json(b'{"a": 0.12345678901234567890, "b": 12345678.123456789}')
+
+        assert data["a"] == Decimal("0.12345678901234567890")
+        assert data["b"] == Decimal("12345678.123456789")
+
+    def test_fast_without_orjson_falls_back_to_exact(self, monkeypatch):
+        monkeypatch.setattr(decoding, "ORJSON_AVAILABLE", False)
+        assert decode_json(b'[0.12345678901234567890]', fast=True) == [Decimal("0.12345678901234567890")]
+
+
+class TestToDecimal:
+
+    @pytest.mark.parametrize("value, expected", [
+        ("0.0712", Decimal("0.0712")),
+        ("", Decimal("0")),
+        (None, Decimal("0")),
+        (5, Decimal("5")),
+        (0.1, Decimal("0.1")),
+        (Decimal("1.50"), Decimal("1.50")),
+    ])
+    def test_values(self, value, expected):
+        assert to_decimal(value) == expected
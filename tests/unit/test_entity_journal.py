@@ -0,0 +1,131 @@
+"""🧪 Журнал сущностей: воспроизведение, недописанный хвост, прерванное уплотнение"""
+
+import asyncio
+from dataclasses import dataclass
+from typing import Optional
+
+from src.infrastructure.persistence.entity_journal import EntityJournal
+from src.infrastructure.persistence.infrastructure_persistence import FileRepository, RepositoryConfig
+
+
+def make_journal(tmp_path, **kwargs):
+    return EntityJournal(tmp_path / "items.json", fsync_policy="never", **kwargs)
+
+
+class TestEntityJournal:
+
+    def test_replay_applies_puts_and_deletes(self, tmp_path):
+        journal = make_journal(tmp_path)
+        assert journal.open() == {}
+        journal.append_put("1", '{"value":1}')
+        journal.append_put("2", '{"value":2}')
+        journal.append_put("1", '{"value":10}')
+        journal.append_delete("2")
+        journal.close()
+
+        reopened = make_journal(tmp_path)
+        assert reopened.open() == {"1": '{"value":10}'}
+        assert reopened.records == 4
+        reopened.close()
+
+    def test_torn_tail_is_truncated_on_open(self, tmp_path):
+        journal = make_journal(tmp_path)
+        journal.open()
+        journal.append_put("1", '{"value":1}')
+        journal.close()
+        # Падение посреди записи: строка без перевода строки
+        with open(journal.journal_path, 'ab') as f:
+            f.write(b'{"op":"put","id":"2","da')
+
+        reopened = make_journal(tmp_path)
+        assert reopened.open() == {"1": '{"value":1}'}
+        # Следующая запись не склеивается с обрезком
+        reopened.append_put("3", '{"value":3}')
+        reopened.close()
+
+        assert make_journal(tmp_path).open() == {"1": '{"value":1}', "3": '{"value":3}'}
+
+    def test_interrupted_compaction_is_finished_on_open(self, tmp_path):
+        journal = make_journal(tmp_path)
+        journal.open()
+        journal.append_put("1", '{"value":1}')
+        journal.append_put("2", '{"value":2}')
+        # Журнал переименован, но снимок так и не записан
+        journal.rotate()
+        journal.append_delete("1")
+        journal.close()
+        assert journal.rotated_path.exists()
+        assert not journal.snapshot_path.exists()
+
+        reopened = make_journal(tmp_path)
+        assert reopened.open() == {"2": '{"value":2}'}
+        assert not reopened.rotated_path.exists()
+        assert reopened.records == 0
+        reopened.close()
+
+        # Снимок самодостаточен: журнал после уплотнения пуст
+        assert reopened.journal_path.stat().st_size == 0
+        assert make_journal(tmp_path).open() == {"2": '{"value":2}'}
+
+
+@dataclass
+class Item:
+    id: Optional[str] = None
+    value: int = 0
+
+
+def make_repository(tmp_path):
+    config = RepositoryConfig(
+        storage_path=str(tmp_path), backup_enabled=False,
+        journal_enabled=True, journal_fsync="never", journal_compaction_min_records=1000
+    )
+    return FileRepository(Item, config, "items.json")
+
+
+class TestJournaledFileRepository:
+
+    def test_numeric_ids_continue_after_reopen(self, tmp_path):
+        async def first_session():
+            repository = make_repository(tmp_path)
+            try:
+                await repository.save(Item(id="1", value=1))
+                saved = [await repository.save(Item(value=i)) for i in range(2, 4)]
+                await repository.save(Item(id="42", value=42))
+                return [item.id for item in saved], (await repository.save(Item(value=43))).id
+            finally:
+                await repository.close()
+
+        # Новые ID продолжают максимальный числовой, в том числе заданный явно
+        ids, after_explicit = asyncio.run(first_session())
+        assert ids == ["2", "3"]
+        assert after_explicit == "43"
+
+        async def second_session():
+            repository = make_repository(tmp_path)
+            try:
+                return (await repository.save(Item(value=44))).id, await repository.count()
+            finally:
+                await repository.close()
+
+        # Счетчик восстанавливается по индексу журнала
+        assert asyncio.run(second_session()) == ("44", 6)
+
+    def test_compacted_snapshot_readable_without_journal(self, tmp_path):
+        async def run():
+            repository = make_repository(tmp_path)
+            try:
+                for i in range(5):
+                    await repository.save(Item(id=str(i), value=i))
+                await repository.delete("0")
+                await repository.compact()
+                return repository.get_journal_status()
+            finally:
+                await repository.close()
+
+        status = asyncio.run(run())
+        assert status["compactions"] == 1 and status["journal_records"] == 0
+
+        config = RepositoryConfig(storage_path=str(tmp_path), backup_enabled=False)
+        plain = FileRepository(Item, config, "items.json")
+        items = asyncio.run(plain.find_all())
+        assert sorted(item.value for item in items) == [1, 2, 3, 4]
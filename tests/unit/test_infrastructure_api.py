@@ -0,0 +1,110 @@
+"""🧪 infrastructure_api импортируется и собирает клиента из src.config"""
+
+import asyncio
+from decimal import Decimal
+
+import pytest
+
+from src.config.settings import APISettings
+from src.infrastructure.api import infrastructure_api
+from src.infrastructure.api.infrastructure_api import (
+    APIClientFactory, AiohttpHTTPClient, ExmoAPIClient, HTTPClient, RateLimiter, ReplayHTTPClient
+)
+from src.infrastructure.api.rate_limiter import PriorityRateLimiter
+
+
+def make_settings(**overrides):
+    return APISettings(api_key="k" * 32, api_secret="s" * 32, base_url="http://127.0.0.1:1/v1.1/", **overrides)
+
+
+class TestAPIClientFactory:
+
+    def test_requests_transport_and_sliding_window(self):
+        client = APIClientFactory.create_exmo_client(make_settings())
+
+        assert isinstance(client, ExmoAPIClient)
+        assert isinstance(client.http_client, HTTPClient)
+        assert client.http_client.base_url == "http://127.0.0.1:1/v1.1"
+        assert isinstance(client.rate_limiter, RateLimiter)
+
+    @pytest.mark.skipif(not infrastructure_api.AIOHTTP_AVAILABLE, reason="aiohttp не установлен")
+    def test_aiohttp_transport_and_priority_limiter(self):
+        client = APIClientFactory.create_exmo_client(
+            make_settings(http_transport="aiohttp", rate_limiter_type="priority", rate_limit_per_minute=120)
+        )
+
+        assert isinstance(client.http_client, AiohttpHTTPClient)
+        assert isinstance(client.rate_limiter, PriorityRateLimiter)
+        assert client.rate_limiter.calls_per_minute == 120
+
+    def test_status_reports_settings(self):
+        status = APIClientFactory.create_exmo_client(make_settings()).get_status()
+
+        assert status["settings"]["base_url"] == "http://127.0.0.1:1/v1.1/"
+        assert status["settings"]["http_transport"] == "requests"
+
+
+class StubTransport:
+    """Сетевой транспорт без сети: фиксированные ответы по эндпоинту"""
+
+    BODIES = {
+        "order_book": b'{"DOGE_EUR": {"ask": [["0.0713", "100", "7.13"]], "bid": [["0.0711", "50", "3.55"]]}}',
+        "user_info": b'{"balances": {"EUR": "12.5", "DOGE": "100"}, "reserved": {}}',
+        "user_trades": b'{"DOGE_EUR": [{"trade_id": 2, "price": "0.0712"}, {"trade_id": 1, "price": "0.0710"}]}',
+    }
+
+    def __init__(self):
+        self.calls = []
+
+    async def get(self, endpoint, params=None):
+        return self._respond(endpoint)
+
+    async def post(self, endpoint, data=None, headers=None):
+        return self._respond(endpoint)
+
+    async def close(self):
+        pass
+
+    def _respond(self, endpoint):
+        self.calls.append(endpoint)
+        return infrastructure_api.HTTPResponse(200, self.BODIES[endpoint])
+
+
+class TestCassetteRecordReplay:
+
+    @staticmethod
+    async def session(client):
+        return (
+            await client.get_order_book("DOGE_EUR"),
+            await client.get_balances(),
+            await client.get_trades_page("DOGE_EUR", limit=2)
+        )
+
+    def test_replay_returns_recorded_session_without_network(self, tmp_path):
+        cassette = str(tmp_path / "session.jsonl.gz")
+
+        recording = APIClientFactory.create_exmo_client(make_settings(http_cassette_mode="record", http_cassette_path=cassette))
+        transport = StubTransport()
+        recording.http_client.inner = transport
+
+        async def record():
+            try:
+                return await self.session(recording)
+            finally:
+                await recording.close()
+
+        recorded = asyncio.run(record())
+        assert transport.calls == ["order_book", "user_info", "user_trades"]
+
+        replaying = APIClientFactory.create_exmo_client(make_settings(http_cassette_mode="replay", http_cassette_path=cassette))
+        assert isinstance(replaying.http_client, ReplayHTTPClient)
+
+        async def replay():
+            try:
+                return await self.session(replaying)
+            finally:
+                await replaying.close()
+
+        assert asyncio.run(replay()) == recorded
+        assert recorded[1]["EUR"] == Decimal("12.5")
+        assert [trade["trade_id"] for trade in recorded[2]] == [2, 1]
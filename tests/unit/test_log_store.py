@@ -0,0 +1,63 @@
+"""🧪 LogStructuredStore: чтение во время уплотнения"""
+
+import threading
+
+import pytest
+
+from src.core.exceptions import CacheError
+from src.infrastructure.cache.log_store import LogStructuredStore
+
+
+def make_store(tmp_path, keys=2000):
+    store = LogStructuredStore(str(tmp_path / "cache.log"), compaction_min_bytes=0)
+    store.put_many((f"key-{i}", {"key": f"key-{i}", "value": i}, None) for i in range(keys))
+    # Перезапись половины ключей - уплотнению есть что выбросить
+    store.put_many((f"key-{i}", {"key": f"key-{i}", "value": i}, None) for i in range(0, keys, 2))
+    return store
+
+
+class TestLogStructuredStore:
+
+    def test_reads_during_compaction_see_own_records(self, tmp_path):
+        store = make_store(tmp_path)
+        errors = []
+        stop = threading.Event()
+
+        def reader(start):
+            i = start
+            while not stop.is_set():
+                key = f"key-{i % 2000}"
+                try:
+                    value = store.get(key)
+                    if value != {"key": key, "value": i % 2000}:
+                        errors.append((key, value))
+                except Exception as e:
+                    errors.append((key, repr(e)))
+                i += 7
+
+        threads = [threading.Thread(target=reader, args=(n,)) for n in range(4)]
+        for thread in threads:
+            thread.start()
+        try:
+            for _ in range(20):
+                store.compact()
+                store.put_many((f"key-{i}", {"key": f"key-{i}", "value": i}, None) for i in range(0, 2000, 3))
+        finally:
+            stop.set()
+            for thread in threads:
+                thread.join()
+            store.close()
+
+        assert errors == []
+        assert store.compactions == 20
+
+    def test_stale_offset_of_other_key_is_rejected(self, tmp_path):
+        store = make_store(tmp_path, keys=10)
+        # Смещение чужой целой записи: crc сходится, ключ - нет
+        other = store._index.get("key-2")
+        store._index.set("key-1", other.offset, other.length, other.expires_at)
+
+        with pytest.raises(CacheError):
+            store.get("key-1")
+        assert store.get("key-2") == {"key": "key-2", "value": 2}
+        store.close()
@@ -0,0 +1,150 @@
+"""🧪 Стакан: снимки и изменения, разрывы последовательности, ранг уровня, VWAP"""
+
+import asyncio
+from decimal import Decimal
+
+import pytest
+
+from src.domain.market.order_book import OrderBook, OrderBookRegistry, parse_levels
+
+
+def d(value):
+    return Decimal(value)
+
+
+def make_book():
+    book = OrderBook("DOGE_EUR")
+    book.apply_snapshot(
+        bids=[(d("0.0710"), d("100")), (d("0.0709"), d("200")), (d("0.0705"), d("500"))],
+        asks=[(d("0.0712"), d("50")), (d("0.0714"), d("150")), (d("0.0720"), d("1000"))],
+        sequence=10
+    )
+    return book
+
+
+class TestSnapshotAndDiff:
+
+    def test_snapshot_sorts_sides_and_drops_empty_levels(self):
+        book = OrderBook("DOGE_EUR")
+        book.apply_snapshot(
+            bids=[(d("0.0705"), d("5")), (d("0.0710"), d("1")), (d("0.0708"), d("0"))],
+            asks=[(d("0.0720"), d("3")), (d("0.0712"), d("2"))]
+        )
+
+        assert book.depth() == {
+            "bid": [(d("0.0710"), d("1")), (d("0.0705"), d("5"))],
+            "ask": [(d("0.0712"), d("2")), (d("0.0720"), d("3"))]
+        }
+        assert book.mid_price == d("0.0711")
+        assert book.spread == d("0.0002")
+
+    def test_diff_inserts_updates_and_removes_levels(self):
+        book = make_book()
+
+        assert book.apply_diff(
+            bids=[(d("0.0711"), d("10")), (d("0.0709"), d("0"))],
+            asks=[(d("0.0712"), d("0")), (d("0.0714"), d("75"))],
+            sequence=11
+        )
+
+        assert book.best_bid == d("0.0711")
+        assert book.best_ask == d("0.0714")
+        assert book.bids.quantity_at(d("0.0709")) == 0
+        assert book.asks.quantity_at(d("0.0714")) == d("75")
+        assert book.sequence == 11
+        assert (book.stats.diffs, book.stats.level_updates) == (1, 4)
+
+    def test_registry_applies_stream_snapshot_and_update(self):
+        registry = OrderBookRegistry()
+        registry.apply_stream_message({
+            "event": "snapshot", "topic": "spot/order_book_updates:DOGE_EUR", "seq": 1,
+            "data": {"bid": [["0.0710", "100", "7.1"]], "ask": [["0.0712", "50", "3.56"]]}
+        })
+        book = registry.apply_stream_message({
+            "event": "update", "topic": "spot/order_book_updates:DOGE_EUR", "seq": 2,
+            "data": {"ask": [["0.0711", "20", "1.42"]]}
+        })
+
+        assert book is registry.books["DOGE_EUR"]
+        assert (book.best_bid, book.best_ask, book.sequence) == (d("0.0710"), d("0.0711"), 2)
+
+    def test_parse_levels_skips_malformed_rows(self):
+        assert parse_levels([["0.07", "10", "0.7"], ["bad", "1"], []]) == [(d("0.07"), d("10"))]
+
+
+class TestSequenceGaps:
+
+    def test_gap_is_rejected_and_book_left_unchanged(self):
+        book = make_book()
+
+        assert not book.apply_diff(asks=[(d("0.0711"), d("1"))], sequence=12)
+        assert book.best_ask == d("0.0712")
+        assert book.sequence == 10
+        assert book.stats.sequence_gaps == 1
+
+    def test_stale_diff_is_ignored(self):
+        book = make_book()
+
+        assert book.apply_diff(asks=[(d("0.0711"), d("1"))], sequence=10)
+        assert book.best_ask == d("0.0712")
+        assert book.stats.diffs == 0
+
+    def test_gap_forces_rest_snapshot_on_next_read(self):
+        class Exchange:
+            def __init__(self):
+                self.calls = 0
+
+            async def get_order_book(self, pair, limit=100):
+                self.calls += 1
+                return {pair: {"bid": [["0.0700", "1", "0.07"]], "ask": [["0.0730", "1", "0.073"]]}}
+
+        exchange = Exchange()
+        registry = OrderBookRegistry(exchange, max_age_seconds=60)
+        topic = "spot/order_book_updates:DOGE_EUR"
+
+        async def run():
+            registry.apply_stream_message({"event": "snapshot", "topic": topic, "seq": 1,
+                                           "data": {"bid": [["0.0710", "1"]], "ask": [["0.0712", "1"]]}})
+            fresh = await registry.get_fresh_book("DOGE_EUR")
+            assert exchange.calls == 0 and fresh.best_ask == d("0.0712")
+
+            registry.apply_stream_message({"event": "update", "topic": topic, "seq": 5, "data": {}})
+            return await registry.get_fresh_book("DOGE_EUR")
+
+        book = asyncio.run(run())
+        assert exchange.calls == 1
+        assert (book.best_bid, book.best_ask) == (d("0.0700"), d("0.0730"))
+
+
+class TestQueries:
+
+    @pytest.mark.parametrize("price, rank", [
+        ("0.0710", 0), ("0.0709", 1), ("0.0705", 2),
+        # Цена между уровнями - позиция, которую она бы заняла
+        ("0.0711", 0), ("0.0708", 2), ("0.0700", 3),
+    ])
+    def test_bid_rank_of(self, price, rank):
+        assert make_book().bids.rank_of(d(price)) == rank
+
+    @pytest.mark.parametrize("price, rank", [
+        ("0.0712", 0), ("0.0714", 1), ("0.0720", 2), ("0.0711", 0), ("0.0715", 2), ("0.0800", 3),
+    ])
+    def test_ask_rank_of(self, price, rank):
+        assert make_book().asks.rank_of(d(price)) == rank
+
+    def test_vwap_to_fill_walks_levels(self):
+        book = make_book()
+
+        # 50 по 0.0712 + 100 по 0.0714
+        assert book.vwap_to_fill("buy", d("150")) == (d("50") * d("0.0712") + d("100") * d("0.0714")) / d("150")
+        assert book.vwap_to_fill("sell", d("100")) == d("0.0710")
+
+        estimate = book.estimate_fill("sell", d("250"))
+        assert estimate.levels_consumed == 2 and estimate.worst_price == d("0.0709")
+
+    def test_vwap_to_fill_without_liquidity(self):
+        book = make_book()
+
+        assert book.vwap_to_fill("sell", d("801")) is None
+        assert book.estimate_fill("sell", d("801")).filled_quantity == d("800")
+        assert OrderBook("DOGE_EUR").vwap_to_fill("buy", d("1")) is None
@@ -0,0 +1,76 @@
+"""🧪 Пакетная отмена ордеров OrderExecutionService"""
+
+import asyncio
+
+from src.domain.execution.order_execution_service import (
+    OrderExecutionService, ExecutionConfig, ExecutionMode
+)
+
+
+class StubExchange:
+    """Ответы в форме ExmoAPIClient.cancel_order: словарь, а не bool"""
+
+    def __init__(self, failing=(), raising=()):
+        self.failing = set(failing)
+        self.raising = set(raising)
+        self.cancelled = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    async def cancel_order(self, order_id):
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            await asyncio.sleep(0)
+            if order_id in self.raising:
+                raise ConnectionError("timeout")
+            if order_id in self.failing:
+                return {"success": False, "error": "Order not found"}
+            self.cancelled.append(order_id)
+            return {"success": True, "result": {"result": True, "error": ""}}
+        finally:
+            self.in_flight -= 1
+
+
+def make_service(exchange, **config):
+    service = OrderExecutionService(exchange, ExecutionConfig(mode=ExecutionMode.LIVE, **config))
+    for order_id in ("1", "2", "3", "4"):
+        service.active_orders[order_id] = {"order_id": order_id}
+    return service
+
+
+class TestCancelMany:
+
+    def test_dict_results_reported_as_cancelled(self):
+        exchange = StubExchange()
+        service = make_service(exchange)
+
+        results = asyncio.run(service.cancel_many(["1", "2", "3"]))
+
+        assert results == {"1": True, "2": True, "3": True}
+        assert sorted(exchange.cancelled) == ["1", "2", "3"]
+        assert list(service.active_orders) == ["4"]
+
+    def test_failed_and_raising_cancels(self):
+        exchange = StubExchange(failing={"2"}, raising={"3"})
+        service = make_service(exchange)
+
+        results = asyncio.run(service.cancel_many(["1", "2", "3"]))
+
+        assert results == {"1": True, "2": False, "3": False}
+        # Неотмененные ордера остаются активными
+        assert sorted(service.active_orders) == ["2", "3", "4"]
+
+    def test_concurrency_limit(self):
+        exchange = StubExchange()
+        service = make_service(exchange, batch_concurrency=2)
+        order_ids = [str(i) for i in range(10)]
+
+        results = asyncio.run(service.cancel_many(order_ids))
+
+        assert all(results[order_id] for order_id in order_ids)
+        assert exchange.max_in_flight == 2
+
+    def test_empty_batch(self):
+        service = make_service(StubExchange())
+        assert asyncio.run(service.cancel_many([])) == {}
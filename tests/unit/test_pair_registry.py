@@ -0,0 +1,31 @@
+"""🧪 PairSpec: точность цены из pair_settings"""
+
+from decimal import Decimal
+
+import pytest
+
+from src.infrastructure.api.pair_registry import PairSpec
+
+
+class TestPairSpecPrecision:
+
+    @pytest.mark.parametrize("raw, precision, step", [
+        (0, 0, Decimal("1")),
+        ("0", 0, Decimal("1")),
+        (6, 6, Decimal("0.000001")),
+        (None, 8, Decimal("1E-8")),
+        ("", 8, Decimal("1E-8")),
+    ])
+    def test_price_precision(self, raw, precision, step):
+        spec = PairSpec.from_payload("BTC_USD", {"price_precision": raw})
+
+        assert spec.price_precision == precision
+        assert spec.price_step == step
+
+    def test_missing_precision_defaults_to_8(self):
+        assert PairSpec.from_payload("BTC_USD", {}).price_precision == 8
+
+    def test_zero_precision_rounds_to_integer(self):
+        spec = PairSpec.from_payload("BTC_USD", {"price_precision": 0})
+
+        assert spec.round_price(Decimal("60123.5")) == Decimal("60124")
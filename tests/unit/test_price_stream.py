@@ -0,0 +1,89 @@
+"""🧪 Push-поток цен: подписки без дублей и свежий кэш MarketDataService"""
+
+import asyncio
+from datetime import datetime
+from decimal import Decimal
+
+import pytest
+
+from src.core.cache.tiered_cache import TieredCache
+from src.core.models import Price
+from src.domain.market.market_data_service import MarketDataService
+from src.infrastructure.api import price_stream
+from src.infrastructure.api.price_stream import ExmoPriceStream, PriceTick
+
+pytestmark = pytest.mark.skipif(not price_stream.AIOHTTP_AVAILABLE, reason="aiohttp не установлен")
+
+
+def make_stream():
+    stream = ExmoPriceStream("ws://127.0.0.1:1/v1/public")
+
+    # Без сети: подписка только запоминает пару
+    async def start():
+        pass
+
+    stream.start = start
+    return stream
+
+
+def tick(pair, value, bid=None, ask=None):
+    return PriceTick(pair, Price(Decimal(value), pair.split("_")[1]), bid, ask, datetime.now())
+
+
+class TestPriceCallbacks:
+
+    def test_repeated_subscription_is_not_duplicated(self):
+        stream = make_stream()
+        received = []
+
+        async def run():
+            await stream.subscribe_to_price_updates("DOGE_EUR", received.append)
+            unsubscribe = await stream.subscribe_to_price_updates("DOGE_EUR", received.append)
+            await stream._dispatch(tick("DOGE_EUR", "0.0712"))
+            await stream._dispatch(tick("BTC_EUR", "60000"))
+
+            await unsubscribe()
+            await stream._dispatch(tick("DOGE_EUR", "0.0713"))
+
+        asyncio.run(run())
+        assert [price.value for price in received] == [Decimal("0.0712")]
+        assert stream.get_status()["price_callbacks"] == 0
+        assert stream.get_status()["listeners"] == 0
+
+    def test_callback_may_unsubscribe_during_dispatch(self):
+        stream = make_stream()
+        calls = []
+
+        async def run():
+            handles = {}
+
+            async def once(price):
+                calls.append(price.value)
+                await handles["once"]()
+
+            handles["once"] = await stream.subscribe_to_price_updates("DOGE_EUR", once)
+            await stream._dispatch(tick("DOGE_EUR", "0.0712"))
+            await stream._dispatch(tick("DOGE_EUR", "0.0713"))
+
+        asyncio.run(run())
+        assert calls == [Decimal("0.0712")]
+
+
+class TestMarketDataFromStream:
+
+    def test_tick_refreshes_cached_market_data(self):
+        stream = make_stream()
+        service = MarketDataService(price_feed=stream, cache=TieredCache())
+
+        async def run():
+            await stream._dispatch(tick("DOGE_EUR", "0.0712", Decimal("0.0711"), Decimal("0.0713")))
+            first = await service.get_market_data("DOGE_EUR")
+            await stream._dispatch(tick("DOGE_EUR", "0.0720"))
+            return first, await service.get_market_data("DOGE_EUR")
+
+        first, second = asyncio.run(run())
+        assert first.current_price.value == Decimal("0.0712")
+        assert (first.bid, first.ask, first.spread) == (Decimal("0.0711"), Decimal("0.0713"), Decimal("0.0002"))
+        # Тик без bid/ask меняет цену, стакан остается от прошлого тика
+        assert second.current_price.value == Decimal("0.0720")
+        assert second.bid == Decimal("0.0711")
@@ -0,0 +1,167 @@
+"""🧪 PriorityRateLimiter на виртуальном времени"""
+
+import asyncio
+
+import pytest
+
+from src.infrastructure.api.rate_limiter import PriorityRateLimiter, EndpointClass
+
+
+class VirtualClock:
+    """Часы и sleep для лимитера: время идет только при ожидании"""
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+    async def sleep(self, delay: float) -> None:
+        # Сначала отдаем управление - разбуженные задачи видят время выдачи
+        await asyncio.sleep(0)
+        self.now += delay
+
+
+def make_limiter(clock, calls_per_minute=60, **kwargs):
+    # Часовой бюджет с запасом - проверяем только минутные полосы
+    return PriorityRateLimiter(
+        calls_per_minute=calls_per_minute, calls_per_hour=100_000,
+        clock=clock, sleep=clock.sleep, **kwargs
+    )
+
+
+async def drain(limiter, endpoint="order_create"):
+    """Выбрать все токены: торговая полоса занимает у всех нижних"""
+    while limiter._try_take(limiter.lanes[limiter.classify(endpoint)]):
+        pass
+
+
+class TestPriorityRateLimiter:
+
+    def test_lane_shares_and_burst_without_wait(self):
+        clock = VirtualClock()
+        limiter = make_limiter(clock)
+
+        capacities = {c: lane.capacity for c, lane in limiter.lanes.items()}
+        assert capacities == {
+            EndpointClass.TRADING: 24, EndpointClass.ACCOUNT: 15,
+            EndpointClass.MARKET_DATA: 15, EndpointClass.HISTORY: 6
+        }
+
+        async def run():
+            return [await limiter.acquire_permit("order_create") for _ in range(24)]
+
+        assert asyncio.run(run()) == [0.0] * 24
+        assert clock.now == 0.0
+
+    def test_trading_borrows_from_lower_lanes(self):
+        clock = VirtualClock()
+        limiter = make_limiter(clock)
+
+        async def run():
+            return [await limiter.acquire_permit("order_create") for _ in range(60)]
+
+        # Весь минутный бюджет (24 + 15 + 15 + 6) доступен торговле без ожидания
+        assert asyncio.run(run()) == [0.0] * 60
+        assert all(lane.tokens < 1 for lane in limiter.lanes.values())
+
+    def test_lower_lane_never_borrows_from_higher(self):
+        clock = VirtualClock()
+        limiter = make_limiter(clock)
+
+        async def run():
+            for _ in range(6):
+                assert await limiter.acquire_permit("user_trades") == 0.0
+            # Полоса истории пуста, торговая полна - но ее токены недоступны
+            return await limiter.acquire_permit("user_trades")
+
+        waited = asyncio.run(run())
+        assert waited > 0
+        assert limiter.lanes[EndpointClass.TRADING].tokens == pytest.approx(24, abs=1e-6)
+
+    def test_wait_matches_refill_rate(self):
+        clock = VirtualClock()
+        limiter = make_limiter(clock)
+
+        async def run():
+            await drain(limiter)
+            return await limiter.acquire_permit("order_create")
+
+        # 60 в минуту, торговая полоса - 0.4 токена в секунду
+        assert asyncio.run(run()) == pytest.approx(2.5)
+
+    def test_waiters_served_by_priority_not_arrival(self):
+        clock = VirtualClock()
+        limiter = make_limiter(clock)
+        granted = []
+
+        async def request(name, endpoint):
+            await limiter.acquire_permit(endpoint)
+            granted.append((name, round(clock.now, 6)))
+
+        async def run():
+            await drain(limiter)
+            tasks = [
+                asyncio.ensure_future(request("history", "user_trades")),
+                asyncio.ensure_future(request("market", "ticker")),
+                asyncio.ensure_future(request("order", "order_create")),
+            ]
+            await asyncio.gather(*tasks)
+
+        asyncio.run(run())
+        # Токен полосы копится 1/rate секунд: 0.4, 0.25 и 0.1 в секунду
+        assert granted == [("order", 2.5), ("market", 4.0), ("history", 10.0)]
+
+    def test_rate_limit_pauses_all_lanes_but_trading(self):
+        clock = VirtualClock()
+        limiter = make_limiter(clock)
+        limiter.register_error("429 rate_limit")
+        assert limiter.adaptive_delay == 2.0
+
+        async def run():
+            order_wait = await limiter.acquire_permit("order_create")
+            ticker_wait = await limiter.acquire_permit("ticker")
+            return order_wait, ticker_wait
+
+        order_wait, ticker_wait = asyncio.run(run())
+        assert order_wait == 0.0
+        assert ticker_wait == pytest.approx(2.0)
+
+    def test_burst_of_429_escalates_pause_once(self):
+        clock = VirtualClock()
+        limiter = make_limiter(clock)
+
+        # Ответы запросов, ушедших одновременно, приходят пачкой
+        for _ in range(8):
+            limiter.register_error("429 Превышен лимит запросов")
+        assert limiter.adaptive_delay == 2.0
+        assert limiter.metrics.rate_limit_hits == 8
+
+        # 429 после окончания паузы - новое увеличение
+        clock.now += 2.0
+        limiter.register_error("429 Превышен лимит запросов")
+        assert limiter.adaptive_delay == 4.0
+
+    def test_deterministic_schedule(self):
+        def schedule():
+            clock = VirtualClock()
+            limiter = make_limiter(clock)
+            events = []
+
+            async def request(i, endpoint):
+                await limiter.acquire_permit(endpoint)
+                events.append((i, endpoint, round(clock.now, 6)))
+
+            async def run():
+                endpoints = ["order_create", "ticker", "user_info", "user_trades"]
+                await asyncio.gather(*(request(i, endpoints[i % 4]) for i in range(120)))
+
+            asyncio.run(run())
+            return events
+
+        first = schedule()
+        assert len(first) == 120
+        assert first == schedule()
+        # К моменту t выдано не больше начального запаса (60) плюс t * 1 в секунду
+        for granted, (_, _, at) in enumerate(first, start=1):
+            assert granted <= 60 + at + 1e-6
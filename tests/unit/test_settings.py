@@ -0,0 +1,31 @@
+"""🧪 Системные настройки: границы интервала только для адаптивного опроса"""
+
+import pytest
+
+from src.config.settings import ConfigConstants, SystemSettings
+from src.core.exceptions import ValidationError
+
+
+class TestSystemSettingsPolling:
+
+    def test_defaults_are_valid_and_inside_constants(self):
+        settings = SystemSettings()
+        settings.validate()
+
+        assert ConfigConstants.MIN_UPDATE_INTERVAL <= settings.min_update_interval_seconds
+        assert settings.max_update_interval_seconds <= ConfigConstants.MAX_UPDATE_INTERVAL
+
+    def test_fixed_interval_ignores_adaptive_bounds(self):
+        SystemSettings(update_interval_seconds=600, adaptive_polling_enabled=False).validate()
+
+    def test_adaptive_interval_outside_bounds_is_rejected(self):
+        with pytest.raises(ValidationError):
+            SystemSettings(update_interval_seconds=600, adaptive_polling_enabled=True).validate()
+
+    @pytest.mark.parametrize("bounds", [(5, 300), (10, 7200)])
+    def test_adaptive_bounds_outside_constants_are_rejected(self, bounds):
+        min_interval, max_interval = bounds
+        settings = SystemSettings(min_update_interval_seconds=min_interval, max_update_interval_seconds=max_interval)
+
+        with pytest.raises(ValidationError):
+            settings.validate()
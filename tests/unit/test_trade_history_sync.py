@@ -0,0 +1,112 @@
+"""🧪 Инкрементальная загрузка истории: сбой страницы не двигает курсор"""
+
+import asyncio
+
+import pytest
+
+from src.infrastructure.persistence.trade_history_sync import (
+    IncrementalTradeSync, TradeHistoryBackfill, TradeHistoryJournal, TradePageError
+)
+
+
+TOTAL_TRADES = 500
+PAGE_SIZE = 100
+
+
+class FakeExchange:
+    """user_trades от новых к старым; страница с failing_offset не отдается"""
+
+    def __init__(self, failure=None, failing_offset=200):
+        self.trades = {
+            pair: [{"trade_id": i, "pair": pair} for i in range(TOTAL_TRADES, 0, -1)]
+            for pair in ("DOGE_EUR", "BTC_EUR")
+        }
+        self.failure = failure
+        self.failing_offset = failing_offset
+        self.offsets = []
+
+    def page(self, pair, offset, limit):
+        self.offsets.append(offset)
+        if self.failure and offset == self.failing_offset:
+            if self.failure == "none":
+                return None
+            raise self.failure
+        return self.trades[pair][offset:offset + limit]
+
+    async def page_async(self, pair, offset, limit):
+        await asyncio.sleep(0)
+        return self.page(pair, offset, limit)
+
+
+def make_sync(tmp_path):
+    return IncrementalTradeSync(TradeHistoryJournal(tmp_path, fsync=False), page_size=PAGE_SIZE)
+
+
+def assert_complete(sync, pair):
+    status = sync.get_status(pair)
+    assert status["last_trade_id"] == TOTAL_TRADES
+    assert status["pending_offset"] is None
+    assert sorted(t["trade_id"] for t in sync.load_trades(pair)) == list(range(1, TOTAL_TRADES + 1))
+
+
+class TestIncrementalTradeSync:
+
+    @pytest.mark.parametrize("failure", ["none", TradePageError("429 rate_limit"), TimeoutError("timeout")])
+    def test_failed_page_keeps_cursor(self, tmp_path, failure):
+        sync = make_sync(tmp_path)
+        exchange = FakeExchange(failure=failure)
+
+        with pytest.raises((TradePageError, TimeoutError)):
+            sync.sync_pair("DOGE_EUR", exchange.page)
+
+        # Проход не завершен: last_trade_id не сдвинут, курсор на упавшей странице
+        status = sync.get_status("DOGE_EUR")
+        assert status["last_trade_id"] == 0
+        assert status["pending_offset"] == 200
+        assert status["total_trades"] == 200
+
+        exchange.failure = None
+        result = sync.sync_pair("DOGE_EUR", exchange.page)
+
+        assert result.resumed and result.completed
+        assert exchange.offsets[-4:] == [200, 300, 400, 500]
+        assert_complete(sync, "DOGE_EUR")
+
+    def test_short_page_completes_pass(self, tmp_path):
+        sync = make_sync(tmp_path)
+        exchange = FakeExchange()
+
+        result = sync.sync_pair("DOGE_EUR", exchange.page)
+
+        assert result.completed and result.new_trades == TOTAL_TRADES
+        assert_complete(sync, "DOGE_EUR")
+
+
+class TestTradeHistoryBackfill:
+
+    @pytest.mark.parametrize("failure", ["none", TradePageError("429 rate_limit"), TimeoutError("timeout")])
+    def test_failed_page_mid_backfill_resumes(self, tmp_path, failure):
+        sync = make_sync(tmp_path)
+        exchange = FakeExchange(failure=failure, failing_offset=300)
+        backfill = TradeHistoryBackfill(sync, concurrency=2)
+
+        progress = asyncio.run(backfill.run(["DOGE_EUR", "BTC_EUR"], exchange.page_async))
+
+        # Обе пары падают на одной и той же странице - ни одна не завершена
+        for pair in ("DOGE_EUR", "BTC_EUR"):
+            result = progress.results[pair]
+            assert result.error and not result.completed
+            status = sync.get_status(pair)
+            assert status["last_trade_id"] == 0
+            assert status["pending_offset"] == 300
+            assert status["total_trades"] == 300
+
+        exchange.failure = None
+        progress = asyncio.run(backfill.run(["DOGE_EUR", "BTC_EUR"], exchange.page_async))
+
+        for pair in ("DOGE_EUR", "BTC_EUR"):
+            result = progress.results[pair]
+            assert result.error is None
+            assert result.resumed and result.completed
+            assert result.new_trades == TOTAL_TRADES - 300
+            assert_complete(sync, pair)
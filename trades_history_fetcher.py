@@ -9,6 +9,10 @@ from datetime import datetime, timedelta
 from typing import Dict, Any, List, Optional
 from dataclasses import dataclass
 
+from src.infrastructure.persistence.trade_history_sync import (
+    IncrementalTradeSync, TradeHistoryJournal, SyncResult, TradePageError
+)
+
 # Импорты из существующих модулей
 try:
     from config import TradingConfig
@@ -73,6 +77,9 @@ class TradesHistoryFetcher:
         os.makedirs('data', exist_ok=True)
         os.makedirs('logs', exist_ok=True)
         
+        # Инкрементальная синхронизация: журнал сделок + курсор по каждой паре
+        self.trades_sync = IncrementalTradeSync(TradeHistoryJournal('data/trades_sync'), page_size=100)
+        
         self.logger.info("📊 TradesHistoryFetcher инициализирован")
     
     def setup_logging(self):
@@ -108,23 +115,7 @@ class TradesHistoryFetcher:
                 return []
             
             trades = []
-            
-            # Парсим ответ в зависимости от структуры
-            if isinstance(response, dict):
-                if pair in response:
-                    # Формат: {pair: [trades]}
-                    raw_trades = response[pair]
-                elif 'result' in response and response['result']:
-                    # Формат: {result: True, data: [trades]}
-                    raw_trades = response.get('data', response.get(pair, []))
-                else:
-                    # Прямой список сделок
-                    raw_trades = response
-            elif isinstance(response, list):
-                raw_trades = response
-            else:
-                self.logger.error(f"❌ Неожиданный формат ответа: {type(response)}")
-                return []
+            raw_trades = self._extract_raw_trades(response, pair)
             
             if not raw_trades:
                 self.logger.warning("⚠️ Нет сделок в ответе API")
@@ -147,6 +138,55 @@ class TradesHistoryFetcher:
             self.logger.error(f"❌ Ошибка получения истории сделок: {e}")
             return []
     
+    def _extract_raw_trades(self, response: Any, pair: str) -> List[Dict[str, Any]]:
+        """🧩 Список сделок из ответа API в зависимости от структуры"""
+        if isinstance(response, dict):
+            if pair in response:
+                # Формат: {pair: [trades]}
+                return response[pair]
+            if 'result' in response and response['result']:
+                # Формат: {result: True, data: [trades]}
+                return response.get('data', response.get(pair, []))
+            return []
+        if isinstance(response, list):
+            return response
+        
+        self.logger.error(f"❌ Неожиданный формат ответа: {type(response)}")
+        return []
+    
+    def sync_user_trades(self, pair: str = None, max_pages: Optional[int] = None) -> SyncResult:
+        """🔄 Инкрементальная синхронизация: дозапись только новых сделок
+        
+        Курсор пары хранится в data/trades_sync; прерванный проход продолжается
+        со следующего запуска без дублей и пропусков.
+        """
+        if pair is None:
+            pair = self.config.get_pair()
+        
+        self.logger.info(f"🔄 Синхронизация истории сделок {pair}")
+        return self.trades_sync.sync_pair(pair, self._fetch_trades_page, max_pages=max_pages)
+    
+    def _fetch_trades_page(self, pair: str, offset: int, limit: int) -> List[Dict[str, Any]]:
+        """📄 Одна страница user_trades (от новых к старым)
+        
+        Пустой или ошибочный ответ - исключение, а не пустая страница:
+        иначе синхронизация сочла бы историю законченной.
+        """
+        response = self.api.get_user_trades(pair, limit, offset=offset)
+        if not isinstance(response, (dict, list)):
+            raise TradePageError(f"{pair}: нет ответа user_trades (offset {offset}): {response!r}")
+        if isinstance(response, dict) and (response.get('result') is False or response.get('error')):
+            raise TradePageError(f"{pair}: ошибка user_trades (offset {offset}): {response.get('error')}")
+        return self._extract_raw_trades(response, pair)
+    
+    def load_synced_trades(self, pair: str = None) -> List[TradeRecord]:
+        """📖 Сделки из локального журнала без обращения к API"""
+        if pair is None:
+            pair = self.config.get_pair()
+        
+        trades = [self._parse_trade_data(raw, pair) for raw in self.trades_sync.load_trades(pair)]
+        return [trade for trade in trades if trade]
+    
     def _parse_trade_data(self, trade_data: Dict[str, Any], pair: str) -> Optional[TradeRecord]:
         """🔍 Парсинг данных одной сделки"""
         
@@ -339,12 +379,21 @@ def main():
         
         pair = input(f"💱 Торговая пара (по умолчанию {fetcher.config.get_pair()}): ") or fetcher.config.get_pair()
         
-        print(f"\n🔄 Получение истории сделок...")
-        print(f"   Пара: {pair}")
-        print(f"   Лимит: {limit}")
+        incremental = (input("🔄 Инкрементальная синхронизация? (Y/n): ").strip().lower() or "y") == "y"
         
-        # Получаем сделки
-        trades = fetcher.get_user_trades(pair, limit)
+        if incremental:
+            print(f"\n🔄 Синхронизация истории сделок {pair}...")
+            result = fetcher.sync_user_trades(pair)
+            print(f"   Новых сделок: {result.new_trades}, страниц: {result.pages}"
+                  f"{', продолжение прерванного прохода' if result.resumed else ''}")
+            trades = fetcher.load_synced_trades(pair)[:limit]
+        else:
+            print(f"\n🔄 Получение истории сделок...")
+            print(f"   Пара: {pair}")
+            print(f"   Лимит: {limit}")
+            
+            # Получаем сделки
+            trades = fetcher.get_user_trades(pair, limit)
         
         if not trades:
             print("❌ Сделки не найдены или произошла ошибка")
@@ -15,6 +15,7 @@ class TradesManager:
         self.data_dir = 'data'
         self.scripts = {
             'fetcher': 'trades_history_fetcher.py',
+            'backfill': os.path.join('scripts', 'backfill_trades_history.py'),
             'analyzer': 'trades_analyzer.py'
         }
         
@@ -31,6 +32,7 @@ class TradesManager:
         print("3. 📂 Показать доступные файлы")
         print("4. 🧹 Очистка старых файлов")
         print("5. ℹ️  Информация о системе")
+        print("6. ⚡ Параллельная загрузка истории всех пар")
         print("0. 🚪 Выход")
         print("=" * 50)
     
@@ -60,6 +62,31 @@ class TradesManager:
         except Exception as e:
             print(f"❌ Ошибка запуска: {e}")
     
+    def backfill_trades(self):
+        """⚡ Параллельная загрузка истории по всем парам"""
+        print("\n⚡ ПАРАЛЛЕЛЬНАЯ ЗАГРУЗКА ИСТОРИИ")
+        print("-" * 30)
+        
+        if not os.path.exists(self.scripts['backfill']):
+            print(f"❌ Скрипт {self.scripts['backfill']} не найден")
+            return
+        
+        try:
+            pairs = input("💱 Пары через запятую (Enter - все поддерживаемые): ").strip()
+            command = [sys.executable, self.scripts['backfill']]
+            if pairs:
+                command += ['--pairs', pairs.replace(' ', '')]
+            
+            result = subprocess.run(command, capture_output=False, text=True)
+            
+            if result.returncode == 0:
+                print("✅ Загрузка истории завершена успешно")
+            else:
+                print(f"❌ Загрузка завершена с ошибками (код: {result.returncode})")
+                
+        except Exception as e:
+            print(f"❌ Ошибка запуска: {e}")
+    
     def analyze_trades(self):
         """📈 Запуск анализа сделок"""
         print("\n📈 АНАЛИЗ ИСТОРИИ СДЕЛОК")
@@ -286,7 +313,7 @@ class TradesManager:
         while True:
             try:
                 self.show_menu()
-                choice = input("\n👉 Выберите действие (0-5): ").strip()
+                choice = input("\n👉 Выберите действие (0-6): ").strip()
                 
                 if choice == '0':
                     print("👋 До свидания!")
@@ -301,8 +328,10 @@ class TradesManager:
                     self.cleanup_files()
                 elif choice == '5':
                     self.show_system_info()
+                elif choice == '6':
+                    self.backfill_trades()
                 else:
-                    print("❌ Неверный выбор. Пожалуйста, выберите 0-5")
+                    print("❌ Неверный выбор. Пожалуйста, выберите 0-6")
                 
                 input("\n📱 Нажмите Enter для продолжения...")
                 